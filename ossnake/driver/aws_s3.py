@@ -1,5 +1,5 @@
 import logging
-from typing import List, Optional, BinaryIO, Dict
+from typing import List, Optional, BinaryIO, Dict, Iterator, Union, IO
 import boto3
 import os
 from datetime import datetime, timedelta
@@ -15,7 +15,7 @@ from .types import OSSConfig, ProgressCallback, MultipartUpload
 from .exceptions import (
     OSSError, ConnectionError, AuthenticationError, 
     ObjectNotFoundError, BucketNotFoundError, 
-    UploadError, DownloadError, TransferError
+    UploadError, DownloadError, TransferError, ObjectChangedError, TransferCancelledError
 )
 
 class AWSS3Client(BaseOSSClient):
@@ -46,7 +46,8 @@ class AWSS3Client(BaseOSSClient):
             
             # 创建客户端配置
             client_config = Config(
-                retries=dict(max_attempts=3)
+                retries=dict(max_attempts=3),
+                max_pool_connections=self.MAX_POOL_CONNECTIONS
             )
             
             # 设置代理配置
@@ -54,7 +55,8 @@ class AWSS3Client(BaseOSSClient):
                 self.logger.info(f"Configuring AWS S3 client with proxy: {self.proxy_settings}")
                 client_config = Config(
                     proxies=self.proxy_settings,
-                    retries=dict(max_attempts=3)
+                    retries=dict(max_attempts=3),
+                    max_pool_connections=self.MAX_POOL_CONNECTIONS
                 )
             else:
                 self.logger.info("AWS S3 client initialized without proxy")
@@ -203,58 +205,6 @@ class AWSS3Client(BaseOSSClient):
             self.logger.error(f"Failed to upload file {local_file}: {str(e)}")
             raise UploadError(f"Failed to upload file {local_file}: {str(e)}")
 
-    def upload_stream(
-        self,
-        stream: BinaryIO,
-        object_name: str,
-        content_type: Optional[str] = None
-    ) -> str:
-        """从流中上传数据到S3
-        Args:
-            stream: 数据流
-            object_name: 对象名称
-            content_type: 内容类型
-        Returns:
-            str: 对象的URL
-        """
-        try:
-            self.logger.debug(f"Starting stream upload to {object_name}")
-            
-            # 确保流指针在开始位置
-            if hasattr(stream, 'seek'):
-                stream.seek(0)
-            
-            # 上传文件
-            self.client.upload_fileobj(
-                stream,
-                self.config.bucket_name,
-                object_name,
-                ExtraArgs={
-                    'ContentType': content_type or 'application/octet-stream'
-                }
-            )
-            
-            self.logger.debug(f"Stream upload completed: {object_name}")
-            return self.get_public_url(object_name)
-            
-        except ClientError as e:
-            error = e.response['Error']
-            error_code = error['Code']
-            error_msg = error['Message']
-            
-            self.logger.error(f"Stream upload failed: {error_code} - {error_msg}")
-            
-            if error_code in ('AccessDenied', 'InvalidAccessKeyId', 'SignatureDoesNotMatch'):
-                raise AuthenticationError(error_msg)
-            elif error_code == 'NoSuchBucket':
-                raise BucketNotFoundError(error_msg)
-            else:
-                raise UploadError(f"Upload failed: {error_msg}")
-                
-        except Exception as e:
-            self.logger.error(f"Unexpected error during stream upload: {str(e)}")
-            raise UploadError(f"Upload failed: {str(e)}")
-
     def download_file(self, remote_path: str, local_path: str, progress_callback=None):
         """下载文件"""
         try:
@@ -262,9 +212,22 @@ class AWSS3Client(BaseOSSClient):
             os.makedirs(os.path.dirname(os.path.abspath(local_path)), exist_ok=True)
             
             # 获取文件总大小
-            total_size = self.get_object_size(remote_path)
+            info = self.get_object_info(remote_path)
+            total_size = info['size']
             transferred = 0
             
+            # 大文件使用并发分段下载
+            from .transfer_manager import TransferManager
+            manager = TransferManager()
+            if manager.use_ranged_download(total_size):
+                return manager.download_file(
+                    self,
+                    remote_path,
+                    local_path,
+                    progress_callback,
+                    object_info=info
+                )
+            
             # 创建进度回调包装器
             config = TransferConfig(
                 use_threads=True,
@@ -284,6 +247,9 @@ class AWSS3Client(BaseOSSClient):
             else:
                 s3_callback = None
             
+            # 小文件一次请求下载，先按限速消费整个文件的流量
+            self._throttle('download', total_size)
+            
             # 执行下载
             self.client.download_file(
                 self.config.bucket_name,
@@ -293,16 +259,14 @@ class AWSS3Client(BaseOSSClient):
                 Callback=s3_callback
             )
             
+        except TransferCancelledError:
+            raise
         except Exception as e:
             raise OSSError(f"Failed to download file: {str(e)}")
 
     def delete_file(self, object_name: str) -> None:
-        """删除文件"""
+        """删除文件（对象不存在时 S3 同样返回成功，不再先 HEAD 检查）"""
         try:
-            # Check if the object exists before attempting to delete
-            if not self.object_exists(object_name):
-                raise ObjectNotFoundError(f"Object not found: {object_name}")
-
             self.client.delete_object(
                 Bucket=self.config.bucket_name,
                 Key=object_name
@@ -312,48 +276,20 @@ class AWSS3Client(BaseOSSClient):
             if e.response['Error']['Code'] != 'NoSuchKey':
                 raise OSSError(f"Failed to delete file {object_name}: {str(e)}")
 
-    def list_objects(self, prefix: str = '', recursive: bool = True) -> List[Dict]:
-        """列出对象"""
-        try:
-            self.logger.info(f"Listing objects with prefix '{prefix}'")
-            self.logger.info(f"Using proxy: {self.proxy_settings}")
-            self.logger.info(f"Endpoint: {self.config.endpoint}")
-            self.logger.info(f"Region: {self.config.region}")
-            
-            # 记录当前环境变量
-            env_proxies = {
-                'HTTP_PROXY': os.environ.get('HTTP_PROXY'),
-                'HTTPS_PROXY': os.environ.get('HTTPS_PROXY')
-            }
-            self.logger.info(f"Current proxy environment: {env_proxies}")
-            
-            objects = []
-            paginator = self.client.get_paginator('list_objects_v2')
-            pages = paginator.paginate(Bucket=self.config.bucket_name, Prefix=prefix)
-            
-            for page in pages:
-                if 'Contents' in page:
-                    for obj in page['Contents']:
-                        if obj['Key'].endswith('/'):
-                            objects.append({
-                                'name': obj['Key'],
-                                'type': 'folder',
-                                'size': 0,
-                                'last_modified': obj['LastModified']
-                            })
-                        else:
-                            objects.append({
-                                'name': obj['Key'],
-                                'type': 'file',
-                                'size': obj['Size'],
-                                'last_modified': obj['LastModified'],
-                                'etag': obj['ETag'].strip('"')
-                            })
-                            
-            return objects
-            
-        except ClientError as e:
-            raise ClientError(e.response, e.operation_name)
+    def list_objects(self, prefix: str = '', recursive: bool = True, page_size: Optional[int] = None) -> 'Listing':
+        """列出对象（默认递归），见 BaseOSSClient.list_objects"""
+        self.logger.info(f"Listing objects with prefix '{prefix}'")
+        self.logger.info(f"Using proxy: {self.proxy_settings}")
+        self.logger.info(f"Endpoint: {self.config.endpoint}")
+        self.logger.info(f"Region: {self.config.region}")
+        
+        # 记录当前环境变量
+        env_proxies = {
+            'HTTP_PROXY': os.environ.get('HTTP_PROXY'),
+            'HTTPS_PROXY': os.environ.get('HTTPS_PROXY')
+        }
+        self.logger.info(f"Current proxy environment: {env_proxies}")
+        return super().list_objects(prefix, recursive, page_size)
 
     def get_presigned_url(self, object_name: str, expires: int = 3600) -> str:
         """获取预签名URL"""
@@ -442,13 +378,13 @@ class AWSS3Client(BaseOSSClient):
         content_type, _ = mimetypes.guess_type(filename)
         return content_type or 'application/octet-stream' 
 
-    def init_multipart_upload(self, object_name: str) -> MultipartUpload:
+    def init_multipart_upload(self, object_name: str, content_type: Optional[str] = None) -> MultipartUpload:
         """初始化分片上传"""
         try:
-            response = self.client.create_multipart_upload(
-                Bucket=self.config.bucket_name,
-                Key=object_name
-            )
+            params = {'Bucket': self.config.bucket_name, 'Key': object_name}
+            if content_type:
+                params['ContentType'] = content_type
+            response = self.client.create_multipart_upload(**params)
             return MultipartUpload(
                 object_name=object_name,
                 upload_id=response['UploadId']
@@ -456,9 +392,12 @@ class AWSS3Client(BaseOSSClient):
         except ClientError as e:
             raise ClientError(e.response, e.operation_name)
 
-    def upload_part(self, upload: MultipartUpload, part_number: int, data: bytes) -> str:
+    def upload_part(self, upload: MultipartUpload, part_number: int, data: Union[bytes, memoryview, IO]) -> str:
         """上传分片，返回ETag"""
         try:
+            # botocore 不接受 memoryview，包装成可 seek 的读取器（不复制数据），
+            # 发送时按块限速
+            data = self._part_body(data)
             response = self.client.upload_part(
                 Bucket=self.config.bucket_name,
                 Key=upload.object_name,
@@ -478,12 +417,13 @@ class AWSS3Client(BaseOSSClient):
                 'ETag': etag
             } for part_number, etag in sorted(upload.parts)]
             
-            self.client.complete_multipart_upload(
+            response = self.client.complete_multipart_upload(
                 Bucket=self.config.bucket_name,
                 Key=upload.object_name,
                 UploadId=upload.upload_id,
                 MultipartUpload={'Parts': parts}
             )
+            upload.etag = response.get('ETag')
             
             return self.get_public_url(upload.object_name)
             
@@ -501,13 +441,47 @@ class AWSS3Client(BaseOSSClient):
         except ClientError as e:
             raise ClientError(e.response, e.operation_name)
 
-    def copy_object(self, source_key: str, target_key: str) -> str:
-        """复制对象
+    def list_multipart_uploads(self, prefix: str = '') -> List[MultipartUpload]:
+        """列出进行中的分片上传"""
+        try:
+            uploads = []
+            paginator = self.client.get_paginator('list_multipart_uploads')
+            for page in paginator.paginate(Bucket=self.config.bucket_name, Prefix=prefix):
+                for item in page.get('Uploads', []):
+                    upload = MultipartUpload(object_name=item['Key'], upload_id=item['UploadId'])
+                    upload.initiated = item.get('Initiated')
+                    uploads.append(upload)
+            return uploads
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'NoSuchBucket':
+                raise BucketNotFoundError(f"Bucket not found: {self.config.bucket_name}")
+            raise OSSError(f"Failed to list multipart uploads: {str(e)}")
+
+    def list_parts(self, upload: MultipartUpload) -> List[Dict]:
+        """列出已上传的分片"""
+        try:
+            parts = []
+            paginator = self.client.get_paginator('list_parts')
+            for page in paginator.paginate(
+                Bucket=self.config.bucket_name,
+                Key=upload.object_name,
+                UploadId=upload.upload_id
+            ):
+                for part in page.get('Parts', []):
+                    parts.append({
+                        'part_number': part['PartNumber'],
+                        'etag': part['ETag'].strip('"'),
+                        'size': part['Size']
+                    })
+            return sorted(parts, key=lambda p: p['part_number'])
+        except ClientError as e:
+            raise OSSError(f"Failed to list parts: {str(e)}")
+
+    def _copy_object(self, source_key: str, target_key: str) -> None:
+        """服务端复制对象（CopyObject，不超过 5GB）
         Args:
             source_key: 源对象路径
             target_key: 目标对象路径
-        Returns:
-            str: 目标对象的URL
         """
         try:
             copy_source = {
@@ -521,8 +495,6 @@ class AWSS3Client(BaseOSSClient):
                 Key=target_key
             )
             
-            return self.get_public_url(target_key)
-            
         except ClientError as e:
             error_code = e.response['Error']['Code']
             if error_code == 'NoSuchKey':
@@ -531,6 +503,30 @@ class AWSS3Client(BaseOSSClient):
                 raise BucketNotFoundError(f"Bucket not found: {self.config.bucket_name}")
             raise OSSError(f"Failed to copy object: {str(e)}")
 
+    def upload_part_copy(self, upload: MultipartUpload, part_number: int, source_key: str,
+                         start: int, end: int, etag: Optional[str] = None) -> str:
+        """服务端复制源对象的 [start, end] 字节为一个分片（UploadPartCopy），返回ETag"""
+        params = {
+            'Bucket': self.config.bucket_name,
+            'Key': upload.object_name,
+            'UploadId': upload.upload_id,
+            'PartNumber': part_number,
+            'CopySource': {'Bucket': self.config.bucket_name, 'Key': source_key},
+            'CopySourceRange': f"bytes={start}-{end}"
+        }
+        if etag:
+            params['CopySourceIfMatch'] = etag
+        try:
+            response = self.client.upload_part_copy(**params)
+            return response['CopyPartResult']['ETag']
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+            if error_code == 'NoSuchKey':
+                raise ObjectNotFoundError(f"Source object not found: {source_key}")
+            if error_code == 'PreconditionFailed':
+                raise ObjectChangedError(f"Source object changed during copy: {source_key}")
+            raise
+
     def rename_object(self, source_key: str, target_key: str) -> str:
         """重命名对象（复制后删除源对象）
         Args:
@@ -551,43 +547,6 @@ class AWSS3Client(BaseOSSClient):
         except ClientError as e:
             raise OSSError(f"Failed to rename object: {str(e)}")
 
-    def rename_folder(self, source_prefix: str, target_prefix: str) -> None:
-        """重命名文件夹（移动所有文件到新路径）
-        Args:
-            source_prefix: 源文件夹路径（以/结尾）
-            target_prefix: 目标文件夹路径（以/结尾）
-        """
-        try:
-            # 确保路径以/结尾
-            if not source_prefix.endswith('/'):
-                source_prefix += '/'
-            if not target_prefix.endswith('/'):
-                target_prefix += '/'
-                
-            # 列出源文件夹中的所有对象
-            paginator = self.client.get_paginator('list_objects_v2')
-            for page in paginator.paginate(
-                Bucket=self.config.bucket_name,
-                Prefix=source_prefix
-            ):
-                if 'Contents' not in page:
-                    raise ObjectNotFoundError(f"Source folder not found: {source_prefix}")
-                    
-                # 处理每个对象
-                for obj in page['Contents']:
-                    old_key = obj['Key']
-                    # 构建新的对象键
-                    new_key = target_prefix + old_key[len(source_prefix):]
-                    
-                    # 复制到新位置
-                    self.copy_object(old_key, new_key)
-                    
-                    # 删除原对象
-                    self.delete_file(old_key)
-                    
-        except ClientError as e:
-            raise OSSError(f"Failed to rename folder: {str(e)}") 
-
     def object_exists(self, object_name: str) -> bool:
         """检查对象是否存在
         Args:
@@ -634,6 +593,14 @@ class AWSS3Client(BaseOSSClient):
             progress_callback: 进度回调函数
         """
         try:
+            # 大对象使用并发分段下载，按顺序写入输出流
+            from .transfer_manager import TransferManager
+            manager = TransferManager()
+            info = self.get_object_info(object_name)
+            if manager.use_ranged_download(info['size']):
+                manager.download_stream(self, object_name, output_stream, progress_callback, object_info=info)
+                return
+            
             # 获取对象
             response = self.client.get_object(
                 Bucket=self.config.bucket_name,
@@ -647,6 +614,7 @@ class AWSS3Client(BaseOSSClient):
             # 流式读取和写入
             body = response['Body']
             for chunk in iter(lambda: body.read(chunk_size), b''):
+                self._throttle('download', len(chunk))
                 output_stream.write(chunk)
                 downloaded += len(chunk)
                 
@@ -656,9 +624,39 @@ class AWSS3Client(BaseOSSClient):
             # 确保所有数据都写入
             output_stream.flush()
             
+        except TransferCancelledError:
+            raise
         except Exception as e:
             raise OSSError(f"Failed to download stream: {str(e)}") 
 
+    def iter_object_range(self, object_name: str, start: int, end: int, chunk_size: int = 1024 * 1024,
+                          etag: Optional[str] = None) -> Iterator[bytes]:
+        """按字节范围读取对象"""
+        params = {
+            'Bucket': self.config.bucket_name,
+            'Key': object_name,
+            'Range': f"bytes={start}-{end}"
+        }
+        if etag:
+            params['IfMatch'] = f'"{etag}"'
+        try:
+            response = self.client.get_object(**params)
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+            if error_code in ('NoSuchKey', '404'):
+                raise ObjectNotFoundError(f"Object not found: {object_name}")
+            if error_code in ('PreconditionFailed', '412'):
+                raise ObjectChangedError(f"Object changed since download started: {object_name}")
+            raise DownloadError(f"Failed to read range {start}-{end} of {object_name}: {str(e)}")
+        
+        body = response['Body']
+        try:
+            for chunk in iter(lambda: body.read(chunk_size), b''):
+                self._throttle('download', len(chunk))
+                yield chunk
+        finally:
+            body.close()
+
     def get_object_info(self, object_name: str) -> Dict:
         """获取对象信息"""
         try:
@@ -714,22 +712,33 @@ class AWSS3Client(BaseOSSClient):
 
 
 
-    def delete_objects(self, object_names: List[str]) -> None:
-        """批量删除对象"""
+    def delete_objects(self, object_names: List[str]) -> Dict[str, str]:
+        """批量删除对象（DeleteObjects，一次最多 1000 个），返回删除失败的对象 {对象名: 错误信息}"""
+        if not object_names:
+            return {}
         try:
-            objects_to_delete = [{'Key': name} for name in object_names]
-            self.bucket.delete_objects(Delete={'Objects': objects_to_delete})
-        except Exception as e:
+            response = self.client.delete_objects(
+                Bucket=self.config.bucket_name,
+                Delete={'Objects': [{'Key': name} for name in object_names], 'Quiet': True}
+            )
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+            if error_code == 'NoSuchBucket':
+                raise BucketNotFoundError(f"Bucket not found: {self.config.bucket_name}")
+            if error_code in ('AccessDenied', 'InvalidAccessKeyId', 'SignatureDoesNotMatch'):
+                raise AuthenticationError(f"Access denied: {str(e)}")
             raise OSSError(f"Failed to delete objects: {str(e)}")
+        return {
+            error['Key']: f"{error.get('Code')}: {error.get('Message')}"
+            for error in response.get('Errors', [])
+        }
 
     def copy_objects(self, source_prefix: str, target_prefix: str) -> None:
-        """批量复制对象"""
-        try:
-            for obj in self.bucket.objects.filter(Prefix=source_prefix):
-                target_key = obj.key.replace(source_prefix, target_prefix, 1)
-                self.bucket.copy({'Bucket': self.config.bucket_name, 'Key': obj.key}, target_key)
-        except Exception as e:
-            raise OSSError(f"Failed to copy objects: {str(e)}") 
+        """批量复制对象（并发服务端复制，见 copy_prefix）"""
+        result = self.copy_prefix(source_prefix, target_prefix)
+        if result['failed']:
+            name, error = next(iter(result['failed'].items()))
+            raise OSSError(f"Failed to copy {len(result['failed'])} objects (e.g. {name}: {error})")
 
     def get_object(self, object_name: str) -> bytes:
         """获取对象内容
@@ -756,18 +765,22 @@ class AWSS3Client(BaseOSSClient):
             self.logger.error(f"Failed to get object {object_name}: {str(e)}")
             raise OSSError(f"Failed to get object: {str(e)}") 
 
-    def _list_objects_page(self, prefix: str = '', delimiter: str = '/', continuation_token: str = None) -> dict:
-        """获取一页对象列表"""
+    def _list_objects_page(self, prefix: str = '', delimiter: str = '/', continuation_token: str = None,
+                           start_after: Optional[str] = None, page_size: Optional[int] = None) -> dict:
+        """获取一页对象列表（ListObjectsV2）"""
         try:
             params = {
                 'Bucket': self.config.bucket_name,
                 'Prefix': prefix,
-                'Delimiter': delimiter,
-                'MaxKeys': 1000
+                'MaxKeys': page_size or self.LIST_PAGE_SIZE
             }
+            if delimiter:
+                params['Delimiter'] = delimiter
             
             if continuation_token:
                 params['ContinuationToken'] = continuation_token
+            elif start_after:
+                params['StartAfter'] = start_after
             
             response = self.client.list_objects_v2(**params)
             
@@ -776,14 +789,15 @@ class AWSS3Client(BaseOSSClient):
             for prefix in response.get('CommonPrefixes', []):
                 common_prefixes.append(prefix.get('Prefix', ''))
             
-            # 处理文件
+            # 处理文件（以 / 结尾的是文件夹标记）
             objects = []
             for obj in response.get('Contents', []):
                 objects.append({
                     'name': obj['Key'],
                     'size': obj['Size'],
-                    'last_modified': obj['LastModified'].strftime('%Y-%m-%d %H:%M:%S'),
-                    'type': 'file'
+                    'last_modified': obj['LastModified'],
+                    'type': 'folder' if obj['Key'].endswith('/') else 'file',
+                    'etag': obj.get('ETag', '').strip('"')
                 })
             
             return {
@@ -1,8 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, BinaryIO, Dict
+from typing import List, Optional, BinaryIO, Dict, Iterable, Iterator, Union, IO
 import os
 from .types import OSSConfig, ProgressCallback, MultipartUpload
 import functools
+import inspect
 import threading
 import time
 from concurrent.futures import ThreadPoolExecutor, TimeoutError
@@ -23,10 +24,158 @@ def with_timeout(timeout_seconds=30):
         return wrapper
     return decorator
 
+def _mutated_objects(values) -> Iterator[str]:
+    """从修改操作的参数中取出对象名：字符串、对象名列表或 MultipartUpload"""
+    for value in values:
+        if isinstance(value, str):
+            yield value
+        elif isinstance(value, (list, tuple, set)):
+            yield from (name for name in value if isinstance(name, str))
+        elif getattr(value, 'object_name', None):
+            yield value.object_name
+
+def invalidates_objects(method, positions):
+    """修改对象的方法结束后（无论成功与否）失效这些对象的缓存
+    Args:
+        method: 客户端方法
+        positions: 对象名参数的位置（不含 self），按参数名传入时同样识别
+    """
+    names = list(inspect.signature(method).parameters)[1:]
+    
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            values = [
+                args[position] if position < len(args) else kwargs.get(names[position])
+                for position in positions if position < len(names) or position < len(args)
+            ]
+            self._invalidate_objects(_mutated_objects(values))
+    wrapper._invalidates_objects = True
+    return wrapper
+
+def caches_metadata(method, kind: str):
+    """HEAD 类方法先查客户端的元数据缓存（见 MetadataCache）
+    Args:
+        method: get_object_info / object_exists / get_object_size 的实现
+        kind: 'info'、'exists' 或 'size'；未命中时 info 和 size 都经 get_object_info 取得并缓存
+    """
+    name_parameter = list(inspect.signature(method).parameters)[1]
+    
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        from .exceptions import ObjectNotFoundError
+        object_name = args[0] if args else kwargs[name_parameter]
+        cache = self.metadata_cache
+        hit, info = cache.lookup(object_name)
+        if hit:
+            if kind == 'exists':
+                return info is not None
+            if info is None:
+                raise ObjectNotFoundError(f"Object not found: {object_name}")
+            return info['size'] if kind == 'size' else dict(info)
+        version = cache.version
+        if kind == 'size':
+            return self.get_object_info(object_name)['size']
+        try:
+            result = method(self, *args, **kwargs)
+        except ObjectNotFoundError:
+            cache.put_missing(object_name, version)
+            raise
+        if kind == 'info':
+            cache.put(object_name, result, version)
+            return dict(result)
+        if not result:
+            cache.put_missing(object_name, version)
+        return result
+    wrapper._caches_metadata = True
+    return wrapper
+
+def seeds_metadata(method):
+    """列举的每一页写入元数据缓存"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        version = self.metadata_cache.version
+        result = method(self, *args, **kwargs)
+        self.metadata_cache.seed(result.get('objects', []), version)
+        return result
+    wrapper._caches_metadata = True
+    return wrapper
+
 class BaseOSSClient(ABC):
     """统一的OSS客户端基类"""
     
     TRANSFER_MANAGER_THRESHOLD = 5 * 1024 * 1024  # 5MB
+    MAX_POOL_CONNECTIONS = 32  # 连接池大小，需覆盖分片并发数
+    # 分片上传限制（S3 / MinIO），服务商不同时在子类中覆盖
+    MIN_PART_SIZE = 5 * 1024 * 1024  # 5MB（最后一个分片除外）
+    MAX_PART_SIZE = 5 * 1024 * 1024 * 1024  # 5GB
+    MAX_PARTS = 10000
+    MAX_DELETE_BATCH = 1000  # 多对象删除每次请求的对象数上限
+    MAX_COPY_SIZE = 5 * 1024 * 1024 * 1024  # 单次服务端复制（CopyObject）的大小上限，超过后分片复制
+    MULTIPART_ETAG_IS_MD5 = True  # 分片对象的 ETag 为 MD5(各分片 MD5)-分片数，完成上传后可本地校验
+    LIST_PAGE_SIZE = 1000  # 单次列举请求的条目数上限（max-keys）
+    # 修改对象的方法 -> 对象名参数的位置；基类和子类中定义的这些方法都自动包装，
+    # 调用结束后失效对象的缓存（见 invalidates_objects）
+    MUTATING_METHODS = {
+        'put_object': (0,),
+        'upload_file': (1,),
+        'upload_stream': (1,),
+        'complete_multipart_upload': (0,),
+        'delete_file': (0,),
+        'delete_objects': (0,),
+        'rename_object': (0, 1),
+        'move_object': (0, 1),
+        'copy_object': (1,),
+    }
+    
+    # HEAD 类方法 -> 缓存方式，子类的实现自动包装为先查元数据缓存（见 caches_metadata）
+    METADATA_METHODS = {
+        'get_object_info': 'info',
+        'object_exists': 'exists',
+        'get_object_size': 'size',
+    }
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._wrap_mutating_methods()
+        cls._wrap_metadata_methods()
+    
+    @classmethod
+    def _wrap_mutating_methods(cls) -> None:
+        for name, positions in cls.MUTATING_METHODS.items():
+            method = cls.__dict__.get(name)
+            if (callable(method) and not getattr(method, '_invalidates_objects', False)
+                    and not getattr(method, '__isabstractmethod__', False)):
+                setattr(cls, name, invalidates_objects(method, positions))
+    
+    @classmethod
+    def _wrap_metadata_methods(cls) -> None:
+        wrappers = dict(cls.METADATA_METHODS, _list_objects_page='listing')
+        for name, kind in wrappers.items():
+            method = cls.__dict__.get(name)
+            if (callable(method) and not getattr(method, '_caches_metadata', False)
+                    and not getattr(method, '__isabstractmethod__', False)):
+                setattr(cls, name, seeds_metadata(method) if kind == 'listing' else caches_metadata(method, kind))
+    
+    @property
+    def metadata_cache(self) -> 'MetadataCache':
+        """对象元数据缓存（每个客户端一个）"""
+        cache = self.__dict__.get('_metadata_cache')
+        if cache is None:
+            from ossnake.utils.metadata_cache import MetadataCache
+            cache = self.__dict__.setdefault('_metadata_cache', MetadataCache())
+        return cache
+    
+    def _invalidate_objects(self, object_names: Iterable[str]) -> None:
+        """对象被修改、删除或重命名后，删除其元数据缓存和内容缓存"""
+        from ossnake.utils.content_cache import ContentCache
+        cache = None
+        for name in object_names:
+            self.metadata_cache.invalidate(name)
+            cache = cache or ContentCache()
+            cache.invalidate(self, name)
     
     def __init__(self, config: OSSConfig):
         self.config = config
@@ -89,85 +238,345 @@ class BaseOSSClient(ABC):
         Returns:
             str: 文件访问URL
         """
-        if os.path.getsize(local_file) > self.TRANSFER_MANAGER_THRESHOLD:
+        file_size = os.path.getsize(local_file)
+        if file_size > self.TRANSFER_MANAGER_THRESHOLD:
             from .transfer_manager import TransferManager
             manager = TransferManager()
             return manager.upload_file(self, local_file, object_name, progress_callback)
+        # 小文件一次请求上传，先按限速消费整个文件的流量
+        self._throttle('upload', file_size)
         return self._upload_file(local_file, object_name, progress_callback)
     
-    @abstractmethod
+    def upload_directory(
+        self,
+        local_dir: str,
+        prefix: str = '',
+        progress_callback=None,
+        token=None
+    ) -> Dict:
+        """上传整个目录，保持目录结构（见 DirectoryUploader）
+        
+        后台遍历目录的同时开始上传：小文件并发单次 PUT，大文件走分片上传。
+        Args:
+            local_dir: 本地目录
+            prefix: 目标前缀
+            progress_callback: 汇总进度回调 progress_callback(transferred, total)
+            token: 传输令牌，用于暂停/取消（默认取当前线程绑定的令牌）
+        Returns:
+            Dict: {'files': 上传的文件数, 'bytes': 字节数, 'failed': {本地路径: 错误}}
+        """
+        from ossnake.utils.directory_upload import DirectoryUploader
+        return DirectoryUploader(self, token=token).upload(local_dir, prefix, progress_callback)
+    
+    def _throttle(self, direction: str, nbytes: int) -> None:
+        """按全局带宽限制消费流量，必要时阻塞（见 BandwidthLimiter）
+        
+        分块读写循环每个数据块都会调用，同时检查当前线程绑定的传输令牌，
+        传输被取消时抛出 TransferCancelledError。
+        """
+        from ossnake.utils.transfer_token import current_token
+        from ossnake.utils.bandwidth_limiter import BandwidthLimiter
+        token = current_token()
+        if token:
+            token.check()
+        BandwidthLimiter().throttle(direction, nbytes)
+    
+    def _part_body(self, data: Union[bytes, memoryview, IO]) -> 'PartReader':
+        """把分片数据包装成边读边限速的读取器（不复制数据）
+        
+        传输管理器传入的 PartReader 已按全局和单个传输的限速计费，直接使用；
+        其余数据在 SDK 读取时按块消费全局限速，并检查当前线程绑定的传输令牌。
+        """
+        from ossnake.utils.part_source import PartReader
+        from ossnake.utils.transfer_token import current_token
+        if isinstance(data, PartReader):
+            if data.throttled:
+                return data
+            data = data.getbuffer()
+        elif not isinstance(data, (bytes, bytearray, memoryview)):
+            data = data.getbuffer() if hasattr(data, 'getbuffer') else data.read()
+        return PartReader(memoryview(data), current_token(), lambda n: self._throttle('upload', n))
+    
     def upload_stream(self, 
                      stream: BinaryIO, 
                      object_name: str,
                      length: int = -1,
-                     content_type: Optional[str] = None) -> str:
-        """上传流数据并返回可访问的URL"""
-        pass
+                     content_type: Optional[str] = None,
+                     progress_callback=None,
+                     token=None) -> str:
+        """上传流数据并返回可访问的URL
+        
+        流不需要支持 seek，长度可以未知（管道、套接字、产生 bytes 的生成器）：
+        边读取边切成分片并发上传，缓冲区数量有上限；数据不足一个分片时一次 PUT（见 StreamUploader）。
+        Args:
+            stream: 支持 readinto/read 的流，或产生 bytes 的可迭代对象
+            object_name: 对象名称
+            length: 数据长度，未知时为 -1
+            content_type: 内容类型
+            progress_callback: 进度回调 progress_callback(uploaded, total)
+            token: 传输令牌，用于暂停/取消（默认取当前线程绑定的令牌）
+        """
+        from ossnake.utils.stream_upload import StreamUploader
+        return StreamUploader(self, token=token).upload(stream, object_name, length, content_type, progress_callback)
     
     def download_file(self, remote_path: str, local_path: str, progress_callback=None):
         """下载文件"""
         raise NotImplementedError
     
+    def iter_object_range(
+        self,
+        object_name: str,
+        start: int,
+        end: int,
+        chunk_size: int = 1024 * 1024,
+        etag: Optional[str] = None
+    ) -> Iterator[bytes]:
+        """按字节范围读取对象，逐块返回数据
+        Args:
+            object_name: 对象名称
+            start: 起始偏移（包含）
+            end: 结束偏移（包含），与HTTP Range语义一致
+            chunk_size: 每次返回的数据块大小
+            etag: 不为空时附带 If-Match，对象已变化则抛出 ObjectChangedError
+        """
+        raise NotImplementedError
+    
+    def get_object_range(self, object_name: str, start: int, end: int, etag: Optional[str] = None) -> bytes:
+        """获取对象指定字节范围的内容"""
+        return b''.join(self.iter_object_range(object_name, start, end, etag=etag))
+    
+    def get_object_info(self, object_name: str) -> Dict:
+        """获取对象信息（HEAD），先查元数据缓存
+        Returns:
+            Dict: {'size', 'type'（内容类型，来自列举的条目为空）, 'last_modified', 'etag'}
+        Raises:
+            ObjectNotFoundError: 对象不存在
+        """
+        raise NotImplementedError
+    
+    def object_exists(self, object_name: str) -> bool:
+        """对象是否存在，先查元数据缓存"""
+        from .exceptions import ObjectNotFoundError
+        try:
+            self.get_object_info(object_name)
+            return True
+        except ObjectNotFoundError:
+            return False
+    
+    def get_object_size(self, object_name: str) -> int:
+        """对象大小（字节），先查元数据缓存"""
+        return self.get_object_info(object_name)['size']
+    
+    def open(self, object_name: str, mode: str = 'rb', buffering: int = -1, encoding: Optional[str] = None,
+             errors: Optional[str] = None, newline: Optional[str] = None, **kwargs) -> IO:
+        """以只读文件对象方式打开对象，按需发出 Range 请求，不下载整个对象
+        
+        返回的对象支持 seek/tell/read/readinto，可直接交给需要文件对象的库（zipfile、
+        tarfile、PIL 等）读取大对象的文件头、文件尾或片段。用法：
+            with client.open('logs/2024.tar') as f:
+                f.seek(-1024, io.SEEK_END)
+                tail = f.read()
+        Args:
+            object_name: 对象名称
+            mode: 'rb'（默认）或文本模式 'r'
+            buffering: 0 返回无缓冲的 ObjectReader（仅二进制模式），大于 1 时为缓冲区大小
+            encoding, errors, newline: 文本模式参数，同内置 open
+            **kwargs: 传给 ObjectReader：size、etag（都已知时不再 HEAD）、block_size、
+                      cache_blocks、token
+        Raises:
+            ObjectNotFoundError: 对象不存在
+            ValueError: 不支持的模式（对象只能读取）
+        """
+        from ossnake.utils.object_reader import open_object
+        return open_object(self, object_name, mode, buffering, encoding, errors, newline, **kwargs)
+    
     @abstractmethod
     def delete_file(self, object_name: str) -> None:
         """删除对象"""
         pass
     
-    def list_objects(self, prefix: str = '', delimiter: str = '/') -> List[Dict]:
-        """列出对象，支持分页加载所有对象
+    def delete_objects(self, object_names: List[str]) -> Dict[str, str]:
+        """一次删除多个对象（不超过 MAX_DELETE_BATCH 个）
+        
+        驱动使用服务端的多对象删除接口覆盖；默认逐个删除。
+        Returns:
+            Dict[str, str]: 删除失败的对象 {对象名: 错误信息}，全部成功时为空
+        """
+        failed = {}
+        for name in object_names:
+            try:
+                self.delete_file(name)
+            except Exception as e:
+                failed[name] = str(e)
+        return failed
+    
+    def delete_many(self, object_names: Iterable[str], progress_callback=None, token=None) -> Dict:
+        """批量删除对象：按 MAX_DELETE_BATCH 分批，多个批次并发删除（见 BatchDeleter）
         Args:
-            prefix: 前缀
-            delimiter: 分隔符，用于模拟文件夹结构
+            object_names: 对象名（可以是生成器，边取边删）
+            progress_callback: 进度回调 progress_callback(deleted, total)
+            token: 传输令牌，用于暂停/取消（默认取当前线程绑定的令牌）
         Returns:
-            List[Dict]: 对象列表，每个对象包含 name, size, last_modified, type 等信息
+            Dict: {'deleted': 删除的对象数, 'failed': {对象名: 错误信息}}
         """
+        from ossnake.utils.batch_delete import BatchDeleter
+        return BatchDeleter(self, token=token).delete(object_names, progress_callback)
+    
+    def delete_prefix(self, prefix: str, progress_callback=None, token=None) -> Dict:
+        """删除前缀下的所有对象（包括各层文件夹标记），边列举边批量删除
+        
+        prefix 为文件夹时应以 '/' 结尾，否则会同时删除同名前缀的其他对象。
+        """
+        names = (obj['name'] for obj in self.iter_objects(prefix, recursive=True))
+        return self.delete_many(names, progress_callback, token)
+    
+    def list_objects(self, prefix: str = '', recursive: bool = False, page_size: Optional[int] = None) -> 'Listing':
+        """列出对象并返回完整列表（按键的字典序，每页中文件夹在前）
+        
+        结果以列式的 Listing 保存，每页的字典加入后即释放；对象很多的前缀应使用
+        iter_objects / iter_pages，边列举边处理。
+        Args:
+            prefix: 前缀，非递归时不以 '/' 结尾则补上
+            recursive: 是否递归列出子目录，默认False表示显示文件夹结构
+            page_size: 每页条目数，默认使用设置中的 list.page_size
+        Returns:
+            Listing: 对象列表，条目可按字典使用，包含 name, size, last_modified, type 等信息，
+                文件夹另有 display_name（去掉前缀的文件夹名称）
+        """
+        from ossnake.utils.listing import Listing
+        
+        if prefix and not recursive and not prefix.endswith('/'):
+            prefix = prefix + '/'
         try:
-            all_objects = []
-            folders = set()  # 用于去重文件夹
-            
-            # 获取所有对象
-            continuation_token = None
-            while True:
-                result = self._list_objects_page(
-                    prefix=prefix,
-                    delimiter=delimiter,
-                    continuation_token=continuation_token
-                )
-                
-                # 处理文件夹
-                for prefix in result.get('common_prefixes', []):
-                    folder_name = prefix.rstrip('/')
-                    if folder_name not in folders and folder_name != prefix:
-                        folders.add(folder_name)
-                        all_objects.append({
-                            'name': folder_name,
-                            'type': 'folder',
-                            'size': 0,
-                            'last_modified': None
-                        })
-                
-                # 处理文件
-                for obj in result.get('objects', []):
-                    if obj['name'] != prefix:  # 排除当前目录
-                        all_objects.append(obj)
-                
-                # 检查是否还有更多数据
-                continuation_token = result.get('next_token')
-                if not continuation_token:
-                    break
-            
-            # 排序：文件夹在前，同类型按名称排序
-            all_objects.sort(key=lambda x: (
-                0 if x['type'] == 'folder' else 1,  # 文件夹优先
-                x['name'].lower()  # 按名称排序
-            ))
-            
-            return all_objects
-            
+            listing = Listing.from_pages(self.iter_pages(prefix, '' if recursive else '/', page_size=page_size), prefix)
+            self.logger.info(f"Listed {len(listing)} objects for prefix '{prefix}'")
+            return listing
         except Exception as e:
             self.logger.error(f"Failed to list objects: {str(e)}")
             raise
     
+    def iter_objects(self, prefix: str = '', recursive: bool = True, delimiter: Optional[str] = None,
+                     start_after: Optional[str] = None, page_size: Optional[int] = None) -> Iterator[Dict]:
+        """逐页列出对象，每页到达后立即返回其中的对象（不等待整个列表、不排序），见 iter_pages
+        Args:
+            prefix: 前缀
+            recursive: True 时列出前缀下所有层级的对象（文件夹标记以 type 为 'folder' 的条目返回）；
+                False 时按 '/' 分隔，子文件夹以 type 为 'folder' 的条目返回
+            delimiter: 分隔符，指定时代替 recursive
+            start_after: 从该键之后开始列举（不含该键）
+            page_size: 每页条目数，默认使用设置中的 list.page_size
+        Returns:
+            Iterator[Dict]: 与 list_objects 相同的对象信息，文件带 size、etag（服务端提供时）
+        """
+        if delimiter is None:
+            delimiter = '' if recursive else '/'
+        for page in self.iter_pages(prefix, delimiter, start_after, page_size):
+            yield from page
+    
+    def iter_objects_parallel(self, prefix: str = '', workers: Optional[int] = None,
+                              page_size: Optional[int] = None, token=None) -> Iterator[Dict]:
+        """并行递归列举前缀下的所有对象，按字典序返回（见 ShardedLister）
+        
+        结果与 iter_objects(prefix, recursive=True) 相同；键空间切成多段同时列举，
+        适合全桶搜索、清点等需要遍历大量键的场景。
+        Args:
+            prefix: 前缀
+            workers: 同时列举的段数
+            page_size: 每页条目数，默认使用设置中的 list.page_size
+            token: 传输令牌，取消后停止列举
+        """
+        from ossnake.utils.sharded_listing import ShardedLister
+        return ShardedLister(self, workers, page_size, token).iter_objects(prefix)
+    
+    def iter_pages(self, prefix: str = '', delimiter: str = '/', start_after: Optional[str] = None,
+                   page_size: Optional[int] = None) -> Iterator[List[Dict]]:
+        """逐页列举，每次返回一页的条目列表（本页的文件夹在前）
+        
+        返回一页的同时在后台线程请求下一页，调用方处理当前页时下一页已在传输；
+        最多提前一页，内存占用与页大小成正比。停止迭代后不再请求后续页。
+        Args:
+            prefix: 前缀
+            delimiter: 分隔符，为空时列出前缀下所有层级的对象
+            start_after: 从该键之后开始列举（不含该键）
+            page_size: 每页条目数，默认使用设置中的 list.page_size，不超过 LIST_PAGE_SIZE
+        """
+        page_size = self._list_page_size(page_size)
+        
+        def fetch(continuation_token):
+            return self._list_objects_page(
+                prefix,
+                delimiter,
+                continuation_token,
+                start_after=None if continuation_token else start_after,
+                page_size=page_size
+            )
+        
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='list-prefetch')
+        future = executor.submit(fetch, None)
+        try:
+            while future is not None:
+                result = future.result()
+                next_token = result.get('next_token')
+                future = executor.submit(fetch, next_token) if next_token else None
+                page = [
+                    {'name': folder, 'type': 'folder', 'size': 0, 'last_modified': None}
+                    for folder in result.get('common_prefixes', [])
+                ]
+                # 按分隔符列举时跳过当前文件夹自身的标记
+                page.extend(obj for obj in result.get('objects', []) if not delimiter or obj['name'] != prefix)
+                yield page
+        finally:
+            if future is not None:
+                future.cancel()
+            executor.shutdown(wait=False)
+    
+    def _list_page_size(self, page_size: Optional[int] = None) -> int:
+        """每页条目数：参数优先，否则读取设置中的 list.page_size"""
+        if page_size is None:
+            try:
+                from ossnake.utils.settings_manager import SettingsManager
+                page_size = SettingsManager().settings.get('list', {}).get('page_size', self.LIST_PAGE_SIZE)
+            except Exception as e:
+                self.logger.warning(f"Failed to load list settings: {e}")
+                page_size = self.LIST_PAGE_SIZE
+        return max(1, min(int(page_size), self.LIST_PAGE_SIZE))
+    
+    def _list_objects_page(self, prefix: str = '', delimiter: str = '/', continuation_token: str = None,
+                           start_after: Optional[str] = None, page_size: Optional[int] = None) -> dict:
+        """获取一页对象列表（各服务商实现，iter_pages 据此翻页）
+        Args:
+            prefix: 前缀
+            delimiter: 分隔符，为空时不合并子文件夹
+            continuation_token: 上一页返回的 next_token，第一页为 None
+            start_after: 从该键之后开始列举，只用于第一页
+            page_size: 本页最多返回的条目数，默认 LIST_PAGE_SIZE
+        Returns:
+            dict: {'objects': 对象信息列表, 'common_prefixes': 子文件夹前缀列表,
+                   'next_token': 下一页的令牌，没有更多页时为 None}
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support listing objects")
+    
+    def download_directory(
+        self,
+        prefix: str,
+        local_dir: str,
+        progress_callback=None,
+        token=None
+    ) -> Dict:
+        """下载前缀下的所有对象到本地目录，保持目录结构（见 DirectoryDownloader）
+        
+        边列举边下载，对象大小和 ETag 取自列举结果，不再逐个 HEAD。
+        Args:
+            prefix: 远程前缀（“文件夹”）
+            local_dir: 本地目录
+            progress_callback: 汇总进度回调 progress_callback(transferred, total)
+            token: 传输令牌，用于暂停/取消（默认取当前线程绑定的令牌）
+        Returns:
+            Dict: {'files': 下载的文件数, 'bytes': 字节数, 'failed': {对象名: 错误}}
+        """
+        from ossnake.utils.directory_download import DirectoryDownloader
+        return DirectoryDownloader(self, token=token).download(prefix, local_dir, progress_callback)
+    
     @abstractmethod
     def get_presigned_url(self, object_name: str, expires: int = 3600) -> str:
         """获取预签名URL"""
@@ -188,6 +597,98 @@ class BaseOSSClient(ABC):
         """移动/重命名对象"""
         pass
     
+    def copy_object(self, source_key: str, target_key: str, size: Optional[int] = None,
+                    etag: Optional[str] = None, token=None) -> str:
+        """在服务端复制对象，数据不经过本机
+        
+        不超过 MAX_COPY_SIZE 的对象一次请求复制（_copy_object），更大的对象并发分片复制
+        （UploadPartCopy，见 MultipartCopier）。未提供 size 时先直接复制，只有失败时才
+        HEAD 一次判断是否超过单次复制的上限。
+        Args:
+            source_key: 源对象路径
+            target_key: 目标对象路径
+            size: 源对象大小（如取自列举结果）
+            etag: 源对象 ETag，分片复制时校验源对象未被修改
+            token: 传输令牌，用于取消分片复制
+        Returns:
+            str: 目标对象的URL
+        """
+        from .exceptions import OSSError, ObjectNotFoundError, AuthenticationError, BucketNotFoundError
+        
+        if size is None:
+            try:
+                self._copy_object(source_key, target_key)
+                return self.get_public_url(target_key)
+            except (ObjectNotFoundError, AuthenticationError, BucketNotFoundError):
+                raise
+            except OSSError:
+                info = self.get_object_info(source_key)
+                if info['size'] <= self.MAX_COPY_SIZE:
+                    raise
+                size, etag = info['size'], etag or info.get('etag')
+        
+        if size > self.MAX_COPY_SIZE:
+            from ossnake.utils.multipart_copy import MultipartCopier
+            MultipartCopier(self, token=token).copy(source_key, target_key, size, etag)
+        else:
+            self._copy_object(source_key, target_key)
+        return self.get_public_url(target_key)
+    
+    def move_prefix(self, source_prefix: str, target_prefix: str, progress_callback=None, token=None) -> Dict:
+        """把前缀下的所有对象移动到新前缀下：边列举边并发服务端复制，源对象分批删除
+        
+        中断后以相同参数再次调用即可续传（见 PrefixMover）。
+        Args:
+            progress_callback: 进度回调 progress_callback(transferred, total)
+            token: 传输令牌，用于暂停/取消（默认取当前线程绑定的令牌）
+        Returns:
+            Dict: {'files', 'bytes', 'failed': {对象名: 错误}, 'skipped', 'elapsed'}
+        """
+        from ossnake.utils.prefix_move import PrefixMover
+        return PrefixMover(self, token=token).move(source_prefix, target_prefix, progress_callback)
+    
+    def copy_prefix(self, source_prefix: str, target_prefix: str, progress_callback=None, token=None) -> Dict:
+        """把前缀下的所有对象复制到新前缀下（并发服务端复制），返回值同 move_prefix"""
+        from ossnake.utils.prefix_move import PrefixMover
+        return PrefixMover(self, token=token).copy(source_prefix, target_prefix, progress_callback)
+    
+    def rename_folder(self, source_prefix: str, target_prefix: str, progress_callback=None, token=None) -> Dict:
+        """重命名文件夹（移动所有文件到新路径，包括各层子文件夹）
+        Args:
+            source_prefix: 源文件夹路径
+            target_prefix: 目标文件夹路径
+        Returns:
+            Dict: 同 move_prefix
+        Raises:
+            ObjectNotFoundError: 源文件夹为空或不存在
+            OSSError: 部分对象移动失败（失败的对象保留在源文件夹）
+        """
+        from .exceptions import OSSError, ObjectNotFoundError
+        
+        source_prefix = source_prefix.strip('/') + '/'
+        target_prefix = target_prefix.strip('/') + '/'
+        result = self.move_prefix(source_prefix, target_prefix, progress_callback, token)
+        if not result['files'] and not result['failed']:
+            raise ObjectNotFoundError(f"Source folder not found: {source_prefix}")
+        if result['failed']:
+            name, error = next(iter(result['failed'].items()))
+            raise OSSError(f"Failed to move {len(result['failed'])} objects (e.g. {name}: {error})")
+        return result
+    
+    def _copy_object(self, source_key: str, target_key: str) -> None:
+        """一次请求在服务端复制对象（不超过 MAX_COPY_SIZE），由驱动实现"""
+        raise NotImplementedError
+    
+    def upload_part_copy(self, upload: MultipartUpload, part_number: int, source_key: str,
+                         start: int, end: int, etag: Optional[str] = None) -> str:
+        """把源对象的 [start, end] 字节在服务端复制为分片上传的一个分片
+        Args:
+            etag: 源对象 ETag，提供时附带 copy-source-if-match
+        Returns:
+            str: 分片的ETag
+        """
+        raise NotImplementedError
+    
     @abstractmethod
     def list_buckets(self) -> List[Dict]:
         """列出所有可用的存储桶"""
@@ -199,13 +700,18 @@ class BaseOSSClient(ABC):
         pass 
     
     @abstractmethod
-    def init_multipart_upload(self, object_name: str) -> MultipartUpload:
-        """初始化分片上传"""
+    def init_multipart_upload(self, object_name: str, content_type: Optional[str] = None) -> MultipartUpload:
+        """初始化分片上传，content_type 为空时由服务端决定"""
         pass
         
     @abstractmethod
-    def upload_part(self, upload: MultipartUpload, part_number: int, data: bytes) -> str:
-        """上传分片，返回ETag"""
+    def upload_part(self, upload: MultipartUpload, part_number: int, data: Union[bytes, memoryview, IO]) -> str:
+        """上传分片，返回ETag
+        
+        data 可以是 bytes、memoryview 或可 seek 的文件对象（如 PartReader），
+        实现应尽量直接交给 SDK，避免再复制一份分片数据；通过 _part_body 包装后
+        交给 SDK 流式读取，限速按块生效。
+        """
         pass
         
     @abstractmethod
@@ -218,6 +724,22 @@ class BaseOSSClient(ABC):
         """取消分片上传"""
         pass 
     
+    def list_multipart_uploads(self, prefix: str = '') -> List[MultipartUpload]:
+        """列出进行中（未完成也未取消）的分片上传
+        Args:
+            prefix: 对象名前缀
+        Returns:
+            List[MultipartUpload]: 分片上传列表，initiated 为初始化时间
+        """
+        raise NotImplementedError
+    
+    def list_parts(self, upload: MultipartUpload) -> List[Dict]:
+        """列出分片上传中已上传的分片
+        Returns:
+            List[Dict]: 按分片号排序，每项包含 part_number, etag, size
+        """
+        raise NotImplementedError
+    
     def _handle_auth_error(self, error):
         """统一处理认证错误"""
         error_msg = str(error).lower()
@@ -271,4 +793,8 @@ class BaseOSSClient(ABC):
             ObjectNotFoundError: 对象不存在
             OSSError: 其他错误
         """
-        pass
\ No newline at end of file
+        pass
+
+
+BaseOSSClient._wrap_mutating_methods()
+BaseOSSClient._wrap_metadata_methods()
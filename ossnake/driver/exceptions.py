@@ -28,14 +28,30 @@ class UploadError(OSSError):
     """Exception raised for upload errors."""
     pass
 
+class LocalFileChangedError(UploadError):
+    """Exception raised when a local file changed size while it was being uploaded."""
+    pass
+
+class ChecksumMismatchError(UploadError):
+    """Exception raised when uploaded data does not match its locally computed checksum."""
+    pass
+
 class DownloadError(OSSError):
     """Exception raised for download errors."""
     pass
 
+class ObjectChangedError(DownloadError):
+    """Exception raised when an object changed during a download (If-Match failed)."""
+    pass
+
 class TransferError(OSSError):
     """Exception raised for general transfer errors."""
     pass
 
+class TransferCancelledError(TransferError):
+    """Exception raised when a transfer is cancelled through its TransferToken."""
+    pass
+
 class BucketError(OSSError):
     """Exception raised for bucket-related errors."""
     pass
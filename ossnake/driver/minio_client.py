@@ -1,7 +1,8 @@
-from typing import List, Optional, BinaryIO, Dict, Union, IO
+from typing import List, Optional, BinaryIO, Dict, Union, IO, Iterator
 from minio import Minio
 import minio
 from minio.error import S3Error
+from minio.commonconfig import CopySource
 import os
 from datetime import datetime, timedelta
 from urllib.parse import urlparse, urlunparse
@@ -19,7 +20,8 @@ from .base_oss import BaseOSSClient
 from .exceptions import (
     OSSError, ConnectionError, AuthenticationError, 
     ObjectNotFoundError, BucketNotFoundError, 
-    UploadError, DownloadError, TransferError, BucketError, GetUrlError, DeleteError
+    UploadError, DownloadError, TransferError, BucketError, GetUrlError, DeleteError,
+    ObjectChangedError, TransferCancelledError
 )
 
 # 配置日志
@@ -49,7 +51,7 @@ class MinioClient(BaseOSSClient):
             # 配置代理
             http_client_args = {
                 'timeout': urllib3.Timeout(connect=10, read=30),
-                'maxsize': 10,
+                'maxsize': self.MAX_POOL_CONNECTIONS,
                 'retries': urllib3.Retry(
                     total=3,
                     backoff_factor=0.2,
@@ -208,45 +210,33 @@ class MinioClient(BaseOSSClient):
             else:
                 raise UploadError(f"Upload failed: {error_msg}")
 
-    def upload_stream(
-        self,
-        stream: BinaryIO,
-        object_name: str,
-        length: int = -1,
-        content_type: Optional[str] = None
-    ) -> str:
-        """从流中上传数据到MinIO"""
-        try:
-            self.client.put_object(
-                self.config.bucket_name,
-                object_name,
-                stream,
-                length,
-                content_type=content_type or 'application/octet-stream'
-            )
-            return self.get_public_url(object_name)
-        except S3Error as e:
-            if 'NoSuchBucket' in str(e):
-                raise BucketNotFoundError(str(e))
-            elif 'AccessDenied' in str(e):
-                raise AuthenticationError(str(e))
-            else:
-                raise UploadError(str(e))
-
     def download_file(self, object_name: str, local_path: str, progress_callback=None):
         """下载文件"""
         try:
             # 确保目标目录存在
             os.makedirs(os.path.dirname(os.path.abspath(local_path)), exist_ok=True)
             
-            # 获取文件大小
+            # 获取文件大小（列举过的对象取自元数据缓存，不再 HEAD）
             try:
-                stat = self.client.stat_object(self.config.bucket_name, object_name)
-                total_size = stat.size
+                info = self.get_object_info(object_name)
+                total_size = info['size']
             except Exception as e:
                 self.logger.error(f"Failed to get object stats: {e}")
+                info = {}
                 total_size = 0
             
+            # 大文件使用并发分段下载
+            from .transfer_manager import TransferManager
+            manager = TransferManager()
+            if manager.use_ranged_download(total_size):
+                return manager.download_file(
+                    self,
+                    object_name,
+                    local_path,
+                    progress_callback,
+                    object_info={'size': total_size, 'etag': info.get('etag')}
+                )
+            
             # 创建进度回调包装器
             if progress_callback and total_size > 0:
                 class ProgressWrapper:
@@ -269,6 +259,9 @@ class MinioClient(BaseOSSClient):
             else:
                 callback = None
             
+            # 小文件一次请求下载，先按限速消费整个文件的流量
+            self._throttle('download', total_size)
+            
             # 执行下载
             self.client.fget_object(
                 bucket_name=self.config.bucket_name,
@@ -277,6 +270,8 @@ class MinioClient(BaseOSSClient):
                 progress=callback
             )
             
+        except TransferCancelledError:
+            raise
         except Exception as e:
             if os.path.exists(local_path):
                 try:
@@ -285,6 +280,32 @@ class MinioClient(BaseOSSClient):
                     pass
             raise OSSError(f"Failed to download file: {str(e)}")
 
+    def iter_object_range(self, object_name: str, start: int, end: int, chunk_size: int = 1024 * 1024,
+                          etag: Optional[str] = None) -> Iterator[bytes]:
+        """按字节范围读取对象"""
+        response = None
+        try:
+            response = self.client.get_object(
+                self.config.bucket_name,
+                object_name,
+                offset=start,
+                length=end - start + 1,
+                request_headers={'If-Match': f'"{etag}"'} if etag else None
+            )
+            for chunk in response.stream(chunk_size):
+                self._throttle('download', len(chunk))
+                yield chunk
+        except S3Error as e:
+            if e.code == 'NoSuchKey':
+                raise ObjectNotFoundError(f"Object not found: {object_name}")
+            if e.code == 'PreconditionFailed':
+                raise ObjectChangedError(f"Object changed since download started: {object_name}")
+            raise DownloadError(f"Failed to read range {start}-{end} of {object_name}: {str(e)}")
+        finally:
+            if response is not None:
+                response.close()
+                response.release_conn()
+
     def delete_file(self, object_name: str) -> None:
         """删除文件
         Args:
@@ -304,109 +325,57 @@ class MinioClient(BaseOSSClient):
             if 'NoSuchKey' not in str(e):
                 raise OSSError(f"Failed to delete file: {str(e)}")
 
-    def list_objects(self, prefix: str = '', recursive: bool = False) -> List[Dict]:
-        """列出MinIO对象
-        Args:
-            prefix: 前缀过滤
-            recursive: 是否递归列出子目录，默认False表示显示文件夹结构
-        Returns:
-            List[Dict]: 对象列表
+    def _list_objects_page(self, prefix: str = '', delimiter: str = '/', continuation_token: str = None,
+                           start_after: Optional[str] = None, page_size: Optional[int] = None) -> dict:
+        """获取一页对象列表（ListObjectsV2）
+        
+        SDK 的 list_objects 在生成器内部自动翻页，取不到续传令牌，这里直接发送单页请求，
+        与其他服务商共用 BaseOSSClient.iter_pages 的翻页和预取。
         """
+        from minio.datatypes import parse_list_objects
+        
+        query = {
+            'list-type': '2',
+            'prefix': prefix or '',
+            'delimiter': delimiter or '',
+            'max-keys': str(page_size or self.LIST_PAGE_SIZE),
+            'encoding-type': 'url'
+        }
+        if continuation_token:
+            query['continuation-token'] = continuation_token
+        elif start_after:
+            query['start-after'] = start_after
         try:
-            self.logger.info(f"Starting to list objects with prefix: '{prefix}', recursive: {recursive}")
-            
-            # 规范化前缀
-            if prefix and not prefix.endswith('/'):
-                prefix = prefix + '/'
-            
-            self.logger.debug(f"Using normalized prefix: '{prefix}'")
-            
-            objects = []
-            total_files = 0
-            total_folders = 0
-            
-            # 使用MinIO的list_objects方法，不使用delimiter参数
-            items = self.client.list_objects(
-                self.config.bucket_name,
-                prefix=prefix,
-                recursive=recursive
-            )
-            
-            # 跟踪已处理的文件夹
-            processed_folders = set()
-            
-            for item in items:
-                try:
-                    # 获取对象名称
-                    name = str(item.object_name)
-                    
-                    # 跳过空对象
-                    if not name:
-                        continue
-                    
-                    # 如果不是递归模式，需要手动处理文件夹结构
-                    if not recursive:
-                        # 获取当前对象的所有父文件夹路径
-                        parts = name.split('/')
-                        for i in range(len(parts)):
-                            if i < len(parts) - 1:  # 不处理最后一个部分（文件名）
-                                folder_path = '/'.join(parts[:i+1]) + '/'
-                                if folder_path not in processed_folders:
-                                    folder_name = parts[i]
-                                    if prefix and folder_path.startswith(prefix):
-                                        # 只显示当前层级的文件夹名称
-                                        folder_name = folder_path[len(prefix):].rstrip('/')
-                                        if '/' in folder_name:
-                                            folder_name = folder_name.split('/')[0]
-                                    
-                                    self.logger.debug(f"Adding folder: {folder_name} (full path: {folder_path})")
-                                    
-                                    objects.append({
-                                        'name': folder_path,  # 保存完整路径
-                                        'display_name': folder_name,  # 显示名称
-                                        'size': 0,
-                                        'last_modified': None,
-                                        'type': 'folder'
-                                    })
-                                    processed_folders.add(folder_path)
-                                    total_folders += 1
-                    
-                    # 处理文件
-                    if not name.endswith('/'):  # 跳过文件夹标记
-                        self.logger.debug(f"Adding file: {name}, size: {item.size}")
-                        
-                        # 如果不是递归模式，只显示当前层级的文件
-                        if not recursive:
-                            if prefix:
-                                # 检查文件是否在当前层级
-                                relative_path = name[len(prefix):]
-                                if '/' in relative_path:
-                                    continue  # 跳过子文件夹中的文件
-                        
-                        objects.append({
-                            'name': name,
-                            'size': item.size,
-                            'last_modified': item.last_modified,
-                            'type': 'file',
-                            'etag': item.etag.strip('"') if item.etag else None
-                        })
-                        total_files += 1
-                        
-                except Exception as e:
-                    self.logger.error(f"Error processing object {getattr(item, 'object_name', 'unknown')}: {str(e)}")
-                    continue
-            
-            self.logger.info(f"Successfully listed {total_files} files and {total_folders} folders for prefix '{prefix}'")
-            return objects
-            
-        except Exception as e:
-            self.logger.error(f"Failed to list objects: {str(e)}")
-            if 'NoSuchBucket' in str(e):
+            response = self.client._execute("GET", self.config.bucket_name, query_params=query)
+            items, is_truncated, next_token, _ = parse_list_objects(response)
+        except S3Error as e:
+            if e.code == 'NoSuchBucket':
                 raise BucketNotFoundError(str(e))
-            elif 'AccessDenied' in str(e):
+            if e.code in ('AccessDenied', 'InvalidAccessKeyId', 'SignatureDoesNotMatch'):
                 raise AuthenticationError(str(e))
+            raise OSSError(f"Failed to list objects: {str(e)}")
+        
+        objects, common_prefixes = [], []
+        for item in items:
+            name = str(item.object_name)
+            if item.last_modified is None and item.etag is None:
+                # CommonPrefixes 解析为只有名称的条目
+                common_prefixes.append(name)
+            elif name.endswith('/'):
+                objects.append({'name': name, 'size': 0, 'last_modified': item.last_modified, 'type': 'folder'})
             else:
-                raise OSSError(f"Failed to list objects: {str(e)}")
+                objects.append({
+                    'name': name,
+                    'size': item.size,
+                    'last_modified': item.last_modified,
+                    'type': 'file',
+                    'etag': item.etag.strip('"') if item.etag else None
+                })
+        return {
+            'objects': objects,
+            'common_prefixes': common_prefixes,
+            'next_token': next_token if is_truncated else None
+        }
 
     def get_presigned_url(self, object_name: str, expires: timedelta = timedelta(days=7)) -> str:
         """生成预签名URL"""
@@ -465,12 +434,8 @@ class MinioClient(BaseOSSClient):
     def move_object(self, source: str, destination: str) -> None:
         """移动/重命名对象"""
         try:
-            # MinIO需先复制删除
-            self.client.copy_object(
-                self.config.bucket_name,
-                destination,
-                f"{self.config.bucket_name}/{source}"
-            )
+            # MinIO需先复制删除（服务端复制）
+            self.copy_object(source, destination)
             self.client.remove_object(self.config.bucket_name, source)
         except S3Error as e:
             if 'NoSuchBucket' in str(e):
@@ -559,14 +524,14 @@ class MinioClient(BaseOSSClient):
         except Exception as e:
             raise UploadError(f"Failed to upload file: {str(e)}")
 
-    def init_multipart_upload(self, object_name: str) -> MultipartUpload:
+    def init_multipart_upload(self, object_name: str, content_type: Optional[str] = None) -> MultipartUpload:
         """初始化分片上传"""
         try:
             # 使用 MinIO 的原生分片上传
             result = self.client._create_multipart_upload(
                 self.config.bucket_name,
                 object_name,
-                {}  # headers
+                {"Content-Type": content_type} if content_type else {}  # headers
             )
             return MultipartUpload(
                 object_name=object_name,
@@ -580,14 +545,20 @@ class MinioClient(BaseOSSClient):
         try:
             self.logger.debug(f"Starting upload_part: part_number={part_number}")
             
-            # 准备数据
-            if isinstance(data, bytes):
-                data_len = len(data)
-                data_to_upload = data
+            # 准备数据：包装成不复制数据的读取器
+            reader = self._part_body(data)
+            data_len = len(reader)
+            headers = {"Content-Length": str(data_len)}
+            if self.client._base_url.is_https:
+                # https 下 SDK 不对请求体签名，提供 Content-MD5 后直接流式发送读取器，
+                # 按 SDK 读取的块限速，取消在一个数据块内生效；MD5 留在读取器中，
+                # 上传后与分片 ETag 比对时不再重算
+                headers["Content-MD5"] = reader.content_md5()
+                data_to_upload = reader
             else:
-                data_bytes = data.read()
-                data_len = len(data_bytes)
-                data_to_upload = data_bytes
+                # http 下签名需要整个请求体的 SHA-256，只能整块发送缓冲区，请求前一次计费
+                reader.charge()
+                data_to_upload = reader.getbuffer()
             
             # 创建一个单的进度跟踪器
             uploaded = 0
@@ -604,7 +575,7 @@ class MinioClient(BaseOSSClient):
                 upload_id=upload.upload_id,
                 part_number=part_number,
                 data=data_to_upload,
-                headers={"Content-Length": str(data_len)}
+                headers=headers
             )
             
             # 上传完成后，确保回调收到完整大小
@@ -653,6 +624,7 @@ class MinioClient(BaseOSSClient):
                     upload.upload_id,
                     parts
                 )
+                upload.etag = result.etag
             except Exception as e:
                 self.logger.error(f"Server-side completion failed: {e}")
                 raise
@@ -691,6 +663,60 @@ class MinioClient(BaseOSSClient):
         except S3Error as e:
             raise S3Error(f"Failed to abort multipart upload: {str(e)}")
 
+    def list_multipart_uploads(self, prefix: str = '') -> List[MultipartUpload]:
+        """列出进行中的分片上传"""
+        try:
+            uploads = []
+            key_marker = None
+            upload_id_marker = None
+            while True:
+                result = self.client._list_multipart_uploads(
+                    self.config.bucket_name,
+                    prefix=prefix or None,
+                    key_marker=key_marker,
+                    upload_id_marker=upload_id_marker
+                )
+                for item in result.uploads:
+                    upload = MultipartUpload(object_name=item.object_name, upload_id=item.upload_id)
+                    upload.initiated = item.initiated_time
+                    uploads.append(upload)
+                
+                if not result.is_truncated or not result.uploads:
+                    break
+                # 部分 minio 版本未正确解析 NextUploadIdMarker，退化为使用最后一条记录
+                key_marker = result.next_key_marker or result.uploads[-1].object_name
+                upload_id_marker = result.uploads[-1].upload_id
+            return uploads
+        except S3Error as e:
+            if 'NoSuchBucket' in str(e):
+                raise BucketNotFoundError(str(e))
+            raise OSSError(f"Failed to list multipart uploads: {str(e)}")
+
+    def list_parts(self, upload: MultipartUpload) -> List[Dict]:
+        """列出已上传的分片"""
+        try:
+            parts = []
+            marker = None
+            while True:
+                result = self.client._list_parts(
+                    self.config.bucket_name,
+                    upload.object_name,
+                    upload.upload_id,
+                    part_number_marker=marker
+                )
+                for part in result.parts:
+                    parts.append({
+                        'part_number': part.part_number,
+                        'etag': part.etag.strip('"'),
+                        'size': part.size
+                    })
+                if not result.is_truncated or not result.parts:
+                    break
+                marker = result.next_part_number_marker or str(result.parts[-1].part_number)
+            return sorted(parts, key=lambda p: p['part_number'])
+        except S3Error as e:
+            raise OSSError(f"Failed to list parts: {str(e)}")
+
     def get_file_url(self, remote_path: str) -> str:
         """
         Get the URL of a file on MinIO.
@@ -705,43 +731,6 @@ class MinioClient(BaseOSSClient):
             raise GetUrlError(f"Failed to get file URL: {str(e)}")
 
 
-    def upload_stream(self, input_stream, object_name: str, content_type: str = None) -> str:
-        """流式上传文件
-        Args:
-            input_stream: 输入流（需要支持read方法）
-            object_name: 对象名称
-            content_type: 内容类型
-        Returns:
-            str: 对象的URL
-        """
-        try:
-            # 获取流的长度
-            if hasattr(input_stream, 'seek') and hasattr(input_stream, 'tell'):
-                # 如果流支持seek和tell，获取长度
-                current_pos = input_stream.tell()
-                input_stream.seek(0, os.SEEK_END)
-                length = input_stream.tell()
-                input_stream.seek(current_pos)  # 恢复原始位置
-            else:
-                # 如果不支持，读取到内存中
-                data = input_stream.read()
-                length = len(data)
-                input_stream = BytesIO(data)
-            
-            # 使用put_object进行流式上传
-            self.client.put_object(
-                bucket_name=self.config.bucket_name,
-                object_name=object_name,
-                data=input_stream,
-                length=length,  # 添加长度参数
-                content_type=content_type or 'application/octet-stream'
-            )
-            
-            return self.get_public_url(object_name)
-            
-        except Exception as e:
-            raise OSSError(f"Failed to upload stream: {str(e)}")
-
     def download_stream(self, object_name: str, output_stream, chunk_size=1024*1024, progress_callback=None):
         """流式下载文件
         Args:
@@ -751,6 +740,14 @@ class MinioClient(BaseOSSClient):
             progress_callback: 进度回调函数
         """
         try:
+            # 大对象使用并发分段下载，按顺序写入输出流
+            from .transfer_manager import TransferManager
+            manager = TransferManager()
+            info = self.get_object_info(object_name)
+            if manager.use_ranged_download(info['size']):
+                manager.download_stream(self, object_name, output_stream, progress_callback, object_info=info)
+                return
+            
             # 获取对象
             response = self.client.get_object(
                 bucket_name=self.config.bucket_name,
@@ -763,6 +760,7 @@ class MinioClient(BaseOSSClient):
             
             # 流式读取和写入
             for chunk in response.stream(chunk_size):
+                self._throttle('download', len(chunk))
                 output_stream.write(chunk)
                 downloaded += len(chunk)
                 
@@ -772,6 +770,8 @@ class MinioClient(BaseOSSClient):
             # 确保所有数据都写入
             output_stream.flush()
             
+        except TransferCancelledError:
+            raise
         except Exception as e:
             raise OSSError(f"Failed to download stream: {str(e)}") 
         
@@ -788,45 +788,68 @@ class MinioClient(BaseOSSClient):
         except S3Error as e:
             raise DeleteError(f"Failed to delete file: {str(e)}")
 
-    def copy_object(self, source_key: str, target_key: str) -> str:
-        """复制对象
+    def delete_objects(self, object_names: List[str]) -> Dict[str, str]:
+        """批量删除对象（remove_objects，一次请求最多 1000 个），返回删除失败的对象 {对象名: 错误信息}"""
+        from minio.deleteobjects import DeleteObject
+        try:
+            # remove_objects 惰性执行，遍历返回的错误时才发送请求
+            errors = self.client.remove_objects(
+                self.config.bucket_name,
+                [DeleteObject(name) for name in object_names]
+            )
+            return {error.name: f"{error.code}: {error.message}" for error in errors}
+        except S3Error as e:
+            if e.code == 'NoSuchBucket':
+                raise BucketNotFoundError(str(e))
+            if e.code in ('AccessDenied', 'InvalidAccessKeyId', 'SignatureDoesNotMatch'):
+                raise AuthenticationError(str(e))
+            raise DeleteError(f"Failed to delete objects: {str(e)}")
+
+    def _copy_object(self, source_key: str, target_key: str) -> None:
+        """服务端复制对象（CopyObject，不超过 5GB），数据不经过本机
         Args:
             source_key: 源对象路径
             target_key: 目标对象路径
-        Returns:
-            str: 目标对象的URL
         """
         try:
-            # 1. 获取源对象信息
-            source_stat = self.client.stat_object(
-                bucket_name=self.config.bucket_name,
-                object_name=source_key
-            )
-            
-            # 2. 获取源对象数据
-            data = self.client.get_object(
-                bucket_name=self.config.bucket_name,
-                object_name=source_key
-            )
-            
-            # 3. 上传到位置
-            result = self.client.put_object(
-                bucket_name=self.config.bucket_name,
+            # SDK 的 copy_object 每次先 stat 源对象（超过 5GB 时串行 compose），
+            # 大小由 BaseOSSClient.copy_object 判断，这里直接发送 CopyObject 请求
+            self.client._execute(
+                "PUT",
+                self.config.bucket_name,
                 object_name=target_key,
-                data=data,
-                length=source_stat.size,  # 使用源文件的大小
-                content_type=source_stat.content_type  # 保持内容类型一致
+                headers=CopySource(self.config.bucket_name, source_key).gen_copy_headers()
             )
-            
-            return self.get_public_url(target_key)
-            
         except S3Error as e:
-            if 'NoSuchKey' in str(e):
+            if e.code == 'NoSuchKey':
                 raise ObjectNotFoundError(f"Source object not found: {source_key}")
-            elif 'NoSuchBucket' in str(e):
+            elif e.code == 'NoSuchBucket':
                 raise BucketNotFoundError(f"Bucket not found: {self.config.bucket_name}")
+            elif e.code in ('AccessDenied', 'InvalidAccessKeyId', 'SignatureDoesNotMatch'):
+                raise AuthenticationError(str(e))
             raise OSSError(f"Failed to copy object: {str(e)}")
 
+    def upload_part_copy(self, upload: MultipartUpload, part_number: int, source_key: str,
+                         start: int, end: int, etag: Optional[str] = None) -> str:
+        """服务端复制源对象的 [start, end] 字节为一个分片（UploadPartCopy），返回ETag"""
+        headers = CopySource(self.config.bucket_name, source_key, match_etag=etag).gen_copy_headers()
+        headers["x-amz-copy-source-range"] = f"bytes={start}-{end}"
+        try:
+            part_etag, _ = self.client._upload_part_copy(
+                self.config.bucket_name,
+                upload.object_name,
+                upload.upload_id,
+                part_number,
+                headers
+            )
+            return part_etag
+        except S3Error as e:
+            if e.code == 'NoSuchKey':
+                raise ObjectNotFoundError(f"Source object not found: {source_key}")
+            if e.code == 'PreconditionFailed':
+                raise ObjectChangedError(f"Source object changed during copy: {source_key}")
+            raise
+
     def rename_object(self, source_key: str, target_key: str) -> str:
         """重命名对象（复制后删除源对象）
         Args:
@@ -847,45 +870,6 @@ class MinioClient(BaseOSSClient):
         except S3Error as e:
             raise OSSError(f"Failed to rename object: {str(e)}")
 
-    def rename_folder(self, source_prefix: str, target_prefix: str) -> None:
-        """重命名文件夹（移动所有文件到新路径）
-        Args:
-            source_prefix: 源文件夹路径（以/结尾）
-            target_prefix: 目标文件夹路径（以/结尾）
-        """
-        try:
-            # 确保路径以/结尾
-            if not source_prefix.endswith('/'):
-                source_prefix += '/'
-            if not target_prefix.endswith('/'):
-                target_prefix += '/'
-            
-            # 列出源文件夹中的所有对象
-            objects = self.client.list_objects(
-                self.config.bucket_name,
-                prefix=source_prefix,
-                recursive=True
-            )
-            
-            found = False
-            for obj in objects:
-                found = True
-                old_key = obj.object_name
-                # 构建新的对象键
-                new_key = target_prefix + old_key[len(source_prefix):]
-                
-                # 复制到新位置
-                self.copy_object(old_key, new_key)
-                
-                # 删除原对象
-                self.delete_file(old_key)
-                
-            if not found:
-                raise ObjectNotFoundError(f"Source folder not found: {source_prefix}")
-            
-        except S3Error as e:
-            raise OSSError(f"Failed to rename folder: {str(e)}")
-
     def object_exists(self, object_name: str) -> bool:
         """对象是否存在"""
         try:
@@ -1,4 +1,4 @@
-from typing import Optional, BinaryIO, List, Dict
+from typing import Optional, BinaryIO, List, Dict, Iterator, Union, IO
 import oss2
 from oss2.models import PartInfo
 from oss2 import Auth, Bucket, ObjectIterator
@@ -14,13 +14,16 @@ from .types import OSSConfig, ProgressCallback, MultipartUpload
 from .exceptions import (
     OSSError, ConnectionError, AuthenticationError, 
     ObjectNotFoundError, BucketNotFoundError,
-    UploadError, DownloadError
+    UploadError, DownloadError, ObjectChangedError, TransferCancelledError, ChecksumMismatchError
 )
 
 class AliyunOSSClient(BaseOSSClient):
     """阿里云OSS客户端实现"""
     
     logger = logging.getLogger(__name__)
+    MIN_PART_SIZE = 100 * 1024  # 阿里云分片最小 100KB
+    MAX_COPY_SIZE = 1024 * 1024 * 1024  # CopyObject 只支持 1GB 以内的对象
+    MULTIPART_ETAG_IS_MD5 = False  # 分片对象的 ETag 不按 S3 规则计算，改为校验 CRC64
 
     def __init__(self, config: OSSConfig):
         """初始化阿里云OSS客户端"""
@@ -38,11 +41,14 @@ class AliyunOSSClient(BaseOSSClient):
                 if https_proxy:
                     os.environ['HTTPS_PROXY'] = https_proxy
             
-            # 创建Bucket对象
+            # 创建Bucket对象（连接池需覆盖分片并发数）；enable_crc 时 SDK 边发送边计算
+            # CRC64，与服务端返回的 x-oss-hash-crc64ecma 比对
             self.client = oss2.Bucket(
                 auth,
                 config.endpoint,
-                config.bucket_name
+                config.bucket_name,
+                session=oss2.Session(pool_size=self.MAX_POOL_CONNECTIONS),
+                enable_crc=True
             )
             self.bucket = self.client  # 为了兼容性保留bucket引用
             self.connected = True
@@ -67,10 +73,45 @@ class AliyunOSSClient(BaseOSSClient):
     def download_file(self, object_name: str, local_file: str, progress_callback: Optional[ProgressCallback] = None) -> None:
         """下载文件"""
         try:
+            # 大文件使用并发分段下载
+            from .transfer_manager import TransferManager
+            manager = TransferManager()
+            info = self.get_object_info(object_name)
+            if manager.use_ranged_download(info['size']):
+                return manager.download_file(
+                    self,
+                    object_name,
+                    local_file,
+                    progress_callback,
+                    object_info=info
+                )
+            
+            # 小文件一次请求下载，先按限速消费整个文件的流量
+            self._throttle('download', info['size'])
             self.bucket.get_object_to_file(object_name, local_file, progress_callback=progress_callback)
         except OssError as e:
             raise DownloadError(f"Failed to download file {object_name}: {str(e)}")
 
+    def iter_object_range(self, object_name: str, start: int, end: int, chunk_size: int = 1024 * 1024,
+                          etag: Optional[str] = None) -> Iterator[bytes]:
+        """按字节范围读取对象"""
+        headers = {'If-Match': f'"{etag}"'} if etag else None
+        try:
+            result = self.bucket.get_object(object_name, byte_range=(start, end), headers=headers)
+        except oss2.exceptions.NoSuchKey:
+            raise ObjectNotFoundError(f"Object not found: {object_name}")
+        except oss2.exceptions.PreconditionFailed:
+            raise ObjectChangedError(f"Object changed since download started: {object_name}")
+        except OssError as e:
+            raise DownloadError(f"Failed to read range {start}-{end} of {object_name}: {str(e)}")
+        
+        try:
+            for chunk in iter(lambda: result.read(chunk_size), b''):
+                self._throttle('download', len(chunk))
+                yield chunk
+        finally:
+            result.close()
+
     def delete_file(self, object_name: str) -> None:
         """删除文件"""
         try:
@@ -78,72 +119,23 @@ class AliyunOSSClient(BaseOSSClient):
         except OssError as e:
             raise OSSError(f"Failed to delete file {object_name}: {str(e)}")
 
-    def list_objects(self, prefix: str = '', recursive: bool = False) -> List[Dict]:
-        """列出对象
-        Args:
-            prefix: 前缀过滤
-            recursive: 是否递归列出子目录，默认False表示显示文件夹结构
-        Returns:
-            List[Dict]: 对象列表
+    def delete_objects(self, object_names: List[str]) -> Dict[str, str]:
+        """批量删除对象（DeleteMultipleObjects，一次最多 1000 个），返回删除失败的对象 {对象名: 错误信息}
+
+        OSS 只返回删除成功的对象（不存在的对象也算成功），未返回的对象视为失败。
         """
-        self.logger.info(f"Starting to list objects with prefix: '{prefix}', recursive: {recursive}")
-        
+        if not object_names:
+            return {}
         try:
-            all_objects = []
-            delimiter = '' if recursive else '/'
-            continuation_token = None
-            total_files = 0
-            total_folders = 0
-            
-            # 如果前缀不为空且不以/结尾，添加/
-            if prefix and not prefix.endswith('/'):
-                prefix = prefix + '/'
-            
-            self.logger.debug(f"Using normalized prefix: '{prefix}'")
-            
-            while True:
-                self.logger.debug(f"Fetching page with marker: {continuation_token}")
-                result = self._list_objects_page(prefix, delimiter, continuation_token)
-                
-                # 添加文件
-                all_objects.extend(result['objects'])
-                total_files += len(result['objects'])
-                
-                # 如果不是递归模式，添加文件夹
-                if not recursive:
-                    for prefix_path in result['common_prefixes']:
-                        # 从完整前缀路径中提取文件夹名称
-                        folder_name = prefix_path
-                        if prefix and folder_name.startswith(prefix):
-                            # 只显示当前层级的文件夹名称
-                            folder_name = folder_name[len(prefix):]
-                            if folder_name.endswith('/'):
-                                folder_name = folder_name[:-1]
-                        
-                        self.logger.debug(f"Adding folder: {folder_name} (full path: {prefix_path})")
-                        
-                        all_objects.append({
-                            'name': prefix_path,  # 保存完整路径
-                            'display_name': folder_name,  # 显示名称
-                            'size': 0,
-                            'last_modified': None,
-                            'type': 'folder'
-                        })
-                        total_folders += 1
-                
-                self.logger.debug(f"Retrieved {len(result['objects'])} files and {len(result['common_prefixes'])} folders in this page")
-                
-                # 检查是否还有更多页
-                continuation_token = result.get('next_token')
-                if not continuation_token:
-                    break
-                    
-            self.logger.info(f"Successfully listed {total_files} files and {total_folders} folders for prefix '{prefix}'")
-            return all_objects
-            
-        except Exception as e:
-            self.logger.error(f"Failed to list objects: {str(e)}")
-            raise OSSError(f"Failed to list objects: {str(e)}")
+            result = self.bucket.batch_delete_objects(list(object_names))
+        except OssError as e:
+            if e.code == 'NoSuchBucket':
+                raise BucketNotFoundError(f"Bucket not found: {self.config.bucket_name}")
+            if e.code in ('AccessDenied', 'InvalidAccessKeyId', 'SignatureDoesNotMatch'):
+                raise AuthenticationError(f"Access denied: {str(e)}")
+            raise OSSError(f"Failed to delete objects: {str(e)}")
+        deleted = set(result.deleted_keys)
+        return {name: 'not deleted' for name in object_names if name not in deleted}
 
     def get_presigned_url(self, object_name: str, expires: int = 3600) -> str:
         """获取预签名URL"""
@@ -168,7 +160,7 @@ class AliyunOSSClient(BaseOSSClient):
     def move_object(self, source: str, destination: str) -> None:
         """移动/重命名对象"""
         try:
-            self.bucket.copy_object(self.config.bucket_name, source, destination)
+            self.copy_object(source, destination)
             self.bucket.delete_object(source)
         except OssError as e:
             raise OSSError(f"Failed to move object: {str(e)}")
@@ -195,10 +187,13 @@ class AliyunOSSClient(BaseOSSClient):
         except OssError as e:
             raise OSSError(f"Failed to set bucket policy: {str(e)}")
 
-    def init_multipart_upload(self, object_name: str) -> MultipartUpload:
+    def init_multipart_upload(self, object_name: str, content_type: Optional[str] = None) -> MultipartUpload:
         """初始化分片上传"""
         try:
-            upload = self.bucket.init_multipart_upload(object_name)
+            upload = self.bucket.init_multipart_upload(
+                object_name,
+                headers={'Content-Type': content_type} if content_type else None
+            )
             return MultipartUpload(
                 object_name=object_name,
                 upload_id=upload.upload_id
@@ -206,16 +201,23 @@ class AliyunOSSClient(BaseOSSClient):
         except OssError as e:
             raise OSSError(f"Failed to init multipart upload: {str(e)}")
 
-    def upload_part(self, upload: MultipartUpload, part_number: int, data: bytes) -> str:
+    def upload_part(self, upload: MultipartUpload, part_number: int, data: Union[bytes, memoryview, IO]) -> str:
         """上传分片"""
         try:
+            # oss2 按 read() 读取非 bytes 数据，包装成读取器（不复制数据），发送时按块限速
+            data = self._part_body(data)
             result = self.bucket.upload_part(
                 upload.object_name,
                 upload.upload_id,
                 part_number,
                 data
             )
+            if result.crc is not None:
+                # 完成上传时由各分片 CRC64 合成整个对象的 CRC64 并校验
+                upload.part_crcs[part_number] = (result.crc, len(data))
             return result.etag
+        except oss2.exceptions.InconsistentError as e:
+            raise ChecksumMismatchError(f"Part {part_number} of {upload.object_name}: {str(e)}")
         except OssError as e:
             raise OSSError(f"Failed to upload part: {str(e)}")
 
@@ -224,13 +226,18 @@ class AliyunOSSClient(BaseOSSClient):
         try:
             parts = []
             for part_num, etag in upload.parts:
-                parts.append(PartInfo(part_num, etag))
-            self.bucket.complete_multipart_upload(
+                # 断点续传恢复的分片没有 CRC64，此时 SDK 跳过整个对象的校验
+                crc, size = upload.part_crcs.get(part_num, (None, None))
+                parts.append(PartInfo(part_num, etag, size=size, part_crc=crc))
+            result = self.bucket.complete_multipart_upload(
                 upload.object_name,
                 upload.upload_id,
                 parts
             )
+            upload.etag = result.etag
             return self.get_public_url(upload.object_name)
+        except oss2.exceptions.InconsistentError as e:
+            raise ChecksumMismatchError(f"Object {upload.object_name}: {str(e)}")
         except OssError as e:
             raise OSSError(f"Failed to complete multipart upload: {str(e)}")
 
@@ -244,32 +251,32 @@ class AliyunOSSClient(BaseOSSClient):
         except OssError as e:
             raise OSSError(f"Failed to abort multipart upload: {str(e)}")
 
-    def upload_stream(self, input_stream, object_name: str, content_type: str = None) -> str:
-        """流式上传文件
-        Args:
-            input_stream: 输入流（需要支持read方法）
-            object_name: 对象名称
-            content_type: 内容类型
-        Returns:
-            str: 对象的URL
-        """
+    def list_multipart_uploads(self, prefix: str = '') -> List[MultipartUpload]:
+        """列出进行中的分片上传"""
         try:
-            # 设置headers
-            headers = {}
-            if content_type:
-                headers['Content-Type'] = content_type
-            
-            # 使用put_object进行流式上传
-            self.bucket.put_object(
-                object_name,
-                input_stream,
-                headers=headers
-            )
-            
-            return self.get_public_url(object_name)
-            
-        except Exception as e:
-            raise OSSError(f"Failed to upload stream: {str(e)}")
+            uploads = []
+            for item in oss2.MultipartUploadIterator(self.bucket, prefix=prefix):
+                upload = MultipartUpload(object_name=item.key, upload_id=item.upload_id)
+                upload.initiated = datetime.fromtimestamp(item.initiation_date)
+                uploads.append(upload)
+            return uploads
+        except OssError as e:
+            raise OSSError(f"Failed to list multipart uploads: {str(e)}")
+
+    def list_parts(self, upload: MultipartUpload) -> List[Dict]:
+        """列出已上传的分片"""
+        try:
+            parts = [
+                {
+                    'part_number': part.part_number,
+                    'etag': part.etag.strip('"'),
+                    'size': part.size
+                }
+                for part in oss2.PartIterator(self.bucket, upload.object_name, upload.upload_id)
+            ]
+            return sorted(parts, key=lambda p: p['part_number'])
+        except OssError as e:
+            raise OSSError(f"Failed to list parts: {str(e)}")
 
     def download_stream(self, object_name: str, output_stream, chunk_size=1024*1024, progress_callback=None):
         """流式下载文件
@@ -280,6 +287,14 @@ class AliyunOSSClient(BaseOSSClient):
             progress_callback: 进度回调函数
         """
         try:
+            # 大对象使用并发分段下载，按顺序写入输出流
+            from .transfer_manager import TransferManager
+            manager = TransferManager()
+            info = self.get_object_info(object_name)
+            if manager.use_ranged_download(info['size']):
+                manager.download_stream(self, object_name, output_stream, progress_callback, object_info=info)
+                return
+            
             # 获取对象
             object_stream = self.bucket.get_object(object_name)
             
@@ -293,6 +308,7 @@ class AliyunOSSClient(BaseOSSClient):
                 if not chunk:
                     break
                 
+                self._throttle('download', len(chunk))
                 output_stream.write(chunk)
                 downloaded += len(chunk)
                 
@@ -302,6 +318,8 @@ class AliyunOSSClient(BaseOSSClient):
             # 确保所有数据都写入
             output_stream.flush()
             
+        except TransferCancelledError:
+            raise
         except Exception as e:
             raise OSSError(f"Failed to download stream: {str(e)}")
 
@@ -323,32 +341,41 @@ class AliyunOSSClient(BaseOSSClient):
         except OssError as e:
             raise OSSError(f"Failed to get object size: {str(e)}")
 
-    def copy_object(self, source_object: str, target_object: str) -> str:
-        """复制对象"""
+    def _copy_object(self, source_object: str, target_object: str) -> None:
+        """服务端复制对象（CopyObject，不超过 1GB）"""
         try:
             self.bucket.copy_object(self.config.bucket_name, source_object, target_object)
-            return self.get_public_url(target_object)
+        except oss2.exceptions.NoSuchKey:
+            raise ObjectNotFoundError(f"Source object not found: {source_object}")
         except OssError as e:
             raise OSSError(f"Failed to copy object: {str(e)}")
 
+    def upload_part_copy(self, upload: MultipartUpload, part_number: int, source_key: str,
+                         start: int, end: int, etag: Optional[str] = None) -> str:
+        """服务端复制源对象的 [start, end] 字节为一个分片（UploadPartCopy），返回ETag"""
+        headers = {'x-oss-copy-source-if-match': etag} if etag else None
+        try:
+            result = self.bucket.upload_part_copy(
+                self.config.bucket_name,
+                source_key,
+                (start, end),
+                upload.object_name,
+                upload.upload_id,
+                part_number,
+                headers=headers
+            )
+            return result.etag
+        except oss2.exceptions.NoSuchKey:
+            raise ObjectNotFoundError(f"Source object not found: {source_key}")
+        except oss2.exceptions.PreconditionFailed:
+            raise ObjectChangedError(f"Source object changed during copy: {source_key}")
+
     def rename_object(self, source_object: str, target_object: str) -> str:
         """重命名对象"""
         self.copy_object(source_object, target_object)
         self.delete_file(source_object)
         return self.get_public_url(target_object)
 
-    def rename_folder(self, source_prefix: str, target_prefix: str) -> None:
-        """重命名文件夹"""
-        if not source_prefix.endswith('/'):
-            source_prefix += '/'
-        if not target_prefix.endswith('/'):
-            target_prefix += '/'
-
-        objects = self.list_objects(prefix=source_prefix)
-        for obj in objects:
-            new_object_name = obj['name'].replace(source_prefix, target_prefix, 1)
-            self.rename_object(obj['name'], new_object_name)
-
     def get_object_info(self, object_name: str) -> Dict:
         """获取对象信息"""
         try:
@@ -447,8 +474,9 @@ class AliyunOSSClient(BaseOSSClient):
             self.logger.error(f"Failed to get object {object_name}: {str(e)}")
             raise OSSError(f"Failed to get object: {str(e)}")
 
-    def _list_objects_page(self, prefix: str = '', delimiter: str = '/', continuation_token: str = None) -> dict:
-        """获取一页对象列表"""
+    def _list_objects_page(self, prefix: str = '', delimiter: str = '/', continuation_token: str = None,
+                           start_after: Optional[str] = None, page_size: Optional[int] = None) -> dict:
+        """获取一页对象列表（marker 即"从该键之后开始"，start_after 直接作为第一页的 marker）"""
         try:
             self.logger.debug(f"Listing objects page with prefix='{prefix}', delimiter='{delimiter}', marker='{continuation_token}'")
             
@@ -456,11 +484,11 @@ class AliyunOSSClient(BaseOSSClient):
             params = {
                 'prefix': prefix,
                 'delimiter': delimiter,
-                'max_keys': 1000
+                'max_keys': page_size or self.LIST_PAGE_SIZE
             }
             
-            if continuation_token:
-                params['marker'] = continuation_token
+            if continuation_token or start_after:
+                params['marker'] = continuation_token or start_after
             
             # 获取一页数据
             result = self.bucket.list_objects(**params)
@@ -482,8 +510,13 @@ class AliyunOSSClient(BaseOSSClient):
             # 处理文件
             objects = []
             for obj in result.object_list:
-                # 跳过表示目录的对象
                 if obj.key.endswith('/'):
+                    if not delimiter:
+                        # 递归列举时返回文件夹标记（删除前缀时需要一并删除）
+                        objects.append({'name': obj.key, 'size': 0, 'last_modified': obj.last_modified,
+                                        'type': 'folder'})
+                        continue
+                    # 跳过表示目录的对象
                     self.logger.debug(f"Skipping directory marker: {obj.key}")
                     continue
                 
@@ -495,7 +528,8 @@ class AliyunOSSClient(BaseOSSClient):
                     'name': obj.key,
                     'size': obj.size,
                     'last_modified': last_modified,
-                    'type': 'file'
+                    'type': 'file',
+                    'etag': (obj.etag or '').strip('"')
                 })
             
             response = {
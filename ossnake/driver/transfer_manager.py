@@ -1,4 +1,4 @@
-from typing import Optional, Dict, BinaryIO, Callable, Tuple
+from typing import Optional, Dict, BinaryIO, Callable, Tuple, List
 import os
 import json
 import hashlib
@@ -9,8 +9,17 @@ import logging
 from io import BytesIO
 import time
 
-from .types import MultipartUpload, ProgressCallback, TransferProgress
-from .exceptions import TransferError
+from .types import MultipartUpload, ProgressCallback
+from .models import TransferProgress
+from .exceptions import (
+    TransferError, UploadError, DownloadError, ObjectChangedError, TransferCancelledError, ChecksumMismatchError
+)
+from ossnake.utils.transfer_journal import TransferJournal
+from ossnake.utils.adaptive_concurrency import AdaptiveConcurrency
+from ossnake.utils.bandwidth_limiter import BandwidthLimiter, transfer_bucket, throttler
+from ossnake.utils.part_source import PartSource
+from ossnake.utils.transfer_token import TransferToken, current_token, bind_token
+from ossnake.utils.checksums import composite_etag, verify_part, verify_upload
 
 class TransferMetrics:
     """传输指标收集"""
@@ -23,8 +32,13 @@ class TransferMetrics:
             'average_speed': 0
         }
         
-    def record_retry(self):
+    def record_retry(self, network_error: bool = True):
         self.metrics['retries'] += 1
+        if network_error:
+            self.metrics['network_errors'] += 1
+    
+    def record_failed_part(self):
+        self.metrics['failed_parts'] += 1
         
     def get_report(self):
         return {
@@ -45,17 +59,61 @@ class TransferManager:
     6. 错误重试
     """
     
-    CHUNK_SIZE = 5 * 1024 * 1024  # 5MB分片大小
-    MAX_WORKERS = 4  # 并发数
-    MAX_RETRIES = 3  # 最大重试次数
+    CHUNK_SIZE = 5 * 1024 * 1024  # 5MB分片大小（首选值，实际大小由 plan_part_size 决定）
+    MAX_WORKERS = 4  # 初始并发数
+    MAX_CONCURRENCY = 16  # 自适应并发上限
+    MAX_RETRIES = 3  # 单个分片的最大重试次数
+    RETRY_BASE_DELAY = 0.5  # 重试退避基数（秒）
+    RETRY_BUDGET_RATIO = 0.1  # 单个传输的重试预算：分片数的 10%（至少 MAX_RETRIES * 3 次）
+    HASH_BLOCK_SIZE = 1024 * 1024  # 校验服务端分片时每次读取的字节数
     
-    def __init__(self):
+    def __init__(self, bandwidth_limit: Optional[int] = None):
+        """
+        Args:
+            bandwidth_limit: 单个传输的限速（字节/秒），与全局带宽限制同时生效
+        """
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger("TransferManager")
         self.lock = threading.Lock()
         self.start_time = datetime.now()
         self.last_bytes = 0
         self.last_time = self.start_time
+        self.upload_settings = self._load_transfer_settings('upload')
+        self.download_settings = self._load_transfer_settings('download')
+        self.journal = TransferJournal()
+        self.bandwidth_limit = bandwidth_limit
+        self.metrics = TransferMetrics()
+
+    def _load_transfer_settings(self, section: str) -> Dict:
+        """读取传输设置（settings.json 中的 upload / download 节）"""
+        settings = {
+            'multipart_enabled': True,
+            'chunk_size': self.CHUNK_SIZE,
+            'workers': self.MAX_WORKERS,
+            'adaptive': True,
+            'max_workers': self.MAX_CONCURRENCY,
+            'verify_checksum': True
+        }
+        try:
+            from ossnake.utils.settings_manager import SettingsManager
+            values = SettingsManager().settings.get(section, {})
+            settings['multipart_enabled'] = bool(values.get('multipart_enabled', True))
+            settings['chunk_size'] = max(1, int(values.get('chunk_size', 5))) * 1024 * 1024
+            settings['workers'] = max(1, int(values.get('workers', self.MAX_WORKERS)))
+            settings['adaptive'] = bool(values.get('adaptive', True))
+            settings['max_workers'] = max(1, int(values.get('max_workers', self.MAX_CONCURRENCY)))
+            settings['verify_checksum'] = bool(values.get('verify_checksum', True))
+        except Exception as e:
+            self.logger.warning(f"Failed to load {section} settings, using defaults: {e}")
+        return settings
+
+    def _create_concurrency(self, initial: int, settings: Dict) -> AdaptiveConcurrency:
+        """创建并发控制器：从 initial 开始，按 AIMD 在 max_workers 以内调整"""
+        return AdaptiveConcurrency(
+            initial=initial,
+            ceiling=settings.get('max_workers', initial),
+            adaptive=settings.get('adaptive', True)
+        )
 
     def _calculate_speed(self, current_bytes: int) -> float:
         """计算当前传输速度"""
@@ -73,72 +131,313 @@ class TransferManager:
         client: 'BaseOSSClient',
         local_file: str,
         object_name: str,
-        progress_callback: Optional[ProgressCallback] = None
+        progress_callback: Optional[ProgressCallback] = None,
+        resumable: bool = True,
+        resume_from_server: bool = False,
+        token: Optional[TransferToken] = None
     ) -> str:
-        """上传文件（使用分片上传）"""
+        """上传文件（使用分片上传）
+        
+        resumable 为 True 时，上传进度写入 ~/.ossnake/transfers 下的日志。
+        上传失败或进程中断后不会取消分片上传，再次调用时跳过已完成的分片，
+        继续同一个 upload_id 的上传。
+        
+        resume_from_server 为 True 且本地没有日志时，通过 ListMultipartUploads /
+        ListParts 查找服务端上同一对象未完成的分片上传，校验通过后只上传缺失的分片。
+        可用于在另一台机器上继续中断的上传。
+        
+        token 用于暂停/取消（默认取当前线程绑定的令牌）：暂停时不再开始新的分片，
+        已完成的分片保留；取消时在一个数据块内停止，并取消分片上传、删除日志。
+        """
+        token = token or current_token()
         try:
             if not os.path.exists(local_file):
                 raise FileNotFoundError(f"Local file not found: {local_file}")
             
-            # 初始化上传信息
-            file_size = os.path.getsize(local_file)
-            total_parts = (file_size + self.CHUNK_SIZE - 1) // self.CHUNK_SIZE
+            if not self.upload_settings['multipart_enabled']:
+                # 设置中关闭了分片上传，整个文件一次请求上传
+                self.logger.info(f"Multipart upload disabled, uploading {local_file} in one request")
+                with bind_token(token):
+                    client._throttle('upload', os.path.getsize(local_file))
+                    return client._upload_file(local_file, object_name, progress_callback)
             
-            self.logger.info(f"Starting multipart upload of {local_file} ({total_parts} parts)")
+            journal_key = None
+            identity = None
+            record = None
+            if resumable:
+                identity = self.journal.file_identity(local_file)
+                journal_key = self._get_transfer_key(client, object_name, identity)
+                record = self.journal.load(journal_key)
             
-            # 初始化分片上传
-            upload = client.init_multipart_upload(object_name)
-            upload.total_parts = total_parts
-            upload.total_size = file_size
+            if record is None and resume_from_server:
+                record = self._discover_server_upload(client, local_file, object_name)
+                if record and journal_key:
+                    self._journal_discovered_upload(client, object_name, journal_key, identity, record)
             
-            completed_parts = []
             try:
-                # 并发上传分片
-                with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
-                    futures = []
-                    for part_number in range(1, total_parts + 1):
-                        future = executor.submit(
-                            self._upload_part,
-                            client,
-                            local_file,
-                            upload,
-                            part_number,
-                            progress_callback
-                        )
-                        futures.append(future)
-                    
-                    # 等待所有分片完成
-                    for future in futures:
-                        try:
-                            part_info = future.result()
-                            completed_parts.append(part_info)
-                        except Exception as e:
-                            # 取消所有未完成的任务
-                            for f in futures:
-                                f.cancel()
-                            client.abort_multipart_upload(upload)
-                            if isinstance(e, TransferError):
-                                raise
-                            raise TransferError(f"Upload failed: {str(e)}")
+                return self._upload_parts(
+                    client, local_file, object_name, progress_callback, journal_key, identity, record, token
+                )
+            except Exception as e:
+                if record and 'nosuchupload' in str(e).lower().replace(' ', ''):
+                    # 服务端已清理该分片上传，丢弃日志重新开始
+                    self.logger.warning(f"Journaled upload {record['upload_id']} no longer exists, restarting")
+                    self.journal.remove(journal_key)
+                    return self._upload_parts(
+                        client, local_file, object_name, progress_callback, journal_key, identity, None, token
+                    )
+                raise
                 
-                # 完成上传
-                upload.parts = sorted(completed_parts, key=lambda x: x[0])
-                self.logger.info("All parts uploaded, completing multipart upload...")
-                url = client.complete_multipart_upload(upload)
-                self.logger.info("Upload completed successfully")
-                return url
+        except Exception as e:
+            self.logger.error(f"Upload failed: {e}")
+            raise
+
+    def _upload_parts(
+        self,
+        client: 'BaseOSSClient',
+        local_file: str,
+        object_name: str,
+        progress_callback: Optional[ProgressCallback],
+        journal_key: Optional[str],
+        identity: Optional[Dict],
+        record: Optional[Dict],
+        token: Optional[TransferToken] = None
+    ) -> str:
+        """执行分片上传，record 不为空时从日志恢复"""
+        file_size = os.path.getsize(local_file)
+        
+        if record:
+            upload = MultipartUpload(object_name=object_name, upload_id=record['upload_id'])
+            upload.part_size = record['part_size']
+            completed = record['parts']
+            self.logger.info(
+                f"Resuming multipart upload {upload.upload_id} of {local_file} "
+                f"({len(completed)} parts already uploaded)"
+            )
+        else:
+            part_size = self.plan_part_size(client, file_size)
+            upload = client.init_multipart_upload(object_name)
+            upload.part_size = part_size
+            completed = {}
+            if journal_key:
+                self.journal.create(
+                    journal_key,
+                    bucket=client.config.bucket_name,
+                    object_name=object_name,
+                    upload_id=upload.upload_id,
+                    part_size=upload.part_size,
+                    **identity
+                )
+        
+        total_parts = max(1, (file_size + upload.part_size - 1) // upload.part_size)
+        upload.total_parts = total_parts
+        upload.total_size = file_size
+        for part_number, part in sorted(completed.items()):
+            upload.add_completed_part(part_number, part['etag'], part['size'])
+        
+        pending_parts = [n for n in range(1, total_parts + 1) if n not in completed]
+        self.logger.info(
+            f"Starting multipart upload of {local_file} "
+            f"({total_parts} parts, {len(pending_parts)} to upload)"
+        )
+        
+        concurrency = self._create_concurrency(self.upload_settings['workers'], self.upload_settings)
+        budgets = self._retry_budgets(client, len(pending_parts))
+        failed = threading.Event()
+        completing = False
+        # 分片数据直接取自文件映射，不为每个分片复制缓冲区；SDK 读取时按块限速
+        throttle = throttler('upload', transfer_bucket(self.bandwidth_limit))
+        source = PartSource(local_file, upload.part_size, token, throttle)
+        
+        def run(part_number: int):
+            # 在控制器允许的并发数内上传，按耗时和错误调整并发数；暂停时不再开始新的分片
+            part_size = min(upload.part_size, file_size - (part_number - 1) * upload.part_size)
+            with concurrency.slot(token) as started:
+                if failed.is_set():
+                    return None
+                try:
+                    # 单个分片失败只重试该分片，已完成的分片不受影响
+                    result = self._retry_operation(
+                        lambda: self._upload_part(
+                            client, local_file, upload, part_number, progress_callback, journal_key, source
+                        ),
+                        budgets=budgets,
+                        on_error=lambda e: concurrency.record_failure(e, started),
+                        description=f"part {part_number}"
+                    )
+                except Exception:
+                    failed.set()
+                    raise
+                concurrency.record_success(part_size, started)
+                return result
+        
+        try:
+            # 并发上传分片，线程数取并发上限，实际在途分片数由控制器决定
+            with ThreadPoolExecutor(max_workers=concurrency.ceiling) as executor:
+                futures = [executor.submit(run, part_number) for part_number in pending_parts]
                 
-            except Exception as e:
-                self.logger.error(f"Upload failed: {e}")
+                # 等待所有分片完成
+                try:
+                    for future in futures:
+                        future.result()
+                except Exception as e:
+                    # 取消所有未完成的任务
+                    for f in futures:
+                        f.cancel()
+                    if isinstance(e, TransferError):
+                        raise
+                    raise TransferError(f"Upload failed: {str(e)}")
+            
+            # 完成上传
+            if token:
+                token.check()
+            upload.parts = sorted(upload.parts, key=lambda x: x[0])
+            self.logger.info("All parts uploaded, completing multipart upload...")
+            completing = True
+            url = client.complete_multipart_upload(upload)
+            if journal_key:
+                self.journal.remove(journal_key)
+            if self.upload_settings['verify_checksum']:
+                verify_upload(client, upload)
+            self.logger.info("Upload completed successfully")
+            return url
+            
+        except Exception as e:
+            self.logger.error(f"Upload failed: {e}")
+            if completing and isinstance(e, ChecksumMismatchError):
+                # 对象已在服务端合并，没有可续传或取消的分片上传
+                if journal_key:
+                    self.journal.remove(journal_key)
+                raise
+            cancelled = isinstance(e, TransferCancelledError)
+            if cancelled and journal_key:
+                # 用户取消：不再续传，删除日志并清理分片
+                self.journal.remove(journal_key)
+            if journal_key and not cancelled:
+                # 保留已上传的分片和日志，下次调用时继续
+                self.logger.info(
+                    f"Keeping multipart upload {upload.upload_id} for resume "
+                    f"({len(upload.parts)}/{total_parts} parts done)"
+                )
+            else:
                 try:
                     client.abort_multipart_upload(upload)
                 except Exception as abort_error:
                     self.logger.warning(f"Failed to abort multipart upload: {abort_error}")
-                raise
-                
-        except Exception as e:
-            self.logger.error(f"Upload failed: {e}")
             raise
+        finally:
+            source.close()
+
+    def _discover_server_upload(
+        self,
+        client: 'BaseOSSClient',
+        local_file: str,
+        object_name: str
+    ) -> Optional[Dict]:
+        """在服务端查找可继续的分片上传，返回与日志格式相同的记录
+        
+        只考虑对象名完全一致的上传，按初始化时间从新到旧依次校验，
+        已上传的分片与本地文件不一致的上传会被跳过。
+        """
+        try:
+            uploads = [
+                u for u in client.list_multipart_uploads(object_name)
+                if u.object_name == object_name
+            ]
+        except NotImplementedError:
+            self.logger.warning(f"{type(client).__name__} does not support listing multipart uploads")
+            return None
+        except Exception as e:
+            self.logger.warning(f"Failed to list multipart uploads for {object_name}: {e}")
+            return None
+        
+        uploads.sort(key=lambda u: u.initiated.timestamp() if u.initiated else 0, reverse=True)
+        file_size = os.path.getsize(local_file)
+        for upload in uploads:
+            try:
+                parts = client.list_parts(upload)
+            except Exception as e:
+                self.logger.warning(f"Failed to list parts of upload {upload.upload_id}: {e}")
+                continue
+            
+            record = self._match_server_parts(client, local_file, file_size, upload, parts)
+            if record:
+                self.logger.info(
+                    f"Found multipart upload {upload.upload_id} on server "
+                    f"({len(record['parts'])} parts already uploaded)"
+                )
+                return record
+            self.logger.info(f"Server upload {upload.upload_id} does not match {local_file}, skipping")
+        return None
+
+    def _match_server_parts(
+        self,
+        client: 'BaseOSSClient',
+        local_file: str,
+        file_size: int,
+        upload: MultipartUpload,
+        parts: List[Dict]
+    ) -> Optional[Dict]:
+        """校验服务端分片是否与本地文件一致
+        
+        分片大小由第 1 个分片（缺失时取最大分片）推断；每个分片的大小必须与
+        本地文件对应范围一致，ETag 为 MD5 时还要比对本地数据的 MD5。
+        """
+        if not parts:
+            return {'upload_id': upload.upload_id, 'part_size': self.plan_part_size(client, file_size), 'parts': {}}
+        
+        by_number = {p['part_number']: p for p in parts}
+        part_size = by_number[1]['size'] if 1 in by_number else max(p['size'] for p in parts)
+        if part_size <= 0:
+            return None
+        
+        total_parts = max(1, (file_size + part_size - 1) // part_size)
+        completed = {}
+        with open(local_file, 'rb') as f:
+            for number, part in sorted(by_number.items()):
+                start = (number - 1) * part_size
+                if number > total_parts or part['size'] != min(part_size, file_size - start):
+                    return None
+                
+                etag = part['etag'].strip('"')
+                if len(etag) == 32 and all(c in '0123456789abcdefABCDEF' for c in etag):
+                    if self._md5_range(f, start, part['size']) != etag.lower():
+                        return None
+                completed[number] = {'etag': etag, 'size': part['size']}
+        
+        return {'upload_id': upload.upload_id, 'part_size': part_size, 'parts': completed}
+
+    def _md5_range(self, f: BinaryIO, start: int, length: int) -> str:
+        """按块计算文件一段数据的 MD5，分片最大可达 5GB，不一次读入内存"""
+        md5 = hashlib.md5()
+        f.seek(start)
+        while length > 0:
+            block = f.read(min(self.HASH_BLOCK_SIZE, length))
+            if not block:
+                break
+            md5.update(block)
+            length -= len(block)
+        return md5.hexdigest()
+
+    def _journal_discovered_upload(
+        self,
+        client: 'BaseOSSClient',
+        object_name: str,
+        journal_key: str,
+        identity: Dict,
+        record: Dict
+    ) -> None:
+        """将服务端发现的上传写入本地日志，之后的续传不必再查询服务端"""
+        self.journal.create(
+            journal_key,
+            bucket=client.config.bucket_name,
+            object_name=object_name,
+            upload_id=record['upload_id'],
+            part_size=record['part_size'],
+            **identity
+        )
+        for number, part in sorted(record['parts'].items()):
+            self.journal.record_part(journal_key, number, part['etag'], part['size'])
 
     def _upload_part(
         self,
@@ -146,29 +445,44 @@ class TransferManager:
         local_file: str,
         upload: MultipartUpload,
         part_number: int,
-        progress_callback: Optional[ProgressCallback] = None
+        progress_callback: Optional[ProgressCallback] = None,
+        journal_key: Optional[str] = None,
+        source: Optional[PartSource] = None
     ) -> Tuple[int, str]:
-        """上传单个分片"""
+        """上传单个分片
+        
+        分片数据以 PartReader 传给驱动（内存映射文件的切片），每次调用（包括重试）
+        都创建新的读取器，从分片开头读取。
+        """
+        own_source = source is None
+        if own_source:
+            source = PartSource(local_file, upload.part_size)
         try:
-            # 计算分片范围
-            start_pos = (part_number - 1) * self.CHUNK_SIZE
-            with open(local_file, 'rb') as f:
-                f.seek(start_pos)
-                data = f.read(self.CHUNK_SIZE)
+            data = source.reader(part_number)
+            size = len(data)
             
-            # 上传分片
+            # 上传分片；SDK 读取数据时同时计算 MD5，与返回的 ETag 比对，
+            # 不一致时抛出可重试的 ChecksumMismatchError，只重传该分片
             etag = client.upload_part(upload, part_number, data)
+            if self.upload_settings['verify_checksum']:
+                verify_part(data, etag, part_number, upload.object_name)
             self.logger.info(f"Part {part_number} uploaded successfully")
             
+            # 先落盘再更新进度，保证日志中的分片都已上传成功
+            if journal_key:
+                self.journal.record_part(journal_key, part_number, etag, size)
+            with self.lock:
+                upload.add_completed_part(part_number, etag, size)
+                completed_bytes = upload.completed_bytes
+            
             # 更新进度
             if progress_callback:
                 try:
-                    progress = upload.add_completed_part(part_number, etag, len(data))
                     progress_callback.on_progress(
-                        upload.completed_bytes,
+                        completed_bytes,
                         upload.total_size,
                         self.start_time,
-                        self._calculate_speed(upload.completed_bytes)
+                        self._calculate_speed(completed_bytes)
                     )
                 except Exception as e:
                     if isinstance(e, TransferError):
@@ -182,11 +496,322 @@ class TransferManager:
                 raise
             self.logger.warning(f"Part {part_number} upload failed: {e}")
             raise
+        finally:
+            if own_source:
+                source.close()
+
+    def plan_part_size(self, client: 'BaseOSSClient', file_size: int) -> int:
+        """根据文件大小、服务商分片限制和并发数计算分片大小"""
+        from ossnake.utils.part_planner import plan_part_size_for
+        try:
+            return plan_part_size_for(
+                client, file_size, self.upload_settings['chunk_size'], self.upload_settings['workers']
+            )
+        except ValueError as e:
+            raise UploadError(str(e))
+
+    def _get_transfer_key(self, client: 'BaseOSSClient', object_name: str, identity: Dict) -> str:
+        """根据目标位置和本地文件标识生成传输键"""
+        target = f"{client.config.endpoint}/{client.config.bucket_name}/{object_name}"
+        return self.journal.make_key(target, identity)
+
+    def use_ranged_download(self, object_size: int) -> bool:
+        """判断对象是否应使用并发分段下载"""
+        return (
+            self.download_settings['multipart_enabled']
+            and object_size > self.download_settings['chunk_size']
+        )
+
+    def _split_ranges(self, object_size: int) -> List[Tuple[int, int]]:
+        """将对象切分为字节范围列表，end 为闭区间"""
+        chunk_size = self.download_settings['chunk_size']
+        return [
+            (start, min(start + chunk_size, object_size) - 1)
+            for start in range(0, object_size, chunk_size)
+        ]
+
+    def download_file(
+        self,
+        client: 'BaseOSSClient',
+        object_name: str,
+        local_file: str,
+        progress_callback: Optional[Callable] = None,
+        object_info: Optional[Dict] = None,
+        token: Optional[TransferToken] = None
+    ) -> None:
+        """并发分段下载文件
+        
+        将对象切分为多个字节范围，在同一个客户端（共享连接池）上并发获取，
+        并按偏移写入预分配的 <local_file>.ossnake-part 文件，已完成的分段记录在
+        旁边的位图中。失败后保留这两个文件，再次下载同一对象时只获取缺失的分段；
+        请求附带 If-Match 固定 ETag，对象变化时放弃续传。全部完成后原子重命名。
+        Args:
+            client: OSS客户端
+            object_name: 对象名称
+            local_file: 本地文件路径
+            progress_callback: 进度回调 progress_callback(transferred, total)
+            object_info: 已获取的对象信息（包含 size、etag），避免重复请求
+            token: 暂停/取消令牌（默认取当前线程绑定的令牌）；取消时删除未完成的文件
+        """
+        from ossnake.utils.download_state import DownloadState
+        
+        token = token or current_token()
+        if object_info is None:
+            object_info = client.get_object_info(object_name)
+        object_size = int(object_info['size'])
+        etag = (object_info.get('etag') or '').strip('"') or None
+        chunk_size = self.download_settings['chunk_size']
+        ranges = self._split_ranges(object_size)
+        
+        os.makedirs(os.path.dirname(os.path.abspath(local_file)), exist_ok=True)
+        state = DownloadState.open(local_file, etag, object_size, chunk_size)
+        pending = state.missing()
+        concurrency = self._create_concurrency(self.download_settings['workers'], self.download_settings)
+        bandwidth = transfer_bucket(self.bandwidth_limit)
+        budgets = self._retry_budgets(client, len(pending))
+        failed = threading.Event()
+        
+        self.logger.info(
+            f"Starting ranged download of {object_name} "
+            f"({object_size} bytes, {len(pending)}/{len(ranges)} ranges, "
+            f"{concurrency.limit}-{concurrency.ceiling} workers)"
+        )
+        
+        transferred = sum(end - start + 1 for i, (start, end) in enumerate(ranges) if state.is_done(i))
+        
+        def on_chunk(size: int):
+            nonlocal transferred
+            if bandwidth:
+                bandwidth.consume(size, step=BandwidthLimiter.CHUNK_SIZE)
+            with self.lock:
+                transferred += size
+                current = transferred
+            if progress_callback:
+                try:
+                    progress_callback(current, object_size)
+                except Exception as e:
+                    self.logger.warning(f"Progress callback failed: {e}")
+        
+        def fetch(index: int):
+            start, end = ranges[index]
+            
+            def attempt():
+                # 失败时撤回本次已计入的进度，重试从分段起点重新写入
+                written = 0
+                
+                def counted(size: int):
+                    nonlocal written
+                    written += size
+                    on_chunk(size)
+                    if token:
+                        token.check()
+                
+                try:
+                    self._download_range(client, object_name, fd, start, end, counted, etag)
+                except Exception:
+                    if written:
+                        on_chunk(-written)
+                    raise
+            
+            # 暂停时不再开始新的分段
+            with concurrency.slot(token) as started:
+                if failed.is_set():
+                    return
+                try:
+                    self._retry_operation(
+                        attempt,
+                        budgets=budgets,
+                        on_error=lambda e: concurrency.record_failure(e, started),
+                        description=f"range {start}-{end}"
+                    )
+                except Exception:
+                    failed.set()
+                    raise
+                concurrency.record_success(end - start + 1, started)
+            # 数据落盘后再标记完成，保证位图中的分段都是完整的
+            os.fsync(fd)
+            state.mark_done(index)
+        
+        fd = os.open(state.part_file, os.O_RDWR | os.O_CREAT | getattr(os, 'O_BINARY', 0))
+        try:
+            # 预分配文件，各分段按偏移写入
+            os.ftruncate(fd, object_size)
+            workers = min(concurrency.ceiling, max(1, len(pending)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(fetch, index) for index in pending]
+                try:
+                    for future in futures:
+                        future.result()
+                except Exception:
+                    for future in futures:
+                        future.cancel()
+                    raise
+            os.close(fd)
+            fd = None
+            state.finish()
+        except Exception as e:
+            if fd is not None:
+                os.close(fd)
+                fd = None
+            self.logger.error(f"Ranged download failed: {e}")
+            if isinstance(e, (ObjectChangedError, TransferCancelledError)):
+                # 对象已变化或用户取消，已下载的分段不再保留
+                state.discard()
+                raise
+            self.logger.info(
+                f"Keeping {state.part_file} for resume "
+                f"({state.completed_count()}/{state.total} ranges done)"
+            )
+            if isinstance(e, (TransferError, DownloadError)):
+                raise
+            raise DownloadError(f"Failed to download {object_name}: {str(e)}")
+        
+        self.logger.info(f"Ranged download of {object_name} completed")
+
+    def _download_range(
+        self,
+        client: 'BaseOSSClient',
+        object_name: str,
+        fd: int,
+        start: int,
+        end: int,
+        on_chunk: Callable[[int], None],
+        etag: Optional[str] = None
+    ) -> int:
+        """下载单个字节范围并写入文件对应偏移"""
+        offset = start
+        for chunk in client.iter_object_range(object_name, start, end, etag=etag):
+            self._write_at(fd, chunk, offset)
+            offset += len(chunk)
+            on_chunk(len(chunk))
+        
+        expected = end - start + 1
+        if offset - start != expected:
+            raise DownloadError(
+                f"Range {start}-{end} of {object_name} returned {offset - start} bytes, expected {expected}"
+            )
+        return expected
 
-    def get_progress(self, local_file: str, object_name: str) -> Optional[TransferProgress]:
-        """获取传输进度"""
-        transfer_key = self._get_transfer_key(local_file, object_name)
-        return self.transfers.get(transfer_key) 
+    def _write_at(self, fd: int, data: bytes, offset: int) -> None:
+        """按偏移写入，不依赖共享的文件指针"""
+        view = memoryview(data)
+        if hasattr(os, 'pwrite'):
+            while view:
+                written = os.pwrite(fd, view, offset)
+                view = view[written:]
+                offset += written
+        else:
+            # Windows 没有 pwrite，退化为加锁的 seek + write
+            with self.lock:
+                os.lseek(fd, offset, os.SEEK_SET)
+                while view:
+                    written = os.write(fd, view)
+                    view = view[written:]
+
+    def download_stream(
+        self,
+        client: 'BaseOSSClient',
+        object_name: str,
+        output_stream: BinaryIO,
+        progress_callback: Optional[Callable] = None,
+        object_info: Optional[Dict] = None,
+        token: Optional[TransferToken] = None
+    ) -> None:
+        """并发分段下载并按顺序写入输出流
+        
+        最多同时保留 当前并发数 * 2 个分段在内存中。
+        Args:
+            progress_callback: 进度回调 progress_callback(downloaded)，与驱动的 download_stream 一致
+            token: 暂停/取消令牌（默认取当前线程绑定的令牌）
+        """
+        token = token or current_token()
+        if object_info is None:
+            object_info = client.get_object_info(object_name)
+        object_size = int(object_info['size'])
+        ranges = self._split_ranges(object_size)
+        concurrency = self._create_concurrency(self.download_settings['workers'], self.download_settings)
+        etag = (object_info.get('etag') or '').strip('"') or None
+        bandwidth = transfer_bucket(self.bandwidth_limit)
+        budgets = self._retry_budgets(client, len(ranges))
+        downloaded = 0
+        
+        def get_range(start: int, end: int) -> bytes:
+            data = client.get_object_range(object_name, start, end, etag=etag)
+            if len(data) != end - start + 1:
+                raise DownloadError(
+                    f"Range {start}-{end} of {object_name} returned {len(data)} bytes"
+                )
+            return data
+        
+        def fetch(start: int, end: int) -> bytes:
+            with concurrency.slot(token) as started:
+                data = self._retry_operation(
+                    lambda: get_range(start, end),
+                    budgets=budgets,
+                    on_error=lambda e: concurrency.record_failure(e, started),
+                    description=f"range {start}-{end}"
+                )
+                concurrency.record_success(len(data), started)
+            if bandwidth:
+                bandwidth.consume(len(data), step=BandwidthLimiter.CHUNK_SIZE)
+            return data
+        
+        with ThreadPoolExecutor(max_workers=concurrency.ceiling) as executor:
+            pending = []
+            next_range = 0
+            try:
+                while next_range < len(ranges) or pending:
+                    # 保持窗口内的分段在途，窗口随并发数变化
+                    while next_range < len(ranges) and len(pending) < concurrency.limit * 2:
+                        pending.append(executor.submit(fetch, *ranges[next_range]))
+                        next_range += 1
+                    
+                    data = pending.pop(0).result()
+                    if token:
+                        token.check()
+                    output_stream.write(data)
+                    downloaded += len(data)
+                    if progress_callback:
+                        progress_callback(downloaded)
+            except Exception:
+                for future in pending:
+                    future.cancel()
+                raise
+        
+        output_stream.flush()
+
+    def get_progress(
+        self,
+        local_file: str,
+        object_name: str,
+        client: Optional['BaseOSSClient'] = None
+    ) -> Optional[TransferProgress]:
+        """获取传输进度（从断点续传日志读取）"""
+        if client is None or not os.path.exists(local_file):
+            return None
+        identity = self.journal.file_identity(local_file)
+        transfer_key = self._get_transfer_key(client, object_name, identity)
+        record = self.journal.load(transfer_key)
+        if not record:
+            return None
+        
+        created = datetime.fromisoformat(record['created'])
+        journal_path = self.journal.path_for(transfer_key)
+        return TransferProgress(
+            total_size=identity['size'],
+            transferred=sum(part['size'] for part in record['parts'].values()),
+            parts_completed={n: True for n in record['parts']},
+            start_time=created,
+            last_update=datetime.fromtimestamp(journal_path.stat().st_mtime),
+            checksum=self._journal_checksum(record),
+            temp_file=str(journal_path)
+        )
+
+    def _journal_checksum(self, record: Dict) -> Optional[str]:
+        """已上传分片的 ETag 按分片号合成的校验和；分片 ETag 不是 MD5 或还没有分片时用抽样哈希"""
+        parts = record['parts']
+        checksum = composite_etag(parts[n]['etag'] for n in sorted(parts))
+        return checksum or record['sample_hash']
 
     def _update_progress(self, upload: MultipartUpload, completed_parts: list, 
                         progress_callback: ProgressCallback):
@@ -224,16 +849,45 @@ class TransferManager:
                 self.logger.error(f"Upload failed: {e}")
                 raise
 
-    def _retry_operation(self, operation, max_retries=3):
-        """统一的重试机制"""
-        for retry in range(max_retries):
-            try:
-                return operation()
-            except Exception as e:
-                if retry == max_retries - 1:
-                    raise
-                self.logger.warning(f"Retry {retry + 1}/{max_retries}: {str(e)}")
-                time.sleep(2 ** retry)  # 指数退避
+    def _retry_operation(
+        self,
+        operation: Callable,
+        max_retries: Optional[int] = None,
+        budgets: Tuple = (),
+        on_error: Optional[Callable[[Exception], None]] = None,
+        description: str = "operation"
+    ):
+        """统一的重试机制
+        
+        不可重试的错误（认证失败、存储空间不存在等）立即抛出；其余错误按带抖动的
+        指数退避重试，限流错误退避加倍。每次重试消耗 budgets 中所有预算，
+        任一预算用完即停止重试。
+        Args:
+            operation: 要执行的操作
+            max_retries: 最大重试次数，默认 MAX_RETRIES
+            budgets: 重试预算（RetryBudget）
+            on_error: 每次失败时的回调（如通知并发控制器）
+            description: 日志中的操作描述
+        """
+        from ossnake.utils.retry_policy import retry_call, THROTTLED
+        
+        return retry_call(
+            operation,
+            max_retries=self.MAX_RETRIES if max_retries is None else max_retries,
+            base_delay=self.RETRY_BASE_DELAY,
+            budgets=budgets,
+            on_error=on_error,
+            logger=self.logger,
+            description=description,
+            on_retry=lambda kind: self.metrics.record_retry(network_error=kind != THROTTLED),
+            on_give_up=lambda e: self.metrics.record_failed_part()
+        )
+
+    def _retry_budgets(self, client: 'BaseOSSClient', operations: int) -> Tuple:
+        """单个传输的重试预算和服务端点共享的重试预算"""
+        from ossnake.utils.retry_policy import RetryBudget, endpoint_retry_budget
+        limit = max(self.MAX_RETRIES * 3, int(operations * self.RETRY_BUDGET_RATIO))
+        return (RetryBudget(limit), endpoint_retry_budget(client.config.endpoint))
 
     def _validate_progress(self, current: float, last: float):
         """验证进度的有效性"""
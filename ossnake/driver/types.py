@@ -65,4 +65,16 @@ class MultipartUpload:
     def __init__(self, object_name: str, upload_id: str):
         self.object_name = object_name
         self.upload_id = upload_id
-        self.parts = []  # List of (part_number, etag)
\ No newline at end of file
+        self.parts = []  # List of (part_number, etag)
+        self.part_size = 5 * 1024 * 1024
+        self.total_parts = 0
+        self.total_size = 0
+        self.completed_bytes = 0
+        self.initiated = None  # 初始化时间（列举进行中的上传时由服务端返回）
+        self.part_crcs = {}  # {分片号: (CRC64, 大小)}，阿里云完成上传时校验整个对象的 CRC64
+        self.etag = None  # 完成上传后服务端返回的 ETag
+    
+    def add_completed_part(self, part_number: int, etag: str, size: int) -> None:
+        """记录已完成的分片（调用方负责加锁）"""
+        self.parts.append((part_number, etag))
+        self.completed_bytes += size
\ No newline at end of file
@@ -60,18 +60,33 @@ class BucketView(ttk.Frame):
         files = self.tree.tk.splitlist(event.data)
         for file_path in files:
             object_name = os.path.basename(file_path)
-            Thread(target=self._upload_thread, args=(file_path, object_name)).start()
+            self._queue_upload(file_path, object_name)
     
-    def _upload_thread(self, local_file, object_name):
+    def _queue_upload(self, local_file, object_name):
+        """提交到全局传输调度器，多个文件共享同一组工作线程"""
         try:
+            from ossnake.utils.transfer_scheduler import TransferScheduler
             # 创建进度窗口
             progress_win = ProgressWindow(self, f"上传 {object_name}")
-            def progress_callback(transferred, total):
+            def progress_callback(transferred, total, *args):
                 progress_win.update_progress(transferred, total)
-            self.oss_client.upload_file(local_file, object_name, progress_callback=progress_callback)
-            progress_win.close()
-            self.load_objects(self.oss_client.config.bucket_name)
-            messagebox.showinfo("成功", f"上传成功: {object_name}")
+            def on_complete(job):
+                def done():
+                    progress_win.close()
+                    self.load_objects(self.oss_client.config.bucket_name)
+                    messagebox.showinfo("成功", f"上传成功: {object_name}")
+                self.after(0, done)
+            def on_error(job, error):
+                def failed():
+                    progress_win.close()
+                    messagebox.showerror("错误", f"上传失败: {str(error)}")
+                self.after(0, failed)
+            TransferScheduler().submit(
+                self.oss_client, local_file, object_name,
+                progress_callback=progress_callback,
+                on_complete=on_complete,
+                on_error=on_error
+            )
         except Exception as e:
             messagebox.showerror("错误", f"上传失败: {str(e)}")
 
@@ -204,8 +219,8 @@ class BucketView(ttk.Frame):
     
     def _search_thread(self, query):
         try:
-            objects = self.oss_client.list_objects(recursive=True)
-            filtered = [obj for obj in objects if query in obj['name']]
+            # 并行分段列举，边列举边过滤，不保存整个存储桶的列表
+            filtered = [obj for obj in self.oss_client.iter_objects_parallel() if query in obj['name']]
             self.tree.delete(*self.tree.get_children())
             for obj in filtered:
                 self.tree.insert('', 'end', values=(
@@ -227,6 +242,6 @@ class BucketView(ttk.Frame):
             for file_path in files:
                 if os.path.isfile(file_path):
                     object_name = os.path.basename(file_path)
-                    Thread(target=self._upload_thread, args=(file_path, object_name)).start()
+                    self._queue_upload(file_path, object_name)
         except Exception as e:
             messagebox.showerror("错误", f"粘贴上传失败: {str(e)}")
\ No newline at end of file
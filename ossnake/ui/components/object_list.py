@@ -59,6 +59,14 @@ class ObjectList(ttk.Frame):
         )
         self.upload_btn.pack(side=tk.LEFT, padx=2)
         
+        # 添加上传文件夹按钮
+        self.upload_dir_btn = ttk.Button(
+            self.toolbar,
+            text="上传文件夹",
+            command=self.start_upload_directory
+        )
+        self.upload_dir_btn.pack(side=tk.LEFT, padx=2)
+        
         # 添加路径导航
         self.path_var = tk.StringVar(value="/")
         self.path_entry = ttk.Entry(
@@ -189,7 +197,7 @@ class ObjectList(ttk.Frame):
                         relative_path,
                         self.format_size(obj.get('size', 0)),
                         self.get_file_type(relative_path),
-                        obj.get('last_modified', '')
+                        self.format_time(obj.get('last_modified'))
                     ))
             
             # 添加返回上级目录项
@@ -351,50 +359,48 @@ class ObjectList(ttk.Frame):
     def _download_items(self, items, download_dir, progress):
         """在后台线程中执行下载"""
         try:
-            total_items = len(items)
-            current_item = 0
-            
-            for name, is_dir in items:
-                if progress.cancelled:
-                    progress.file_var.set("已取消下载")
-                    break
-                
-                full_path = f"{self.current_path}/{name}".lstrip('/')
-                local_path = os.path.join(download_dir, name)
+            # 绑定进度窗口的令牌，驱动和分段下载据此暂停/取消
+            with progress.token.bound():
+                total_items = len(items)
+                current_item = 0
                 
-                if is_dir:
-                    # 下载目录
-                    self._download_directory(full_path, local_path, progress)
-                else:
-                    try:
-                        # 获取文件大小
-                        file_info = self.oss_client.get_object_info(full_path)
-                        total_size = int(file_info.get('size', 0))
-                        
-                        # 创建进度回调
-                        def progress_callback(transferred, total):
-                            if not progress.cancelled:
-                                progress.update_progress(
-                                    transferred,
-                                    total,
-                                    name
-                                )
-                        
-                        # 下载文件
-                        self.oss_client.download_file(
-                            full_path,
-                            local_path,
-                            progress_callback=progress_callback
-                        )
-                    except Exception as e:
-                        if progress.cancelled:
-                            if os.path.exists(local_path):
-                                os.remove(local_path)
-                            break
-                        else:
-                            raise
-                
-                current_item += 1
+                for name, is_dir in items:
+                    if progress.cancelled:
+                        progress.file_var.set("已取消下载")
+                        break
+                    
+                    full_path = f"{self.current_path}/{name}".lstrip('/')
+                    local_path = os.path.join(download_dir, name)
+                    
+                    if is_dir:
+                        # 下载目录
+                        self._download_directory(full_path, local_path, progress)
+                    else:
+                        try:
+                            # 创建进度回调（驱动自行获取对象大小，这里不再单独 HEAD）
+                            def progress_callback(transferred, total):
+                                if not progress.cancelled:
+                                    progress.update_progress(
+                                        transferred,
+                                        total,
+                                        name
+                                    )
+                            
+                            # 下载文件
+                            self.oss_client.download_file(
+                                full_path,
+                                local_path,
+                                progress_callback=progress_callback
+                            )
+                        except Exception as e:
+                            if progress.cancelled:
+                                if os.path.exists(local_path):
+                                    os.remove(local_path)
+                                break
+                            else:
+                                raise
+                    
+                    current_item += 1
             
             if progress.cancelled:
                 progress.file_var.set("下载已取消")
@@ -410,35 +416,23 @@ class ObjectList(ttk.Frame):
             progress.after(1500, progress.destroy)
     
     def _download_directory(self, remote_dir, local_dir, progress):
-        """下载整个目录"""
-        try:
-            os.makedirs(local_dir, exist_ok=True)
-            objects = self.oss_client.list_objects(prefix=remote_dir)
-            
-            for obj in objects:
-                if progress.cancelled:
-                    break
-                    
-                name = obj['name']
-                if obj['type'] != 'directory':
-                    relative_path = name[len(remote_dir):].lstrip('/')
-                    local_path = os.path.join(local_dir, relative_path)
-                    
-                    # 创建本地目录
-                    os.makedirs(os.path.dirname(local_path), exist_ok=True)
-                    
-                    # 更新进度
-                    progress.update_progress(
-                        -1,  # 不确定的进度
-                        f"正在下载: {relative_path}"
-                    )
-                    
-                    # 下载文件
-                    self.oss_client.download_file(name, local_path)
+        """下载整个目录：边列举边并发下载，汇总进度（见 BaseOSSClient.download_directory）"""
+        name = os.path.basename(local_dir)
+        
+        def progress_callback(transferred, total):
+            if not progress.cancelled:
+                progress.update_progress(transferred, total, name)
         
+        try:
+            result = self.oss_client.download_directory(
+                remote_dir, local_dir, progress_callback, token=progress.token
+            )
         except Exception as e:
             self.logger.error(f"Directory download failed: {str(e)}")
             raise
+        if result['failed']:
+            failed = ', '.join(list(result['failed'])[:5])
+            raise Exception(f"{len(result['failed'])} 个文件下载失败: {failed}")
     
     def delete_selected(self):
         """删除选中的对象"""
@@ -480,48 +474,44 @@ class ObjectList(ttk.Frame):
         thread.start()
     
     def _delete_items(self, items, progress):
-        """在后台线程中执行删除"""
+        """在后台线程中执行删除：选中的文件合并批量删除，目录边列举边批量删除"""
+        files = [path for path, is_dir in items if not is_dir]
+        folders = [path for path, is_dir in items if is_dir]
+        failed = {}
+        
+        def progress_callback(deleted, total):
+            if not progress.cancelled:
+                progress.update_progress(deleted, total, f"已删除 {deleted} 个对象")
+        
         try:
-            total_items = len(items)
-            for i, (path, is_dir) in enumerate(items, 1):
-                if progress.cancelled:
-                    break
-                    
-                try:
-                    # 更新进度
-                    progress.update_progress(
-                        i, total_items,
-                        f"正在删除: {path}"
-                    )
-                    
-                    if is_dir:
-                        # 删除目录
-                        objects = self.oss_client.list_objects(prefix=path)
-                        for obj in objects:
-                            if progress.cancelled:
-                                break
-                            self.oss_client.delete_file(obj['name'])
-                    else:
-                        # 删除文件
-                        self.oss_client.delete_file(path)
-                        
-                except Exception as e:
-                    self.logger.error(f"Failed to delete {path}: {str(e)}")
-                    if not messagebox.askyesno(
-                        "删除错误",
-                        f"删除 {path} 失败: {str(e)}\n是否继续删除其他项目？"
-                    ):
+            # 进度窗口的取消按钮通过令牌停止后续批次
+            with progress.token.bound():
+                if files:
+                    failed.update(self.oss_client.delete_many(files, progress_callback)['failed'])
+                for path in folders:
+                    if progress.cancelled:
                         break
+                    progress.file_var.set(f"正在删除: {path}")
+                    result = self.oss_client.delete_prefix(path.rstrip('/') + '/', progress_callback)
+                    failed.update(result['failed'])
             
             if progress.cancelled:
                 progress.file_var.set("已取消删除")
+            elif failed:
+                for name, error in failed.items():
+                    self.logger.error(f"Failed to delete {name}: {error}")
+                progress.file_var.set(f"{len(failed)} 个对象删除失败，详见日志")
+                self.load_objects(self.current_path)
             else:
                 progress.file_var.set("删除完成")
                 self.load_objects(self.current_path)  # 刷新列表
                 
         except Exception as e:
             self.logger.error(f"Delete operation failed: {str(e)}")
-            progress.file_var.set(f"删除失败: {str(e)}")
+            if progress.cancelled:
+                progress.file_var.set("已取消删除")
+            else:
+                progress.file_var.set(f"删除失败: {str(e)}")
         finally:
             # 延迟关闭进度对话框
             progress.after(1500, progress.destroy)
@@ -554,6 +544,15 @@ class ObjectList(ttk.Frame):
             size /= 1024
         return f"{size:.1f} PB"
     
+    @staticmethod
+    def format_time(value):
+        """格式化修改时间（列举结果为 UTC datetime，显示为本地时间）"""
+        if value is None:
+            return ''
+        if hasattr(value, 'astimezone'):
+            return value.astimezone().strftime('%Y-%m-%d %H:%M:%S')
+        return str(value)
+    
     @staticmethod
     def get_file_type(filename):
         """获取文件类型"""
@@ -566,17 +565,23 @@ class ObjectList(ttk.Frame):
         self.oss_client = client
         self.load_objects() 
     
-    def _upload_thread(self, local_file, object_name):
+    def _queue_upload(self, local_file, object_name):
+        """把上传任务提交给全局传输调度器，多个文件共享同一组工作线程"""
         try:
-            # 获取文件大小和计算分片信息
-            file_size = os.path.getsize(local_file)
-            chunk_size = 5 * 1024 * 1024  # 5MB
-            is_multipart = file_size > chunk_size
+            from ossnake.utils.transfer_scheduler import TransferScheduler
+            scheduler = TransferScheduler()
             
-            # 正确计算分片数量
-            total_parts = (file_size + chunk_size - 1) // chunk_size if is_multipart else 0
+            # 分片大小由规划器根据文件大小和服务商限制决定，进度窗口使用相同的分片数量
+            file_size = os.path.getsize(local_file)
+            is_multipart = file_size > scheduler.chunk_size
+            if is_multipart:
+                from ossnake.utils.part_planner import plan_part_size_for
+                part_size = plan_part_size_for(self.oss_client, file_size, scheduler.chunk_size, scheduler.workers)
+                total_parts = (file_size + part_size - 1) // part_size
+            else:
+                total_parts = 0
             
-            self.logger.info(f"Starting upload: {object_name}, size: {file_size}, parts: {total_parts}")
+            self.logger.info(f"Queueing upload: {object_name}, size: {file_size}, parts: {total_parts}")
             
             # 创建进度窗口
             progress_win = ProgressDialog(
@@ -597,22 +602,34 @@ class ObjectList(ttk.Frame):
             else:
                 remote_path = object_name
             
-            # 使用传输管理器上传
-            from ossnake.utils.transfer_manager import TransferManager
-            manager = TransferManager(chunk_size=chunk_size)  # 确保使用相同的分片大小
-            manager.upload_file(
+            def on_complete(job):
+                def done():
+                    progress_win.close()
+                    self.load_objects(self.current_path)  # 刷新当前目录
+                    # 使用 Toast 替代 messagebox
+                    Toast(self, f"上传成功: {object_name}")
+                self.after(0, done)
+            
+            def on_error(job, error):
+                def failed():
+                    progress_win.close()
+                    if job.status == job.CANCELLED:
+                        Toast(self, f"已取消上传: {object_name}")
+                    else:
+                        messagebox.showerror("错误", f"上传失败: {str(error)}")
+                self.after(0, failed)
+            
+            # 进度窗口的暂停/取消按钮通过令牌控制任务
+            scheduler.submit(
                 self.oss_client,
                 local_file,
                 remote_path,
-                progress_callback=progress_callback
+                progress_callback=progress_callback,
+                on_complete=on_complete,
+                on_error=on_error,
+                token=progress_win.token
             )
             
-            progress_win.close()
-            self.load_objects(self.current_path)  # 刷新当前目录
-            
-            # 使用 Toast 替代 messagebox
-            Toast(self, f"上传成功: {object_name}")
-            
         except Exception as e:
             self.logger.error(f"Upload failed: {str(e)}")
             messagebox.showerror("错误", f"上传失败: {str(e)}")
@@ -626,26 +643,65 @@ class ObjectList(ttk.Frame):
         if files:
             for file_path in files:
                 object_name = os.path.basename(file_path)
-                thread = threading.Thread(
-                    target=self._upload_thread,
-                    args=(file_path, object_name)
+                self._queue_upload(file_path, object_name)
+    
+    def start_upload_directory(self):
+        """通过对话框选择文件夹上传"""
+        local_dir = filedialog.askdirectory(title="选择要上传的文件夹", mustexist=True)
+        if local_dir:
+            self._upload_directory(local_dir)
+    
+    def _upload_directory(self, local_dir):
+        """在后台线程上传整个文件夹到当前目录下的同名文件夹"""
+        name = os.path.basename(os.path.normpath(local_dir))
+        prefix = f"{self.current_path}/{name}".lstrip('/')
+        progress = ProgressDialog(self, f"上传 {name}", f"正在上传文件夹 {name}")
+        
+        def progress_callback(transferred, total):
+            progress.update_progress(transferred, total, name)
+        
+        def run():
+            try:
+                result = self.oss_client.upload_directory(
+                    local_dir, prefix, progress_callback, token=progress.token
                 )
-                thread.daemon = True
-                thread.start()
+            except Exception as e:
+                self.logger.error(f"Directory upload failed: {str(e)}")
+                error = e
+                
+                def failed():
+                    progress.close()
+                    if progress.cancelled:
+                        Toast(self, f"已取消上传: {name}")
+                    else:
+                        messagebox.showerror("错误", f"上传失败: {str(error)}")
+                self.after(0, failed)
+                return
+            
+            def done():
+                progress.close()
+                self.load_objects(self.current_path)
+                if result['failed']:
+                    messagebox.showwarning(
+                        "部分文件上传失败",
+                        f"已上传 {result['files']} 个文件，{len(result['failed'])} 个文件失败，详见日志"
+                    )
+                else:
+                    Toast(self, f"上传成功: {name}（{result['files']} 个文件）")
+            self.after(0, done)
+        
+        threading.Thread(target=run, daemon=True).start()
     
     def on_drop(self, event):
         """处理文件拖放"""
         try:
             files = self.tree.tk.splitlist(event.data)
             for file_path in files:
-                if os.path.isfile(file_path):  # 只处理文件
+                if os.path.isdir(file_path):
+                    self._upload_directory(file_path)
+                elif os.path.isfile(file_path):
                     object_name = os.path.basename(file_path)
-                    thread = threading.Thread(
-                        target=self._upload_thread,
-                        args=(file_path, object_name)
-                    )
-                    thread.daemon = True
-                    thread.start()
+                    self._queue_upload(file_path, object_name)
         except Exception as e:
             self.logger.error(f"Drop failed: {str(e)}")
             messagebox.showerror("错误", f"拖放上传失败: {str(e)}") 
@@ -673,13 +729,20 @@ class ObjectList(ttk.Frame):
         # 构建新路径
         new_path = f"{self.current_path}/{new_name}".lstrip('/')
         
+        if is_dir:
+            # 重命名目录：后台并发移动所有对象，可取消，再次重命名时从断点继续
+            progress = ProgressDialog(self, "重命名", f"正在移动: {old_name} → {new_name}")
+            thread = threading.Thread(
+                target=self._rename_folder,
+                args=(old_path, new_path, progress)
+            )
+            thread.daemon = True
+            thread.start()
+            return
+            
         try:
-            if is_dir:
-                # 重命名目录（移动所有文件）
-                self.oss_client.rename_folder(old_path, new_path)
-            else:
-                # 重命名文件（复制后删除）
-                self.oss_client.rename_object(old_path, new_path)
+            # 重命名文件（服务端复制后删除）
+            self.oss_client.rename_object(old_path, new_path)
             
             # 刷新列表
             self.load_objects(self.current_path)
@@ -691,6 +754,26 @@ class ObjectList(ttk.Frame):
             self.logger.error(f"Failed to rename {old_path} to {new_path}: {str(e)}")
             messagebox.showerror("错误", f"重命名失败: {str(e)}")
     
+    def _rename_folder(self, old_path, new_path, progress):
+        """在后台线程中移动目录下的所有对象"""
+        def progress_callback(moved, total):
+            if not progress.cancelled:
+                progress.update_progress(moved, total)
+        
+        try:
+            with progress.token.bound():
+                result = self.oss_client.rename_folder(old_path, new_path, progress_callback)
+            progress.file_var.set(f"已移动 {result['files']} 个对象，用时 {result['elapsed']:.1f} 秒")
+        except Exception as e:
+            self.logger.error(f"Failed to rename {old_path} to {new_path}: {str(e)}")
+            if progress.cancelled:
+                progress.file_var.set("已取消重命名，再次重命名可继续")
+            else:
+                progress.file_var.set(f"重命名失败: {str(e)}")
+        finally:
+            self.load_objects(self.current_path)
+            progress.after(1500, progress.destroy)
+    
     def show_rename_dialog(self, old_name):
         """显示重命名对话框"""
         dialog = tk.Toplevel(self)
@@ -88,8 +88,19 @@ class ProgressDialog(tk.Toplevel):
         )
         self.cancel_button.pack(side=tk.RIGHT)
         
-        # 取消标志
+        # 暂停/继续按钮
+        self.pause_button = ttk.Button(
+            self.button_frame,
+            text="暂停",
+            command=self.toggle_pause,
+            width=15
+        )
+        self.pause_button.pack(side=tk.RIGHT, padx=(0, 5))
+        
+        # 取消标志；传输代码通过 token 协作暂停/取消
         self.cancelled = False
+        from ossnake.utils.transfer_token import TransferToken
+        self.token = TransferToken()
         
         # 记录开始时间和已传输大小
         self.start_time = None
@@ -260,10 +271,23 @@ class ProgressDialog(tk.Toplevel):
         """格式化速度"""
         return f"{ProgressDialog.format_size(speed)}/s"
     
+    def toggle_pause(self):
+        """暂停或继续传输（正在传输的分片会先完成）"""
+        if self.token.paused:
+            self.token.resume()
+            self.pause_button.config(text="暂停")
+            self.speed_var.set("")
+        else:
+            self.token.pause()
+            self.pause_button.config(text="继续")
+            self.speed_var.set("已暂停")
+    
     def cancel(self):
         """取消操作"""
         self.cancelled = True
+        self.token.cancel()
         self.cancel_button.config(state='disabled')
+        self.pause_button.config(state='disabled')
         self.file_var.set("正在取消...")
         self.speed_var.set("")
         self.progress_bar.config(mode='indeterminate')
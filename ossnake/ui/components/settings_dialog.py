@@ -246,6 +246,24 @@ class SettingsDialog(tk.Toplevel):
         )
         dl_workers_entry.pack(side=tk.LEFT, padx=5)
         
+        # 带宽限制组
+        bandwidth_frame = ttk.LabelFrame(scrollable_frame, text="带宽限制", padding="5")
+        bandwidth_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        up_limit_frame = ttk.Frame(bandwidth_frame)
+        up_limit_frame.pack(fill=tk.X, pady=2)
+        ttk.Label(up_limit_frame, text="上传限速:").pack(side=tk.LEFT)
+        self.upload_limit_var = tk.StringVar(value="0")
+        ttk.Entry(up_limit_frame, width=10, textvariable=self.upload_limit_var).pack(side=tk.LEFT, padx=5)
+        ttk.Label(up_limit_frame, text="KB/s (0 表示不限)").pack(side=tk.LEFT)
+        
+        dl_limit_frame = ttk.Frame(bandwidth_frame)
+        dl_limit_frame.pack(fill=tk.X, pady=2)
+        ttk.Label(dl_limit_frame, text="下载限速:").pack(side=tk.LEFT)
+        self.download_limit_var = tk.StringVar(value="0")
+        ttk.Entry(dl_limit_frame, width=10, textvariable=self.download_limit_var).pack(side=tk.LEFT, padx=5)
+        ttk.Label(dl_limit_frame, text="KB/s (0 表示不限)").pack(side=tk.LEFT)
+        
         # 默认设置组
         default_frame = ttk.LabelFrame(scrollable_frame, text="默认设置", padding="5")
         default_frame.pack(fill=tk.X, padx=5, pady=5)
@@ -521,8 +539,11 @@ class SettingsDialog(tk.Toplevel):
 
     def _clear_cache(self):
         """清理缓存"""
-        # TODO: 实现缓存清理
-        pass
+        from ossnake.utils.content_cache import ContentCache
+        cache = ContentCache()
+        used = cache.usage()
+        cache.clear()
+        messagebox.showinfo("提示", f"已清除缓存 {used['disk'] / 1024 / 1024:.1f} MB")
 
     def load_settings(self):
         """加载设置到UI"""
@@ -548,6 +569,10 @@ class SettingsDialog(tk.Toplevel):
         self.download_chunk_size_var.set(str(settings["download"]["chunk_size"]))
         self.download_workers_var.set(str(settings["download"]["workers"]))
         
+        # 加载带宽限制
+        self.upload_limit_var.set(str(settings["bandwidth"]["upload_limit"]))
+        self.download_limit_var.set(str(settings["bandwidth"]["download_limit"]))
+        
         # 加载默认设置
         self.default_oss_var.set(settings["default"]["oss_source"])
         
@@ -585,6 +610,8 @@ class SettingsDialog(tk.Toplevel):
             # 验证数值输入
             self._validate_numeric_settings()
             
+            # 设置页面未提供的选项（如自适应并发）沿用当前值
+            current = self.settings_manager.settings
             settings = {
                 "proxy": {
                     "enabled": self.proxy_enabled_var.get(),
@@ -597,15 +624,22 @@ class SettingsDialog(tk.Toplevel):
                     "default_oss": self.api_oss_var.get()
                 },
                 "upload": {
+                    **current.get("upload", {}),
                     "multipart_enabled": self.multipart_upload_var.get(),
                     "chunk_size": int(self.chunk_size_var.get()),
                     "workers": int(self.upload_workers_var.get())
                 },
                 "download": {
+                    **current.get("download", {}),
                     "multipart_enabled": self.multipart_download_var.get(),
                     "chunk_size": int(self.download_chunk_size_var.get()),
                     "workers": int(self.download_workers_var.get())
                 },
+                "bandwidth": {
+                    **current.get("bandwidth", {}),
+                    "upload_limit": int(self.upload_limit_var.get()),
+                    "download_limit": int(self.download_limit_var.get())
+                },
                 "default": {
                     "oss_source": self.default_oss_var.get()
                 },
@@ -629,6 +663,15 @@ class SettingsDialog(tk.Toplevel):
             
             # 保存设置
             if self.settings_manager.save_settings(settings):
+                # 立即应用带宽限制
+                from ossnake.utils.bandwidth_limiter import BandwidthLimiter
+                BandwidthLimiter().reload(self.settings_manager.settings["bandwidth"])
+                # 新的分片大小和并发数对之后开始的上传生效
+                from ossnake.utils.transfer_scheduler import TransferScheduler
+                TransferScheduler().configure(self.settings_manager.settings["upload"])
+                # 新的缓存大小立即生效，超出部分按最近访问时间淘汰
+                from ossnake.utils.content_cache import ContentCache
+                ContentCache().configure(self.settings_manager.settings["advanced"])
                 # 应用代理设置
                 self._apply_proxy_settings(settings["proxy"])
                 return True
@@ -698,6 +741,11 @@ class SettingsDialog(tk.Toplevel):
             if not (1 <= dl_workers <= 32):
                 raise ValueError("下载并发数必须在1-32之间")
             
+            # 限速验证
+            for var, name in ((self.upload_limit_var, "上传限速"), (self.download_limit_var, "下载限速")):
+                if int(var.get()) < 0:
+                    raise ValueError(f"{name}不能为负数")
+            
             # 列表大小验证
             list_size = int(self.list_size_var.get())
             if not (100 <= list_size <= 10000):
@@ -6,6 +6,7 @@ import logging
 from .base_viewer import BaseViewer
 import os
 from ..components.loading_indicator import LoadingIndicator
+from ossnake.utils.content_cache import ContentCache
 
 class ImageViewer(BaseViewer):
     """图片查看器"""
@@ -192,11 +193,12 @@ class ImageViewer(BaseViewer):
             # 显示加载指示器
             self.show_loading()
             
-            # 获取图片数据
-            self.image_data = self.oss_client.get_object(self.object_name)
+            # 获取图片数据（对象未变化时来自缓存，磁盘缓存以内存映射返回）
+            self.image_data = ContentCache().fetch(self.oss_client, self.object_name)
             
             # 使用PIL打开图片
-            self.original_image = Image.open(io.BytesIO(self.image_data))
+            data = self.image_data
+            self.original_image = Image.open(io.BytesIO(data) if isinstance(data, bytes) else data)
             self.rotation_angle = 0  # 初始化旋转角度
             
             # 更新图片信息
@@ -4,6 +4,7 @@ import logging
 from typing import Optional, Callable
 from .base_viewer import BaseViewer
 import tkinter.messagebox as messagebox
+from ossnake.utils.content_cache import ContentCache
 
 class TextEditor(BaseViewer):
     """文本编辑器"""
@@ -200,7 +201,7 @@ class TextEditor(BaseViewer):
     def load_content(self):
         """加载文件内容"""
         try:
-            content = self.oss_client.get_object(self.object_name)
+            content = ContentCache().fetch(self.oss_client, self.object_name)
             
             # 尝试不同的编码方式
             encodings = ['utf-8', 'gbk', 'gb2312', 'iso-8859-1']
@@ -208,14 +209,14 @@ class TextEditor(BaseViewer):
             
             for encoding in encodings:
                 try:
-                    text_content = content.decode(encoding)
+                    text_content = str(content, encoding)
                     self.logger.info(f"Successfully decoded content with {encoding}")
                     break
                 except UnicodeDecodeError:
                     continue
             
             if text_content is None:
-                text_content = str(content)
+                text_content = str(bytes(content))
                 self.logger.warning("Failed to decode content with known encodings, displaying as binary")
             
             # 更新文本框内容
@@ -257,8 +258,9 @@ class TextEditor(BaseViewer):
     def on_encoding_change(self, event=None):
         """处理编码改变"""
         try:
-            content = self.oss_client.get_object(self.object_name)
-            text_content = content.decode(self.encoding_var.get())
+            # 内容来自缓存（对象未变化时不重新下载）
+            content = ContentCache().fetch(self.oss_client, self.object_name)
+            text_content = str(content, self.encoding_var.get())
             
             if self.mode == "view":
                 self.text.config(state=tk.NORMAL)
@@ -0,0 +1,157 @@
+import time
+import socket
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+_clock = threading.local()
+
+
+def start_clock() -> float:
+    """开始为当前线程的分片计时，返回开始时间"""
+    started = time.monotonic()
+    _clock.started = started
+    _clock.idle = 0.0
+    return started
+
+
+def record_idle(seconds: float) -> None:
+    """记录当前线程在限速、重试退避中等待的时间，这段时间不计入分片耗时"""
+    if getattr(_clock, 'started', None) is not None:
+        _clock.idle += seconds
+
+
+def _idle_since(started: float) -> float:
+    """当前线程自 started 开始计时以来的等待时间"""
+    if getattr(_clock, 'started', None) == started:
+        return _clock.idle
+    return 0.0
+
+
+class AdaptiveConcurrency:
+    """AIMD 自适应并发控制器
+
+    控制同时在途的分片数：
+    - 分片成功且单位字节耗时没有明显变长时加性增加（每完成约 limit 个分片 +1）；
+    - 遇到 503 / SlowDown / 超时等拥塞错误，或单位字节耗时超过基线的
+      LATENCY_THRESHOLD 倍时乘性减少；
+    - 每次减少后，减少前开始的分片产生的拥塞信号被忽略，避免一次拥塞连续减半。
+    并发数始终在 [floor, ceiling] 之间；adaptive 为 False 时固定为 initial。
+    分片耗时从 acquire()（或 start_clock()）开始计算，扣除同一线程在限速和重试退避中
+    的等待时间（record_idle），限速生效时不会被误判为拥塞。
+    """
+
+    DECREASE_FACTOR = 0.5  # 乘性减少系数
+    LATENCY_THRESHOLD = 2.0  # 单位字节耗时超过基线的倍数视为拥塞
+    BASELINE_DRIFT = 1.05  # 每个样本基线向当前值靠拢的最大比例，适应网络变化
+
+    CONGESTION_MARKERS = (
+        '503', 'slowdown', 'slow down', 'serviceunavailable', 'service unavailable',
+        'throttl', 'toomanyrequests', 'too many requests', 'requesttimeout',
+        'timeout', 'timed out'
+    )
+
+    def __init__(self, initial: int = 4, ceiling: int = 16, floor: int = 1, adaptive: bool = True):
+        self.logger = logging.getLogger(__name__)
+        self.floor = max(1, floor)
+        self.ceiling = max(self.floor, ceiling, initial) if adaptive else max(self.floor, initial)
+        self.adaptive = adaptive
+        self._limit = float(min(max(initial, self.floor), self.ceiling))
+        self._in_flight = 0
+        self._baseline = None  # 最小单位字节耗时（秒/字节）
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """当前允许的在途分片数"""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def acquire(self) -> float:
+        """等待一个并发名额，返回开始时间"""
+        with self._cond:
+            while self._in_flight >= int(self._limit):
+                self._cond.wait()
+            self._in_flight += 1
+        return start_clock()
+
+    def release(self) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify()
+
+    @contextmanager
+    def slot(self, token=None) -> Iterator[float]:
+        """占用一个并发名额，yield 开始时间
+
+        指定传输令牌时，名额内的代码绑定该令牌执行；暂停时先等待继续，拿到名额时
+        若已暂停则归还名额重新等待，保证暂停后不再开始新的分片。
+        """
+        from ossnake.utils.transfer_token import bind_token
+        while True:
+            if token:
+                token.wait_if_paused()
+            started = self.acquire()
+            if token and token.paused:
+                self.release()
+                continue
+            break
+        try:
+            with bind_token(token):
+                yield started
+        finally:
+            self.release()
+
+    def record_success(self, nbytes: int, started: float) -> None:
+        """记录成功的分片，根据耗时调整并发数"""
+        if not self.adaptive:
+            return
+        elapsed = max(time.monotonic() - started - _idle_since(started), 1e-6)
+        per_byte = elapsed / max(nbytes, 1)
+        with self._cond:
+            if self._baseline is None or per_byte < self._baseline:
+                self._baseline = per_byte
+            else:
+                self._baseline = min(self._baseline * self.BASELINE_DRIFT, per_byte)
+
+            if per_byte > self._baseline * self.LATENCY_THRESHOLD:
+                self._decrease(started, f"part latency {per_byte / self._baseline:.1f}x baseline")
+            elif self._limit < self.ceiling:
+                before = int(self._limit)
+                self._limit = min(self.ceiling, self._limit + 1.0 / self._limit)
+                if int(self._limit) > before:
+                    self.logger.debug(f"Concurrency increased to {int(self._limit)}")
+                    self._cond.notify_all()
+
+    def record_failure(self, error: BaseException, started: Optional[float] = None) -> bool:
+        """记录失败的分片，拥塞错误时减少并发数
+
+        Returns:
+            bool: 是否判定为拥塞错误
+        """
+        congested = self.is_congestion_error(error)
+        if congested and self.adaptive:
+            with self._cond:
+                self._decrease(started, str(error))
+        return congested
+
+    def _decrease(self, started: Optional[float], reason: str) -> None:
+        """乘性减少（调用方持有锁）"""
+        if started is not None and started < self._last_decrease:
+            return
+        self._limit = max(float(self.floor), self._limit * self.DECREASE_FACTOR)
+        self._last_decrease = time.monotonic()
+        self.logger.info(f"Concurrency decreased to {int(self._limit)}: {reason}")
+
+    @classmethod
+    def is_congestion_error(cls, error: BaseException) -> bool:
+        """判断是否为限流、服务繁忙或超时类错误"""
+        if isinstance(error, (TimeoutError, socket.timeout)):
+            return True
+        text = f"{type(error).__name__} {error}".lower()
+        return any(marker in text for marker in cls.CONGESTION_MARKERS)
@@ -0,0 +1,167 @@
+import time
+import logging
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from ossnake.utils.adaptive_concurrency import record_idle
+
+
+class TokenBucket:
+    """令牌桶
+
+    consume 先扣除令牌（允许透支），再按欠额睡眠，多个线程并发消费时
+    各自按顺序排队，总速率不超过 rate。rate 为 None 或 0 表示不限速。
+    """
+
+    def __init__(self, rate: Optional[float] = None, burst: Optional[float] = None):
+        self._lock = threading.Lock()
+        self.rate = rate or None
+        self.burst = burst
+        self._tokens = self._capacity()
+        self._last = time.monotonic()
+
+    def _capacity(self) -> float:
+        if not self.rate:
+            return 0.0
+        # 默认允许 0.25 秒的突发
+        return float(self.burst if self.burst is not None else self.rate / 4)
+
+    def set_rate(self, rate: Optional[float]) -> None:
+        """修改速率（用于时间段切换）"""
+        rate = rate or None
+        if rate == self.rate:
+            return
+        with self._lock:
+            self.rate = rate
+            self._tokens = min(self._tokens, self._capacity())
+            self._last = time.monotonic()
+
+    def consume(self, nbytes: int, step: Optional[int] = None) -> float:
+        """消费 nbytes 个令牌，必要时阻塞，返回睡眠时间
+
+        指定 step 时按 step 分块消费，避免一次长时间睡眠后突发。
+        """
+        if not self.rate or nbytes <= 0:
+            return 0.0
+        if step and nbytes > step:
+            waited = 0.0
+            while nbytes > 0:
+                waited += self.consume(min(step, nbytes))
+                nbytes -= step
+            return waited
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._capacity(), self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= nbytes
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+            record_idle(wait)
+        return wait
+
+
+class BandwidthLimiter:
+    """进程级带宽限制器
+
+    所有传输（ObjectList、BucketView 以及驱动的 upload_part / 下载循环）共享
+    上传、下载两个令牌桶。限速读取 settings.json 的 bandwidth 节（单位 KB/s，0 表示不限）：
+        {
+            "upload_limit": 512,
+            "download_limit": 0,
+            "schedules": [{"start": "22:00", "end": "06:00", "upload": 0, "download": 0}]
+        }
+    schedules 中第一个覆盖当前时间的时间段优先于 upload_limit / download_limit，
+    结束时间早于开始时间表示跨越午夜。数据按 CHUNK_SIZE 分块消费令牌，速率平滑。
+    分片上传在 SDK 读取请求体时按块计费（见 PartReader），不超过驱动
+    TRANSFER_MANAGER_THRESHOLD 的小文件仍在请求前整体计费。
+    """
+
+    _instance = None
+
+    CHUNK_SIZE = 64 * 1024  # 每次消费令牌的最大字节数
+    DIRECTIONS = ('upload', 'download')
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if not self._initialized:
+            self.logger = logging.getLogger(__name__)
+            self._buckets = {direction: TokenBucket() for direction in self.DIRECTIONS}
+            self._settings: Dict = {}
+            self._initialized = True
+            self.reload()
+
+    def reload(self, settings: Optional[Dict] = None) -> None:
+        """重新读取限速设置"""
+        if settings is None:
+            try:
+                from ossnake.utils.settings_manager import SettingsManager
+                settings = SettingsManager().settings.get('bandwidth', {})
+            except Exception as e:
+                self.logger.warning(f"Failed to load bandwidth settings: {e}")
+                settings = {}
+        self._settings = dict(settings or {})
+        self.logger.info(
+            f"Bandwidth limits: upload={self._settings.get('upload_limit', 0)}KB/s, "
+            f"download={self._settings.get('download_limit', 0)}KB/s, "
+            f"{len(self._settings.get('schedules') or [])} schedules"
+        )
+
+    def current_limit(self, direction: str, now: Optional[datetime] = None) -> Optional[int]:
+        """当前生效的限速（字节/秒），None 表示不限"""
+        now = now or datetime.now()
+        limit = self._settings.get(f'{direction}_limit', 0)
+        for schedule in self._settings.get('schedules') or []:
+            if self._in_window(schedule, now):
+                limit = schedule.get(direction, limit)
+                break
+        return int(limit) * 1024 if limit else None
+
+    @staticmethod
+    def _in_window(schedule: Dict, now: datetime) -> bool:
+        """当前时间是否在时间段内（[start, end)，支持跨午夜）"""
+        try:
+            start = datetime.strptime(schedule['start'], '%H:%M').time()
+            end = datetime.strptime(schedule['end'], '%H:%M').time()
+        except (KeyError, TypeError, ValueError):
+            return False
+        current = now.time()
+        if start <= end:
+            return start <= current < end
+        return current >= start or current < end
+
+    def throttle(self, direction: str, nbytes: int) -> None:
+        """按当前限速消费 nbytes，必要时阻塞
+        Args:
+            direction: 'upload' 或 'download'
+            nbytes: 字节数
+        """
+        bucket = self._buckets[direction]
+        bucket.set_rate(self.current_limit(direction))
+        bucket.consume(nbytes, step=self.CHUNK_SIZE)
+
+
+def transfer_bucket(limit: Optional[int]) -> Optional[TokenBucket]:
+    """创建单个传输的限速令牌桶（字节/秒），limit 为空时返回 None
+
+    与全局限速叠加：驱动层按全局限速消费，传输管理器再按该令牌桶消费。
+    """
+    return TokenBucket(limit) if limit else None
+
+
+def throttler(direction: str, bucket: Optional[TokenBucket] = None) -> Callable[[int], None]:
+    """返回按全局限速（以及 bucket 指定的单个传输限速）消费流量的函数，供 PartReader 按块调用"""
+    limiter = BandwidthLimiter()
+
+    def throttle(nbytes: int) -> None:
+        limiter.throttle(direction, nbytes)
+        if bucket:
+            bucket.consume(nbytes, step=BandwidthLimiter.CHUNK_SIZE)
+
+    return throttle
@@ -0,0 +1,113 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional
+
+from ossnake.driver.exceptions import TransferCancelledError
+from ossnake.utils.directory_transfer import is_stopping_error
+from ossnake.utils.transfer_token import TransferToken, bind_token, current_token
+
+
+class BatchDeleter:
+    """批量删除：把对象名按 client.MAX_DELETE_BATCH 分批，用多对象删除接口并发删除
+
+    对象名可以来自逐页列举（delete_prefix），边列举边删除；在途批次数有上限，
+    列举不会比删除快太多。每批暂时性错误整批重试；服务端逐个返回的失败只记录，
+    其余对象继续删除。取消、认证失败或存储空间不存在时停止。
+    """
+
+    WORKERS = 4  # 并发删除的批次数
+    MAX_RETRIES = 3
+    RETRY_BASE_DELAY = 0.5
+
+    def __init__(self, client: 'BaseOSSClient', token: Optional[TransferToken] = None):
+        self.client = client
+        self.token = token or current_token() or TransferToken()
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._stop_error: Optional[Exception] = None
+        self._progress_callback: Optional[Callable] = None
+        self.total = 0
+        self.deleted = 0
+        self.failed: Dict[str, str] = {}
+
+    def delete(self, object_names: Iterable[str],
+               progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict:
+        """删除 object_names 中的所有对象
+        Args:
+            object_names: 对象名（可以是生成器）
+            progress_callback: progress_callback(deleted, total)，total 为目前已取得的对象数
+        Returns:
+            Dict: {'deleted': 删除的对象数, 'failed': {对象名: 错误信息}}
+        """
+        self._progress_callback = progress_callback
+        batch_size = self.client.MAX_DELETE_BATCH
+        slots = threading.Semaphore(self.WORKERS * 2)
+        futures = []
+        with ThreadPoolExecutor(max_workers=self.WORKERS) as executor:
+            def submit(batch: List[str]):
+                slots.acquire()
+                future = executor.submit(self._delete_batch, batch)
+                future.add_done_callback(lambda _: slots.release())
+                futures.append(future)
+
+            try:
+                batch = []
+                for name in object_names:
+                    if self._stop_error is not None:
+                        break
+                    self.token.wait_if_paused()
+                    batch.append(name)
+                    with self._lock:
+                        self.total += 1
+                    if len(batch) == batch_size:
+                        submit(batch)
+                        batch = []
+                if batch and self._stop_error is None:
+                    submit(batch)
+            except Exception as e:
+                self._stop(e)
+            wait(futures)
+
+        if self._stop_error is None and self.token.cancelled:
+            self._stop_error = TransferCancelledError("Transfer cancelled")
+        if self._stop_error is not None:
+            raise self._stop_error
+        self.logger.info(f"Batch delete finished: {self.deleted}/{self.total} deleted, {len(self.failed)} failed")
+        return {'deleted': self.deleted, 'failed': dict(self.failed)}
+
+    def _delete_batch(self, batch: List[str]) -> None:
+        from ossnake.utils.retry_policy import retry_call, endpoint_retry_budget
+
+        if self._stop_error is not None or self.token.cancelled:
+            return
+        try:
+            with bind_token(self.token):
+                failed = retry_call(
+                    lambda: self.client.delete_objects(batch),
+                    max_retries=self.MAX_RETRIES,
+                    base_delay=self.RETRY_BASE_DELAY,
+                    budgets=(endpoint_retry_budget(self.client.config.endpoint),),
+                    logger=self.logger,
+                    description=f"delete of {len(batch)} objects"
+                )
+        except Exception as e:
+            if is_stopping_error(e):
+                self._stop(e)
+                return
+            self.logger.error(f"Failed to delete batch of {len(batch)} objects: {e}")
+            failed = {name: str(e) for name in batch}
+
+        with self._lock:
+            self.failed.update(failed)
+            self.deleted += len(batch) - len(failed)
+            if self._progress_callback:
+                try:
+                    self._progress_callback(self.deleted, self.total)
+                except Exception as e:
+                    self.logger.warning(f"Progress callback failed: {e}")
+
+    def _stop(self, error: Exception) -> None:
+        with self._lock:
+            if self._stop_error is None:
+                self._stop_error = error
@@ -0,0 +1,72 @@
+import hashlib
+import re
+from typing import Iterable, Optional
+
+from ossnake.driver.exceptions import ChecksumMismatchError
+
+_MD5_ETAG = re.compile(r'^[0-9a-f]{32}$')
+
+
+def normalize_etag(etag: Optional[str]) -> str:
+    """去掉 ETag 两侧的引号并转为小写"""
+    return (etag or '').strip().strip('"').lower()
+
+
+def is_md5_etag(etag: Optional[str]) -> bool:
+    """ETag 是否为数据的 MD5（普通上传的对象/分片；SSE-KMS 加密和分片对象不是）"""
+    return bool(_MD5_ETAG.match(normalize_etag(etag)))
+
+
+def composite_etag(part_etags: Iterable[str]) -> Optional[str]:
+    """按 S3 规则由分片 ETag 计算分片上传对象的 ETag：MD5(各分片 MD5 拼接)-分片数
+
+    任一分片 ETag 不是 MD5 时无法计算，返回 None。
+    """
+    digest = hashlib.md5()
+    count = 0
+    for etag in part_etags:
+        if not is_md5_etag(etag):
+            return None
+        digest.update(bytes.fromhex(normalize_etag(etag)))
+        count += 1
+    if not count:
+        return None
+    return f"{digest.hexdigest()}-{count}"
+
+
+def verify_part(data, etag: Optional[str], part_number: int, object_name: str) -> None:
+    """用上传时边读边算的 MD5 校验服务端返回的分片 ETag
+
+    data 不是 PartReader（没有 md5_hex）或 ETag 不是 MD5 时不校验。
+    Raises:
+        ChecksumMismatchError: 分片 ETag 与本地 MD5 不一致（可重试，只重传该分片）
+    """
+    md5_hex = getattr(data, 'md5_hex', None)
+    if md5_hex is None or not is_md5_etag(etag):
+        return
+    expected = md5_hex()
+    if normalize_etag(etag) != expected:
+        raise ChecksumMismatchError(
+            f"Part {part_number} of {object_name}: server ETag {normalize_etag(etag)} != local MD5 {expected}"
+        )
+
+
+def verify_upload(client: 'BaseOSSClient', upload: 'MultipartUpload') -> Optional[str]:
+    """完成分片上传后，用分片 ETag 计算对象 ETag 并与服务端返回的比对
+
+    只在 client.MULTIPART_ETAG_IS_MD5 且服务端返回了 ETag 时校验（阿里云在
+    complete_multipart_upload 中校验整个对象的 CRC64）。
+    Returns:
+        Optional[str]: 计算出的对象 ETag，无法计算时为 None
+    Raises:
+        ChecksumMismatchError: 对象 ETag 与分片 ETag 计算结果不一致
+    """
+    expected = composite_etag(etag for _, etag in sorted(upload.parts))
+    if expected is None or not upload.etag or not getattr(client, 'MULTIPART_ETAG_IS_MD5', False):
+        return expected
+    actual = normalize_etag(upload.etag)
+    if actual != expected:
+        raise ChecksumMismatchError(
+            f"Object {upload.object_name}: server ETag {actual} != composite of part ETags {expected}"
+        )
+    return expected
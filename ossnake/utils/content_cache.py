@@ -0,0 +1,254 @@
+import hashlib
+import logging
+import mmap
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+Content = Union[bytes, mmap.mmap]
+
+
+class ContentCache:
+    """对象内容缓存（内存 + 磁盘两级），按 (OSS源, 存储桶, 对象名, ETag) 区分版本
+
+    - 不超过 MEMORY_OBJECT_LIMIT 的对象同时保存在内存 LRU 中（总量不超过 MEMORY_BUDGET）；
+    - 所有缓存的对象写入 ~/.ossnake/cache 下的文件，总大小不超过设置中的
+      advanced.cache_size（MB），超出时按最近访问时间淘汰；命中时以只读内存映射返回，
+      不把文件读入内存；文件的修改时间记录最近访问时间，重启后 LRU 顺序仍然有效；
+    - 对象被覆盖后 ETag 变化，旧版本不会再命中；客户端的 put_object / delete_file /
+      rename_object 等修改操作完成后调用 invalidate 立即删除该对象的所有版本
+      （见 BaseOSSClient.MUTATING_METHODS）。
+    用法：
+        data = ContentCache().fetch(client, 'docs/readme.txt')
+        text = str(data, 'utf-8')
+    """
+
+    _instance = None
+
+    MEMORY_OBJECT_LIMIT = 4 * 1024 * 1024  # 放入内存层的对象大小上限
+    MEMORY_BUDGET = 64 * 1024 * 1024  # 内存层总大小上限
+    MAX_OBJECT_RATIO = 0.25  # 超过缓存总量该比例的对象不缓存
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if not self._initialized:
+            self.logger = logging.getLogger(__name__)
+            self._lock = threading.Lock()
+            self._memory: 'OrderedDict[Tuple, Tuple[str, bytes]]' = OrderedDict()
+            self._memory_bytes = 0
+            self._files: Optional[Dict[Path, Tuple[int, float]]] = None  # 路径 -> (大小, 最近访问时间)
+            self._disk_bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self._initialized = True
+            self.configure()
+
+    def configure(self, settings: Optional[Dict] = None, cache_dir: Optional[str] = None) -> None:
+        """读取 advanced 设置中的缓存大小（MB），cache_dir 默认 ~/.ossnake/cache"""
+        if settings is None:
+            try:
+                from ossnake.utils.settings_manager import SettingsManager
+                settings = SettingsManager().settings.get('advanced', {})
+            except Exception as e:
+                self.logger.warning(f"Failed to load cache settings: {e}")
+                settings = {}
+        with self._lock:
+            self.budget = max(0, int(settings.get('cache_size', 1024))) * 1024 * 1024
+            if cache_dir is not None or not hasattr(self, 'cache_dir'):
+                self.cache_dir = Path(cache_dir or os.path.join(os.path.expanduser("~/.ossnake"), "cache"))
+                self._files = None  # 目录变化时重新扫描
+            self._trim_memory()
+        self._trim_disk()
+
+    @staticmethod
+    def object_key(client: 'BaseOSSClient', object_name: str) -> Tuple[str, str, str]:
+        """(OSS源, 存储桶, 对象名)"""
+        config = client.config
+        source = f"{config.provider or type(client).__name__}:{config.endpoint or ''}"
+        return source, config.bucket_name, object_name
+
+    def fetch(self, client: 'BaseOSSClient', object_name: str, etag: Optional[str] = None,
+              size: Optional[int] = None) -> Content:
+        """返回对象内容，缓存中没有当前版本时下载并缓存
+        Args:
+            client: OSS客户端
+            object_name: 对象名称
+            etag, size: 对象的 ETag 和大小，都已知（如来自列举结果）时不再 HEAD
+        Returns:
+            bytes 或只读的 mmap（支持缓冲区协议和 read/seek，可直接交给 PIL、str(data, 编码) 等）
+        """
+        if etag is None or size is None:
+            info = client.get_object_info(object_name)
+            etag, size = info.get('etag'), int(info['size'])
+        if not etag:
+            return client.get_object(object_name)  # 无法区分版本，不缓存
+        key = self.object_key(client, object_name)
+        data = self.get(key, etag)
+        if data is not None:
+            return data
+        # 带 If-Match 读取，HEAD 之后对象被覆盖时不会把新内容当作旧版本缓存
+        data = client.get_object_range(object_name, 0, size - 1, etag=etag) if size else b''
+        self.put(key, etag, data)
+        return data
+
+    def get(self, key: Tuple[str, str, str], etag: str) -> Optional[Content]:
+        """查找指定版本，未命中返回 None"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[0] == etag:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+        path = self._path(key, etag)
+        try:
+            with open(path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+            os.utime(path)  # 记录最近访问时间
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+            if self._files is not None and path in self._files:
+                self._files[path] = (size, path.stat().st_mtime)
+            if size <= self.MEMORY_OBJECT_LIMIT:
+                self._remember(key, etag, bytes(data))
+        return data
+
+    def put(self, key: Tuple[str, str, str], etag: str, data: Union[bytes, memoryview]) -> None:
+        """缓存对象的一个版本（同一对象的旧版本被替换）"""
+        size = len(data)
+        if size > self.budget * self.MAX_OBJECT_RATIO:
+            return
+        self.invalidate_key(key)
+        with self._lock:
+            if size <= self.MEMORY_OBJECT_LIMIT:
+                self._remember(key, etag, bytes(data))
+        path = self._path(key, etag)
+        temp = path.with_suffix('.tmp')
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp, 'wb') as f:
+                f.write(data)
+            os.replace(temp, path)
+        except OSError as e:
+            self.logger.warning(f"Failed to write cache file for {key[2]}: {e}")
+            return
+        with self._lock:
+            if self._files is not None:
+                self._add_file(path, size, path.stat().st_mtime)
+        self._trim_disk()
+
+    def invalidate(self, client: 'BaseOSSClient', object_name: str) -> None:
+        """删除对象的所有缓存版本（对象被修改、删除或重命名后调用）"""
+        self.invalidate_key(self.object_key(client, object_name))
+
+    def invalidate_key(self, key: Tuple[str, str, str]) -> None:
+        directory = self._object_dir(key)
+        with self._lock:
+            entry = self._memory.pop(key, None)
+            if entry is not None:
+                self._memory_bytes -= len(entry[1])
+            if not directory.exists():
+                return  # 大多数修改的对象没有缓存，不扫描文件表
+            if self._files is not None:
+                for path in [path for path in self._files if path.parent == directory]:
+                    self._remove_file(path)
+        shutil.rmtree(directory, ignore_errors=True)
+
+    def clear(self) -> None:
+        """清空内存和磁盘缓存（设置中的"清除缓存"）"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            self._files = {}
+            self._disk_bytes = 0
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        self.logger.info(f"Cleared content cache {self.cache_dir}")
+
+    def usage(self) -> Dict[str, int]:
+        """当前缓存占用（字节）"""
+        with self._lock:
+            self._scan()
+            return {'memory': self._memory_bytes, 'disk': self._disk_bytes,
+                    'files': len(self._files), 'budget': self.budget}
+
+    def _object_dir(self, key: Tuple[str, str, str]) -> Path:
+        digest = hashlib.sha1('\0'.join(key).encode('utf-8')).hexdigest()
+        return self.cache_dir / digest[:2] / digest
+
+    def _path(self, key: Tuple[str, str, str], etag: str) -> Path:
+        return self._object_dir(key) / hashlib.sha1(etag.strip('"').encode('utf-8')).hexdigest()
+
+    def _remember(self, key: Tuple[str, str, str], etag: str, data: bytes) -> None:
+        """放入内存层，调用方持有 _lock"""
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= len(old[1])
+        self._memory[key] = (etag, data)
+        self._memory_bytes += len(data)
+        self._trim_memory()
+
+    def _trim_memory(self) -> None:
+        """调用方持有 _lock"""
+        limit = min(self.MEMORY_BUDGET, self.budget)
+        while self._memory and self._memory_bytes > limit:
+            _, (_, data) = self._memory.popitem(last=False)
+            self._memory_bytes -= len(data)
+
+    def _scan(self) -> None:
+        """第一次使用时扫描缓存目录，调用方持有 _lock"""
+        if self._files is not None:
+            return
+        self._files = {}
+        self._disk_bytes = 0
+        if not self.cache_dir.exists():
+            return
+        for path in self.cache_dir.glob('*/*/*'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if path.suffix == '.tmp':
+                path.unlink(missing_ok=True)  # 上次写入中断留下的临时文件
+                continue
+            self._add_file(path, stat.st_size, stat.st_mtime)
+
+    def _add_file(self, path: Path, size: int, mtime: float) -> None:
+        self._remove_file(path)
+        self._files[path] = (size, mtime)
+        self._disk_bytes += size
+
+    def _remove_file(self, path: Path) -> None:
+        entry = self._files.pop(path, None)
+        if entry is not None:
+            self._disk_bytes -= entry[0]
+
+    def _trim_disk(self) -> None:
+        """磁盘层超出缓存大小时，按最近访问时间删除最旧的文件"""
+        with self._lock:
+            self._scan()
+            if self._disk_bytes <= self.budget:
+                return
+            victims = []
+            for path, (size, _) in sorted(self._files.items(), key=lambda item: item[1][1]):
+                if self._disk_bytes <= self.budget:
+                    break
+                self._remove_file(path)
+                victims.append(path)
+        for path in victims:
+            try:
+                path.unlink()
+            except OSError as e:
+                # Windows 上仍被映射的文件无法删除，下次扫描时再淘汰
+                self.logger.debug(f"Failed to evict cache file {path}: {e}")
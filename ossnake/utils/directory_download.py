@@ -0,0 +1,108 @@
+import os
+import threading
+from typing import Callable, Dict, Optional
+
+from ossnake.utils.directory_transfer import DirectoryTransfer, FileProgress
+from ossnake.utils.transfer_token import bind_token
+
+
+class DirectoryDownloader(DirectoryTransfer):
+    """目录下载：边列举边下载
+
+    调用线程通过 client.iter_objects 逐页列举前缀下的对象，每个对象立即交给工作线程：
+    - 大小和 ETag 取自列举结果，不再为每个对象 HEAD；下载附带 If-Match，对象在列举后被修改时报错；
+    - 小对象由 WORKERS 个线程各自一次 GET 下载，写入临时文件后重命名；
+    - 超过分段下载阈值的对象交给 TransferManager 并发分段下载（支持续传）。
+    本地目录只在第一次遇到时创建。
+    """
+
+    WORKERS = 32  # 并发下载的对象数（不超过客户端连接池大小）
+    LARGE_FILE_WORKERS = 2  # 同时分段下载的大对象数
+    TEMP_SUFFIX = '.ossnake-tmp'
+
+    def __init__(self, client: 'BaseOSSClient', manager=None, token=None):
+        super().__init__(client, manager, token)
+        self._created_dirs = set()
+        self._dirs_lock = threading.Lock()
+
+    def download(self, prefix: str, local_dir: str,
+                 progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict:
+        """下载 prefix 下的所有对象到 local_dir，保持目录结构
+        Args:
+            prefix: 远程前缀，为空时下载整个存储空间
+            local_dir: 本地目录
+            progress_callback: progress_callback(transferred, total)，total 为目前已列举到的总字节数，
+                列举完成前会增长
+        Returns:
+            Dict: {'files': 成功下载的文件数, 'bytes': 字节数, 'failed': {对象名: 错误}}
+        """
+        prefix = prefix.strip('/')
+        if prefix:
+            prefix += '/'
+        self._progress_callback = progress_callback
+        self._ensure_dir(local_dir)
+        self.logger.info(f"Downloading {prefix or '/'} to directory {local_dir}")
+
+        def objects():
+            for obj in self.client.iter_objects(prefix, recursive=True):
+                relative = obj['name'][len(prefix):]
+                if obj.get('type') == 'folder' or not relative or relative.endswith('/'):
+                    continue  # 文件夹标记，目录在下载其中的文件时创建
+                local_file = os.path.join(local_dir, *relative.split('/'))
+                yield obj['name'], int(obj.get('size') or 0), local_file, obj.get('etag')
+
+        workers = max(1, min(self.WORKERS, self.client.MAX_POOL_CONNECTIONS))
+        return self._run(
+            objects(),
+            [(workers, self._download_small), (self.LARGE_FILE_WORKERS, self._download_large)],
+            lambda size: 1 if self.manager.use_ranged_download(size) else 0
+        )
+
+    def _ensure_dir(self, path: str) -> None:
+        """创建本地目录，同一目录只创建一次"""
+        with self._dirs_lock:
+            if path in self._created_dirs:
+                return
+            os.makedirs(path, exist_ok=True)
+            self._created_dirs.add(path)
+
+    def _download_small(self, object_name: str, size: int, local_file: str, etag: Optional[str]) -> None:
+        """一次 GET 下载对象，写入临时文件后重命名，暂时性错误重试"""
+        self._ensure_dir(os.path.dirname(local_file))
+        temp_file = local_file + self.TEMP_SUFFIX
+        progress = FileProgress(self)
+
+        def attempt():
+            progress.rollback()
+            written = 0
+            with bind_token(self.token), open(temp_file, 'wb') as f:
+                if size:
+                    for chunk in self.client.iter_object_range(object_name, 0, size - 1, etag=etag):
+                        f.write(chunk)
+                        written += len(chunk)
+                        progress(written)
+            if written != size:
+                raise IOError(f"Downloaded {written} bytes of {object_name}, expected {size}")
+
+        try:
+            self._retry(attempt, f"download of {object_name}")
+            os.replace(temp_file, local_file)
+        except Exception:
+            progress.rollback()
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+            raise
+
+    def _download_large(self, object_name: str, size: int, local_file: str, etag: Optional[str]) -> None:
+        """大对象并发分段下载，按分段计入总进度"""
+        self._ensure_dir(os.path.dirname(local_file))
+        progress = FileProgress(self)
+        try:
+            self.manager.download_file(
+                self.client, object_name, local_file, progress,
+                object_info={'size': size, 'etag': etag}, token=self.token
+            )
+        except Exception:
+            progress.rollback()
+            raise
+        progress.settle(size)
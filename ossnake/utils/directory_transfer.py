@@ -0,0 +1,180 @@
+import queue
+import logging
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from ossnake.driver.exceptions import AuthenticationError, BucketNotFoundError, TransferCancelledError
+from ossnake.utils.transfer_token import TransferToken, current_token
+
+
+def is_stopping_error(error: Exception) -> bool:
+    """影响所有对象的错误（取消、认证失败、存储空间不存在），批量操作遇到时应停止"""
+    stopping = (TransferCancelledError, AuthenticationError, BucketNotFoundError)
+    return isinstance(error, stopping) or isinstance(error.__cause__, stopping)
+
+
+class FileProgress:
+    """把单个文件的进度（累计字节数）折算进目录总进度
+
+    可直接作为 progress_callback(transferred, total) 使用，
+    也提供 TransferManager 分片上传使用的 on_progress(transferred, total, ...)。
+    """
+
+    def __init__(self, transfer: 'DirectoryTransfer'):
+        self.transfer = transfer
+        self.counted = 0
+        self.lock = threading.Lock()  # 多个分片线程同时回调
+
+    def __call__(self, transferred: int, total: int = 0, *args) -> None:
+        with self.lock:
+            delta = transferred - self.counted
+            self.counted = transferred
+        self.transfer._add_progress(delta)
+
+    on_progress = __call__
+
+    def settle(self, size: int) -> None:
+        """文件完成后按实际大小补齐（进度回调可能缺失或乱序）"""
+        self(size)
+
+    def rollback(self) -> None:
+        """文件失败时撤回已计入的进度"""
+        self(0)
+
+
+class DirectoryTransfer:
+    """目录传输的公共部分：边遍历/列举边传输
+
+    调用线程逐个产生待传输的文件，立即放入有上限的队列，由各通道的工作线程处理；
+    队列满时遍历暂停，遍历不会比传输快太多而占用大量内存。
+    单个文件失败只记录，其余文件继续；取消、认证失败或存储空间不存在时停止整个传输。
+    """
+
+    QUEUE_SIZE = 1024  # 每条通道等待传输的文件数上限
+    MAX_RETRIES = 3  # 单次请求传输的文件的最大重试次数
+    RETRY_BASE_DELAY = 0.5
+
+    def __init__(self, client: 'BaseOSSClient', manager=None, token: Optional[TransferToken] = None):
+        if manager is None:
+            from ossnake.driver.transfer_manager import TransferManager
+            manager = TransferManager()
+        self.client = client
+        self.manager = manager
+        self.token = token or current_token() or TransferToken()
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._stop_error: Optional[Exception] = None
+        self._progress_callback: Optional[Callable] = None
+        self.total_files = 0
+        self.total_bytes = 0
+        self.completed_files = 0
+        self.transferred = 0
+        self.failed: Dict[str, Exception] = {}
+
+    def _run(self, items: Iterable[Tuple], lanes: List[Tuple[int, Callable]],
+             route: Callable[[int], int]) -> Dict:
+        """传输 items 中的文件
+        Args:
+            items: 逐个产生 (名称, 大小, 其余参数...)，名称用于记录失败
+            lanes: 每条通道的 (工作线程数, 处理函数)，处理函数参数与 items 中的元组相同
+            route: 根据文件大小返回通道下标
+        Returns:
+            Dict: {'files': 成功的文件数, 'bytes': 字节数, 'failed': {名称: 错误}}
+        """
+        queues = [queue.Queue(self.QUEUE_SIZE) for _ in lanes]
+        self.token.on_cancel(self._stop.set)
+        threads = [
+            threading.Thread(target=self._work, args=(lane, handler), daemon=True)
+            for lane, (workers, handler) in zip(queues, lanes)
+            for _ in range(workers)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            for item in items:
+                if self._stop.is_set():
+                    break
+                with self._lock:
+                    self.total_files += 1
+                    self.total_bytes += item[1]
+                self._put(queues[route(item[1])], item)
+        except Exception as e:
+            self._record_failure('', e, stop=True)
+        finally:
+            # 每个工作线程一个结束标记
+            for lane, (workers, _) in zip(queues, lanes):
+                for _ in range(workers):
+                    lane.put(None)
+            for thread in threads:
+                thread.join()
+
+        if self._stop_error is None and self.token.cancelled:
+            self._stop_error = TransferCancelledError("Transfer cancelled")
+        if self._stop_error is not None:
+            raise self._stop_error
+        self.logger.info(
+            f"Directory transfer finished: {self.completed_files}/{self.total_files} files, "
+            f"{self.transferred} bytes, {len(self.failed)} failed"
+        )
+        return {'files': self.completed_files, 'bytes': self.transferred, 'failed': dict(self.failed)}
+
+    def _put(self, lane: queue.Queue, item) -> None:
+        """队列满时等待腾出位置；停止后放弃"""
+        while not self._stop.is_set():
+            try:
+                lane.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _work(self, lane: queue.Queue, handler: Callable) -> None:
+        while True:
+            item = lane.get()
+            if item is None:
+                return
+            if self._stop.is_set():
+                continue  # 取出剩余文件，直到结束标记
+            try:
+                self.token.wait_if_paused()
+                handler(*item)
+            except Exception as e:
+                self._record_failure(item[0], e)
+            else:
+                with self._lock:
+                    self.completed_files += 1
+
+    def _retry(self, operation: Callable, description: str):
+        """单次请求传输的文件，暂时性错误按退避重试"""
+        from ossnake.utils.retry_policy import retry_call, endpoint_retry_budget
+        return retry_call(
+            operation,
+            max_retries=self.MAX_RETRIES,
+            base_delay=self.RETRY_BASE_DELAY,
+            budgets=(endpoint_retry_budget(self.client.config.endpoint),),
+            logger=self.logger,
+            description=description
+        )
+
+    def _add_progress(self, nbytes: int) -> None:
+        with self._lock:
+            self.transferred += nbytes
+            if not self._progress_callback or not nbytes:
+                return
+            # 在锁内回调，保证多个线程报告的进度按顺序到达
+            try:
+                self._progress_callback(self.transferred, self.total_bytes)
+            except Exception as e:
+                self.logger.warning(f"Progress callback failed: {e}")
+
+    def _record_failure(self, name: str, error: Exception, stop: bool = False) -> None:
+        """记录失败的文件；影响所有文件的错误停止整个传输"""
+        if stop or is_stopping_error(error):
+            with self._lock:
+                if self._stop_error is None:
+                    self._stop_error = error
+            self._stop.set()
+            return
+        self.logger.error(f"Failed to transfer {name}: {error}")
+        with self._lock:
+            self.failed[name] = error
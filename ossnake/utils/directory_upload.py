@@ -0,0 +1,96 @@
+import os
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+from ossnake.utils.directory_transfer import DirectoryTransfer, FileProgress
+from ossnake.utils.transfer_token import bind_token
+
+
+def iter_files(local_dir: str, on_error: Optional[Callable[[str, Exception], None]] = None
+               ) -> Iterator[Tuple[str, str, int]]:
+    """用 os.scandir 逐个目录遍历，边遍历边返回 (本地路径, 相对路径, 大小)
+
+    相对路径使用 '/' 分隔；不跟随目录的符号链接，避免循环。
+    无法读取的目录或文件交给 on_error(path, error)，遍历继续。
+    """
+    stack = [(local_dir, '')]
+    while stack:
+        directory, relative = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    name = f"{relative}{entry.name}"
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append((entry.path, f"{name}/"))
+                        elif entry.is_file():
+                            yield entry.path, name, entry.stat().st_size
+                    except OSError as e:
+                        if on_error:
+                            on_error(entry.path, e)
+        except OSError as e:
+            if on_error:
+                on_error(directory, e)
+
+
+class DirectoryUploader(DirectoryTransfer):
+    """目录上传：边遍历边上传
+
+    调用线程用 os.scandir 遍历目录，遍历到的文件立即按大小交给两条通道的工作线程：
+    - 小文件（不超过 client.TRANSFER_MANAGER_THRESHOLD）由 SMALL_FILE_WORKERS 个线程各自一次 PUT 上传；
+    - 大文件由 LARGE_FILE_WORKERS 个线程交给 TransferManager 分片上传（分片并发、续传日志照常生效）。
+    """
+
+    SMALL_FILE_WORKERS = 32  # 小文件并发 PUT 数（不超过客户端连接池大小）
+    LARGE_FILE_WORKERS = 2  # 同时分片上传的大文件数
+
+    def upload(self, local_dir: str, prefix: str = '',
+               progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict:
+        """上传 local_dir 下的所有文件到 prefix 下，保持目录结构
+        Args:
+            local_dir: 本地目录
+            prefix: 对象前缀（目标“文件夹”），为空时上传到存储空间根目录
+            progress_callback: progress_callback(transferred, total)，total 为目前已遍历到的总字节数，
+                遍历完成前会增长
+        Returns:
+            Dict: {'files': 成功上传的文件数, 'bytes': 字节数, 'failed': {本地路径: 错误}}
+        """
+        if not os.path.isdir(local_dir):
+            raise FileNotFoundError(f"Local directory not found: {local_dir}")
+        prefix = prefix.strip('/')
+        if prefix:
+            prefix += '/'
+        self._progress_callback = progress_callback
+        self.logger.info(f"Uploading directory {local_dir} to {prefix or '/'}")
+
+        files = (
+            (path, size, f"{prefix}{relative}")
+            for path, relative, size in iter_files(local_dir, self._record_failure)
+        )
+        small_workers = max(1, min(self.SMALL_FILE_WORKERS, self.client.MAX_POOL_CONNECTIONS))
+        threshold = self.client.TRANSFER_MANAGER_THRESHOLD
+        return self._run(
+            files,
+            [(small_workers, self._upload_small), (self.LARGE_FILE_WORKERS, self._upload_large)],
+            lambda size: 0 if size <= threshold else 1
+        )
+
+    def _upload_small(self, path: str, size: int, object_name: str) -> None:
+        """一次请求上传小文件，暂时性错误重试"""
+        def attempt():
+            with bind_token(self.token):
+                self.client._throttle('upload', size)
+                return self.client._upload_file(path, object_name, None)
+
+        self._retry(attempt, f"upload of {path}")
+        self._add_progress(size)
+
+    def _upload_large(self, path: str, size: int, object_name: str) -> None:
+        """大文件分片上传，按分片计入总进度"""
+        progress = FileProgress(self)
+        try:
+            self.manager.upload_file(self.client, path, object_name, progress, token=self.token)
+        except Exception:
+            progress.rollback()
+            raise
+        # 关闭分片上传时没有分片进度，完成后补齐
+        progress.settle(size)
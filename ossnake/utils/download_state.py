@@ -0,0 +1,119 @@
+import os
+import json
+import base64
+import logging
+import threading
+from typing import List, Optional
+
+
+class DownloadState:
+    """分段下载的完成位图
+
+    下载数据写入预分配的 <name>.ossnake-part 文件，旁边的 <name>.ossnake-part.state
+    记录对象 ETag、大小、分段大小和已完成分段的位图。中断后再次下载时，
+    只要 ETag 和大小未变就只获取缺失的分段；全部完成后原子重命名为目标文件。
+    """
+
+    VERSION = 1
+    PART_SUFFIX = '.ossnake-part'
+    STATE_SUFFIX = '.ossnake-part.state'
+
+    def __init__(self, local_file: str, etag: Optional[str], size: int, chunk_size: int):
+        self.logger = logging.getLogger(__name__)
+        self.local_file = local_file
+        self.part_file = local_file + self.PART_SUFFIX
+        self.state_file = local_file + self.STATE_SUFFIX
+        self.etag = etag or None
+        self.size = size
+        self.chunk_size = chunk_size
+        self.total = (size + chunk_size - 1) // chunk_size
+        self.bitmap = bytearray((self.total + 7) // 8)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, local_file: str, etag: Optional[str], size: int, chunk_size: int) -> 'DownloadState':
+        """读取已有状态，对象已变化或状态无效时从头开始
+
+        没有 ETag 时无法判断对象是否变化，不做续传。
+        """
+        state = cls(local_file, etag, size, chunk_size)
+        if state.etag and state._load():
+            state.logger.info(
+                f"Resuming download of {local_file} "
+                f"({state.completed_count()}/{state.total} ranges already downloaded)"
+            )
+        else:
+            state.discard()
+        return state
+
+    def _load(self) -> bool:
+        """读取状态文件，与当前对象一致时返回 True"""
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+            bitmap = bytearray(base64.b64decode(saved['bitmap']))
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+
+        if (
+            saved.get('version') != self.VERSION
+            or saved.get('etag') != self.etag
+            or saved.get('size') != self.size
+            or saved.get('chunk_size') != self.chunk_size
+            or len(bitmap) != len(self.bitmap)
+            or not os.path.exists(self.part_file)
+            or os.path.getsize(self.part_file) != self.size
+        ):
+            return False
+        self.bitmap = bitmap
+        return True
+
+    def is_done(self, index: int) -> bool:
+        """分段是否已完成"""
+        return bool(self.bitmap[index // 8] & (1 << (index % 8)))
+
+    def missing(self) -> List[int]:
+        """未完成的分段序号"""
+        return [i for i in range(self.total) if not self.is_done(i)]
+
+    def completed_count(self) -> int:
+        return self.total - len(self.missing())
+
+    def mark_done(self, index: int) -> None:
+        """标记分段完成并保存（调用前应确保数据已落盘）"""
+        with self._lock:
+            self.bitmap[index // 8] |= 1 << (index % 8)
+            self._save()
+
+    def _save(self) -> None:
+        """原子写入状态文件"""
+        tmp_file = self.state_file + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': self.VERSION,
+                'etag': self.etag,
+                'size': self.size,
+                'chunk_size': self.chunk_size,
+                'bitmap': base64.b64encode(bytes(self.bitmap)).decode('ascii')
+            }, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.state_file)
+
+    def finish(self) -> None:
+        """下载完成：重命名为目标文件并删除状态"""
+        os.replace(self.part_file, self.local_file)
+        self._remove(self.state_file)
+
+    def discard(self) -> None:
+        """丢弃未完成的下载"""
+        self._remove(self.part_file)
+        self._remove(self.state_file)
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self.logger.warning(f"Failed to remove {path}: {e}")
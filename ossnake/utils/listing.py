@@ -0,0 +1,310 @@
+import math
+from array import array
+from collections.abc import Mapping
+from datetime import datetime, timezone
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Union
+
+FOLDER = 1  # _types 列中文件夹的取值，文件为 0
+
+_FILE_KEYS = ('name', 'size', 'last_modified', 'type', 'etag')
+_FOLDER_KEYS = ('name', 'size', 'last_modified', 'type', 'display_name')
+
+
+def _timestamp(value) -> float:
+    """last_modified（datetime、时间戳或 ISO 格式字符串）转为 UTC 时间戳，未知时为 NaN"""
+    if value is None:
+        return math.nan
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return _timestamp(datetime.fromisoformat(str(value)))
+    except ValueError:
+        return math.nan
+
+
+class ListingEntry(Mapping):
+    """Listing 中一个条目的只读视图，可像列举结果的字典一样使用（obj['name']、obj.get('size')、dict(obj)）"""
+
+    __slots__ = ('_listing', '_index')
+
+    def __init__(self, listing: 'Listing', index: int):
+        self._listing = listing
+        self._index = index
+
+    def __getitem__(self, key: str):
+        listing, index = self._listing, self._index
+        if key == 'name':
+            return listing.name(index)
+        if key == 'size':
+            return listing._sizes[index]
+        if key == 'type':
+            return 'folder' if listing._types[index] == FOLDER else 'file'
+        if key == 'last_modified':
+            return listing.last_modified(index)
+        if key == 'etag' and listing._types[index] != FOLDER:
+            return listing.etag(index)
+        if key == 'display_name' and listing._types[index] == FOLDER:
+            return listing._relative(index).decode('utf-8', 'surrogatepass').rstrip('/')
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_FOLDER_KEYS if self._listing._types[self._index] == FOLDER else _FILE_KEYS)
+
+    def __len__(self) -> int:
+        return 5
+
+    def __repr__(self) -> str:
+        return f"ListingEntry({dict(self)!r})"
+
+
+class Listing:
+    """列举结果的列式存储，代替每个对象一个字典
+
+    - 对象名以 UTF-8 保存在一个连续缓冲区中，偏移量放在 array 列里；所有名称共同的
+      前缀（列举的 prefix）只保存一次；
+    - 大小、修改时间（UTC 时间戳）、类型各为一个 array 列，ETag 同样以偏移量缓冲区保存；
+    - 每个条目约为 名称长度 + 70 字节，而字典表示需要数百字节；
+    - 迭代和下标返回 ListingEntry 视图，与原来的字典用法兼容（last_modified 统一为
+      UTC datetime，未知时为 None）；
+    - filter / sort 直接在列上计算，返回新的 Listing，不为每个对象创建视图。
+    """
+
+    __slots__ = ('prefix', '_prefix_bytes', '_names', '_name_offsets', '_sizes', '_mtimes', '_types',
+                 '_etags', '_etag_offsets')
+
+    def __init__(self, objects: Iterable = (), prefix: str = ''):
+        """
+        Args:
+            objects: 列举结果的字典（或 ListingEntry），包含 name，可选 size、last_modified、type、etag
+            prefix: 名称共同的前缀，加入不以它开头的名称时自动缩短
+        """
+        self.prefix = prefix
+        self._prefix_bytes = prefix.encode('utf-8', 'surrogatepass')
+        self._names = bytearray()
+        self._name_offsets = array('Q', [0])
+        self._sizes = array('q')
+        self._mtimes = array('d')
+        self._types = bytearray()
+        self._etags = bytearray()
+        self._etag_offsets = array('Q', [0])
+        self.extend(objects)
+
+    @classmethod
+    def from_pages(cls, pages: Iterable[Iterable], prefix: str = '') -> 'Listing':
+        """由 iter_pages 的结果构建，每页加入后即可释放该页的字典"""
+        listing = cls(prefix=prefix)
+        for page in pages:
+            listing.extend(page)
+        return listing
+
+    def append(self, obj) -> None:
+        name = obj['name']
+        if not name.startswith(self.prefix):
+            self._rebase(name)
+        relative = name.encode('utf-8', 'surrogatepass')[len(self._prefix_bytes):]
+        self._names += relative
+        self._name_offsets.append(len(self._names))
+        self._sizes.append(int(obj.get('size') or 0))
+        self._mtimes.append(_timestamp(obj.get('last_modified')))
+        self._types.append(FOLDER if obj.get('type') in ('folder', 'directory') else 0)
+        self._etags += (obj.get('etag') or '').strip('"').encode('utf-8')
+        self._etag_offsets.append(len(self._etags))
+
+    def extend(self, objects: Iterable) -> None:
+        for obj in objects:
+            self.append(obj)
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+    def __bool__(self) -> bool:
+        return len(self._sizes) > 0
+
+    def __iter__(self) -> Iterator[ListingEntry]:
+        return (ListingEntry(self, index) for index in range(len(self)))
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[ListingEntry, 'Listing']:
+        if isinstance(index, slice):
+            return self.take(range(len(self))[index])
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Listing index out of range")
+        return ListingEntry(self, index)
+
+    def __repr__(self) -> str:
+        return f"<Listing prefix={self.prefix!r} entries={len(self)}>"
+
+    # 列访问
+    def name(self, index: int) -> str:
+        return self.prefix + self._relative(index).decode('utf-8', 'surrogatepass')
+
+    def names(self) -> Iterator[str]:
+        for index in range(len(self)):
+            yield self.name(index)
+
+    def last_modified(self, index: int) -> Optional[datetime]:
+        value = self._mtimes[index]
+        return None if math.isnan(value) else datetime.fromtimestamp(value, timezone.utc)
+
+    def etag(self, index: int) -> Optional[str]:
+        start, end = self._etag_offsets[index], self._etag_offsets[index + 1]
+        return self._etags[start:end].decode('utf-8') or None
+
+    def total_size(self) -> int:
+        return sum(self._sizes)
+
+    def take(self, indices: Iterable[int]) -> 'Listing':
+        """按下标取出条目（保持给定顺序），返回新的 Listing"""
+        result = Listing(prefix=self.prefix)
+        names, offsets = self._names, self._name_offsets
+        etags, etag_offsets = self._etags, self._etag_offsets
+        for index in indices:
+            result._names += names[offsets[index]:offsets[index + 1]]
+            result._name_offsets.append(len(result._names))
+            result._etags += etags[etag_offsets[index]:etag_offsets[index + 1]]
+            result._etag_offsets.append(len(result._etags))
+            result._sizes.append(self._sizes[index])
+            result._mtimes.append(self._mtimes[index])
+            result._types.append(self._types[index])
+        return result
+
+    def filter(self, contains: Optional[str] = None, prefix: Optional[str] = None, suffix: Optional[str] = None,
+               type: Optional[str] = None, min_size: Optional[int] = None, max_size: Optional[int] = None,
+               modified_after: Optional[datetime] = None, modified_before: Optional[datetime] = None,
+               predicate: Optional[Callable[[ListingEntry], bool]] = None) -> 'Listing':
+        """按条件筛选（条件同时满足），返回新的 Listing
+        Args:
+            contains: 名称包含的子串（在整个名称缓冲区上查找，不逐个解码名称）
+            prefix, suffix: 名称的前缀、后缀
+            type: 'file' 或 'folder'
+            min_size, max_size: 大小范围（字节，含边界）
+            modified_after, modified_before: 修改时间范围（不含边界，修改时间未知的条目不满足）
+            predicate: 其他条件，参数为 ListingEntry
+        """
+        indices: Sequence[int] = range(len(self))
+        if type is not None:
+            wanted = FOLDER if type in ('folder', 'directory') else 0
+            types = self._types
+            indices = [i for i in indices if types[i] == wanted]
+        if min_size is not None or max_size is not None:
+            low = -1 if min_size is None else min_size
+            high = math.inf if max_size is None else max_size
+            sizes = self._sizes
+            indices = [i for i in indices if low <= sizes[i] <= high]
+        if modified_after is not None or modified_before is not None:
+            after = -math.inf if modified_after is None else _timestamp(modified_after)
+            before = math.inf if modified_before is None else _timestamp(modified_before)
+            mtimes = self._mtimes
+            indices = [i for i in indices if after < mtimes[i] < before]
+        if prefix is not None:
+            indices = self._with_prefix(indices, prefix)
+        if suffix:
+            tail = suffix.encode('utf-8', 'surrogatepass')
+            indices = [i for i in indices if self._full_endswith(i, tail)]
+        if contains:
+            matches = self._containing(contains)
+            indices = [i for i in indices if i in matches]
+        if predicate is not None:
+            indices = [i for i in indices if predicate(ListingEntry(self, i))]
+        return self.take(indices)
+
+    def sort(self, by: str = 'name', reverse: bool = False, folders_first: bool = False,
+             ignore_case: bool = False) -> 'Listing':
+        """排序，返回新的 Listing
+        Args:
+            by: 'name'、'size' 或 'last_modified'（修改时间未知的排在最前）
+            reverse: 降序
+            folders_first: 文件夹排在文件之前（不受 reverse 影响）
+            ignore_case: 按名称排序时忽略大小写
+        """
+        if by == 'name':
+            names, offsets = bytes(self._names), self._name_offsets
+            if ignore_case:
+                key = lambda i: names[offsets[i]:offsets[i + 1]].decode('utf-8', 'surrogatepass').lower()
+            else:
+                # UTF-8 字节序与码点顺序一致，不需要解码
+                key = lambda i: names[offsets[i]:offsets[i + 1]]
+        elif by == 'size':
+            key = self._sizes.__getitem__
+        elif by == 'last_modified':
+            mtimes = self._mtimes
+            key = lambda i: -math.inf if math.isnan(mtimes[i]) else mtimes[i]
+        else:
+            raise ValueError(f"Unsupported sort key: {by}")
+        order = sorted(range(len(self)), key=key, reverse=reverse)
+        if folders_first:
+            types = self._types
+            order = [i for i in order if types[i] == FOLDER] + [i for i in order if types[i] != FOLDER]
+        return self.take(order)
+
+    def to_dicts(self) -> List[dict]:
+        return [dict(entry) for entry in self]
+
+    def _relative(self, index: int) -> bytes:
+        return bytes(self._names[self._name_offsets[index]:self._name_offsets[index + 1]])
+
+    def _full_endswith(self, index: int, tail: bytes) -> bool:
+        relative = self._relative(index)
+        if len(tail) <= len(relative):
+            return relative.endswith(tail)
+        return (self._prefix_bytes + relative).endswith(tail)
+
+    def _with_prefix(self, indices: Sequence[int], prefix: str) -> List[int]:
+        if self.prefix.startswith(prefix):
+            return list(indices)
+        if not prefix.startswith(self.prefix):
+            return []
+        head = prefix.encode('utf-8', 'surrogatepass')[len(self._prefix_bytes):]
+        names, offsets, size = self._names, self._name_offsets, len(head)
+        return [i for i in indices
+                if offsets[i + 1] - offsets[i] >= size and names[offsets[i]:offsets[i] + size] == head]
+
+    def _containing(self, text: str) -> set:
+        """名称包含 text 的条目下标：在名称缓冲区上用 find 定位，再按偏移量映射到条目"""
+        from bisect import bisect_right
+
+        needle = text.encode('utf-8', 'surrogatepass')
+        if needle in self._prefix_bytes:
+            return set(range(len(self)))
+        names, offsets = self._names, self._name_offsets
+        found = set()
+        position = names.find(needle)
+        while position >= 0:
+            index = bisect_right(offsets, position) - 1
+            end = offsets[index + 1]
+            if position + len(needle) <= end:
+                found.add(index)
+                position = names.find(needle, end)  # 同一名称只记一次
+            else:
+                position = names.find(needle, position + 1)
+        # 跨越共同前缀和名称其余部分的匹配
+        for split in range(1, min(len(needle), len(self._prefix_bytes) + 1)):
+            if self._prefix_bytes.endswith(needle[:split]):
+                rest = needle[split:]
+                found.update(i for i in range(len(self))
+                             if names[offsets[i]:offsets[i] + len(rest)] == rest
+                             and offsets[i + 1] - offsets[i] >= len(rest))
+        return found
+
+    def _rebase(self, name: str) -> None:
+        """加入不以当前前缀开头的名称前，把前缀缩短为两者的公共部分，已有名称补回去掉的部分"""
+        common = 0
+        while common < min(len(self.prefix), len(name)) and self.prefix[common] == name[common]:
+            common += 1
+        prefix = self.prefix[:common]
+        dropped = self.prefix[common:].encode('utf-8', 'surrogatepass')
+        names = bytearray()
+        offsets = array('Q', [0])
+        for index in range(len(self)):
+            names += dropped
+            names += self._names[self._name_offsets[index]:self._name_offsets[index + 1]]
+            offsets.append(len(names))
+        self.prefix = prefix
+        self._prefix_bytes = prefix.encode('utf-8', 'surrogatepass')
+        self._names = names
+        self._name_offsets = offsets
@@ -0,0 +1,97 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+
+class MetadataCache:
+    """客户端的对象元数据缓存（HEAD 结果），条目在 TTL 秒后过期
+
+    - 正条目保存 get_object_info 的结果，object_exists / get_object_size 也由它回答；
+    - 负条目记录对象不存在，过期时间较短（NEGATIVE_TTL）；
+    - 列举结果中的文件（带 size 和 etag）自动写入，列举过的对象不再需要 HEAD；
+    - 客户端的修改操作（见 BaseOSSClient.MUTATING_METHODS）结束后失效对应条目；
+      失效时递增版本号，失效之前发出、之后才返回的 HEAD 结果不会写回缓存。
+    最多保留 MAX_ENTRIES 个条目，超出时淘汰最久未使用的。
+    """
+
+    TTL = 30.0  # 秒
+    NEGATIVE_TTL = 5.0  # 秒
+    MAX_ENTRIES = 100000
+
+    def __init__(self, ttl: Optional[float] = None, negative_ttl: Optional[float] = None):
+        self.ttl = self.TTL if ttl is None else ttl
+        self.negative_ttl = self.NEGATIVE_TTL if negative_ttl is None else negative_ttl
+        self._entries: 'OrderedDict[str, Tuple[float, Optional[Dict]]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.version = 0  # 每次失效递增
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, object_name: str) -> Tuple[bool, Optional[Dict]]:
+        """返回 (是否命中, 对象信息)；命中负条目时对象信息为 None"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(object_name)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[object_name]
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(object_name)
+            self.hits += 1
+            return True, entry[1]
+
+    def put(self, object_name: str, info: Dict, version: Optional[int] = None) -> None:
+        """记录对象信息；version 为发出请求前读取的版本号，期间有失效时丢弃"""
+        self._store(object_name, dict(info), self.ttl, version)
+
+    def put_missing(self, object_name: str, version: Optional[int] = None) -> None:
+        """记录对象不存在"""
+        self._store(object_name, None, self.negative_ttl, version)
+
+    def seed(self, objects: Iterable[Dict], version: Optional[int] = None) -> None:
+        """写入列举结果中的文件（列举结果没有内容类型，type 为空）"""
+        expires = time.monotonic() + self.ttl
+        with self._lock:
+            if (version is not None and version != self.version) or self.ttl <= 0:
+                return
+            for obj in objects:
+                if obj.get('type') == 'folder' or obj.get('size') is None or not obj.get('etag'):
+                    continue
+                self._entries[obj['name']] = (expires, {
+                    'size': int(obj['size']),
+                    'type': '',
+                    'last_modified': obj.get('last_modified'),
+                    'etag': obj['etag'].strip('"')
+                })
+                self._entries.move_to_end(obj['name'])
+            self._trim()
+
+    def invalidate(self, object_name: str) -> None:
+        with self._lock:
+            self._entries.pop(object_name, None)
+            self.version += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.version += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _store(self, object_name: str, info: Optional[Dict], ttl: float, version: Optional[int]) -> None:
+        with self._lock:
+            if version is not None and version != self.version:
+                return  # 请求期间对象可能被修改
+            if ttl <= 0:
+                return
+            self._entries[object_name] = (time.monotonic() + ttl, info)
+            self._entries.move_to_end(object_name)
+            self._trim()
+
+    def _trim(self) -> None:
+        """调用方持有 _lock"""
+        while len(self._entries) > self.MAX_ENTRIES:
+            self._entries.popitem(last=False)
@@ -0,0 +1,83 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_EXCEPTION, wait
+from typing import Optional
+
+from ossnake.driver.exceptions import TransferCancelledError
+from ossnake.utils.part_planner import plan_part_size_for
+from ossnake.utils.transfer_token import TransferToken, bind_token, current_token
+
+
+class MultipartCopier:
+    """分片服务端复制：超过 client.MAX_COPY_SIZE 的对象按字节范围拆成分片，
+    并发调用 client.upload_part_copy（UploadPartCopy）在服务端复制，数据不经过本机。
+
+    每个分片带 If-Match（源对象 ETag），复制过程中源对象被修改时失败；
+    分片暂时性错误单独重试，最终失败或取消时取消分片上传。
+    """
+
+    WORKERS = 8  # 并发复制的分片数
+    PART_SIZE = 512 * 1024 * 1024  # 首选分片大小，服务端复制不受本机带宽影响，分片取大一些
+    MAX_RETRIES = 3
+    RETRY_BASE_DELAY = 0.5
+
+    def __init__(self, client: 'BaseOSSClient', token: Optional[TransferToken] = None):
+        self.client = client
+        self.token = token or current_token() or TransferToken()
+        self.logger = logging.getLogger(__name__)
+
+    def copy(self, source_key: str, target_key: str, size: int, etag: Optional[str] = None) -> None:
+        """把 source_key 分片复制到 target_key
+        Args:
+            source_key: 源对象
+            target_key: 目标对象
+            size: 源对象大小
+            etag: 源对象 ETag，提供时每个分片都校验源对象未被修改
+        """
+        workers = max(1, min(self.WORKERS, self.client.MAX_POOL_CONNECTIONS))
+        part_size = plan_part_size_for(self.client, size, self.PART_SIZE, workers)
+        ranges = [
+            (number, start, min(start + part_size, size) - 1)
+            for number, start in enumerate(range(0, size, part_size), start=1)
+        ]
+        self.token.check()
+        upload = self.client.init_multipart_upload(target_key)
+        upload.part_size = part_size
+        upload.total_parts = len(ranges)
+        upload.total_size = size
+        lock = threading.Lock()
+        self.logger.info(f"Multipart copy {source_key} -> {target_key}: {len(ranges)} parts of {part_size} bytes")
+
+        def copy_part(number: int, start: int, end: int) -> None:
+            from ossnake.utils.retry_policy import retry_call, endpoint_retry_budget
+
+            self.token.check()
+            with bind_token(self.token):
+                part_etag = retry_call(
+                    lambda: self.client.upload_part_copy(upload, number, source_key, start, end, etag=etag),
+                    max_retries=self.MAX_RETRIES,
+                    base_delay=self.RETRY_BASE_DELAY,
+                    budgets=(endpoint_retry_budget(self.client.config.endpoint),),
+                    logger=self.logger,
+                    description=f"copy of part {number} of {source_key}"
+                )
+            with lock:
+                upload.add_completed_part(number, part_etag, end - start + 1)
+
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(copy_part, *part) for part in ranges]
+                done, pending = wait(futures, return_when=FIRST_EXCEPTION)
+                for future in pending:
+                    future.cancel()
+                for future in done:
+                    future.result()
+            if self.token.cancelled:
+                raise TransferCancelledError("Transfer cancelled")
+            self.client.complete_multipart_upload(upload)
+        except BaseException:
+            try:
+                self.client.abort_multipart_upload(upload)
+            except Exception as e:
+                self.logger.warning(f"Failed to abort multipart copy of {target_key}: {e}")
+            raise
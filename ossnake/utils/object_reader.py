@@ -0,0 +1,182 @@
+import io
+import logging
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from ossnake.utils.transfer_token import TransferToken, bind_token, current_token
+
+
+class ObjectReader(io.RawIOBase):
+    """按 HTTP Range 随机读取对象的只读文件对象（client.open(key, 'rb') 返回的底层流）
+
+    - 对象按 BLOCK_SIZE 分块，读取时只请求缺失的块，读过的块保存在最多 CACHE_BLOCKS 个的
+      LRU 中，反复读取文件头、文件尾或同一片段不会重复请求；
+    - 顺序读取时预读窗口每次缺块翻倍（最大 MAX_READ_AHEAD），一次 Range 请求取回多个块，
+      大文件顺序读取的请求数随读取量对数增长；seek 到其他位置后窗口恢复为一个块；
+    - 打开时记录对象的 ETag，之后的每次 Range 请求都带 If-Match，读取过程中对象被
+      覆盖时抛出 ObjectChangedError，而不是拼出新旧混合的数据。
+    """
+
+    BLOCK_SIZE = 1024 * 1024  # 缓存块大小
+    MAX_READ_AHEAD = 16 * 1024 * 1024  # 顺序读取时单次请求的最大字节数
+    CACHE_BLOCKS = 32  # LRU 中保留的块数
+    MAX_RETRIES = 3
+    RETRY_BASE_DELAY = 0.5
+
+    def __init__(self, client: 'BaseOSSClient', object_name: str, size: Optional[int] = None,
+                 etag: Optional[str] = None, block_size: Optional[int] = None,
+                 cache_blocks: Optional[int] = None, token: Optional[TransferToken] = None):
+        """
+        Args:
+            client: OSS客户端
+            object_name: 对象名称
+            size: 对象大小，与 etag 都已知（如来自列举结果）时不再 HEAD
+            etag: 对象 ETag
+            block_size: 缓存块大小，默认 BLOCK_SIZE
+            cache_blocks: LRU 中保留的块数，默认 CACHE_BLOCKS
+            token: 传输令牌，取消后读取抛出 TransferCancelledError
+        """
+        super().__init__()
+        self.logger = logging.getLogger(__name__)
+        self.client = client
+        self.name = object_name
+        self.token = token or current_token()
+        if size is None:
+            info = client.get_object_info(object_name)
+            size = int(info['size'])
+            etag = etag or info.get('etag')
+        self.size = size
+        self.etag = etag
+        self.block_size = block_size or self.BLOCK_SIZE
+        self.cache_blocks = max(1, cache_blocks or self.CACHE_BLOCKS)
+        self._blocks: 'OrderedDict[int, memoryview]' = OrderedDict()
+        self._pos = 0
+        self._window = 1  # 预读窗口（块数）
+        self._next_block = -1  # 顺序读取时下一个要缺的块
+        self.requests = 0  # 已发出的 Range 请求数
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        self._check_closed()
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._pos + offset
+        elif whence == io.SEEK_END:
+            position = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if position < 0:
+            raise ValueError(f"Negative seek position: {position}")
+        self._pos = position
+        return position
+
+    def tell(self) -> int:
+        self._check_closed()
+        return self._pos
+
+    def readinto(self, buffer) -> int:
+        self._check_closed()
+        out = memoryview(buffer).cast('B')
+        wanted = min(len(out), self.size - self._pos)
+        if wanted <= 0:
+            return 0
+        filled = 0
+        while filled < wanted:
+            index, offset = divmod(self._pos, self.block_size)
+            block = self._block(index)
+            n = min(len(block) - offset, wanted - filled)
+            out[filled:filled + n] = block[offset:offset + n]
+            filled += n
+            self._pos += n
+        return filled
+
+    def readall(self) -> bytes:
+        """读取到对象末尾"""
+        self._check_closed()
+        remaining = max(0, self.size - self._pos)
+        buffer = bytearray(remaining)
+        n = self.readinto(buffer)
+        return bytes(buffer[:n])
+
+    def close(self) -> None:
+        self._blocks.clear()
+        super().close()
+
+    def _check_closed(self) -> None:
+        if self.closed:
+            raise ValueError("I/O operation on closed object reader")
+
+    def _block(self, index: int) -> memoryview:
+        """返回第 index 块，缺失时连同预读窗口内的后续块一次取回"""
+        block = self._blocks.get(index)
+        if block is not None:
+            self._blocks.move_to_end(index)
+            return block
+        # 顺序读到上次取回范围之后时扩大预读窗口，随机访问时恢复为一个块
+        if index == self._next_block:
+            self._window = min(self._window * 2, max(1, self.MAX_READ_AHEAD // self.block_size))
+        else:
+            self._window = 1
+        last = min(index + min(self._window, self.cache_blocks), self._block_count()) - 1
+        while last > index and last in self._blocks:
+            last -= 1  # 已缓存的块不再请求
+        for number, data in self._fetch(index, last):
+            self._blocks[number] = data
+            self._blocks.move_to_end(number)
+        self._next_block = last + 1
+        while len(self._blocks) > self.cache_blocks:
+            self._blocks.popitem(last=False)
+        return self._blocks[index]
+
+    def _block_count(self) -> int:
+        return (self.size + self.block_size - 1) // self.block_size
+
+    def _fetch(self, first: int, last: int) -> List[Tuple[int, memoryview]]:
+        """一次 Range 请求取回第 first 到 last 块，按块切分（切片共享同一份数据，不复制）"""
+        from ossnake.utils.retry_policy import retry_call, endpoint_retry_budget
+
+        start = first * self.block_size
+        end = min((last + 1) * self.block_size, self.size) - 1
+        if self.token:
+            self.token.check()
+        with bind_token(self.token):
+            data = retry_call(
+                lambda: self.client.get_object_range(self.name, start, end, etag=self.etag),
+                max_retries=self.MAX_RETRIES,
+                base_delay=self.RETRY_BASE_DELAY,
+                budgets=(endpoint_retry_budget(self.client.config.endpoint),),
+                logger=self.logger,
+                description=f"range {start}-{end} of {self.name}"
+            )
+        self.requests += 1
+        if len(data) != end - start + 1:
+            raise IOError(f"Short read of {self.name}: expected {end - start + 1} bytes, got {len(data)}")
+        view = memoryview(data)
+        return [
+            (number, view[offset:offset + self.block_size])
+            for number, offset in zip(range(first, last + 1), range(0, len(data), self.block_size))
+        ]
+
+
+def open_object(client: 'BaseOSSClient', object_name: str, mode: str = 'rb', buffering: int = -1,
+                encoding: Optional[str] = None, errors: Optional[str] = None, newline: Optional[str] = None,
+                **kwargs):
+    """以文件对象方式打开对象，见 BaseOSSClient.open"""
+    if set(mode) - set('rbt') or 'r' not in mode or ('b' in mode and 't' in mode):
+        raise ValueError(f"Unsupported mode: {mode!r} (objects can only be opened for reading)")
+    raw = ObjectReader(client, object_name, **kwargs)
+    if buffering == 0:
+        if 'b' not in mode:
+            raise ValueError("Can't have unbuffered text I/O")
+        return raw
+    # 底层已按块缓存，缓冲区只用来合并小读取（readline、逐字节解析）
+    buffered = io.BufferedReader(raw, buffer_size=buffering if buffering > 1 else io.DEFAULT_BUFFER_SIZE)
+    if 'b' in mode:
+        return buffered
+    return io.TextIOWrapper(buffered, encoding=encoding, errors=errors, newline=newline)
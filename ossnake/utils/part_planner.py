@@ -0,0 +1,70 @@
+import math
+
+MB = 1024 * 1024
+
+# 与 S3 / MinIO 的限制一致，各驱动可通过类属性覆盖
+DEFAULT_MIN_PART_SIZE = 5 * MB
+DEFAULT_MAX_PART_SIZE = 5 * 1024 * MB
+DEFAULT_MAX_PARTS = 10000
+
+PARTS_PER_WORKER = 256  # 每个并发线程希望承担的最大分片数，超过后增大分片减少请求数
+MAX_AUTO_PART_SIZE = 64 * MB  # 为减少请求数自动放大分片的上限（受分片数限制时除外）
+
+
+def plan_part_size(
+    file_size: int,
+    preferred: int = DEFAULT_MIN_PART_SIZE,
+    workers: int = 4,
+    min_part_size: int = DEFAULT_MIN_PART_SIZE,
+    max_part_size: int = DEFAULT_MAX_PART_SIZE,
+    max_parts: int = DEFAULT_MAX_PARTS
+) -> int:
+    """计算分片大小
+
+    1. 以配置的分片大小为起点，限制在服务商允许的 [min_part_size, max_part_size] 内；
+    2. 分片数超过 workers * PARTS_PER_WORKER 时增大分片（不超过 MAX_AUTO_PART_SIZE），
+       减少大文件的请求数，同时保证每个线程仍有足够的分片可传；
+    3. 最后保证分片数不超过 max_parts，必要时突破 MAX_AUTO_PART_SIZE。
+    Args:
+        file_size: 文件大小
+        preferred: 配置的分片大小
+        workers: 并发线程数
+    Returns:
+        int: 分片大小（字节）
+    Raises:
+        ValueError: 文件超过 max_part_size * max_parts
+    """
+    part_size = min(max(preferred, min_part_size), max_part_size)
+    if file_size <= 0:
+        return part_size
+
+    target_parts = max(1, workers) * PARTS_PER_WORKER
+    if math.ceil(file_size / part_size) > target_parts:
+        part_size = max(part_size, min(_round_up(math.ceil(file_size / target_parts)), MAX_AUTO_PART_SIZE))
+
+    if math.ceil(file_size / part_size) > max_parts:
+        part_size = _round_up(math.ceil(file_size / max_parts))
+
+    if part_size > max_part_size:
+        raise ValueError(
+            f"File of {file_size} bytes exceeds the multipart limit "
+            f"({max_parts} parts of at most {max_part_size} bytes)"
+        )
+    return part_size
+
+
+def plan_part_size_for(client, file_size: int, preferred: int, workers: int) -> int:
+    """按客户端（驱动）声明的分片限制计算分片大小"""
+    return plan_part_size(
+        file_size,
+        preferred=preferred,
+        workers=workers,
+        min_part_size=getattr(client, 'MIN_PART_SIZE', DEFAULT_MIN_PART_SIZE),
+        max_part_size=getattr(client, 'MAX_PART_SIZE', DEFAULT_MAX_PART_SIZE),
+        max_parts=getattr(client, 'MAX_PARTS', DEFAULT_MAX_PARTS)
+    )
+
+
+def _round_up(size: int, unit: int = MB) -> int:
+    """向上取整到 unit 的整数倍"""
+    return ((size + unit - 1) // unit) * unit
@@ -0,0 +1,214 @@
+import io
+import os
+import mmap
+import base64
+import hashlib
+import logging
+from typing import Callable, Optional
+
+from ossnake.driver.exceptions import LocalFileChangedError
+
+
+class PartReader(io.RawIOBase):
+    """分片数据的只读读取器
+
+    数据来自 memoryview（通常是内存映射文件的切片），读取时按需切片，
+    不会为整个分片分配缓冲区。支持 seek/tell 和 len()，SDK 可以据此计算
+    长度、校验和并在重试时回到开头；getbuffer() 返回底层 memoryview，
+    可以直接交给接受缓冲区的 SDK（如 MinIO）。
+    指定 token 时每次读取前检查，传输取消后 SDK 在下一个数据块处中止请求。
+    指定 throttle（见 bandwidth_limiter.throttler）时，SDK 每读取一块就为新读到的字节
+    消费限速令牌，数据边读边发，速率平滑。同一段数据只计费一次：SDK 先读一遍计算
+    校验和、再读一遍发送，或重试时从头重读，都不会重复计费。
+    SDK 读取数据的同时计算 MD5（md5_hex），与服务端返回的分片 ETag 比对，不需要
+    再读一遍分片；重读的部分不会重复计算。
+    """
+
+    def __init__(self, view: memoryview, token=None, throttle: Optional[Callable[[int], None]] = None):
+        super().__init__()
+        self._view = view
+        self._pos = 0
+        self._token = token
+        self._throttle = throttle
+        self._charged = 0  # 已计入限速的字节数
+        self._md5 = hashlib.md5()
+        self._hashed = 0  # 已计入 MD5 的字节数
+
+    def __len__(self) -> int:
+        return self._view.nbytes
+
+    @property
+    def throttled(self) -> bool:
+        """读取时是否按块限速"""
+        return self._throttle is not None
+
+    def _hash(self, start: int, end: int) -> None:
+        """把新读到的 [start, end) 中尚未计入的字节加入 MD5（只能顺序追加）"""
+        if start <= self._hashed < end:
+            self._md5.update(self._view[self._hashed:end])
+            self._hashed = end
+
+    def md5_digest(self) -> bytes:
+        """分片数据的 MD5；SDK 没有读完（如整块发送缓冲区）时补算剩余部分"""
+        self._hash(self._hashed, self._view.nbytes)
+        return self._md5.digest()
+
+    def md5_hex(self) -> str:
+        return self.md5_digest().hex()
+
+    def content_md5(self) -> str:
+        """Content-MD5 请求头的值（base64）"""
+        return base64.b64encode(self.md5_digest()).decode()
+
+    def _charge(self, end: int) -> None:
+        if self._throttle and end > self._charged:
+            self._throttle(end - self._charged)
+            self._charged = end
+
+    def charge(self) -> None:
+        """把尚未计费的字节一次计入限速（SDK 整块发送缓冲区时使用）"""
+        self._charge(self._view.nbytes)
+
+    def getbuffer(self) -> memoryview:
+        return self._view
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._token:
+            self._token.check()
+        n = min(len(buffer), self._view.nbytes - self._pos)
+        if n <= 0:
+            return 0
+        self._charge(self._pos + n)
+        buffer[:n] = self._view[self._pos:self._pos + n]
+        self._hash(self._pos, self._pos + n)
+        self._pos += n
+        return n
+
+    def read(self, size: int = -1) -> bytes:
+        if self._token:
+            self._token.check()
+        if size is None or size < 0:
+            size = self._view.nbytes - self._pos
+        self._charge(min(self._pos + size, self._view.nbytes))
+        data = self._view[self._pos:self._pos + size].tobytes()
+        self._hash(self._pos, self._pos + len(data))
+        self._pos += len(data)
+        return data
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._pos + offset
+        elif whence == io.SEEK_END:
+            position = self._view.nbytes + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if position < 0:
+            raise ValueError(f"Negative seek position: {position}")
+        self._pos = position
+        return position
+
+    def tell(self) -> int:
+        return self._pos
+
+
+class PartSource:
+    """按分片提供本地文件数据
+
+    文件以只读方式内存映射，每个分片是映射的 memoryview 切片，数据由页缓存直接
+    提供，不会逐个分片 read() 出新的 bytes。无法映射时（空文件、部分文件系统）
+    退回到按分片 os.pread。getbuffer() 方式整块发送的 SDK 无法在分片中途取消。
+    上传期间文件大小变化时，下一个分片抛出 LocalFileChangedError（见 _check_size）。用法：
+        with PartSource(local_file, part_size) as source:
+            client.upload_part(upload, 1, source.reader(1))
+    """
+
+    def __init__(self, local_file: str, part_size: int, token=None,
+                 throttle: Optional[Callable[[int], None]] = None):
+        self.logger = logging.getLogger(__name__)
+        self.local_file = local_file
+        self.part_size = part_size
+        self.token = token  # 传输令牌，传给每个读取器
+        self.throttle = throttle  # 限速函数，传给每个读取器
+        self._fd = os.open(local_file, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+        self.size = os.fstat(self._fd).st_size
+        self._mmap: Optional[mmap.mmap] = None
+        self._view: Optional[memoryview] = None
+        if self.size:
+            try:
+                self._mmap = mmap.mmap(self._fd, 0, access=mmap.ACCESS_READ)
+                self._view = memoryview(self._mmap)
+            except (OSError, ValueError) as e:
+                self.logger.debug(f"mmap unavailable for {local_file}, using pread: {e}")
+
+    def __enter__(self) -> 'PartSource':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def part_range(self, part_number: int):
+        """分片在文件中的 (起始位置, 长度)"""
+        start = (part_number - 1) * self.part_size
+        return start, max(0, min(self.part_size, self.size - start))
+
+    def view(self, part_number: int) -> memoryview:
+        """分片数据的 memoryview
+
+        Raises:
+            LocalFileChangedError: 文件大小与开始上传时不同
+        """
+        self._check_size()
+        start, length = self.part_range(part_number)
+        if self._view is not None:
+            return self._view[start:start + length]
+        return memoryview(self._pread(start, length))
+
+    def reader(self, part_number: int) -> PartReader:
+        """分片数据的读取器"""
+        return PartReader(self.view(part_number), self.token, self.throttle)
+
+    def _check_size(self) -> None:
+        """读取映射前确认文件没有被截断或追加
+
+        映射的文件被截断后，访问超出新长度的页会收到 SIGBUS，整个进程退出，
+        因此每个分片开始前检查一次大小。检查与发送之间仍可能被截断，上传期间
+        不应修改文件。
+        """
+        size = os.fstat(self._fd).st_size
+        if size != self.size:
+            raise LocalFileChangedError(
+                f"{self.local_file} changed during upload ({self.size} -> {size} bytes)"
+            )
+
+    def _pread(self, start: int, length: int) -> bytes:
+        if hasattr(os, 'pread'):
+            return os.pread(self._fd, length, start)
+        with open(self.local_file, 'rb') as f:
+            f.seek(start)
+            return f.read(length)
+
+    def close(self) -> None:
+        """释放映射和文件描述符
+
+        SDK 仍持有分片切片（例如异常的 traceback 引用了请求体）时无法立即关闭映射，
+        交给垃圾回收在切片释放后关闭。
+        """
+        if self._mmap is not None:
+            try:
+                self._view.release()
+                self._mmap.close()
+            except BufferError:
+                self.logger.debug(f"Parts of {self.local_file} still referenced, deferring unmap")
+            self._view = None
+            self._mmap = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
@@ -0,0 +1,173 @@
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ossnake.driver.exceptions import DeleteError
+from ossnake.utils.batch_delete import BatchDeleter
+from ossnake.utils.directory_transfer import DirectoryTransfer
+from ossnake.utils.transfer_journal import TransferJournal
+
+
+class PrefixMover(DirectoryTransfer):
+    """前缀移动/复制（重命名文件夹）：边列举边在服务端复制，源对象批量删除
+
+    - 调用线程递归逐页列举源前缀，每个对象立即交给工作线程，大小和 ETag 取自列举结果；
+    - 不超过 client.MAX_COPY_SIZE 的对象由 WORKERS 个线程各自一次 CopyObject 复制，
+      更大的对象由 LARGE_OBJECT_WORKERS 个线程分片复制，数据都不经过本机；
+    - 移动时复制成功的源对象送入 BatchDeleter，按 MAX_DELETE_BATCH 分批并发删除，
+      复制失败的对象保留在源前缀下；
+    - 已复制的对象每 CHECKPOINT_BATCH 个写入一次断点日志，中断后再次移动同一前缀时，
+      ETag 未变的对象不再复制（已移走的对象不会再被列举到）。
+    """
+
+    WORKERS = 32  # 并发复制的对象数（不超过客户端连接池大小）
+    LARGE_OBJECT_WORKERS = 2  # 同时分片复制的大对象数
+    CHECKPOINT_BATCH = 500  # 每复制多少个对象写一次断点日志
+
+    def __init__(self, client: 'BaseOSSClient', token=None, journal: Optional[TransferJournal] = None):
+        super().__init__(client, token=token)
+        self.journal = journal or self.manager.journal
+        self._journal_key: Optional[str] = None
+        self._copied: Dict[str, Optional[str]] = {}
+        self._pending_checkpoint: List[Tuple[str, Optional[str]]] = []
+        self._checkpoint_lock = threading.Lock()
+        self._deletes: Optional[queue.Queue] = None
+        self.skipped = 0
+
+    def move(self, source_prefix: str, target_prefix: str,
+             progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict:
+        """把 source_prefix 下的所有对象移动到 target_prefix 下，保持相对路径"""
+        return self._transfer(source_prefix, target_prefix, progress_callback, delete_source=True)
+
+    def copy(self, source_prefix: str, target_prefix: str,
+             progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict:
+        """把 source_prefix 下的所有对象复制到 target_prefix 下，保持相对路径"""
+        return self._transfer(source_prefix, target_prefix, progress_callback, delete_source=False)
+
+    def _transfer(self, source_prefix: str, target_prefix: str,
+                  progress_callback: Optional[Callable[[int, int], None]], delete_source: bool) -> Dict:
+        """
+        Args:
+            source_prefix: 源前缀，文件夹应以 '/' 结尾
+            target_prefix: 目标前缀
+            progress_callback: progress_callback(transferred, total)，total 为目前已列举到的总字节数
+            delete_source: 复制后是否删除源对象
+        Returns:
+            Dict: {'files': 完成的对象数, 'bytes': 字节数, 'failed': {对象名: 错误},
+                   'skipped': 按断点日志跳过复制的对象数, 'elapsed': 秒}
+        """
+        if not source_prefix:
+            raise ValueError("Source prefix is required")
+        if target_prefix.startswith(source_prefix) or source_prefix.startswith(target_prefix):
+            # 目标在源前缀之内时，复制出的对象会再次被列举到
+            raise ValueError(f"Cannot {'move' if delete_source else 'copy'} {source_prefix} into {target_prefix}")
+        self._progress_callback = progress_callback
+        self._open_checkpoint(source_prefix, target_prefix, delete_source)
+        self.logger.info(f"{'Moving' if delete_source else 'Copying'} {source_prefix} to {target_prefix}")
+
+        delete_result: Dict = {}
+        delete_thread = None
+        if delete_source:
+            self._deletes = queue.Queue()
+
+            def run_deletes():
+                try:
+                    delete_result.update(BatchDeleter(self.client, self.token).delete(iter(self._deletes.get, None)))
+                except Exception as e:
+                    self._record_failure('', e, stop=True)
+
+            delete_thread = threading.Thread(target=run_deletes, daemon=True)
+            delete_thread.start()
+
+        def objects():
+            for obj in self.client.iter_objects(source_prefix, recursive=True):
+                target = target_prefix + obj['name'][len(source_prefix):]
+                yield obj['name'], int(obj.get('size') or 0), target, obj.get('etag')
+
+        workers = max(1, min(self.WORKERS, self.client.MAX_POOL_CONNECTIONS))
+        max_copy_size = self.client.MAX_COPY_SIZE
+        start = time.time()
+        try:
+            result = self._run(
+                objects(),
+                [(workers, self._copy), (self.LARGE_OBJECT_WORKERS, self._copy)],
+                lambda size: 0 if size <= max_copy_size else 1
+            )
+        finally:
+            self._flush_checkpoint()
+            if delete_thread is not None:
+                self._deletes.put(None)
+                delete_thread.join()
+        if self._stop_error is not None:
+            raise self._stop_error  # 删除线程遇到的取消/认证错误
+
+        for name, message in delete_result.get('failed', {}).items():
+            result['failed'][name] = DeleteError(message)
+            result['files'] -= 1
+        if not result['failed']:
+            self.journal.remove(self._journal_key)
+
+        elapsed = time.time() - start
+        result.update(skipped=self.skipped, elapsed=elapsed)
+        self.logger.info(
+            f"Prefix {'move' if delete_source else 'copy'} {source_prefix} -> {target_prefix}: "
+            f"{result['files']} objects ({result['bytes']} bytes) in {elapsed:.1f}s, "
+            f"{result['files'] / max(elapsed, 1e-6):.0f} objects/s, {len(result['failed'])} failed"
+        )
+        return result
+
+    def _copy(self, name: str, size: int, target: str, etag: Optional[str]) -> None:
+        """服务端复制一个对象，移动时把源对象交给批量删除"""
+        if etag and self._copied.get(name) == etag:
+            with self._lock:
+                self.skipped += 1  # 上次中断前已复制
+        else:
+            self._retry(
+                lambda: self.client.copy_object(name, target, size=size, etag=etag, token=self.token),
+                f"copy of {name}"
+            )
+            self._checkpoint(name, etag)
+        if self._deletes is not None:
+            self._deletes.put(name)
+        self._add_progress(size)
+
+    def _open_checkpoint(self, source_prefix: str, target_prefix: str, delete_source: bool) -> None:
+        """读取同一源/目标前缀上次中断留下的断点日志，没有时新建"""
+        config = self.client.config
+        mode = 'move' if delete_source else 'copy'
+        self._journal_key = TransferJournal.make_key(
+            f"{mode}:{config.endpoint}/{config.bucket_name}/{source_prefix}",
+            {'target_prefix': target_prefix}
+        )
+        record = self.journal.load(self._journal_key)
+        if record and record.get('kind') == mode:
+            self._copied = record['copied']
+            self.logger.info(f"Resuming {mode} of {source_prefix}: {len(self._copied)} objects already copied")
+        else:
+            self.journal.create(self._journal_key, kind=mode, bucket=config.bucket_name,
+                                source_prefix=source_prefix, target_prefix=target_prefix)
+            self._copied = {}
+
+    def _checkpoint(self, name: str, etag: Optional[str]) -> None:
+        """记录已复制的对象，攒够 CHECKPOINT_BATCH 个写一次日志"""
+        if not etag:
+            return  # 没有 ETag 无法判断对象是否变化，续传时重新复制
+        with self._checkpoint_lock:
+            self._pending_checkpoint.append((name, etag))
+            if len(self._pending_checkpoint) >= self.CHECKPOINT_BATCH:
+                self._write_checkpoint()
+
+    def _flush_checkpoint(self) -> None:
+        with self._checkpoint_lock:
+            self._write_checkpoint()
+
+    def _write_checkpoint(self) -> None:
+        """调用方持有 _checkpoint_lock"""
+        if not self._pending_checkpoint:
+            return
+        try:
+            self.journal.record_copied(self._journal_key, self._pending_checkpoint)
+        except OSError as e:
+            self.logger.warning(f"Failed to write move checkpoint: {e}")
+        self._pending_checkpoint = []
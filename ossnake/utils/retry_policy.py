@@ -0,0 +1,164 @@
+import time
+import random
+import logging
+import threading
+from collections import deque
+from typing import Callable, Dict, Iterable, Optional
+
+from ossnake.driver.exceptions import (
+    AuthenticationError, BucketNotFoundError, ObjectNotFoundError, ObjectChangedError,
+    TransferCancelledError, LocalFileChangedError
+)
+from ossnake.utils.adaptive_concurrency import AdaptiveConcurrency, record_idle
+
+# 错误分类
+FATAL = 'fatal'  # 不可重试：认证失败、存储空间/对象不存在、参数错误等
+THROTTLED = 'throttled'  # 限流/服务繁忙，退避时间加倍
+RETRYABLE = 'retryable'  # 网络错误、5xx 等暂时性错误
+
+FATAL_EXCEPTIONS = (
+    AuthenticationError, BucketNotFoundError, ObjectNotFoundError, ObjectChangedError,
+    TransferCancelledError, LocalFileChangedError, FileNotFoundError, PermissionError, IsADirectoryError,
+    NotImplementedError, ValueError, TypeError
+)
+
+# 服务端错误码（S3 / MinIO / 阿里云 OSS 通用）
+FATAL_CODES = (
+    'accessdenied', 'invalidaccesskeyid', 'signaturedoesnotmatch', 'nosuchbucket',
+    'nosuchkey', 'nosuchupload', 'invalidbucketname', 'invalidpart', 'invalidpartorder',
+    'entitytoosmall', 'entitytoolarge', 'invalidargument', 'preconditionfailed',
+    'accountproblem', 'invalidobjectname', 'methodnotallowed', 'malformedxml'
+)
+FATAL_STATUSES = (400, 401, 403, 404, 405, 409, 411, 412, 416)
+
+ENDPOINT_RETRY_LIMIT = 100  # 同一服务端点每个时间窗口内允许的重试次数
+ENDPOINT_RETRY_WINDOW = 60.0  # 秒
+
+
+def _error_code_and_status(error: BaseException):
+    """从 boto3 / minio / oss2 的异常中提取错误码和 HTTP 状态码"""
+    code = getattr(error, 'code', None)
+    status = getattr(error, 'status', None)
+    response = getattr(error, 'response', None)
+    if isinstance(response, dict):
+        code = code or response.get('Error', {}).get('Code')
+        status = status or response.get('ResponseMetadata', {}).get('HTTPStatusCode')
+    try:
+        status = int(status) if status is not None else None
+    except (TypeError, ValueError):
+        status = None
+    return (str(code).lower() if code else None), status
+
+
+def classify_error(error: BaseException) -> str:
+    """错误分类，返回 FATAL / THROTTLED / RETRYABLE"""
+    if isinstance(error, FATAL_EXCEPTIONS):
+        return FATAL
+    if AdaptiveConcurrency.is_congestion_error(error):
+        return THROTTLED
+
+    code, status = _error_code_and_status(error)
+    if code in FATAL_CODES or status in FATAL_STATUSES:
+        return FATAL
+    if status == 429:
+        return THROTTLED
+
+    # 驱动会把 SDK 异常包装成带原始信息的 OSSError，按文本再判断一次
+    text = str(error).lower().replace(' ', '')
+    if any(marker in text for marker in FATAL_CODES):
+        return FATAL
+    return RETRYABLE
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 30.0, throttled: bool = False) -> float:
+    """带完全抖动的指数退避：在 [0, min(cap, base * 2^attempt)] 内随机取值
+
+    attempt 从 1 开始；限流错误的退避基数加倍。
+    """
+    if throttled:
+        base *= 2
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class RetryBudget:
+    """重试预算
+
+    window 为空时预算总数固定（用于单个传输）；否则为滑动时间窗口内的
+    次数上限（用于服务端点，避免大量并发传输同时重试）。
+    """
+
+    def __init__(self, limit: int, window: Optional[float] = None):
+        self.limit = limit
+        self.window = window
+        self._spent = deque()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        """消耗一次重试机会，预算用完时返回 False"""
+        with self._lock:
+            now = time.monotonic()
+            if self.window is not None:
+                while self._spent and now - self._spent[0] > self.window:
+                    self._spent.popleft()
+            if len(self._spent) >= self.limit:
+                return False
+            self._spent.append(now)
+            return True
+
+    @property
+    def remaining(self) -> int:
+        with self._lock:
+            return max(0, self.limit - len(self._spent))
+
+
+_endpoint_budgets: Dict[str, RetryBudget] = {}
+_endpoint_lock = threading.Lock()
+
+
+def endpoint_retry_budget(endpoint: str) -> RetryBudget:
+    """获取服务端点共享的重试预算（进程内所有传输共享）"""
+    with _endpoint_lock:
+        budget = _endpoint_budgets.get(endpoint)
+        if budget is None:
+            budget = RetryBudget(ENDPOINT_RETRY_LIMIT, ENDPOINT_RETRY_WINDOW)
+            _endpoint_budgets[endpoint] = budget
+        return budget
+
+
+def retry_call(operation: Callable, max_retries: int = 3, base_delay: float = 0.5,
+               budgets: Iterable['RetryBudget'] = (), on_error: Optional[Callable] = None,
+               logger: Optional[logging.Logger] = None, description: str = 'operation',
+               on_retry: Optional[Callable[[str], None]] = None,
+               on_give_up: Optional[Callable[[Exception], None]] = None):
+    """执行 operation，暂时性错误按带抖动的指数退避重试
+
+    不可重试的错误立即抛出；每次重试消耗 budgets 中所有预算，任一预算用完即停止。
+    on_error 在每次失败时调用（如通知并发控制器）；on_retry(kind) 在每次重试前、
+    on_give_up(error) 在放弃时调用（如记录传输指标）。
+    """
+    attempt = 0
+    while True:
+        try:
+            return operation()
+        except Exception as e:
+            if on_error:
+                on_error(e)
+            kind = classify_error(e)
+            if kind == FATAL or attempt >= max_retries:
+                if on_give_up:
+                    on_give_up(e)
+                raise
+            if not all(budget.try_acquire() for budget in budgets):
+                if logger:
+                    logger.warning(f"Retry budget exhausted, giving up {description}: {e}")
+                if on_give_up:
+                    on_give_up(e)
+                raise
+            attempt += 1
+            if on_retry:
+                on_retry(kind)
+            delay = backoff_delay(attempt, base_delay, throttled=kind == THROTTLED)
+            if logger:
+                logger.warning(f"Retry {attempt}/{max_retries} of {description} in {delay:.2f}s ({kind}): {e}")
+            time.sleep(delay)
+            record_idle(delay)
@@ -23,12 +23,23 @@ class SettingsManager:
         "upload": {
             "multipart_enabled": True,
             "chunk_size": 5,  # MB
-            "workers": 4
+            "workers": 4,  # 初始并发数
+            "adaptive": True,  # 按吞吐和错误自动调整并发数
+            "max_workers": 16,  # 自适应并发上限
+            "verify_checksum": True  # 校验分片 ETag 与本地 MD5；SSE-KMS 加密的存储桶 ETag 不是 MD5，可关闭
         },
         "download": {
             "multipart_enabled": True,
             "chunk_size": 5,  # MB
-            "workers": 4
+            "workers": 4,
+            "adaptive": True,
+            "max_workers": 16
+        },
+        "bandwidth": {
+            "upload_limit": 0,  # KB/s，0 表示不限速
+            "download_limit": 0,  # KB/s
+            # 时间段限速，如 {"start": "22:00", "end": "06:00", "upload": 0, "download": 0}
+            "schedules": []
         },
         "default": {
             "oss_source": "",
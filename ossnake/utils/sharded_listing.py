@@ -0,0 +1,181 @@
+import logging
+import queue
+import string
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, NamedTuple, Optional, Union
+
+from ossnake.utils.transfer_token import TransferToken, current_token
+
+
+class Shard(NamedTuple):
+    """键空间的一段：前缀 prefix 下、大于 start_after 且不大于 end 的键（None 表示不限）"""
+    prefix: str
+    start_after: Optional[str] = None
+    end: Optional[str] = None
+
+
+_DONE = object()
+
+
+class ShardedLister:
+    """并行递归列举：把前缀下的键空间切成多段同时列举，再按字典序合并成一个流
+
+    - 先列举第一页（递归），没有后续页时直接返回，不产生额外请求；
+    - 否则按 '/' 列举第一页之后的顶层条目：全部在一页内且子文件夹不少于两个时，
+      每个子文件夹为一段；
+    - 顶层条目很多或没有子文件夹时，用第一页的键选择切分层级（前缀本身和第一页键的
+      公共前缀），在每个层级上以 数字/字母 为边界用 start_after 切分键空间；
+      边界不要求是存在的键，各段首尾相接，不重不漏；
+    - 各段在线程池中同时列举（共用客户端的连接池），每段最多缓冲 QUEUE_PAGES 页；
+      调用方按顺序读取，前面的段读完时后面的段通常已经列举好。
+    结果与 client.iter_objects(prefix, recursive=True) 相同（包括文件夹标记），
+    总耗时随并发数下降，而不是 请求往返时间 × 页数。
+    """
+
+    WORKERS = 8
+    QUEUE_PAGES = 4  # 每段最多缓冲的页数
+    MIN_SHARDS = 2  # 子文件夹少于该数量时改为按边界切分
+    BOUNDARY_CHARS = string.digits + string.ascii_uppercase + string.ascii_lowercase
+    MAX_RETRIES = 3
+    RETRY_BASE_DELAY = 0.5
+
+    def __init__(self, client: 'BaseOSSClient', workers: Optional[int] = None, page_size: Optional[int] = None,
+                 token: Optional[TransferToken] = None):
+        """
+        Args:
+            client: OSS客户端
+            workers: 同时列举的段数，默认 WORKERS，不超过客户端连接池大小
+            page_size: 每页条目数，默认使用设置中的 list.page_size
+            token: 传输令牌，取消后列举抛出 TransferCancelledError
+        """
+        self.client = client
+        self.workers = max(1, min(workers or self.WORKERS, client.MAX_POOL_CONNECTIONS))
+        self.page_size = client._list_page_size(page_size)
+        self.token = token or current_token()
+        self.logger = logging.getLogger(__name__)
+        self.requests = 0  # 已发出的列举请求数
+        self._lock = threading.Lock()
+
+    def iter_objects(self, prefix: str = '') -> Iterator[Dict]:
+        """按字典序返回前缀下所有层级的对象"""
+        first = self._fetch(prefix, '', None, None)
+        objects = first.get('objects', [])
+        if not first.get('next_token') or not objects:
+            yield from objects
+            return
+
+        plan = self._plan(prefix, objects)
+        self.logger.info(f"Listing '{prefix}' in {sum(isinstance(step, Shard) for step in plan)} shards "
+                         f"with {self.workers} workers")
+        stop = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='list-shard')
+        queues = {}
+        try:
+            for index, step in enumerate(plan):
+                if isinstance(step, Shard):
+                    queues[index] = queue.Queue(maxsize=self.QUEUE_PAGES)
+                    executor.submit(self._produce, step, queues[index], stop)
+            yield from objects
+            for index, step in enumerate(plan):
+                if not isinstance(step, Shard):
+                    yield step
+                    continue
+                while True:
+                    item = queues[index].get()
+                    if item is _DONE:
+                        break
+                    if isinstance(item, BaseException):
+                        raise item
+                    yield from item
+        finally:
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _plan(self, prefix: str, first_page: List[Dict]) -> List[Union[Shard, Dict]]:
+        """切分第一页之后的键空间，返回按字典序排列的段和顶层对象"""
+        last = first_page[-1]['name']
+        top = self._fetch(prefix, '/', None, last)
+        folders = top.get('common_prefixes', [])
+        if not top.get('next_token') and len(folders) >= self.MIN_SHARDS:
+            steps = [
+                Shard(folder, last if last.startswith(folder) else None)
+                for folder in folders
+            ]
+            # 顶层的文件直接插入合并结果；文件夹前缀与其中的键相对其他键的顺序相同
+            steps.extend(obj for obj in top.get('objects', []) if obj['name'] != prefix)
+            return sorted(steps, key=lambda step: step.prefix if isinstance(step, Shard) else step['name'])
+
+        boundaries = self._boundaries(prefix, first_page)
+        starts = [last] + boundaries
+        ends = boundaries + [None]
+        return [Shard(prefix, start, end) for start, end in zip(starts, ends)]
+
+    def _boundaries(self, prefix: str, first_page: List[Dict]) -> List[str]:
+        """在前缀本身和第一页键的公共前缀两个层级上，以 数字/字母 为边界"""
+        first, last = first_page[0]['name'], first_page[-1]['name']
+        common = len(prefix)
+        while common < min(len(first), len(last)) and first[common] == last[common]:
+            common += 1
+        bases = {prefix, first[:common]}
+        return sorted({
+            base + char
+            for base in bases
+            for char in self.BOUNDARY_CHARS
+            if base + char > last
+        })
+
+    def _produce(self, shard: Shard, pages: queue.Queue, stop: threading.Event) -> None:
+        """列举一段，逐页放入队列，超出 end 或调用方停止读取时结束"""
+        try:
+            continuation_token = None
+            while not stop.is_set():
+                result = self._fetch(shard.prefix, '', continuation_token, shard.start_after)
+                page = result.get('objects', [])
+                if shard.end is not None and page and page[-1]['name'] > shard.end:
+                    self._put(pages, [obj for obj in page if obj['name'] <= shard.end], stop)
+                    break
+                if not self._put(pages, page, stop):
+                    break
+                continuation_token = result.get('next_token')
+                if not continuation_token:
+                    break
+        except BaseException as e:
+            self._put(pages, e, stop)
+        finally:
+            self._put(pages, _DONE, stop)
+
+    @staticmethod
+    def _put(pages: queue.Queue, item, stop: threading.Event) -> bool:
+        """队列满时等待调用方读取；调用方停止读取后返回 False"""
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _fetch(self, prefix: str, delimiter: str, continuation_token: Optional[str],
+               start_after: Optional[str]) -> dict:
+        from ossnake.utils.retry_policy import retry_call, endpoint_retry_budget
+
+        if self.token:
+            self.token.check()
+        result = retry_call(
+            lambda: self.client._list_objects_page(
+                prefix,
+                delimiter,
+                continuation_token,
+                start_after=None if continuation_token else start_after,
+                page_size=self.page_size
+            ),
+            max_retries=self.MAX_RETRIES,
+            base_delay=self.RETRY_BASE_DELAY,
+            budgets=(endpoint_retry_budget(self.client.config.endpoint),),
+            logger=self.logger,
+            description=f"listing of '{prefix}' after {continuation_token or start_after}"
+        )
+        with self._lock:
+            self.requests += 1
+        return result
@@ -0,0 +1,244 @@
+import io
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional, Union
+
+from ossnake.driver.exceptions import ChecksumMismatchError, TransferCancelledError, UploadError
+from ossnake.utils.bandwidth_limiter import throttler
+from ossnake.utils.checksums import verify_part, verify_upload
+from ossnake.utils.part_planner import plan_part_size_for
+from ossnake.utils.part_source import PartReader
+from ossnake.utils.transfer_token import TransferToken, bind_token, current_token
+
+
+class IterableReader(io.RawIOBase):
+    """把产生 bytes 的可迭代对象（生成器等）包装成可 readinto 的流"""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._pending = memoryview(b'')
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            try:
+                self._pending = memoryview(next(self._chunks))
+            except StopIteration:
+                return 0
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+def as_reader(stream: Union[io.IOBase, Iterable[bytes]]):
+    """返回支持 readinto 或 read 的流；bytes 的可迭代对象用 IterableReader 包装"""
+    if hasattr(stream, 'readinto') or hasattr(stream, 'read'):
+        return stream
+    return IterableReader(stream)
+
+
+class StreamUploader:
+    """流式上传：不需要预先知道长度，也不要求流可以 seek（管道、套接字、生成器）
+
+    从流中依次读满分片缓冲区，每读满一个立即交给线程池作为分片上传，同时继续读取下一个；
+    缓冲区最多 并发数 + 1 个，读取快于上传时等待缓冲区归还，内存占用有上限。
+    第一个缓冲区没读满流就结束时，改为一次 PUT 上传（不产生分片上传）。
+    长度未知时分片大小每 PART_GROWTH_INTERVAL 个分片翻倍，保证不超过分片数上限。
+    verify_checksum 时用发送时计算的 MD5 校验每个分片的 ETag（不一致只重传该分片），
+    完成后校验整个对象的 ETag。
+    """
+
+    PART_GROWTH_INTERVAL = 1000  # 长度未知时，每多少个分片把分片大小加倍
+    MAX_RETRIES = 3
+    RETRY_BASE_DELAY = 0.5
+
+    def __init__(self, client: 'BaseOSSClient', token: Optional[TransferToken] = None,
+                 part_size: Optional[int] = None, workers: Optional[int] = None,
+                 verify_checksum: Optional[bool] = None):
+        if part_size is None or workers is None or verify_checksum is None:
+            from ossnake.driver.transfer_manager import TransferManager
+            settings = TransferManager().upload_settings
+            part_size = part_size or settings['chunk_size']
+            workers = workers or settings['workers']
+            verify_checksum = settings['verify_checksum'] if verify_checksum is None else verify_checksum
+        self.client = client
+        self.verify_checksum = verify_checksum
+        self.token = token or current_token() or TransferToken()
+        self.part_size = part_size
+        self.workers = max(1, min(workers, client.MAX_POOL_CONNECTIONS))
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._free: List[bytearray] = []
+        self._slots = threading.Semaphore(self.workers + 1)
+        self._error: Optional[BaseException] = None
+        self._progress_callback: Optional[Callable] = None
+        self.uploaded = 0
+        self.read_bytes = 0
+
+    def upload(self, stream, object_name: str, length: int = -1, content_type: Optional[str] = None,
+               progress_callback: Optional[Callable[[int, int], None]] = None) -> str:
+        """上传流中的全部数据
+        Args:
+            stream: 支持 readinto/read 的流，或产生 bytes 的可迭代对象
+            object_name: 对象名称
+            length: 数据长度，未知时为 -1（只用于选择分片大小和报告进度）
+            content_type: 内容类型
+            progress_callback: progress_callback(uploaded, total)，长度未知时 total 为目前已读取的字节数
+        Returns:
+            str: 对象的URL
+        """
+        reader = as_reader(stream)
+        self._progress_callback = progress_callback
+        self._length = length
+        base_size = self._base_part_size(length)
+
+        self.token.check()
+        first = self._acquire(base_size)
+        filled = self._fill(reader, first, base_size)
+        if filled < base_size:
+            # 短流：一次 PUT
+            with bind_token(self.token):
+                url = self.client.put_object(object_name, bytes(memoryview(first)[:filled]), content_type)
+            self._add_progress(filled)
+            return url
+
+        upload = self.client.init_multipart_upload(object_name, content_type=content_type)
+        upload.part_size = base_size
+        self.logger.info(f"Streaming {object_name} as multipart upload {upload.upload_id}")
+        completing = False
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                part_number, buffer, size = 1, first, base_size
+                while True:
+                    executor.submit(self._upload_part, upload, part_number, buffer, filled)
+                    if filled < size:
+                        break  # 流已结束
+                    part_number += 1
+                    if part_number > self.client.MAX_PARTS:
+                        raise UploadError(f"Stream exceeds {self.client.MAX_PARTS} parts")
+                    size = self._part_size_for(part_number, base_size)
+                    buffer = self._acquire(size)
+                    if self._error is not None:
+                        self._release(buffer)
+                        break
+                    filled = self._fill(reader, buffer, size)
+                    if filled == 0:
+                        self._release(buffer)
+                        break
+            if self._error is not None:
+                raise self._error
+            if self.token.cancelled:
+                raise TransferCancelledError("Transfer cancelled")
+            upload.total_parts = len(upload.parts)
+            upload.total_size = upload.completed_bytes
+            completing = True
+            url = self.client.complete_multipart_upload(upload)
+            if self.verify_checksum:
+                verify_upload(self.client, upload)
+            return url
+        except BaseException as e:
+            self._error = self._error or e
+            if completing and isinstance(e, ChecksumMismatchError):
+                raise  # 对象已在服务端合并，没有可取消的分片上传
+            try:
+                self.client.abort_multipart_upload(upload)
+            except Exception as abort_error:
+                self.logger.warning(f"Failed to abort stream upload {upload.upload_id}: {abort_error}")
+            raise
+
+    def _base_part_size(self, length: int) -> int:
+        """长度已知时按分片数限制计算分片大小，未知时使用配置的分片大小"""
+        if length is not None and length >= 0:
+            return plan_part_size_for(self.client, length, self.part_size, self.workers)
+        return min(max(self.part_size, self.client.MIN_PART_SIZE), self.client.MAX_PART_SIZE)
+
+    def _part_size_for(self, part_number: int, base_size: int) -> int:
+        if self._length is not None and self._length >= 0:
+            return base_size
+        growth = (part_number - 1) // self.PART_GROWTH_INTERVAL
+        return min(base_size << growth, self.client.MAX_PART_SIZE)
+
+    def _fill(self, reader, buffer: bytearray, size: int) -> int:
+        """从流中读取数据直到填满 size 字节或流结束，返回读取的字节数"""
+        view = memoryview(buffer)[:size]
+        filled = 0
+        while filled < size:
+            self.token.check()
+            if hasattr(reader, 'readinto'):
+                n = reader.readinto(view[filled:])
+            else:
+                chunk = reader.read(size - filled)
+                n = len(chunk) if chunk else 0
+                view[filled:filled + n] = chunk or b''
+            if not n:
+                break
+            filled += n
+        with self._lock:
+            self.read_bytes += filled
+        return filled
+
+    def _acquire(self, size: int) -> bytearray:
+        """取一个至少 size 字节的缓冲区，缓冲区都在使用中时等待"""
+        self._slots.acquire()
+        with self._lock:
+            # 分片变大后，较小的缓冲区不再使用
+            self._free = [buffer for buffer in self._free if len(buffer) >= size]
+            if self._free:
+                return self._free.pop()
+        return bytearray(size)
+
+    def _release(self, buffer: bytearray) -> None:
+        with self._lock:
+            self._free.append(buffer)
+        self._slots.release()
+
+    def _upload_part(self, upload, part_number: int, buffer: bytearray, size: int) -> None:
+        from ossnake.utils.retry_policy import retry_call, endpoint_retry_budget
+
+        try:
+            if self._error is not None or self.token.cancelled:
+                return
+            data = memoryview(buffer)[:size]
+            throttle = throttler('upload')
+
+            def attempt():
+                # 每次尝试新建读取器，从分片开头读取并重新计算 MD5
+                reader = PartReader(data, self.token, throttle)
+                etag = self.client.upload_part(upload, part_number, reader)
+                if self.verify_checksum:
+                    verify_part(reader, etag, part_number, upload.object_name)
+                return etag
+
+            with bind_token(self.token):
+                etag = retry_call(
+                    attempt,
+                    max_retries=self.MAX_RETRIES,
+                    base_delay=self.RETRY_BASE_DELAY,
+                    budgets=(endpoint_retry_budget(self.client.config.endpoint),),
+                    logger=self.logger,
+                    description=f"upload of stream part {part_number}"
+                )
+            with self._lock:
+                upload.add_completed_part(part_number, etag, size)
+            self._add_progress(size)
+        except BaseException as e:
+            with self._lock:
+                if self._error is None:
+                    self._error = e
+        finally:
+            self._release(buffer)
+
+    def _add_progress(self, nbytes: int) -> None:
+        with self._lock:
+            self.uploaded += nbytes
+            if not self._progress_callback:
+                return
+            total = self._length if self._length is not None and self._length >= 0 else self.read_bytes
+            try:
+                self._progress_callback(self.uploaded, total)
+            except Exception as e:
+                self.logger.warning(f"Progress callback failed: {e}")
@@ -0,0 +1,140 @@
+import os
+import json
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+class TransferJournal:
+    """断点续传日志
+
+    每个传输对应 ~/.ossnake/transfers 下的一个 .journal 文件：
+    第一行记录传输信息（upload_id、分片大小、本地文件标识），
+    之后每完成一个分片追加一行（前缀移动时每复制一批对象追加若干行）。
+    追加写入并 fsync，进程崩溃后也能恢复。
+    """
+
+    VERSION = 1
+    SAMPLE_SIZE = 64 * 1024  # 采样哈希每段读取的字节数
+
+    def __init__(self, journal_dir: Optional[str] = None):
+        self.logger = logging.getLogger(__name__)
+        if journal_dir is None:
+            journal_dir = os.path.join(os.path.expanduser("~/.ossnake"), "transfers")
+        # 目录在第一次写日志时创建，只读取进度的实例不会在磁盘上留下目录
+        self.journal_dir = Path(journal_dir)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def file_identity(cls, local_file: str) -> Dict:
+        """计算本地文件标识：路径、大小、修改时间和采样哈希
+
+        采样哈希只读取文件头、中、尾各 SAMPLE_SIZE 字节，大文件也能快速计算。
+        """
+        stat = os.stat(local_file)
+        size = stat.st_size
+        digest = hashlib.md5(str(size).encode())
+        with open(local_file, 'rb') as f:
+            for offset in sorted({0, max(0, size // 2 - cls.SAMPLE_SIZE // 2), max(0, size - cls.SAMPLE_SIZE)}):
+                f.seek(offset)
+                digest.update(f.read(cls.SAMPLE_SIZE))
+        return {
+            'local_file': os.path.abspath(local_file),
+            'size': size,
+            'mtime': stat.st_mtime,
+            'sample_hash': digest.hexdigest()
+        }
+
+    @staticmethod
+    def make_key(target: str, identity: Dict) -> str:
+        """根据目标对象和本地文件标识生成日志键"""
+        raw = json.dumps([target, identity], sort_keys=True)
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def path_for(self, key: str) -> Path:
+        """日志文件路径"""
+        return self.journal_dir / f"{key}.journal"
+
+    def load(self, key: str) -> Optional[Dict]:
+        """读取日志，返回传输信息，其中 parts 为 {分片号: {'etag', 'size'}}，
+        copied 为 {已复制的对象名: ETag}
+
+        最后一行可能因崩溃写了一半，解析失败的行会被忽略。
+        """
+        path = self.path_for(key)
+        if not path.exists():
+            return None
+
+        record = None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        self.logger.warning(f"Ignoring corrupt journal line in {path}")
+                        continue
+
+                    if record is None:
+                        if entry.get('version') != self.VERSION:
+                            self.logger.warning(f"Unsupported journal version in {path}")
+                            return None
+                        record = dict(entry, parts={}, copied={})
+                    elif 'part_number' in entry:
+                        record['parts'][int(entry['part_number'])] = {
+                            'etag': entry['etag'],
+                            'size': entry.get('size', 0)
+                        }
+                    elif 'copied' in entry:
+                        record['copied'][entry['copied']] = entry.get('etag')
+        except OSError as e:
+            self.logger.warning(f"Failed to read journal {path}: {e}")
+            return None
+        return record
+
+    def create(self, key: str, **info) -> Dict:
+        """创建新日志（覆盖旧日志）"""
+        header = dict(info, version=self.VERSION, created=datetime.now().isoformat())
+        path = self.path_for(key)
+        self.journal_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(header, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        return dict(header, parts={}, copied={})
+
+    def record_part(self, key: str, part_number: int, etag: str, size: int) -> None:
+        """追加一条分片完成记录"""
+        line = json.dumps({'part_number': part_number, 'etag': etag, 'size': size}) + '\n'
+        with self._lock:
+            with open(self.path_for(key), 'a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def record_copied(self, key: str, objects: List[Tuple[str, Optional[str]]]) -> None:
+        """追加一批已复制对象的记录 (对象名, ETag)，一次 fsync"""
+        lines = ''.join(json.dumps({'copied': name, 'etag': etag}, ensure_ascii=False) + '\n'
+                        for name, etag in objects)
+        with self._lock:
+            with open(self.path_for(key), 'a', encoding='utf-8') as f:
+                f.write(lines)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def remove(self, key: str) -> None:
+        """删除日志"""
+        try:
+            self.path_for(key).unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self.logger.warning(f"Failed to remove journal {key}: {e}")
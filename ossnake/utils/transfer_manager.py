@@ -1,32 +1,84 @@
 import os
 import logging
 from concurrent.futures import ThreadPoolExecutor
+import threading
 from threading import Lock
 from typing import Optional, Callable
 
+from ossnake.utils.part_source import PartSource
+from ossnake.utils.transfer_token import TransferToken, current_token
+
 class TransferManager:
     """传输管理器，处理分片上传下载"""
     
     def __init__(self, 
                  chunk_size: int = 5 * 1024 * 1024,  # 5MB
-                 max_workers: int = 4):
+                 max_workers: int = 4,
+                 readahead: int = 2,
+                 max_concurrency: Optional[int] = None,
+                 adaptive: bool = True,
+                 bandwidth_limit: Optional[int] = None,
+                 max_retries: int = 3,
+                 retry_base_delay: float = 0.5):
         self.chunk_size = chunk_size
-        self.max_workers = max_workers
+        self.max_workers = max_workers  # 初始并发数
+        self.max_concurrency = max_concurrency or max_workers  # 自适应并发上限
+        self.adaptive = adaptive
+        self.readahead = readahead  # 排队分片数：提交线程最多领先上传线程 readahead 个分片
+        self.bandwidth_limit = bandwidth_limit  # 单个传输的限速（字节/秒），与全局带宽限制同时生效
+        self.max_retries = max_retries  # 单个分片的最大重试次数
+        self.retry_base_delay = retry_base_delay
         self.logger = logging.getLogger(__name__)
         self._lock = Lock()
+    
+    def plan_part_size(self, client, file_size: int) -> int:
+        """计算分片大小
+        
+        chunk_size 只是首选值，实际大小还取决于文件大小、服务商的分片限制
+        （最多 10000 个分片）和并发数，UI 应使用该结果计算分片数量。
+        """
+        from ossnake.utils.part_planner import plan_part_size_for
+        return plan_part_size_for(client, file_size, self.chunk_size, self.max_workers)
+        
+    def _upload_part_with_retry(self, client, upload, part_number: int, data: bytes,
+                                on_error: Optional[Callable] = None) -> str:
+        """上传单个分片，暂时性错误按带抖动的指数退避重试，不可重试的错误立即抛出"""
+        from ossnake.utils.retry_policy import retry_call, endpoint_retry_budget
+        
+        def attempt():
+            if hasattr(data, 'seek'):
+                data.seek(0)
+            return client.upload_part(upload, part_number, data)
+        
+        return retry_call(
+            attempt,
+            max_retries=self.max_retries,
+            base_delay=self.retry_base_delay,
+            budgets=(endpoint_retry_budget(client.config.endpoint),),
+            on_error=on_error,
+            logger=self.logger,
+            description=f"part {part_number}"
+        )
         
     def upload_file(self, 
                     client, 
                     local_file: str, 
                     remote_path: str,
-                    progress_callback: Optional[Callable] = None) -> str:
-        """分片上传文件"""
+                    progress_callback: Optional[Callable] = None,
+                    token: Optional[TransferToken] = None) -> str:
+        """分片上传文件
+        
+        token 用于暂停/取消：暂停时不再提交新的分片，取消时在一个数据块内停止并取消分片上传。
+        """
+        token = token or current_token()
         try:
             file_size = os.path.getsize(local_file)
             transferred = 0  # 已传输字节数
             
             # 小文件直接上传
             if file_size <= self.chunk_size:
+                if token:
+                    token.check()
                 if progress_callback:
                     progress_callback(0, file_size)  # 初始进度
                     
@@ -44,14 +96,15 @@ class TransferManager:
                     progress_callback(file_size, file_size)  # 完成进度
                 return result
             
+            # 计算分片大小和数量
+            part_size = self.plan_part_size(client, file_size)
+            total_parts = (file_size + part_size - 1) // part_size
+            self.logger.info(f"Total parts: {total_parts}, File size: {file_size}, Part size: {part_size}")
+            
             # 初始化分片上传
             upload = client.init_multipart_upload(remote_path)
             self.logger.info(f"Started multipart upload: {upload.upload_id}")
             
-            # 计算分片数量和每个分片的大小
-            total_parts = (file_size + self.chunk_size - 1) // self.chunk_size
-            self.logger.info(f"Total parts: {total_parts}, File size: {file_size}, Chunk size: {self.chunk_size}")
-            
             # 创建分片进度跟踪
             part_progress = {i: 0 for i in range(1, total_parts + 1)}
             
@@ -64,10 +117,10 @@ class TransferManager:
                     if progress_callback:
                         # 计算当前分片的总大小
                         if part_number == total_parts:
-                            # 最后一个分片的大小可能不足chunk_size
-                            part_total = file_size - (total_parts - 1) * self.chunk_size
+                            # 最后一个分片的大小可能不足part_size
+                            part_total = file_size - (total_parts - 1) * part_size
                         else:
-                            part_total = self.chunk_size
+                            part_total = part_size
                             
                         progress_callback(
                             transferred,  # 总已传输
@@ -77,43 +130,68 @@ class TransferManager:
                             part_total    # 分片大小
                         )
             
-            # 创建任务列表
-            tasks = []
-            with open(local_file, 'rb') as f:
-                for part_number in range(1, total_parts + 1):
-                    # 计算当前分片大小
-                    chunk_start = (part_number - 1) * self.chunk_size
-                    f.seek(chunk_start)
-                    
-                    # 对于最后一个分片，只读取剩余的字节
-                    if part_number == total_parts:
-                        chunk_size = file_size - chunk_start
-                    else:
-                        chunk_size = self.chunk_size
-                        
-                    chunk = f.read(chunk_size)
-                    tasks.append((part_number, chunk))
-                    
-                    self.logger.debug(f"Created task for part {part_number}, size: {len(chunk)}")
+            # 在途分片数由 AIMD 控制器按吞吐和错误动态调整
+            from ossnake.utils.adaptive_concurrency import AdaptiveConcurrency
+            from ossnake.utils.bandwidth_limiter import transfer_bucket, throttler
+            throttle = throttler('upload', transfer_bucket(self.bandwidth_limit))
+            concurrency = AdaptiveConcurrency(
+                initial=self.max_workers,
+                ceiling=self.max_concurrency,
+                adaptive=self.adaptive
+            )
             
-            # 使用线程池并发上传分片
+            # 分片队列：提交线程最多领先上传线程 readahead 个分片
+            buffer_cond = threading.Condition()
+            buffered = 0
+            failed = threading.Event()
+            
+            def upload_part(part_number: int, data: bytes):
+                nonlocal buffered
+                try:
+                    with concurrency.slot(token) as started:
+                        if failed.is_set():
+                            return part_number, None
+                        etag = self._upload_part_with_retry(
+                            client, upload, part_number, data,
+                            on_error=lambda e: concurrency.record_failure(e, started)
+                        )
+                        concurrency.record_success(len(data), started)
+                    update_progress(part_number, len(data))
+                    return part_number, etag
+                except Exception as e:
+                    failed.set()
+                    self.logger.error(f"Failed to upload part {part_number}: {e}")
+                    raise
+                finally:
+                    # 归还缓冲区，让读取线程继续预读
+                    with buffer_cond:
+                        buffered -= 1
+                        buffer_cond.notify()
+            
+            # 分片数据取自文件映射，按读取器提交，不为每个分片 read() 一份缓冲区；SDK 读取时按块限速
             completed_parts = []
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                def upload_part(args):
-                    part_number, data = args
-                    try:
-                        etag = client.upload_part(upload, part_number, data)
-                        update_progress(part_number, len(data))
-                        return part_number, etag
-                    except Exception as e:
-                        self.logger.error(f"Failed to upload part {part_number}: {e}")
-                        raise
-                
-                # 提交所有任务并等待完成
-                futures = [executor.submit(upload_part, task) for task in tasks]
-                for future in futures:
-                    part_number, etag = future.result()
-                    completed_parts.append((part_number, etag))
+            futures = []
+            with ThreadPoolExecutor(max_workers=concurrency.ceiling) as executor:
+                with PartSource(local_file, part_size, token, throttle) as source:
+                    for part_number in range(1, total_parts + 1):
+                        # 暂停时不再提交新的分片，已提交但未开始的分片在并发名额处等待
+                        if token:
+                            token.wait_if_paused()
+                        with buffer_cond:
+                            # 并发数可能随时变化，定期重新检查
+                            while buffered >= concurrency.limit + self.readahead and not failed.is_set():
+                                buffer_cond.wait(0.1)
+                            if failed.is_set():
+                                break
+                            buffered += 1
+                        
+                        chunk = source.reader(part_number)
+                        futures.append(executor.submit(upload_part, part_number, chunk))
+                        self.logger.debug(f"Submitted part {part_number}, size: {len(chunk)}")
+                    
+                    for future in futures:
+                        part_number, etag = future.result()
+                        completed_parts.append((part_number, etag))
             
             # 按分片号排序
             upload.parts = sorted(completed_parts, key=lambda x: x[0])
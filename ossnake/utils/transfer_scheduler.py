@@ -0,0 +1,528 @@
+import os
+import logging
+import itertools
+import threading
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+from ossnake.driver.exceptions import TransferCancelledError, ChecksumMismatchError
+from ossnake.driver.types import MultipartUpload
+from ossnake.utils.adaptive_concurrency import AdaptiveConcurrency, start_clock
+from ossnake.utils.bandwidth_limiter import throttler
+from ossnake.utils.checksums import verify_part, verify_upload
+from ossnake.utils.part_source import PartSource
+from ossnake.utils.transfer_journal import TransferJournal
+from ossnake.utils.transfer_token import TransferToken, bind_token
+
+
+class TransferJob:
+    """调度器中的一个上传任务
+
+    UI 可以读取 status / transferred / size / error 等属性观察进度，
+    或调用 wait() 等待完成；通过 token 暂停、继续或取消。
+    调度相关的字段（下划线开头）由调度器加锁维护。
+    """
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    COMPLETED = 'completed'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+
+    def __init__(self, job_id: int, client, local_file: str, remote_path: str,
+                 progress_callback: Optional[Callable] = None,
+                 on_complete: Optional[Callable] = None,
+                 on_error: Optional[Callable] = None,
+                 token: Optional[TransferToken] = None):
+        self.id = job_id
+        self.client = client
+        self.local_file = local_file
+        self.remote_path = remote_path
+        self.size = os.path.getsize(local_file)
+        self.transferred = 0
+        self.total_parts = 0
+        self.status = self.QUEUED
+        self.result: Optional[str] = None
+        self.error: Optional[Exception] = None
+        self.progress_callback = progress_callback
+        self.on_complete = on_complete
+        self.on_error = on_error
+        self.token = token or TransferToken()
+        self._done = threading.Event()
+
+        # 调度状态
+        self._stage = 'init'  # init -> parts -> (cancelling) -> done
+        self._busy = False  # 初始化或合并分片的任务正在执行
+        self._pending = deque()  # 待上传的分片号
+        self._running = 0  # 正在上传的分片数
+        self._upload = None
+        self._source: Optional[PartSource] = None
+        self._part_size = 0
+        self._journal_key: Optional[str] = None
+
+    @property
+    def finished(self) -> bool:
+        return self._done.is_set()
+
+    @property
+    def paused(self) -> bool:
+        return self.token.paused and not self.finished
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """等待任务结束，返回是否已结束"""
+        return self._done.wait(timeout)
+
+    def part_length(self, part_number: int) -> int:
+        return max(0, min(self._part_size, self.size - (part_number - 1) * self._part_size))
+
+
+class _Task:
+    """工作线程执行的一个请求（初始化、上传分片或合并分片）"""
+
+    def __init__(self, job: TransferJob, run: Callable, size: int):
+        self.job = job
+        self.run = run
+        self.size = size
+
+
+class TransferScheduler:
+    """应用级传输调度器
+
+    所有拖放、选择文件触发的上传都提交到这里，由一组常驻工作线程执行，
+    而不是每个文件各开一个线程和线程池：
+    - 最多 MAX_ACTIVE_FILES 个文件同时处于上传状态（暂停的文件不计入），其余排队；
+    - 工作线程按轮询从活动文件中取下一个分片，多个文件的分片交错上传；
+    - 在途请求数由自适应并发控制器限制（上限取 upload.max_workers），
+      在途分片总字节数不超过 MAX_BUFFER_BYTES；
+    - 分片上传记录在传输日志中（与 TransferManager 共用），临时错误失败后
+      保留已上传的分片，重新提交同一文件时从日志续传。
+    UI 可通过 jobs() 读取队列，或用 add_listener() 订阅任务状态变化。
+    """
+
+    _instance = None
+
+    MAX_ACTIVE_FILES = 8  # 同时交错上传的文件数
+    MAX_BUFFER_BYTES = 256 * 1024 * 1024  # 在途分片的总字节数上限
+    MAX_RETRIES = 3  # 单个分片的最大重试次数
+    RETRY_BASE_DELAY = 0.5
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if not self._initialized:
+            self.logger = logging.getLogger(__name__)
+            self._cond = threading.Condition()
+            self._queue = deque()  # 排队的任务
+            self._active = deque()  # 正在上传的任务（轮询顺序）
+            self._jobs: List[TransferJob] = []
+            self._listeners: List[Callable] = []
+            self._ids = itertools.count(1)
+            self._workers: List[threading.Thread] = []
+            self._in_flight = 0
+            self._in_flight_bytes = 0
+            self.journal = TransferJournal()
+            self._initialized = True
+            self.configure()
+
+    def configure(self, settings: Optional[Dict] = None) -> None:
+        """读取 upload 设置：分片大小（MB）、初始并发数、并发上限和是否自适应"""
+        if settings is None:
+            try:
+                from ossnake.utils.settings_manager import SettingsManager
+                settings = SettingsManager().settings.get('upload', {})
+            except Exception as e:
+                self.logger.warning(f"Failed to load upload settings: {e}")
+                settings = {}
+        workers = max(1, int(settings.get('workers', 4)))
+        ceiling = max(workers, int(settings.get('max_workers', 16)))
+        with self._cond:
+            self.chunk_size = max(1, int(settings.get('chunk_size', 5))) * 1024 * 1024
+            self.workers = workers
+            self.verify_checksum = bool(settings.get('verify_checksum', True))
+            self.concurrency = AdaptiveConcurrency(
+                workers, ceiling=ceiling, adaptive=bool(settings.get('adaptive', True))
+            )
+            self._cond.notify_all()
+        self.logger.info(f"Transfer scheduler: {workers} workers (max {self.concurrency.ceiling})")
+
+    def submit(self, client, local_file: str, remote_path: str,
+               progress_callback: Optional[Callable] = None,
+               on_complete: Optional[Callable] = None,
+               on_error: Optional[Callable] = None,
+               token: Optional[TransferToken] = None) -> TransferJob:
+        """提交上传任务
+        Args:
+            client: OSS客户端
+            local_file: 本地文件路径
+            remote_path: 对象名称
+            progress_callback: 进度回调 (transferred, total, part_number, part_transferred, part_total)
+            on_complete: 完成回调 (job)
+            on_error: 失败回调 (job, error)，取消时 error 为 TransferCancelledError
+            token: 暂停/取消令牌，默认为任务新建一个（job.token）
+        Returns:
+            TransferJob: 任务对象
+        """
+        job = TransferJob(
+            next(self._ids), client, local_file, remote_path,
+            progress_callback, on_complete, on_error, token
+        )
+        with self._cond:
+            self._jobs.append(job)
+            self._queue.append(job)
+            self._ensure_workers()
+            self._cond.notify_all()
+        self.logger.info(f"Queued upload #{job.id}: {local_file} -> {remote_path}")
+        self._notify(job)
+        job.token.on_cancel(lambda: self._cancel_queued(job))
+        return job
+
+    def _cancel_queued(self, job: TransferJob) -> None:
+        """排队中被取消的任务不必等到轮到它，直接结束（已开始的任务由工作线程清理）"""
+        with self._cond:
+            if job not in self._queue:
+                return
+            self._queue.remove(job)
+        self._fail(job, TransferCancelledError("Transfer cancelled"))
+
+    def jobs(self) -> List[TransferJob]:
+        """按提交顺序返回所有任务（包括已结束的）"""
+        with self._cond:
+            return list(self._jobs)
+
+    def clear_finished(self) -> None:
+        """从任务列表中移除已结束的任务"""
+        with self._cond:
+            self._jobs = [job for job in self._jobs if not job.finished]
+
+    def add_listener(self, callback: Callable[[TransferJob], None]) -> None:
+        """订阅任务状态变化（在工作线程中调用，UI 需自行切换到主线程）"""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[TransferJob], None]) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, job: TransferJob) -> None:
+        for listener in list(self._listeners):
+            try:
+                listener(job)
+            except Exception as e:
+                self.logger.warning(f"Transfer listener failed: {e}")
+
+    def _ensure_workers(self) -> None:
+        """按并发上限补足工作线程（调用方持有锁）"""
+        while len(self._workers) < self.concurrency.ceiling:
+            worker = threading.Thread(
+                target=self._worker,
+                name=f"transfer-worker-{len(self._workers) + 1}",
+                daemon=True
+            )
+            self._workers.append(worker)
+            worker.start()
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                task = self._next_task()
+                while task is None:
+                    # 并发上限会随时变化，定期重新检查
+                    self._cond.wait(0.1)
+                    task = self._next_task()
+                self._in_flight += 1
+                self._in_flight_bytes += task.size
+            try:
+                task.run()
+            except Exception as e:
+                self.logger.error(f"Transfer task of job #{task.job.id} failed: {e}")
+            finally:
+                with self._cond:
+                    self._in_flight -= 1
+                    self._in_flight_bytes -= task.size
+                    self._cond.notify_all()
+
+    def _next_task(self) -> Optional[_Task]:
+        """轮询活动任务，取下一个可执行的请求（调用方持有锁）"""
+        if self._in_flight >= self.concurrency.limit:
+            return None
+        # 暂停的任务不占用活动名额，也不从队列中取出
+        running = sum(1 for job in self._active if not job.token.paused)
+        for job in list(self._queue):
+            if running >= self.MAX_ACTIVE_FILES:
+                break
+            if not job.token.paused:
+                self._queue.remove(job)
+                self._active.append(job)
+                running += 1
+        for _ in range(len(self._active)):
+            job = self._active[0]
+            self._active.rotate(-1)
+            task = self._task_for(job)
+            if task:
+                return task
+        return None
+
+    def _fits(self, size: int) -> bool:
+        return not self._in_flight or self._in_flight_bytes + size <= self.MAX_BUFFER_BYTES
+
+    def _task_for(self, job: TransferJob) -> Optional[_Task]:
+        if job._busy:
+            return None
+        if job.token.cancelled and job._stage != 'done':
+            # 取消：停止派发并清理分片上传（在途分片在下一个数据块处中止）
+            job._stage = 'cancelling'
+            job._pending.clear()
+            # 清理任务执行前不再重复派发
+            job._busy = True
+            return _Task(job, lambda: self._fail(job, TransferCancelledError("Transfer cancelled")), 0)
+        if job.token.paused:
+            # 暂停：不再派发新的请求，在途分片照常完成
+            return None
+        if job._stage == 'init':
+            size = min(job.size, self.chunk_size)
+            if not self._fits(size):
+                return None
+            job._busy = True
+            return _Task(job, lambda: self._start_job(job), size)
+        if job._stage == 'parts':
+            if job._pending:
+                part_number = job._pending[0]
+                size = job.part_length(part_number)
+                if not self._fits(size):
+                    return None
+                job._pending.popleft()
+                job._running += 1
+                return _Task(job, lambda: self._upload_part(job, part_number), size)
+            if not job._running:
+                job._busy = True
+                return _Task(job, lambda: self._complete_job(job), 0)
+        return None
+
+    def _start_job(self, job: TransferJob) -> None:
+        """小文件直接上传；大文件规划分片并初始化分片上传"""
+        job.status = TransferJob.RUNNING
+        self._notify(job)
+        try:
+            if job.size <= self.chunk_size:
+                def small_file_callback(chunk_size):
+                    job.transferred += chunk_size
+                    self._report(job)
+
+                with bind_token(job.token):
+                    result = job.client.upload_file(job.local_file, job.remote_path, small_file_callback)
+                job.transferred = job.size
+                self._report(job)
+                self._finish(job, result=result)
+                return
+
+            identity = self.journal.file_identity(job.local_file)
+            config = job.client.config
+            job._journal_key = self.journal.make_key(
+                f"{config.endpoint}/{config.bucket_name}/{job.remote_path}", identity
+            )
+            record = self.journal.load(job._journal_key)
+            if record:
+                job._upload = MultipartUpload(object_name=job.remote_path, upload_id=record['upload_id'])
+                job._part_size = record['part_size']
+                completed = record['parts']
+            else:
+                from ossnake.utils.part_planner import plan_part_size_for
+                job._part_size = plan_part_size_for(job.client, job.size, self.chunk_size, self.workers)
+                job._upload = job.client.init_multipart_upload(job.remote_path)
+                self.journal.create(
+                    job._journal_key,
+                    bucket=config.bucket_name,
+                    object_name=job.remote_path,
+                    upload_id=job._upload.upload_id,
+                    part_size=job._part_size,
+                    **identity
+                )
+                completed = {}
+            job._upload.part_size = job._part_size
+            job._source = PartSource(job.local_file, job._part_size, job.token, throttler('upload'))
+            job.total_parts = (job.size + job._part_size - 1) // job._part_size
+            for part_number, part in sorted(completed.items()):
+                job._upload.add_completed_part(part_number, part['etag'], part['size'])
+                job.transferred += part['size']
+            if completed:
+                self.logger.info(
+                    f"Resuming multipart upload #{job.id} from journal: "
+                    f"{len(completed)}/{job.total_parts} parts already uploaded"
+                )
+                self._report(job)
+            else:
+                self.logger.info(
+                    f"Started multipart upload #{job.id}: {job.total_parts} parts of {job._part_size} bytes"
+                )
+        except Exception as e:
+            self._fail(job, e)
+            return
+        with self._cond:
+            job._pending.extend(
+                n for n in range(1, job.total_parts + 1) if n not in completed
+            )
+            job._stage = 'parts'
+            job._busy = False
+            self._cond.notify_all()
+
+    def _upload_part(self, job: TransferJob, part_number: int) -> None:
+        from ossnake.utils.retry_policy import retry_call, endpoint_retry_budget
+
+        size = job.part_length(part_number)
+        concurrency = self.concurrency
+        started = start_clock()
+        
+        def attempt():
+            if job._stage != 'parts':
+                return None  # 任务已失败，放弃剩余分片
+            reader = job._source.reader(part_number)
+            etag = job.client.upload_part(job._upload, part_number, reader)
+            if self.verify_checksum:
+                verify_part(reader, etag, part_number, job.remote_path)
+            return etag
+        
+        try:
+            with bind_token(job.token):
+                etag = retry_call(
+                    attempt,
+                    max_retries=self.MAX_RETRIES,
+                    base_delay=self.RETRY_BASE_DELAY,
+                    budgets=(endpoint_retry_budget(job.client.config.endpoint),),
+                    on_error=lambda e: concurrency.record_failure(e, started),
+                    logger=self.logger,
+                    description=f"part {part_number} of job #{job.id}"
+                )
+        except Exception as e:
+            self._part_finished(job)
+            self._fail(job, e)
+            return
+        if etag is None:
+            self._part_finished(job)
+            return
+        concurrency.record_success(size, started)
+        try:
+            self.journal.record_part(job._journal_key, part_number, etag, size)
+        except OSError as e:
+            self.logger.warning(f"Failed to journal part {part_number} of job #{job.id}: {e}")
+        with self._cond:
+            job._upload.parts.append((part_number, etag))
+            job.transferred += size
+        self._part_finished(job)
+        self._report(job, part_number, size)
+
+    def _part_finished(self, job: TransferJob) -> None:
+        """分片结束；任务已结束且没有在途分片时释放文件映射"""
+        with self._cond:
+            job._running -= 1
+            self._cond.notify_all()
+            release = job._stage == 'done' and not job._running
+        if release:
+            self._release_source(job)
+
+    def _release_source(self, job: TransferJob) -> None:
+        with self._cond:
+            source, job._source = job._source, None
+        if source is not None:
+            source.close()
+
+    def _complete_job(self, job: TransferJob) -> None:
+        try:
+            job._upload.parts.sort(key=lambda part: part[0])
+            result = job.client.complete_multipart_upload(job._upload)
+        except ChecksumMismatchError as e:
+            self.journal.remove(job._journal_key)
+            self._finish(job, error=e)  # 对象已在服务端合并，没有可取消的分片上传
+            return
+        except Exception as e:
+            self._fail(job, e)
+            return
+        self.journal.remove(job._journal_key)
+        if self.verify_checksum:
+            try:
+                verify_upload(job.client, job._upload)
+            except ChecksumMismatchError as e:
+                self.logger.error(f"Upload #{job.id} of {job.local_file} failed verification: {e}")
+                self._finish(job, error=e)
+                return
+        self._finish(job, result=result)
+
+    def _report(self, job: TransferJob, part_number: Optional[int] = None, part_size: int = 0) -> None:
+        if not job.progress_callback:
+            return
+        try:
+            if part_number is None:
+                job.progress_callback(job.transferred, job.size)
+            else:
+                job.progress_callback(job.transferred, job.size, part_number, part_size, part_size)
+        except Exception as e:
+            self.logger.warning(f"Progress callback failed: {e}")
+
+    def _fail(self, job: TransferJob, error: Exception) -> None:
+        """任务失败：停止派发剩余分片
+
+        临时错误（网络中断、限流、服务端错误）保留分片上传和日志，重新提交后续传；
+        用户取消、不可重试的错误或上传已被服务端清理时取消分片上传并删除日志。
+        """
+        from ossnake.utils.retry_policy import classify_error, FATAL
+
+        with self._cond:
+            if job._stage == 'done':
+                return
+            job._stage = 'done'
+            job._pending.clear()
+        cancelled = isinstance(error, TransferCancelledError)
+        if cancelled:
+            self.logger.info(f"Upload #{job.id} of {job.local_file} cancelled")
+        else:
+            self.logger.error(f"Upload #{job.id} of {job.local_file} failed: {error}")
+        discard = (
+            cancelled
+            or classify_error(error) == FATAL
+            or 'nosuchupload' in str(error).lower().replace(' ', '')
+        )
+        if job._upload is not None and not discard:
+            self.logger.info(
+                f"Keeping multipart upload {job._upload.upload_id} for resume "
+                f"({len(job._upload.parts)}/{job.total_parts} parts done)"
+            )
+            self._finish(job, error=error)
+            return
+        if job._journal_key:
+            self.journal.remove(job._journal_key)
+        if job._upload is not None:
+            try:
+                job.client.abort_multipart_upload(job._upload)
+            except Exception as abort_error:
+                self.logger.warning(f"Failed to abort multipart upload: {abort_error}")
+        self._finish(job, error=error)
+
+    def _finish(self, job: TransferJob, result: Optional[str] = None,
+                error: Optional[Exception] = None) -> None:
+        with self._cond:
+            job._stage = 'done'
+            job._busy = False
+            if job in self._active:
+                self._active.remove(job)
+            job.result = result
+            job.error = error
+            if isinstance(error, TransferCancelledError):
+                job.status = TransferJob.CANCELLED
+            else:
+                job.status = TransferJob.FAILED if error else TransferJob.COMPLETED
+            self._cond.notify_all()
+            release = not job._running
+        if release:
+            # 仍有分片在上传时，由最后一个分片释放
+            self._release_source(job)
+        job._done.set()
+        try:
+            if error and job.on_error:
+                job.on_error(job, error)
+            elif not error and job.on_complete:
+                job.on_complete(job)
+        except Exception as e:
+            self.logger.warning(f"Transfer callback failed: {e}")
+        self._notify(job)
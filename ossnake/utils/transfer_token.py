@@ -0,0 +1,91 @@
+import threading
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+from ossnake.driver.exceptions import TransferCancelledError
+
+_local = threading.local()
+
+
+class TransferToken:
+    """传输控制令牌：暂停 / 继续 / 取消
+
+    UI 持有令牌并调用 pause() / resume() / cancel()，传输代码在以下位置协作检查：
+    - 传输管理器在并发名额处（AdaptiveConcurrency.slot(token)）调用 wait_if_paused()，
+      暂停时不再开始新的分片，正在传输的分片照常完成并保留；
+    - 分片读取器和驱动的分块读写循环每个数据块调用 check()，取消后在一个数据块内
+      抛出 TransferCancelledError，由传输管理器清理分片上传。
+    驱动的循环通过 current_token() 读取当前线程绑定的令牌（见 bound()）。
+    """
+
+    def __init__(self):
+        self._running = threading.Event()
+        self._running.set()
+        self._cancelled = False
+        self._cancel_callbacks = []
+
+    @property
+    def paused(self) -> bool:
+        return not self._running.is_set() and not self._cancelled
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def pause(self) -> None:
+        if not self._cancelled:
+            self._running.clear()
+
+    def resume(self) -> None:
+        self._running.set()
+
+    def cancel(self) -> None:
+        self._cancelled = True
+        # 唤醒暂停中的线程，让其看到取消
+        self._running.set()
+        callbacks, self._cancel_callbacks = self._cancel_callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def on_cancel(self, callback: Callable[[], None]) -> None:
+        """取消时调用 callback（在调用 cancel() 的线程中执行；已取消时立即调用）"""
+        if self._cancelled:
+            callback()
+        else:
+            self._cancel_callbacks.append(callback)
+
+    def check(self) -> None:
+        """已取消时抛出 TransferCancelledError"""
+        if self._cancelled:
+            raise TransferCancelledError("Transfer cancelled")
+
+    def wait_if_paused(self, timeout: Optional[float] = None) -> bool:
+        """暂停时阻塞直到继续或取消；返回是否可以继续（超时返回 False）"""
+        resumed = self._running.wait(timeout)
+        self.check()
+        return resumed
+
+    @contextmanager
+    def bound(self):
+        """在当前线程绑定令牌，驱动的分块循环通过 current_token() 检查"""
+        previous = getattr(_local, 'token', None)
+        _local.token = self
+        try:
+            yield self
+        finally:
+            _local.token = previous
+
+
+def current_token() -> Optional[TransferToken]:
+    """当前线程绑定的传输令牌"""
+    return getattr(_local, 'token', None)
+
+
+@contextmanager
+def bind_token(token: Optional[TransferToken]):
+    """token 不为空时在当前线程绑定"""
+    if token is None:
+        yield None
+    else:
+        with token.bound():
+            yield token
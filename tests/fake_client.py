@@ -0,0 +1,229 @@
+"""离线测试用的内存OSS客户端"""
+import threading
+import hashlib
+from typing import Dict, Iterator, List, Optional
+
+from ossnake.driver.base_oss import BaseOSSClient
+from ossnake.driver.types import OSSConfig, MultipartUpload
+from ossnake.driver.exceptions import OSSError, ObjectNotFoundError, ObjectChangedError
+from ossnake.utils.checksums import composite_etag
+
+
+class FakeOSSClient(BaseOSSClient):
+    """把对象保存在字典里的客户端，用于测试传输逻辑"""
+
+    MIN_PART_SIZE = 1  # 测试使用很小的分片
+    PAGE_SIZE = 1000  # 每页列举的条目数
+
+    def __init__(self, bucket_name: str = 'test-bucket'):
+        self.objects: Dict[str, bytes] = {}
+        self.uploads: Dict[str, Dict[int, bytes]] = {}
+        self.upload_keys: Dict[str, str] = {}
+        self.lock = threading.Lock()
+        self.calls: List[str] = []
+        self._next_upload_id = 0
+        super().__init__(OSSConfig(
+            access_key='ak',
+            secret_key='sk',
+            bucket_name=bucket_name,
+            endpoint='fake.local'
+        ))
+
+    def _init_client(self) -> None:
+        self.connected = True
+
+    def _record(self, name: str) -> None:
+        with self.lock:
+            self.calls.append(name)
+
+    def _upload_file(self, local_file, object_name, progress_callback=None) -> str:
+        with open(local_file, 'rb') as f:
+            return self.put_object(object_name, f.read())
+
+    def upload_file(self, local_file, object_name=None, progress_callback=None) -> str:
+        return self._upload_file(local_file, object_name, progress_callback)
+
+    def put_object(self, object_name: str, data: bytes, content_type: str = None) -> str:
+        self._record('put_object')
+        with self.lock:
+            self.objects[object_name] = bytes(data)
+        return self.get_public_url(object_name)
+
+    def get_object(self, object_name: str) -> bytes:
+        self._record('get_object')
+        with self.lock:
+            if object_name not in self.objects:
+                raise ObjectNotFoundError(f"Object not found: {object_name}")
+            return self.objects[object_name]
+
+    def get_object_info(self, object_name: str) -> Dict:
+        self._record('get_object_info')
+        data = self.get_object(object_name)
+        return {
+            'size': len(data),
+            'type': 'application/octet-stream',
+            'last_modified': None,
+            'etag': hashlib.md5(data).hexdigest()
+        }
+
+    def iter_object_range(self, object_name: str, start: int, end: int,
+                          chunk_size: int = 1024 * 1024, etag: Optional[str] = None) -> Iterator[bytes]:
+        self._record('iter_object_range')
+        data = self.get_object(object_name)
+        if etag and hashlib.md5(data).hexdigest() != etag:
+            raise ObjectChangedError(f"Object changed: {object_name}")
+        data = data[start:end + 1]
+        for offset in range(0, len(data), chunk_size):
+            yield data[offset:offset + chunk_size]
+
+    def delete_file(self, object_name: str) -> None:
+        self._record('delete_file')
+        with self.lock:
+            self.objects.pop(object_name, None)
+
+    def delete_objects(self, object_names: List[str]) -> Dict[str, str]:
+        self._record('delete_objects')
+        assert len(object_names) <= self.MAX_DELETE_BATCH
+        with self.lock:
+            for name in object_names:
+                self.objects.pop(name, None)
+        return {}
+
+    def _list_objects_page(self, prefix: str = '', delimiter: str = '/', continuation_token: str = None,
+                           start_after: str = None, page_size: int = None) -> dict:
+        """按 S3 语义分页：每页最多 page_size 个条目（不超过 PAGE_SIZE），next_token 为本页最后处理的键"""
+        self._record('list_objects_page')
+        page_size = min(page_size or self.PAGE_SIZE, self.PAGE_SIZE)
+        with self.lock:
+            keys = sorted(key for key in self.objects if key.startswith(prefix))
+        objects, common_prefixes = [], []
+        last_key = None
+        for key in keys:
+            if not continuation_token and start_after and key <= start_after:
+                continue
+            if continuation_token and (key <= continuation_token or (
+                    delimiter and continuation_token.endswith(delimiter) and key.startswith(continuation_token))):
+                continue  # 上一页最后是文件夹时，跳过其中所有的键
+            rest = key[len(prefix):]
+            if delimiter and delimiter in rest:
+                folder = prefix + rest.split(delimiter)[0] + delimiter
+                if common_prefixes and common_prefixes[-1] == folder:
+                    continue  # 同一文件夹下的键合并为一个条目
+                entry = folder
+            else:
+                data = self.objects[key]
+                entry = {'name': key, 'size': len(data), 'last_modified': None,
+                         'type': 'file', 'etag': hashlib.md5(data).hexdigest()}
+            if len(objects) + len(common_prefixes) == page_size:
+                return {'objects': objects, 'common_prefixes': common_prefixes, 'next_token': last_key}
+            if isinstance(entry, str):
+                common_prefixes.append(entry)
+                last_key = entry
+            else:
+                objects.append(entry)
+                last_key = key
+        return {'objects': objects, 'common_prefixes': common_prefixes, 'next_token': None}
+
+    def get_presigned_url(self, object_name: str, expires: int = 3600) -> str:
+        return self.get_public_url(object_name)
+
+    def get_public_url(self, object_name: str) -> str:
+        return f"https://{self.config.endpoint}/{self.config.bucket_name}/{object_name}"
+
+    def create_folder(self, folder_name: str) -> None:
+        self.put_object(folder_name.rstrip('/') + '/', b'')
+
+    def _copy_object(self, source_key: str, target_key: str) -> None:
+        self._record('copy_object')
+        with self.lock:
+            if source_key not in self.objects:
+                raise ObjectNotFoundError(f"Source object not found: {source_key}")
+            if len(self.objects[source_key]) > self.MAX_COPY_SIZE:
+                raise OSSError("Failed to copy object: EntityTooLarge")
+            self.objects[target_key] = self.objects[source_key]
+
+    def upload_part_copy(self, upload: MultipartUpload, part_number: int, source_key: str,
+                         start: int, end: int, etag: Optional[str] = None) -> str:
+        self._record('upload_part_copy')
+        with self.lock:
+            if source_key not in self.objects:
+                raise ObjectNotFoundError(f"Source object not found: {source_key}")
+            data = self.objects[source_key]
+            if etag and hashlib.md5(data).hexdigest() != etag:
+                raise ObjectChangedError(f"Source object changed during copy: {source_key}")
+            self.uploads[upload.upload_id][part_number] = data[start:end + 1]
+        return hashlib.md5(data[start:end + 1]).hexdigest()
+
+    def move_object(self, source: str, destination: str) -> None:
+        with self.lock:
+            self.objects[destination] = self.objects.pop(source)
+
+    def list_buckets(self) -> List[Dict]:
+        return [{'name': self.config.bucket_name}]
+
+    def set_bucket_policy(self, policy: Dict) -> None:
+        pass
+
+    def init_multipart_upload(self, object_name: str, content_type: str = None) -> MultipartUpload:
+        self._record('init_multipart_upload')
+        with self.lock:
+            self._next_upload_id += 1
+            upload_id = f"upload-{self._next_upload_id}"
+            self.uploads[upload_id] = {}
+            self.upload_keys[upload_id] = object_name
+        return MultipartUpload(object_name=object_name, upload_id=upload_id)
+
+    def upload_part(self, upload: MultipartUpload, part_number: int, data) -> str:
+        self._record('upload_part')
+        if hasattr(data, 'read'):
+            data = data.read()
+        data = bytes(data)
+        with self.lock:
+            self.uploads[upload.upload_id][part_number] = bytes(data)
+        return hashlib.md5(data).hexdigest()
+
+    def complete_multipart_upload(self, upload: MultipartUpload) -> str:
+        self._record('complete_multipart_upload')
+        with self.lock:
+            parts = self.uploads.pop(upload.upload_id)
+            self.objects[upload.object_name] = b''.join(
+                parts[part_number] for part_number, _ in sorted(upload.parts)
+            )
+        # 与 S3 一样按收到的分片数据计算对象 ETag
+        upload.etag = composite_etag(hashlib.md5(parts[n]).hexdigest() for n, _ in sorted(upload.parts))
+        return self.get_public_url(upload.object_name)
+
+    def abort_multipart_upload(self, upload: MultipartUpload) -> None:
+        self._record('abort_multipart_upload')
+        with self.lock:
+            self.uploads.pop(upload.upload_id, None)
+
+    def list_multipart_uploads(self, prefix: str = '') -> List[MultipartUpload]:
+        self._record('list_multipart_uploads')
+        with self.lock:
+            return [
+                MultipartUpload(object_name=key, upload_id=upload_id)
+                for upload_id, key in self.upload_keys.items()
+                if upload_id in self.uploads and key.startswith(prefix)
+            ]
+
+    def list_parts(self, upload: MultipartUpload) -> List[Dict]:
+        self._record('list_parts')
+        with self.lock:
+            parts = self.uploads[upload.upload_id]
+            return [
+                {'part_number': n, 'etag': hashlib.md5(data).hexdigest(), 'size': len(data)}
+                for n, data in sorted(parts.items())
+            ]
+
+
+def transfer_settings(chunk_size: int = 1024, workers: int = 1, adaptive: bool = False) -> Dict:
+    """固定的传输设置，测试不读取本机 settings.json"""
+    return {
+        'multipart_enabled': True,
+        'chunk_size': chunk_size,
+        'workers': workers,
+        'adaptive': adaptive,
+        'max_workers': workers,
+        'verify_checksum': True
+    }
@@ -0,0 +1,88 @@
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ossnake.utils.adaptive_concurrency import AdaptiveConcurrency, record_idle
+
+
+class TestAdaptiveConcurrency(unittest.TestCase):
+    def succeed(self, controller, count, nbytes=1024 * 1024):
+        for _ in range(count):
+            with controller.slot():
+                pass
+            # 固定耗时约 0.1 秒，避免计时抖动被当作延迟升高
+            controller.record_success(nbytes, time.monotonic() - 0.1)
+
+    def test_additive_increase_up_to_ceiling(self):
+        controller = AdaptiveConcurrency(initial=2, ceiling=5)
+        # 每完成约 limit 个分片增加 1
+        self.succeed(controller, 3)
+        self.assertEqual(controller.limit, 3)
+        self.succeed(controller, 100)
+        self.assertEqual(controller.limit, 5)
+
+    def test_congestion_halves_once_per_epoch(self):
+        controller = AdaptiveConcurrency(initial=8, ceiling=8)
+        started = time.monotonic()
+        self.assertTrue(controller.record_failure(IOError("503 SlowDown: Please reduce your request rate"), started))
+        self.assertEqual(controller.limit, 4)
+        # 减少之前开始的分片再次报错，不再继续减少
+        controller.record_failure(TimeoutError("read timed out"), started)
+        self.assertEqual(controller.limit, 4)
+        controller.record_failure(TimeoutError("read timed out"), time.monotonic())
+        self.assertEqual(controller.limit, 2)
+
+    def test_latency_inflation_shrinks(self):
+        controller = AdaptiveConcurrency(initial=8, ceiling=8)
+        self.succeed(controller, 3)
+        controller.record_success(1024 * 1024, time.monotonic() - 1.0)
+        self.assertEqual(controller.limit, 4)
+
+    def test_throttle_wait_is_not_latency(self):
+        controller = AdaptiveConcurrency(initial=8, ceiling=8)
+        self.succeed(controller, 3)
+        with controller.slot() as started:
+            # 0.25 秒中有 0.2 秒在等待限速，扣除后不超过基线（约 0.1 秒）的 2 倍
+            time.sleep(0.25)
+            record_idle(0.2)
+        controller.record_success(1024 * 1024, started)
+        self.assertEqual(controller.limit, 8)
+
+    def test_other_errors_do_not_shrink(self):
+        controller = AdaptiveConcurrency(initial=4, ceiling=8)
+        self.assertFalse(controller.record_failure(IOError("AccessDenied"), time.monotonic()))
+        self.assertEqual(controller.limit, 4)
+
+    def test_fixed_when_not_adaptive(self):
+        controller = AdaptiveConcurrency(initial=3, ceiling=16, adaptive=False)
+        self.succeed(controller, 50)
+        controller.record_failure(IOError("503"), time.monotonic())
+        self.assertEqual(controller.limit, 3)
+        self.assertEqual(controller.ceiling, 3)
+
+    def test_slots_are_bounded_by_limit(self):
+        controller = AdaptiveConcurrency(initial=2, ceiling=2)
+        peak = 0
+        lock = threading.Lock()
+
+        def work():
+            nonlocal peak
+            with controller.slot():
+                with lock:
+                    peak = max(peak, controller.in_flight)
+                time.sleep(0.01)
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(5)
+        self.assertEqual(peak, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import sys
+import time
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ossnake.utils.bandwidth_limiter import BandwidthLimiter, TokenBucket
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_unlimited_never_waits(self):
+        self.assertEqual(TokenBucket(None).consume(10 ** 9), 0.0)
+
+    def test_rate_is_enforced(self):
+        bucket = TokenBucket(100 * 1024)
+        start = time.monotonic()
+        bucket.consume(50 * 1024, step=8 * 1024)
+        elapsed = time.monotonic() - start
+        # 扣除 0.25 秒的突发额度后，约需 0.25 秒
+        self.assertGreater(elapsed, 0.2)
+        self.assertLess(elapsed, 1.0)
+
+
+class TestBandwidthLimiter(unittest.TestCase):
+    def setUp(self):
+        self.limiter = BandwidthLimiter()
+
+    def tearDown(self):
+        self.limiter.reload({})
+
+    def test_singleton(self):
+        self.assertIs(BandwidthLimiter(), self.limiter)
+
+    def test_base_limits(self):
+        self.limiter.reload({'upload_limit': 512, 'download_limit': 0})
+        self.assertEqual(self.limiter.current_limit('upload'), 512 * 1024)
+        self.assertIsNone(self.limiter.current_limit('download'))
+
+    def test_schedule_across_midnight(self):
+        self.limiter.reload({
+            'upload_limit': 256,
+            'schedules': [{'start': '22:00', 'end': '06:00', 'upload': 0}]
+        })
+        self.assertIsNone(self.limiter.current_limit('upload', datetime(2024, 1, 1, 23, 30)))
+        self.assertIsNone(self.limiter.current_limit('upload', datetime(2024, 1, 1, 5, 59)))
+        self.assertEqual(self.limiter.current_limit('upload', datetime(2024, 1, 1, 12, 0)), 256 * 1024)
+
+    def test_schedule_only_overrides_given_direction(self):
+        self.limiter.reload({
+            'download_limit': 1024,
+            'schedules': [{'start': '09:00', 'end': '18:00', 'upload': 128}]
+        })
+        now = datetime(2024, 1, 1, 10, 0)
+        self.assertEqual(self.limiter.current_limit('upload', now), 128 * 1024)
+        self.assertEqual(self.limiter.current_limit('download', now), 1024 * 1024)
+
+
+if __name__ == '__main__':
+    unittest.main()
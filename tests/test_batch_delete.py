@@ -0,0 +1,124 @@
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ossnake.driver.base_oss import BaseOSSClient
+from ossnake.driver.exceptions import AuthenticationError, TransferCancelledError
+from ossnake.utils.batch_delete import BatchDeleter
+from ossnake.utils.transfer_token import TransferToken
+from tests.fake_client import FakeOSSClient
+
+
+class BatchClient(FakeOSSClient):
+    """每批最多 10 个对象，记录批次大小和并发峰值"""
+
+    MAX_DELETE_BATCH = 10
+
+    def __init__(self, refuse=(), error=None):
+        super().__init__()
+        self.refuse = set(refuse)
+        self.error = error
+        self.batches = []
+        self.active = 0
+        self.peak = 0
+        self.release = threading.Event()
+        self.release.set()
+
+    def delete_objects(self, object_names):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            self.release.wait(5)
+            if self.error:
+                raise self.error
+            self.batches.append(len(object_names))
+            super().delete_objects([name for name in object_names if name not in self.refuse])
+            return {name: 'AccessDenied: denied' for name in object_names if name in self.refuse}
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+class TestBatchDelete(unittest.TestCase):
+    def make_client(self, **kwargs):
+        client = BatchClient(**kwargs)
+        client.PAGE_SIZE = 7
+        for i in range(45):
+            client.objects[f"logs/{i // 10}/{i:03}.log"] = b'x'
+        client.objects['logs/'] = b''
+        client.objects['logs/3/'] = b''
+        client.objects['logs-old.txt'] = b'keep'
+        client.objects['other/a.txt'] = b'keep'
+        return client
+
+    def test_delete_prefix_in_batches(self):
+        client = self.make_client()
+        progress = []
+        result = client.delete_prefix('logs/', lambda deleted, total: progress.append(deleted))
+
+        self.assertEqual(result, {'deleted': 47, 'failed': {}})
+        # 文件夹标记一并删除，同名前缀的其他对象保留
+        self.assertEqual(sorted(client.objects), ['logs-old.txt', 'other/a.txt'])
+        self.assertEqual(sorted(client.batches), [7] + [10] * 4)
+        self.assertEqual(max(progress), 47)
+        self.assertNotIn('delete_file', client.calls)
+
+    def test_batches_run_concurrently(self):
+        client = self.make_client()
+        client.release.clear()
+        deleter = BatchDeleter(client)
+        thread = threading.Thread(target=deleter.delete, args=([f"k{i}" for i in range(40)],))
+        thread.start()
+        try:
+            for _ in range(100):
+                if client.active >= 2:
+                    break
+                time.sleep(0.01)
+        finally:
+            client.release.set()
+            thread.join(5)
+        self.assertGreaterEqual(client.peak, 2)
+        self.assertLessEqual(client.peak, BatchDeleter.WORKERS)
+
+    def test_per_key_failures_are_reported(self):
+        client = self.make_client(refuse={'logs/0/003.log'})
+        result = client.delete_prefix('logs/')
+        self.assertEqual(result['deleted'], 46)
+        self.assertEqual(result['failed'], {'logs/0/003.log': 'AccessDenied: denied'})
+        self.assertIn('logs/0/003.log', client.objects)
+
+    def test_authentication_error_stops(self):
+        client = self.make_client(error=AuthenticationError("denied"))
+        with self.assertRaises(AuthenticationError):
+            client.delete_prefix('logs/')
+
+    def test_cancel_stops_listing(self):
+        client = self.make_client()
+        token = TransferToken()
+        token.cancel()
+        with self.assertRaises(TransferCancelledError):
+            client.delete_prefix('logs/', token=token)
+        self.assertEqual(client.batches, [])
+
+    def test_default_delete_objects_reports_failures(self):
+        class SingleDeleteClient(FakeOSSClient):
+            def delete_file(self, object_name):
+                if object_name == 'b':
+                    raise PermissionError("denied")
+                super().delete_file(object_name)
+
+        client = SingleDeleteClient()
+        client.objects.update({'a': b'1', 'b': b'2'})
+        # 驱动没有多对象删除接口时逐个删除
+        failed = BaseOSSClient.delete_objects(client, ['a', 'b'])
+        self.assertEqual(failed, {'b': 'denied'})
+        self.assertEqual(list(client.objects), ['b'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import hashlib
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ossnake.driver.exceptions import ChecksumMismatchError
+from ossnake.driver.transfer_manager import TransferManager
+from ossnake.utils.checksums import composite_etag, is_md5_etag
+from ossnake.utils.part_source import PartReader
+from ossnake.utils.stream_upload import StreamUploader
+from ossnake.utils.transfer_journal import TransferJournal
+from tests.fake_client import FakeOSSClient, transfer_settings
+
+
+class CorruptingClient(FakeOSSClient):
+    """指定分片第一次上传时服务端收到的数据损坏（ETag 按损坏后的数据计算）"""
+
+    def __init__(self, corrupt_parts=(), object_etag=None):
+        super().__init__()
+        self.corrupt_parts = set(corrupt_parts)
+        self.object_etag = object_etag
+        self.uploaded_parts = []
+
+    def upload_part(self, upload, part_number, data):
+        self.uploaded_parts.append(part_number)
+        if part_number in self.corrupt_parts:
+            self.corrupt_parts.discard(part_number)
+            data.read()  # 客户端照常发送
+            return super().upload_part(upload, part_number, b'\x00' * len(data))
+        return super().upload_part(upload, part_number, data)
+
+    def complete_multipart_upload(self, upload):
+        url = super().complete_multipart_upload(upload)
+        if self.object_etag:
+            upload.etag = self.object_etag
+        return url
+
+
+class TestChecksums(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.local_file = os.path.join(self.tmpdir.name, 'data.bin')
+        self.data = os.urandom(4 * 1024 + 100)
+        with open(self.local_file, 'wb') as f:
+            f.write(self.data)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def make_manager(self, verify=True):
+        manager = TransferManager()
+        manager.upload_settings = transfer_settings(chunk_size=1024, workers=2)
+        manager.upload_settings['verify_checksum'] = verify
+        manager.RETRY_BASE_DELAY = 0
+        manager.journal = TransferJournal(os.path.join(self.tmpdir.name, 'transfers'))
+        return manager
+
+    def test_reader_hashes_while_sending(self):
+        data = os.urandom(1000)
+        reader = PartReader(memoryview(data))
+        buffer = bytearray(300)
+        while reader.readinto(buffer):
+            pass
+        # SDK 重试时从头重读，MD5 不重复计算
+        reader.seek(0)
+        reader.read(500)
+        self.assertEqual(reader.md5_hex(), hashlib.md5(data).hexdigest())
+
+    def test_digest_covers_unread_remainder(self):
+        data = os.urandom(1000)
+        reader = PartReader(memoryview(data))
+        reader.read(10)
+        self.assertEqual(reader.md5_hex(), hashlib.md5(data).hexdigest())
+
+    def test_composite_etag_follows_s3_rule(self):
+        parts = [b'a' * 10, b'b' * 5]
+        etags = [f'"{hashlib.md5(part).hexdigest().upper()}"' for part in parts]
+        expected = hashlib.md5(b''.join(hashlib.md5(part).digest() for part in parts)).hexdigest()
+        self.assertEqual(composite_etag(etags), f"{expected}-2")
+        self.assertIsNone(composite_etag(etags + ['not-an-md5']))
+        self.assertFalse(is_md5_etag(f"{expected}-2"))
+
+    def test_corrupted_part_is_reuploaded_alone(self):
+        client = CorruptingClient(corrupt_parts={3})
+        self.make_manager().upload_file(client, self.local_file, 'data.bin')
+        self.assertEqual(client.objects['data.bin'], self.data)
+        self.assertEqual(sorted(client.uploaded_parts), [1, 2, 3, 3, 4, 5])
+
+    def test_object_etag_mismatch_fails_upload(self):
+        client = CorruptingClient(object_etag='0' * 32 + '-5')
+        manager = self.make_manager()
+        with self.assertRaises(ChecksumMismatchError):
+            manager.upload_file(client, self.local_file, 'data.bin')
+        # 对象已合并：不取消分片上传，也不保留续传日志
+        self.assertNotIn('abort_multipart_upload', client.calls)
+        self.assertEqual(list(manager.journal.journal_dir.glob('*.journal')), [])
+
+    def test_verification_can_be_disabled(self):
+        client = CorruptingClient(corrupt_parts={2}, object_etag='kms-etag')
+        self.make_manager(verify=False).upload_file(client, self.local_file, 'data.bin')
+        self.assertEqual(client.uploaded_parts.count(2), 1)
+
+    def test_progress_checksum_is_composite_of_part_etags(self):
+        client = FakeOSSClient()
+        manager = self.make_manager()
+        identity = TransferJournal.file_identity(self.local_file)
+        key = manager._get_transfer_key(client, 'data.bin', identity)
+        manager.journal.create(key, upload_id='u1', part_size=1024, **identity)
+        self.assertEqual(manager.get_progress(self.local_file, 'data.bin', client).checksum,
+                         identity['sample_hash'])
+        etags = [hashlib.md5(self.data[:1024]).hexdigest(), hashlib.md5(self.data[1024:2048]).hexdigest()]
+        for n, etag in enumerate(etags, start=1):
+            manager.journal.record_part(key, n, etag, 1024)
+        self.assertEqual(manager.get_progress(self.local_file, 'data.bin', client).checksum,
+                         composite_etag(etags))
+
+    def test_stream_upload_retries_corrupted_part(self):
+        client = CorruptingClient(corrupt_parts={2})
+        uploader = StreamUploader(client, part_size=100, workers=2, verify_checksum=True)
+        uploader.RETRY_BASE_DELAY = 0
+        data = os.urandom(350)
+        uploader.upload(iter([data]), 'stream.bin')
+        self.assertEqual(client.objects['stream.bin'], data)
+        self.assertEqual(client.uploaded_parts.count(2), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import mmap
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ossnake.utils.content_cache import ContentCache
+from tests.fake_client import FakeOSSClient
+
+
+class TestContentCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = ContentCache()
+        self.original_dir = self.cache.cache_dir
+        self.cache.configure({'cache_size': 1}, cache_dir=self.tmpdir.name)
+        self.cache.clear()
+        self.client = FakeOSSClient()
+        self.client.objects['notes.txt'] = '缓存内容'.encode('gbk')
+        self.client.objects['photo.jpg'] = os.urandom(200 * 1024)
+
+    def tearDown(self):
+        self.cache.clear()
+        self.cache.__dict__.pop('MEMORY_OBJECT_LIMIT', None)
+        self.cache.configure(cache_dir=str(self.original_dir))
+        self.tmpdir.cleanup()
+
+    def test_second_fetch_is_served_from_cache(self):
+        first = self.cache.fetch(self.client, 'notes.txt')
+        self.client.calls.clear()
+        second = self.cache.fetch(self.client, 'notes.txt')
+        self.assertEqual(str(second, 'gbk'), '缓存内容')
+        self.assertEqual(bytes(first), bytes(second))
+        # 版本取自元数据缓存，不再 HEAD，也不再读取内容
+        self.assertEqual(self.client.calls, [])
+
+    def test_known_etag_skips_head(self):
+        info = self.client.get_object_info('notes.txt')
+        self.cache.fetch(self.client, 'notes.txt')
+        self.client.calls.clear()
+        self.cache.fetch(self.client, 'notes.txt', etag=info['etag'], size=info['size'])
+        self.assertEqual(self.client.calls, [])
+
+    def test_disk_hit_is_memory_mapped(self):
+        self.cache.MEMORY_OBJECT_LIMIT = 1024  # 图片只进入磁盘层
+        self.cache.fetch(self.client, 'photo.jpg')
+        data = self.cache.fetch(self.client, 'photo.jpg')
+        self.assertIsInstance(data, mmap.mmap)
+        self.assertEqual(bytes(data), self.client.objects['photo.jpg'])
+        self.assertEqual(data[:4], self.client.objects['photo.jpg'][:4])
+        data.close()
+
+    def test_changed_object_is_refetched(self):
+        self.cache.fetch(self.client, 'notes.txt')
+        # 绕过客户端直接修改，ETag 变化后不命中旧版本
+        self.client.objects['notes.txt'] = b'new'
+        self.client.metadata_cache.clear()  # 元数据缓存过期
+        self.assertEqual(bytes(self.cache.fetch(self.client, 'notes.txt')), b'new')
+        self.assertEqual(self.cache.usage()['files'], 1)
+
+    def test_mutating_calls_invalidate(self):
+        self.cache.fetch(self.client, 'notes.txt')
+        self.client.put_object('notes.txt', b'v2')
+        self.assertEqual(self.cache.usage()['files'], 0)
+
+        self.cache.fetch(self.client, 'notes.txt')
+        self.client.move_object('notes.txt', 'moved.txt')
+        self.assertEqual(self.cache.usage()['files'], 0)
+
+        self.cache.fetch(self.client, 'moved.txt')
+        self.client.delete_file(object_name='moved.txt')
+        self.assertEqual(self.cache.usage(), {'memory': 0, 'disk': 0, 'files': 0, 'budget': 1024 * 1024})
+
+    def test_disk_budget_evicts_least_recently_used(self):
+        for i in range(6):
+            self.client.objects[f'img{i}.jpg'] = os.urandom(200 * 1024)
+            self.cache.fetch(self.client, f'img{i}.jpg')
+            # 第一个对象一直被访问，不被淘汰
+            self.cache.fetch(self.client, 'photo.jpg')
+        usage = self.cache.usage()
+        self.assertLessEqual(usage['disk'], 1024 * 1024)
+        self.client.calls.clear()
+        self.cache.fetch(self.client, 'photo.jpg')
+        self.assertNotIn('iter_object_range', self.client.calls)
+        self.cache.fetch(self.client, 'img0.jpg')
+        self.assertIn('iter_object_range', self.client.calls)
+
+    def test_cache_survives_restart(self):
+        self.cache.fetch(self.client, 'photo.jpg')
+        # 模拟重新启动：清空内存层和文件表
+        self.cache._memory.clear()
+        self.cache._memory_bytes = 0
+        self.cache._files = None
+        self.client.calls.clear()
+        self.cache.fetch(self.client, 'photo.jpg')
+        self.assertNotIn('iter_object_range', self.client.calls)
+        self.assertEqual(self.cache.usage()['files'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ossnake.driver.exceptions import TransferCancelledError
+from ossnake.driver.transfer_manager import TransferManager
+from ossnake.utils.directory_download import DirectoryDownloader
+from ossnake.utils.transfer_token import TransferToken
+from tests.fake_client import FakeOSSClient, transfer_settings
+
+
+class TestDirectoryDownload(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.local_dir = os.path.join(self.tmpdir.name, 'out')
+        self.client = FakeOSSClient()
+        self.client.PAGE_SIZE = 2  # 多页列举
+        self.files = {
+            'photos/a.jpg': os.urandom(10),
+            'photos/2024/b.jpg': os.urandom(100),
+            'photos/2024/deep/c.raw': os.urandom(5000),
+            'photos/empty.txt': b'',
+            'photos/2024/': b'',  # 文件夹标记
+            'other/d.txt': os.urandom(20),
+        }
+        self.client.objects.update(self.files)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def make_downloader(self, token=None):
+        manager = TransferManager()
+        manager.RETRY_BASE_DELAY = 0
+        manager.download_settings = transfer_settings(chunk_size=1024, workers=2)
+        downloader = DirectoryDownloader(self.client, manager, token)
+        downloader.RETRY_BASE_DELAY = 0
+        return downloader
+
+    def read(self, relative):
+        with open(os.path.join(self.local_dir, *relative.split('/')), 'rb') as f:
+            return f.read()
+
+    def test_downloads_tree_without_head_requests(self):
+        progress = []
+        result = self.make_downloader().download(
+            'photos', self.local_dir, lambda done, total: progress.append((done, total))
+        )
+
+        total = 10 + 100 + 5000
+        self.assertEqual(result, {'files': 4, 'bytes': total, 'failed': {}})
+        self.assertEqual(self.read('a.jpg'), self.files['photos/a.jpg'])
+        self.assertEqual(self.read('2024/b.jpg'), self.files['photos/2024/b.jpg'])
+        self.assertEqual(self.read('2024/deep/c.raw'), self.files['photos/2024/deep/c.raw'])
+        self.assertEqual(self.read('empty.txt'), b'')
+        self.assertFalse(os.path.exists(os.path.join(self.local_dir, 'd.txt')))
+        # 大小和 ETag 取自列举结果
+        self.assertNotIn('get_object_info', self.client.calls)
+        self.assertGreater(self.client.calls.count('list_objects_page'), 1)
+        self.assertEqual(progress[-1], (total, total))
+
+    def test_changed_object_is_reported_and_others_continue(self):
+        downloader = self.make_downloader()
+        original = self.client.iter_objects
+
+        def iter_objects(prefix, recursive=True):
+            for obj in original(prefix, recursive):
+                if obj['name'] == 'photos/a.jpg':
+                    # 列举之后对象被覆盖
+                    self.client.objects['photos/a.jpg'] = b'changed'
+                yield obj
+
+        self.client.iter_objects = iter_objects
+        result = downloader.download('photos/', self.local_dir)
+
+        self.assertEqual(list(result['failed']), ['photos/a.jpg'])
+        self.assertEqual(result['files'], 3)
+        self.assertFalse([name for name in os.listdir(self.local_dir) if name.startswith('a.jpg')])
+
+    def test_cancelled_token_stops_download(self):
+        token = TransferToken()
+        token.cancel()
+        with self.assertRaises(TransferCancelledError):
+            self.make_downloader(token).download('photos', self.local_dir)
+        self.assertNotIn('iter_object_range', self.client.calls)
+
+    def test_iter_objects_pages_lazily(self):
+        objects = self.client.iter_objects('photos/', recursive=True)
+        self.assertEqual(next(objects)['name'], 'photos/2024/')
+        # 第一页返回后最多预取一页
+        self.assertLessEqual(self.client.calls.count('list_objects_page'), 2)
+        names = [obj['name'] for obj in objects]
+        self.assertEqual(names, ['photos/2024/b.jpg', 'photos/2024/deep/c.raw',
+                                 'photos/a.jpg', 'photos/empty.txt'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ossnake.driver.exceptions import AuthenticationError, TransferCancelledError
+from ossnake.driver.transfer_manager import TransferManager
+from ossnake.utils.directory_upload import DirectoryUploader, iter_files
+from ossnake.utils.transfer_journal import TransferJournal
+from ossnake.utils.transfer_token import TransferToken
+from tests.fake_client import FakeOSSClient, transfer_settings
+
+
+class SmallThresholdClient(FakeOSSClient):
+    """超过 1KB 的文件走分片上传"""
+
+    TRANSFER_MANAGER_THRESHOLD = 1024
+
+    def __init__(self, fail_name=None, fail_error=None):
+        super().__init__()
+        self.fail_name = fail_name
+        self.fail_error = fail_error or PermissionError("AccessDenied")
+
+    def _upload_file(self, local_file, object_name, progress_callback=None):
+        if object_name == self.fail_name:
+            raise self.fail_error
+        return super()._upload_file(local_file, object_name, progress_callback)
+
+
+class TestDirectoryUpload(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmpdir.name, 'data')
+        self.files = {}
+        for relative, size in [('a.txt', 10), ('sub/b.txt', 100), ('sub/deep/c.bin', 4096),
+                               ('sub/deep/d.txt', 0), ('e.bin', 3000)]:
+            path = os.path.join(self.root, *relative.split('/'))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            data = os.urandom(size)
+            with open(path, 'wb') as f:
+                f.write(data)
+            self.files[relative] = data
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def make_uploader(self, client, token=None):
+        manager = TransferManager()
+        manager.RETRY_BASE_DELAY = 0
+        manager.upload_settings = transfer_settings(chunk_size=1024, workers=2)
+        manager.journal = TransferJournal(os.path.join(self.tmpdir.name, 'transfers'))
+        uploader = DirectoryUploader(client, manager, token)
+        uploader.RETRY_BASE_DELAY = 0
+        return uploader
+
+    def test_iter_files_walks_tree(self):
+        found = {relative: size for _, relative, size in iter_files(self.root)}
+        self.assertEqual(found, {relative: len(data) for relative, data in self.files.items()})
+
+    def test_uploads_small_and_large_files_with_structure(self):
+        client = SmallThresholdClient()
+        progress = []
+        result = self.make_uploader(client).upload(
+            self.root, 'backup/', lambda done, total: progress.append((done, total))
+        )
+
+        total = sum(len(data) for data in self.files.values())
+        self.assertEqual(result, {'files': len(self.files), 'bytes': total, 'failed': {}})
+        for relative, data in self.files.items():
+            self.assertEqual(client.objects[f"backup/{relative}"], data)
+        # 大文件走分片上传，小文件一次 PUT
+        self.assertEqual(client.calls.count('complete_multipart_upload'), 2)
+        self.assertEqual(progress[-1], (total, total))
+
+    def test_failed_file_does_not_stop_others(self):
+        client = SmallThresholdClient(fail_name='sub/b.txt')
+        result = self.make_uploader(client).upload(self.root)
+
+        self.assertEqual(list(result['failed']), [os.path.join(self.root, 'sub', 'b.txt')])
+        self.assertEqual(result['files'], len(self.files) - 1)
+        self.assertNotIn('sub/b.txt', client.objects)
+        self.assertEqual(client.objects['sub/deep/c.bin'], self.files['sub/deep/c.bin'])
+
+    def test_authentication_error_stops_upload(self):
+        client = SmallThresholdClient(fail_name='a.txt', fail_error=AuthenticationError("denied"))
+        uploader = self.make_uploader(client)
+        uploader.SMALL_FILE_WORKERS = 1
+        with self.assertRaises(AuthenticationError):
+            uploader.upload(self.root)
+
+    def test_cancelled_token_stops_upload(self):
+        client = SmallThresholdClient()
+        token = TransferToken()
+        token.cancel()
+        with self.assertRaises(TransferCancelledError):
+            self.make_uploader(client, token).upload(self.root)
+        self.assertEqual(client.objects, {})
+
+    def test_client_upload_directory(self):
+        client = FakeOSSClient()
+        result = client.upload_directory(os.path.join(self.root, 'sub'), 'x')
+        self.assertEqual(result['files'], 3)
+        self.assertEqual(client.objects['x/deep/c.bin'], self.files['sub/deep/c.bin'])
+
+
+if __name__ == '__main__':
+    unittest.main()
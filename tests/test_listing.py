@@ -0,0 +1,86 @@
+import sys
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ossnake.utils.listing import Listing
+from tests.fake_client import FakeOSSClient
+
+T1 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+T2 = datetime(2024, 6, 1, 12, 30, tzinfo=timezone.utc)
+
+
+class TestListing(unittest.TestCase):
+    def setUp(self):
+        self.objects = [
+            {'name': 'data/b.txt', 'size': 20, 'last_modified': T2, 'type': 'file', 'etag': '"bb"'},
+            {'name': 'data/A.log', 'size': 5, 'last_modified': T1, 'type': 'file', 'etag': 'aa'},
+            {'name': 'data/sub/', 'size': 0, 'last_modified': None, 'type': 'folder'},
+            {'name': 'data/日志/c.txt', 'size': 7, 'last_modified': 1704067200, 'type': 'file', 'etag': 'cc'},
+        ]
+        self.listing = Listing(self.objects, prefix='data/')
+
+    def test_entries_behave_like_dicts(self):
+        first = self.listing[0]
+        self.assertEqual(first['name'], 'data/b.txt')
+        self.assertEqual(first['size'], 20)
+        self.assertEqual(first['etag'], 'bb')
+        self.assertEqual(first['last_modified'], T2)
+        self.assertEqual(first.get('missing', 'x'), 'x')
+        folder = self.listing[2]
+        self.assertEqual(dict(folder), {'name': 'data/sub/', 'size': 0, 'last_modified': None,
+                                        'type': 'folder', 'display_name': 'sub'})
+        self.assertNotIn('etag', folder)
+        self.assertEqual(self.listing[-1]['name'], 'data/日志/c.txt')
+        self.assertEqual(self.listing[-1]['last_modified'], T1)
+        self.assertEqual(len(self.listing), 4)
+        self.assertEqual([obj['name'] for obj in self.listing[1:3]], ['data/A.log', 'data/sub/'])
+        with self.assertRaises(IndexError):
+            self.listing[4]
+
+    def test_names_outside_prefix_rebase(self):
+        self.listing.append({'name': 'dat', 'size': 1, 'type': 'file'})
+        self.assertEqual(self.listing.prefix, 'dat')
+        self.assertEqual(list(self.listing.names())[0], 'data/b.txt')
+        self.assertEqual(self.listing[-1]['name'], 'dat')
+
+    def test_filter(self):
+        names = lambda listing: list(listing.names())
+        self.assertEqual(names(self.listing.filter(contains='.txt')), ['data/b.txt', 'data/日志/c.txt'])
+        self.assertEqual(names(self.listing.filter(contains='a/b')), ['data/b.txt'])  # 跨越共同前缀
+        self.assertEqual(len(self.listing.filter(contains='ata')), 4)
+        self.assertEqual(names(self.listing.filter(type='folder')), ['data/sub/'])
+        self.assertEqual(names(self.listing.filter(min_size=6, max_size=20)), ['data/b.txt', 'data/日志/c.txt'])
+        self.assertEqual(names(self.listing.filter(prefix='data/日')), ['data/日志/c.txt'])
+        self.assertEqual(names(self.listing.filter(suffix='.log')), ['data/A.log'])
+        self.assertEqual(names(self.listing.filter(modified_after=T1)), ['data/b.txt'])
+        self.assertEqual(names(self.listing.filter(type='file', predicate=lambda obj: obj['etag'] == 'cc')),
+                         ['data/日志/c.txt'])
+
+    def test_sort(self):
+        names = lambda listing: list(listing.names())
+        self.assertEqual(names(self.listing.sort()), ['data/A.log', 'data/b.txt', 'data/sub/', 'data/日志/c.txt'])
+        self.assertEqual(names(self.listing.sort(by='size', reverse=True))[:2], ['data/b.txt', 'data/日志/c.txt'])
+        self.assertEqual(names(self.listing.sort(folders_first=True, ignore_case=True)),
+                         ['data/sub/', 'data/A.log', 'data/b.txt', 'data/日志/c.txt'])
+        self.assertEqual(names(self.listing.sort(by='last_modified'))[0], 'data/sub/')
+        self.assertEqual(self.listing.sort(by='size')[1]['etag'], 'aa')
+        with self.assertRaises(ValueError):
+            self.listing.sort(by='owner')
+
+    def test_list_objects_returns_listing(self):
+        client = FakeOSSClient()
+        client.PAGE_SIZE = 2
+        client.objects.update({'docs/a.txt': b'aaa', 'docs/b.txt': b'b', 'docs/img/x.png': b'xx', 'top': b''})
+        listing = client.list_objects('docs')
+        self.assertIsInstance(listing, Listing)
+        self.assertEqual(sorted(listing.names()), ['docs/a.txt', 'docs/b.txt', 'docs/img/'])
+        self.assertEqual(listing.filter(type='folder')[0]['display_name'], 'img')
+        self.assertEqual(listing.total_size(), 4)
+        self.assertEqual(len(client.list_objects(recursive=True)), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
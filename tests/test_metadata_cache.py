@@ -0,0 +1,93 @@
+import sys
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ossnake.driver.exceptions import ObjectNotFoundError
+from ossnake.utils.metadata_cache import MetadataCache
+from tests.fake_client import FakeOSSClient
+
+
+class RacingClient(FakeOSSClient):
+    """HEAD 进行期间对象被修改"""
+
+    def get_object_info(self, object_name):
+        info = super().get_object_info(object_name)
+        self.metadata_cache.invalidate(object_name)
+        return info
+
+
+class TestMetadataCache(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeOSSClient()
+        self.client.objects.update({'a.txt': b'aaa', 'dir/b.txt': b'bb', 'dir/': b''})
+
+    def heads(self):
+        return self.client.calls.count('get_object_info')
+
+    def test_repeated_head_calls_hit_cache(self):
+        info = self.client.get_object_info('a.txt')
+        self.assertEqual(self.client.get_object_info('a.txt'), info)
+        self.assertEqual(self.client.get_object_size('a.txt'), 3)
+        self.assertTrue(self.client.object_exists('a.txt'))
+        self.assertEqual(self.heads(), 1)
+        # 返回副本，调用方修改不影响缓存
+        info['size'] = 0
+        self.assertEqual(self.client.get_object_info('a.txt')['size'], 3)
+
+    def test_negative_entries(self):
+        with self.assertRaises(ObjectNotFoundError):
+            self.client.get_object_info('missing.txt')
+        self.assertFalse(self.client.object_exists('missing.txt'))
+        with self.assertRaises(ObjectNotFoundError):
+            self.client.get_object_size('missing.txt')
+        self.assertEqual(self.heads(), 1)
+
+    def test_listing_seeds_cache(self):
+        names = [obj['name'] for obj in self.client.iter_objects('', recursive=True)]
+        self.assertIn('dir/b.txt', names)
+        info = self.client.get_object_info('dir/b.txt')
+        self.assertEqual(info['size'], 2)
+        self.assertEqual(self.heads(), 0)
+
+    def test_mutations_invalidate(self):
+        self.assertFalse(self.client.object_exists('new.txt'))
+        self.client.put_object('new.txt', b'12345')
+        self.assertEqual(self.client.get_object_size('new.txt'), 5)
+
+        self.client.rename_folder('dir', 'moved')
+        self.assertFalse(self.client.object_exists('dir/b.txt'))
+        self.assertTrue(self.client.object_exists('moved/b.txt'))
+
+        self.client.delete_file('a.txt')
+        self.assertFalse(self.client.object_exists('a.txt'))
+
+    def test_entries_expire(self):
+        self.client._metadata_cache = MetadataCache(ttl=0.05, negative_ttl=0.05)
+        self.client.get_object_info('a.txt')
+        self.client.objects['a.txt'] = b'changed'
+        self.assertEqual(self.client.get_object_size('a.txt'), 3)
+        time.sleep(0.06)
+        self.assertEqual(self.client.get_object_size('a.txt'), 7)
+        self.assertEqual(self.heads(), 2)
+
+    def test_invalidation_during_head_is_not_overwritten(self):
+        client = RacingClient()
+        client.objects['a.txt'] = b'aaa'
+        client.get_object_info('a.txt')
+        client.get_object_info('a.txt')
+        self.assertEqual(client.calls.count('get_object_info'), 2)
+
+    def test_cache_is_bounded(self):
+        cache = MetadataCache()
+        cache.MAX_ENTRIES = 10
+        cache.seed({'name': f'k{i}', 'size': i, 'etag': f'e{i}'} for i in range(25))
+        self.assertEqual(len(cache), 10)
+        self.assertEqual(cache.lookup('k24')[1]['size'], 24)
+        self.assertEqual(cache.lookup('k0'), (False, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import hashlib
+import os
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ossnake.driver.exceptions import ObjectChangedError, TransferCancelledError
+from ossnake.utils.multipart_copy import MultipartCopier
+from ossnake.utils.transfer_token import TransferToken
+from tests.fake_client import FakeOSSClient
+
+
+class SmallCopyLimitClient(FakeOSSClient):
+    """超过 100 字节的对象分片复制，分片最大 16 字节"""
+
+    MAX_COPY_SIZE = 100
+    MAX_PART_SIZE = 16
+
+    def __init__(self):
+        super().__init__()
+        self.active = 0
+        self.peak = 0
+        self.release = threading.Event()
+        self.release.set()
+
+    def upload_part_copy(self, upload, part_number, source_key, start, end, etag=None):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            self.release.wait(5)
+            return super().upload_part_copy(upload, part_number, source_key, start, end, etag)
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+class TestMultipartCopy(unittest.TestCase):
+    def setUp(self):
+        self.client = SmallCopyLimitClient()
+        self.small = os.urandom(50)
+        self.large = os.urandom(250)
+        self.client.objects.update({'small.bin': self.small, 'large.bin': self.large})
+
+    def test_small_object_single_server_side_copy(self):
+        url = self.client.copy_object('small.bin', 'copy/small.bin')
+        self.assertTrue(url.endswith('copy/small.bin'))
+        self.assertEqual(self.client.objects['copy/small.bin'], self.small)
+        # 一次复制请求，不 HEAD，也不读取数据
+        self.assertEqual(self.client.calls, ['copy_object'])
+
+    def test_large_object_multipart_copy(self):
+        self.client.copy_object('large.bin', 'copy/large.bin', size=len(self.large))
+        self.assertEqual(self.client.objects['copy/large.bin'], self.large)
+        self.assertEqual(self.client.calls.count('upload_part_copy'), 16)
+        self.assertNotIn('copy_object', self.client.calls)
+        self.assertNotIn('get_object', self.client.calls)
+        self.assertEqual(self.client.uploads, {})
+
+    def test_unknown_size_falls_back_after_single_copy_fails(self):
+        self.client.copy_object('large.bin', 'copy/large.bin')
+        self.assertEqual(self.client.objects['copy/large.bin'], self.large)
+        self.assertEqual(self.client.calls[:2], ['copy_object', 'get_object_info'])
+        self.assertIn('complete_multipart_upload', self.client.calls)
+
+    def test_parts_copy_concurrently(self):
+        self.client.release.clear()
+        thread = threading.Thread(target=MultipartCopier(self.client).copy,
+                                  args=('large.bin', 'copy/large.bin', len(self.large)))
+        thread.start()
+        try:
+            for _ in range(100):
+                if self.client.active >= 2:
+                    break
+                time.sleep(0.01)
+        finally:
+            self.client.release.set()
+            thread.join(5)
+        self.assertGreaterEqual(self.client.peak, 2)
+        self.assertEqual(self.client.objects['copy/large.bin'], self.large)
+
+    def test_changed_source_aborts_upload(self):
+        etag = hashlib.md5(self.large).hexdigest()
+        self.client.objects['large.bin'] = b'y' * len(self.large)
+        with self.assertRaises(ObjectChangedError):
+            self.client.copy_object('large.bin', 'copy/large.bin', size=len(self.large), etag=etag)
+        self.assertNotIn('copy/large.bin', self.client.objects)
+        self.assertIn('abort_multipart_upload', self.client.calls)
+        self.assertEqual(self.client.uploads, {})
+
+    def test_cancelled_token_aborts_copy(self):
+        token = TransferToken()
+        token.cancel()
+        with self.assertRaises(TransferCancelledError):
+            self.client.copy_object('large.bin', 'copy/large.bin', size=len(self.large), token=token)
+        self.assertNotIn('copy/large.bin', self.client.objects)
+        self.assertNotIn('init_multipart_upload', self.client.calls)
+
+
+if __name__ == '__main__':
+    unittest.main()
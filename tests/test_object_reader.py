@@ -0,0 +1,107 @@
+import hashlib
+import io
+import os
+import sys
+import unittest
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ossnake.driver.exceptions import ObjectChangedError, ObjectNotFoundError
+from ossnake.utils.object_reader import ObjectReader
+from tests.fake_client import FakeOSSClient
+
+
+class TestObjectReader(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeOSSClient()
+        self.data = os.urandom(10 * 100 + 37)
+        self.client.objects['big.bin'] = self.data
+
+    def make_reader(self, **kwargs):
+        kwargs.setdefault('block_size', 100)
+        reader = ObjectReader(self.client, 'big.bin', **kwargs)
+        reader.RETRY_BASE_DELAY = 0
+        return reader
+
+    def test_random_access_reads_only_needed_blocks(self):
+        reader = self.make_reader()
+        reader.seek(-10, io.SEEK_END)
+        self.assertEqual(reader.read(), self.data[-10:])
+        reader.seek(250)
+        self.assertEqual(reader.read(100), self.data[250:350])
+        self.assertEqual(reader.tell(), 350)
+        # 尾部一块，加上 250-350 跨越的两块
+        self.assertEqual(reader.requests, 3)
+        self.assertEqual(self.client.calls.count('iter_object_range'), 3)
+
+    def test_cached_blocks_are_not_refetched(self):
+        reader = self.make_reader()
+        for _ in range(3):
+            reader.seek(0)
+            self.assertEqual(reader.read(50), self.data[:50])
+        self.assertEqual(reader.requests, 1)
+
+    def test_sequential_read_ahead_grows(self):
+        reader = self.make_reader()
+        chunks = []
+        while True:
+            chunk = reader.read(30)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        self.assertEqual(b''.join(chunks), self.data)
+        # 11 个块按 1、2、4、4 块的窗口取回
+        self.assertEqual(reader.requests, 4)
+
+    def test_lru_evicts_oldest_blocks(self):
+        reader = self.make_reader(cache_blocks=2)
+        for offset in (0, 500, 900, 0):
+            reader.seek(offset)
+            reader.read(1)
+        self.assertEqual(reader.requests, 4)
+
+    def test_known_size_and_etag_skip_head(self):
+        etag = hashlib.md5(self.data).hexdigest()
+        with self.client.open('big.bin', size=len(self.data), etag=etag, block_size=100) as f:
+            self.assertEqual(f.read(5), self.data[:5])
+        self.assertNotIn('get_object_info', self.client.calls)
+
+    def test_changed_object_raises(self):
+        reader = self.make_reader()
+        reader.read(10)
+        self.client.objects['big.bin'] = b'x' * len(self.data)
+        reader.seek(600)
+        with self.assertRaises(ObjectChangedError):
+            reader.read(10)
+
+    def test_open_works_with_zipfile(self):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w') as archive:
+            archive.writestr('a.txt', 'hello')
+            archive.writestr('b.bin', os.urandom(5000))
+        self.client.objects['archive.zip'] = buffer.getvalue()
+        with self.client.open('archive.zip', block_size=512) as f:
+            with zipfile.ZipFile(f) as archive:
+                self.assertEqual(archive.read('a.txt'), b'hello')
+
+    def test_text_mode_and_invalid_modes(self):
+        self.client.objects['notes.txt'] = '第一行\nsecond\n'.encode('utf-8')
+        with self.client.open('notes.txt', 'r', encoding='utf-8') as f:
+            self.assertEqual(f.readlines(), ['第一行\n', 'second\n'])
+        for mode in ('wb', 'r+b', 'ab'):
+            with self.assertRaises(ValueError):
+                self.client.open('notes.txt', mode)
+        with self.assertRaises(ObjectNotFoundError):
+            self.client.open('missing.bin')
+
+    def test_empty_object(self):
+        self.client.objects['empty'] = b''
+        with self.client.open('empty', buffering=0) as f:
+            self.assertEqual(f.read(), b'')
+            self.assertEqual(f.requests, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
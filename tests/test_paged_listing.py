@@ -0,0 +1,88 @@
+import sys
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tests.fake_client import FakeOSSClient
+
+
+class SlowPageClient(FakeOSSClient):
+    """第一页之后的请求等待放行，用来观察预取"""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+        self.requested = threading.Event()
+
+    def _list_objects_page(self, prefix='', delimiter='/', continuation_token=None, start_after=None, page_size=None):
+        if continuation_token:
+            self.requested.set()
+            self.release.wait(5)
+        return super()._list_objects_page(prefix, delimiter, continuation_token, start_after, page_size)
+
+
+class TestPagedListing(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeOSSClient()
+        self.keys = [f"data/{i:03d}.txt" for i in range(10)]
+        self.client.objects.update({key: b'x' for key in self.keys})
+        self.client.objects.update({'data/sub/a.txt': b'a', 'data/sub/b.txt': b'b', 'other.txt': b'o'})
+
+    def test_page_size_is_honoured(self):
+        pages = list(self.client.iter_pages('data/', '', page_size=4))
+        self.assertEqual([len(page) for page in pages], [4, 4, 4])
+        self.assertEqual([obj['name'] for page in pages for obj in page],
+                         self.keys + ['data/sub/a.txt', 'data/sub/b.txt'])
+
+    def test_page_size_is_capped(self):
+        self.client.PAGE_SIZE = 5
+        pages = list(self.client.iter_pages('data/', '', page_size=1000))
+        self.assertEqual([len(page) for page in pages], [5, 5, 2])
+
+    def test_page_size_defaults_to_setting(self):
+        from ossnake.utils.settings_manager import SettingsManager
+        with mock.patch.object(SettingsManager, 'load_settings', return_value={'list': {'page_size': 3}}):
+            pages = list(self.client.iter_pages('data/', '/'))
+        self.assertEqual([len(page) for page in pages], [3, 3, 3, 2])
+
+    def test_start_after(self):
+        names = [obj['name'] for obj in self.client.iter_objects('data/', start_after='data/007.txt', page_size=2)]
+        self.assertEqual(names, ['data/008.txt', 'data/009.txt', 'data/sub/a.txt', 'data/sub/b.txt'])
+
+    def test_delimiter_returns_folders(self):
+        names = [(obj['name'], obj['type']) for obj in self.client.iter_objects('data/', delimiter='/', page_size=4)]
+        self.assertIn(('data/sub/', 'folder'), names)
+        self.assertNotIn('data/sub/a.txt', [name for name, _ in names])
+        self.assertEqual(len(names), 11)
+
+    def test_next_page_is_prefetched_while_consumer_works(self):
+        client = SlowPageClient()
+        client.objects.update(self.client.objects)
+        pages = client.iter_pages('data/', '', page_size=4)
+        first = next(pages)
+        self.assertEqual(len(first), 4)
+        # 调用方还在处理第一页，第二页已经发出请求
+        self.assertTrue(client.requested.wait(5))
+        client.release.set()
+        self.assertEqual(sum(len(page) for page in pages), 8)
+
+    def test_stopping_early_stops_listing(self):
+        pages = self.client.iter_pages('data/', '', page_size=2)
+        next(pages)
+        pages.close()
+        # 最多预取了一页
+        self.assertLessEqual(self.client.calls.count('list_objects_page'), 2)
+
+    def test_list_objects_adds_display_name(self):
+        objects = self.client.list_objects('data')
+        folders = [obj for obj in objects if obj['type'] == 'folder']
+        self.assertEqual([(obj['name'], obj['display_name']) for obj in folders], [('data/sub/', 'sub')])
+        self.assertEqual(len(objects), 11)
+        self.assertEqual(len(self.client.list_objects(recursive=True)), 13)
+
+
+if __name__ == '__main__':
+    unittest.main()
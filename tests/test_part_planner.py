@@ -0,0 +1,46 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ossnake.utils.part_planner import plan_part_size, plan_part_size_for, MB, MAX_AUTO_PART_SIZE
+from ossnake.driver.oss_ali import AliyunOSSClient
+from tests.fake_client import FakeOSSClient
+
+GB = 1024 * MB
+
+
+class TestPartPlanner(unittest.TestCase):
+    def test_small_file_keeps_preferred_size(self):
+        self.assertEqual(plan_part_size(100 * MB, preferred=5 * MB, workers=4), 5 * MB)
+
+    def test_preferred_size_is_clamped_to_provider_minimum(self):
+        self.assertEqual(plan_part_size(100 * MB, preferred=1 * MB), 5 * MB)
+        self.assertEqual(plan_part_size(100 * MB, preferred=1 * MB, min_part_size=100 * 1024), 1 * MB)
+
+    def test_huge_file_stays_within_part_limit(self):
+        for size in (48 * GB, 49 * GB, 1024 * GB, 5 * 1024 * GB):
+            part_size = plan_part_size(size, preferred=5 * MB, workers=4)
+            self.assertLessEqual((size + part_size - 1) // part_size, 10000)
+            self.assertEqual(part_size % MB, 0)
+
+    def test_large_file_uses_fewer_requests(self):
+        part_size = plan_part_size(10 * GB, preferred=5 * MB, workers=4)
+        self.assertGreater(part_size, 5 * MB)
+        self.assertLessEqual(part_size, MAX_AUTO_PART_SIZE)
+        # 更多并发线程时保留更多分片
+        self.assertLess(plan_part_size(10 * GB, preferred=5 * MB, workers=16), part_size)
+
+    def test_file_beyond_limit_raises(self):
+        with self.assertRaises(ValueError):
+            plan_part_size(10000 * 5 * GB + 1)
+
+    def test_uses_client_limits(self):
+        self.assertEqual(AliyunOSSClient.MIN_PART_SIZE, 100 * 1024)
+        client = FakeOSSClient()
+        self.assertEqual(plan_part_size_for(client, 10 * 1024, 1024, 1), 1024)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import io
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ossnake.utils.part_source import PartSource, PartReader
+from ossnake.driver.exceptions import LocalFileChangedError
+
+
+class TestPartSource(unittest.TestCase):
+    def setUp(self):
+        self.data = os.urandom(2500)
+        self.tmp = tempfile.NamedTemporaryFile(delete=False)
+        self.tmp.write(self.data)
+        self.tmp.close()
+
+    def tearDown(self):
+        os.remove(self.tmp.name)
+
+    def test_views_cover_file(self):
+        with PartSource(self.tmp.name, 1000) as source:
+            views = [source.view(n) for n in (1, 2, 3)]
+            self.assertEqual([len(v) for v in views], [1000, 1000, 500])
+            self.assertEqual(b''.join(v.tobytes() for v in views), self.data)
+            for view in views:
+                view.release()
+
+    def test_views_share_the_mapping(self):
+        with PartSource(self.tmp.name, 1000) as source:
+            view = source.view(2)
+            # 切片引用同一块映射内存，而不是新分配的 bytes
+            self.assertIsInstance(view.obj, type(source._mmap))
+            view.release()
+
+    def test_close_with_outstanding_view(self):
+        source = PartSource(self.tmp.name, 1000)
+        view = source.view(1)
+        source.close()
+        self.assertEqual(view.tobytes(), self.data[:1000])
+
+    def test_reader_is_seekable(self):
+        with PartSource(self.tmp.name, 1000) as source:
+            reader = source.reader(3)
+            self.assertEqual(len(reader), 500)
+            self.assertEqual(reader.read(100), self.data[2000:2100])
+            reader.seek(0)
+            buffer = bytearray(600)
+            self.assertEqual(reader.readinto(buffer), 500)
+            self.assertEqual(bytes(buffer[:500]), self.data[2000:])
+            self.assertEqual(reader.read(), b'')
+            reader.seek(-10, io.SEEK_END)
+            self.assertEqual(reader.tell(), 490)
+
+    def test_truncated_file_is_rejected(self):
+        with PartSource(self.tmp.name, 1000) as source:
+            source.reader(1)
+            with open(self.tmp.name, 'r+b') as f:
+                f.truncate(1500)
+            with self.assertRaises(LocalFileChangedError):
+                source.reader(2)
+
+    def test_reader_over_bytes(self):
+        reader = PartReader(memoryview(b'abcdef'))
+        self.assertEqual(reader.read(), b'abcdef')
+        self.assertEqual(reader.getbuffer().tobytes(), b'abcdef')
+
+    def test_reader_charges_each_byte_once(self):
+        charged = []
+        reader = PartReader(memoryview(self.data[:1000]), throttle=charged.append)
+        # SDK 先读一遍计算校验和
+        self.assertEqual(reader.read(300), self.data[:300])
+        self.assertEqual(reader.read(), self.data[300:1000])
+        reader.seek(0)
+        # 发送时再读一遍，不重复计费
+        buffer = bytearray(400)
+        while reader.readinto(buffer):
+            pass
+        self.assertEqual(charged, [300, 700])
+        reader.charge()
+        self.assertEqual(sum(charged), 1000)
+
+    def test_reader_charges_as_it_reads(self):
+        charged = []
+        reader = PartReader(memoryview(self.data[:1000]), throttle=charged.append)
+        reader.read(100)
+        self.assertEqual(charged, [100])
+        reader.charge()
+        self.assertEqual(charged, [100, 900])
+
+
+if __name__ == '__main__':
+    unittest.main()
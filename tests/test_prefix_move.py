@@ -0,0 +1,130 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ossnake.driver.exceptions import DeleteError, ObjectNotFoundError, TransferCancelledError
+from ossnake.utils.prefix_move import PrefixMover
+from ossnake.utils.transfer_journal import TransferJournal
+from tests.fake_client import FakeOSSClient
+
+
+class MoveClient(FakeOSSClient):
+    """可以拒绝复制或删除指定对象的客户端"""
+
+    def __init__(self, refuse_copy=(), refuse_delete=()):
+        super().__init__()
+        self.refuse_copy = set(refuse_copy)
+        self.refuse_delete = set(refuse_delete)
+
+    def _copy_object(self, source_key, target_key):
+        if source_key in self.refuse_copy:
+            raise PermissionError("AccessDenied")
+        super()._copy_object(source_key, target_key)
+
+    def delete_objects(self, object_names):
+        super().delete_objects([name for name in object_names if name not in self.refuse_delete])
+        return {name: 'AccessDenied: denied' for name in object_names if name in self.refuse_delete}
+
+
+class TestPrefixMove(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.journal = TransferJournal(os.path.join(self.tmpdir.name, 'transfers'))
+        self.files = {f"videos/{i % 3}/clip{i:02}.mp4": os.urandom(i + 1) for i in range(20)}
+        self.files['videos/'] = b''
+        self.files['videos/1/'] = b''
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def make_client(self, **kwargs):
+        client = MoveClient(**kwargs)
+        client.PAGE_SIZE = 4
+        client.objects.update(self.files)
+        client.objects['videos-old/x.mp4'] = b'keep'
+        return client
+
+    def make_mover(self, client, token=None):
+        mover = PrefixMover(client, token, journal=self.journal)
+        mover.RETRY_BASE_DELAY = 0
+        return mover
+
+    def test_moves_nested_objects_server_side(self):
+        client = self.make_client()
+        progress = []
+        result = self.make_mover(client).move('videos/', 'archive/videos/',
+                                              lambda done, total: progress.append(done))
+
+        self.assertEqual(result['files'], len(self.files))
+        self.assertEqual(result['failed'], {})
+        expected = {f"archive/{name}": data for name, data in self.files.items()}
+        expected['videos-old/x.mp4'] = b'keep'
+        self.assertEqual(client.objects, expected)
+        # 数据不经过本机，源对象批量删除
+        self.assertNotIn('get_object', client.calls)
+        self.assertNotIn('iter_object_range', client.calls)
+        self.assertNotIn('delete_file', client.calls)
+        self.assertIn('delete_objects', client.calls)
+        self.assertEqual(max(progress), sum(len(data) for data in self.files.values()))
+        self.assertEqual(list(self.journal.journal_dir.glob('*.journal')), [])
+
+    def test_copy_keeps_sources(self):
+        client = self.make_client()
+        result = self.make_mover(client).copy('videos/', 'backup/')
+        self.assertEqual(result['files'], len(self.files))
+        for name, data in self.files.items():
+            self.assertEqual(client.objects[name], data)
+            self.assertEqual(client.objects['backup/' + name[len('videos/'):]], data)
+        self.assertNotIn('delete_objects', client.calls)
+
+    def test_failed_copy_keeps_source(self):
+        client = self.make_client(refuse_copy={'videos/0/clip03.mp4'})
+        result = self.make_mover(client).move('videos/', 'moved/')
+        self.assertEqual(list(result['failed']), ['videos/0/clip03.mp4'])
+        self.assertEqual(result['files'], len(self.files) - 1)
+        self.assertIn('videos/0/clip03.mp4', client.objects)
+        self.assertNotIn('moved/0/clip03.mp4', client.objects)
+
+    def test_interrupted_move_resumes_without_recopying(self):
+        client = self.make_client(refuse_delete={'videos/2/clip05.mp4'})
+        result = self.make_mover(client).move('videos/', 'moved/')
+        self.assertIsInstance(result['failed']['videos/2/clip05.mp4'], DeleteError)
+        self.assertEqual(client.objects['moved/2/clip05.mp4'], self.files['videos/2/clip05.mp4'])
+
+        client.refuse_delete.clear()
+        client.calls.clear()
+        result = self.make_mover(client).move('videos/', 'moved/')
+        self.assertEqual(result['failed'], {})
+        self.assertEqual(result['skipped'], 1)
+        self.assertNotIn('copy_object', client.calls)
+        self.assertNotIn('videos/2/clip05.mp4', client.objects)
+
+    def test_rename_folder_adds_slashes_and_checks_source(self):
+        client = self.make_client()
+        client.rename_folder('videos', 'films')
+        self.assertIn('films/1/', client.objects)
+        self.assertIn('videos-old/x.mp4', client.objects)
+        with self.assertRaises(ObjectNotFoundError):
+            client.rename_folder('missing', 'other')
+
+    def test_target_inside_source_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.make_mover(self.make_client()).move('videos/', 'videos/sub/')
+
+    def test_cancelled_token_stops_move(self):
+        from ossnake.utils.transfer_token import TransferToken
+        client = self.make_client()
+        token = TransferToken()
+        token.cancel()
+        with self.assertRaises(TransferCancelledError):
+            self.make_mover(client, token).move('videos/', 'moved/')
+        for name in self.files:
+            self.assertIn(name, client.objects)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import io
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ossnake.driver.transfer_manager import TransferManager
+from ossnake.driver.exceptions import DownloadError, ObjectChangedError
+from ossnake.utils.download_state import DownloadState
+from tests.fake_client import FakeOSSClient, transfer_settings
+
+
+def make_manager(chunk_size=1000, workers=4):
+    manager = TransferManager()
+    manager.download_settings = transfer_settings(chunk_size=chunk_size, workers=workers)
+    manager.RETRY_BASE_DELAY = 0
+    return manager
+
+
+class TestRangedDownload(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeOSSClient()
+        self.data = os.urandom(10 * 1000 + 17)
+        self.client.objects['big.bin'] = self.data
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_download_file_reassembles_ranges(self):
+        manager = make_manager()
+        local_file = os.path.join(self.tmpdir.name, 'out', 'big.bin')
+        progress = []
+        manager.download_file(self.client, 'big.bin', local_file,
+                              lambda done, total: progress.append((done, total)))
+
+        with open(local_file, 'rb') as f:
+            self.assertEqual(f.read(), self.data)
+        self.assertEqual(self.client.calls.count('iter_object_range'), 11)
+        self.assertEqual(progress[-1], (len(self.data), len(self.data)))
+
+    def test_short_range_fails_and_removes_file(self):
+        class ShortClient(FakeOSSClient):
+            def iter_object_range(self, object_name, start, end, chunk_size=1024 * 1024, etag=None):
+                yield self.objects[object_name][start:end]
+
+        client = ShortClient()
+        client.objects['big.bin'] = self.data
+        local_file = os.path.join(self.tmpdir.name, 'big.bin')
+        with self.assertRaises(DownloadError):
+            make_manager().download_file(client, 'big.bin', local_file)
+        self.assertFalse(os.path.exists(local_file))
+
+    def test_resume_fetches_only_missing_ranges(self):
+        class FlakyClient(FakeOSSClient):
+            fail_start = 5000
+
+            def iter_object_range(self, object_name, start, end, chunk_size=1024 * 1024, etag=None):
+                if start == self.fail_start:
+                    raise IOError("connection reset")
+                return super().iter_object_range(object_name, start, end, chunk_size, etag)
+
+        client = FlakyClient()
+        client.objects['big.bin'] = self.data
+        local_file = os.path.join(self.tmpdir.name, 'big.bin')
+        with self.assertRaises(DownloadError):
+            make_manager(workers=1).download_file(client, 'big.bin', local_file)
+        self.assertFalse(os.path.exists(local_file))
+        self.assertTrue(os.path.exists(local_file + '.ossnake-part'))
+        self.assertTrue(os.path.exists(local_file + '.ossnake-part.state'))
+
+        state = DownloadState.open(local_file, client.get_object_info('big.bin')['etag'], len(self.data), 1000)
+        missing = state.missing()
+        self.assertEqual(missing[0], 5)
+
+        client.fail_start = None
+        client.calls.clear()
+        progress = []
+        make_manager(workers=1).download_file(client, 'big.bin', local_file,
+                                              lambda done, total: progress.append(done))
+        self.assertEqual(client.calls.count('iter_object_range'), len(missing))
+        self.assertEqual(progress[-1], len(self.data))
+        with open(local_file, 'rb') as f:
+            self.assertEqual(f.read(), self.data)
+        self.assertFalse(os.path.exists(local_file + '.ossnake-part'))
+        self.assertFalse(os.path.exists(local_file + '.ossnake-part.state'))
+
+    def test_changed_object_discards_partial_download(self):
+        class ChangingClient(FakeOSSClient):
+            def iter_object_range(self, object_name, start, end, chunk_size=1024 * 1024, etag=None):
+                if start == 3000:
+                    self.objects[object_name] = b'changed'
+                return super().iter_object_range(object_name, start, end, chunk_size, etag)
+
+        client = ChangingClient()
+        client.objects['big.bin'] = self.data
+        local_file = os.path.join(self.tmpdir.name, 'big.bin')
+        with self.assertRaises(ObjectChangedError):
+            make_manager(workers=1).download_file(client, 'big.bin', local_file)
+        self.assertFalse(os.path.exists(local_file + '.ossnake-part'))
+        self.assertFalse(os.path.exists(local_file + '.ossnake-part.state'))
+
+    def test_download_stream_preserves_order(self):
+        output = io.BytesIO()
+        progress = []
+        make_manager(workers=3).download_stream(self.client, 'big.bin', output, progress.append)
+        self.assertEqual(output.getvalue(), self.data)
+        self.assertEqual(progress[-1], len(self.data))
+
+    def test_use_ranged_download_honours_settings(self):
+        manager = make_manager(chunk_size=1000)
+        self.assertTrue(manager.use_ranged_download(1001))
+        self.assertFalse(manager.use_ranged_download(1000))
+        manager.download_settings['multipart_enabled'] = False
+        self.assertFalse(manager.use_ranged_download(10 ** 9))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ossnake.driver.transfer_manager import TransferManager
+from ossnake.driver.exceptions import AuthenticationError, OSSError
+from ossnake.utils.transfer_journal import TransferJournal
+from ossnake.utils.retry_policy import (
+    classify_error, backoff_delay, RetryBudget, FATAL, THROTTLED, RETRYABLE
+)
+from tests.fake_client import FakeOSSClient, transfer_settings
+
+
+class FailingClient(FakeOSSClient):
+    """upload_part / iter_object_range 按顺序抛出指定异常"""
+
+    def __init__(self, part_errors=(), range_errors=()):
+        super().__init__()
+        self.part_errors = list(part_errors)
+        self.range_errors = list(range_errors)
+
+    def upload_part(self, upload, part_number, data):
+        if part_number == 2 and self.part_errors:
+            raise self.part_errors.pop(0)
+        return super().upload_part(upload, part_number, data)
+
+    def iter_object_range(self, object_name, start, end, chunk_size=1024 * 1024, etag=None):
+        chunks = super().iter_object_range(object_name, start, end, 100, etag)
+        if start == 0 and self.range_errors:
+            # 先返回部分数据再失败
+            yield next(chunks)
+            raise self.range_errors.pop(0)
+        yield from chunks
+
+
+class TestClassifyError(unittest.TestCase):
+    def test_fatal_errors(self):
+        self.assertEqual(classify_error(AuthenticationError("bad key")), FATAL)
+        self.assertEqual(classify_error(OSSError("Upload failed: NoSuchBucket")), FATAL)
+        self.assertEqual(classify_error(OSSError("Access Denied")), FATAL)
+
+    def test_status_from_sdk_response(self):
+        class ClientError(Exception):
+            def __init__(self, code, status):
+                super().__init__(code)
+                self.response = {'Error': {'Code': code}, 'ResponseMetadata': {'HTTPStatusCode': status}}
+
+        self.assertEqual(classify_error(ClientError('Forbidden', 403)), FATAL)
+        self.assertEqual(classify_error(ClientError('TooManyRequests', 429)), THROTTLED)
+        self.assertEqual(classify_error(ClientError('InternalError', 500)), RETRYABLE)
+
+    def test_transient_errors(self):
+        self.assertEqual(classify_error(ConnectionResetError("connection reset")), RETRYABLE)
+        self.assertEqual(classify_error(OSSError("503 SlowDown")), THROTTLED)
+
+    def test_backoff_is_capped(self):
+        for attempt in range(1, 20):
+            self.assertLessEqual(backoff_delay(attempt, base=0.5, cap=4), 4)
+
+
+class TestRetryBudget(unittest.TestCase):
+    def test_fixed_budget(self):
+        budget = RetryBudget(2)
+        self.assertTrue(budget.try_acquire())
+        self.assertTrue(budget.try_acquire())
+        self.assertFalse(budget.try_acquire())
+        self.assertEqual(budget.remaining, 0)
+
+    def test_window_budget_refills(self):
+        budget = RetryBudget(1, window=0.05)
+        self.assertTrue(budget.try_acquire())
+        self.assertFalse(budget.try_acquire())
+        import time
+        time.sleep(0.06)
+        self.assertTrue(budget.try_acquire())
+
+
+class TestPartRetry(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.local_file = os.path.join(self.tmpdir.name, 'data.bin')
+        self.data = os.urandom(4096)
+        with open(self.local_file, 'wb') as f:
+            f.write(self.data)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def make_manager(self):
+        manager = TransferManager()
+        manager.upload_settings = transfer_settings(chunk_size=1024, workers=2)
+        manager.RETRY_BASE_DELAY = 0
+        manager.journal = TransferJournal(os.path.join(self.tmpdir.name, 'journal'))
+        return manager
+
+    def test_transient_part_failure_is_retried(self):
+        client = FailingClient(part_errors=[ConnectionResetError("reset"), TimeoutError("timed out")])
+        manager = self.make_manager()
+        manager.upload_file(client, self.local_file, 'data.bin')
+
+        self.assertEqual(client.objects['data.bin'], self.data)
+        self.assertNotIn('abort_multipart_upload', client.calls)
+        self.assertEqual(manager.metrics.metrics['retries'], 2)
+
+    def test_fatal_error_fails_fast(self):
+        client = FailingClient(part_errors=[AuthenticationError("InvalidAccessKeyId")])
+        manager = self.make_manager()
+        with self.assertRaises(Exception):
+            manager.upload_file(client, self.local_file, 'data.bin')
+        self.assertEqual(manager.metrics.metrics['retries'], 0)
+        self.assertEqual(manager.metrics.metrics['failed_parts'], 1)
+
+    def test_range_retry_does_not_double_count_progress(self):
+        client = FailingClient(range_errors=[ConnectionResetError("reset")])
+        client.objects['data.bin'] = self.data
+        manager = self.make_manager()
+        manager.download_settings = {'multipart_enabled': True, 'chunk_size': 1024, 'workers': 1}
+        progress = []
+        local_file = os.path.join(self.tmpdir.name, 'out.bin')
+        manager.download_file(client, 'data.bin', local_file,
+                              lambda done, total: progress.append(done))
+
+        with open(local_file, 'rb') as f:
+            self.assertEqual(f.read(), self.data)
+        self.assertEqual(progress[-1], len(self.data))
+        self.assertEqual(max(progress), len(self.data))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import random
+import sys
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ossnake.driver.exceptions import OSSError
+from ossnake.utils.sharded_listing import ShardedLister
+from tests.fake_client import FakeOSSClient
+
+
+class SlowListClient(FakeOSSClient):
+    """每次列举请求耗时固定，记录同时进行的请求数"""
+
+    DELAY = 0.01
+
+    def __init__(self):
+        super().__init__()
+        self.active = 0
+        self.max_active = 0
+
+    def _list_objects_page(self, *args, **kwargs):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.DELAY)
+            return super()._list_objects_page(*args, **kwargs)
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+class TestShardedListing(unittest.TestCase):
+    def setUp(self):
+        self.client = SlowListClient()
+        self.client.PAGE_SIZE = 10
+
+    def names(self, lister, prefix=''):
+        return [obj['name'] for obj in lister.iter_objects(prefix)]
+
+    def test_single_page_needs_one_request(self):
+        self.client.objects.update({f"k{i}": b'' for i in range(5)})
+        lister = ShardedLister(self.client)
+        self.assertEqual(self.names(lister), [f"k{i}" for i in range(5)])
+        self.assertEqual(lister.requests, 1)
+
+    def test_folders_are_listed_concurrently_and_merged_in_order(self):
+        keys = [f"{folder}/{i:03d}" for folder in 'abcdefgh' for i in range(40)]
+        keys += ['a.txt', 'b0', 'top', 'c/']  # 顶层文件和文件夹标记夹在文件夹之间
+        self.client.objects.update({key: b'x' for key in keys})
+        lister = ShardedLister(self.client, workers=4)
+        self.assertEqual(self.names(lister), sorted(keys))
+        self.assertGreater(self.client.max_active, 1)
+
+    def test_flat_key_space_is_split_by_boundaries(self):
+        rng = random.Random(7)
+        chars = 'abcXYZ019-_.~'
+        keys = {'logs/' + ''.join(rng.choice(chars) for _ in range(6)) for _ in range(400)}
+        # 恰好等于边界的键只出现一次
+        keys |= {'logs/a', 'logs/Z', 'logs/0', 'logs/z'}
+        self.client.objects.update({key: b'' for key in keys})
+        self.client.objects['other'] = b''
+        lister = ShardedLister(self.client, workers=8)
+        self.assertEqual(self.names(lister, 'logs/'), sorted(keys))
+        self.assertGreater(self.client.max_active, 1)
+
+    def test_matches_iter_objects(self):
+        keys = [f"data/{i % 7}/{i:04d}.bin" for i in range(300)] + ['data/', 'data/readme']
+        self.client.objects.update({key: b'y' for key in keys})
+        expected = [obj['name'] for obj in self.client.iter_objects('data/', recursive=True)]
+        self.assertEqual([obj['name'] for obj in self.client.iter_objects_parallel('data/')], expected)
+
+    def test_stopping_early_stops_shards(self):
+        self.client.objects.update({f"{folder}/{i:03d}": b'' for folder in 'abcdef' for i in range(200)})
+        objects = ShardedLister(self.client, workers=6).iter_objects()
+        next(objects)
+        objects.close()
+        time.sleep(0.2)
+        calls = self.client.calls.count('list_objects_page')
+        time.sleep(0.2)
+        self.assertEqual(self.client.calls.count('list_objects_page'), calls)
+        self.assertLess(calls, 6 * 20)
+
+    def test_shard_error_is_raised(self):
+        self.client.objects.update({f"{folder}/{i:03d}": b'' for folder in 'abc' for i in range(30)})
+        original = self.client._list_objects_page
+
+        def failing(prefix='', delimiter='/', continuation_token=None, start_after=None, page_size=None):
+            if prefix == 'c/':
+                raise OSSError("listing failed")
+            return original(prefix, delimiter, continuation_token, start_after, page_size)
+
+        self.client._list_objects_page = failing
+        lister = ShardedLister(self.client)
+        lister.MAX_RETRIES = 0
+        with self.assertRaises(OSSError):
+            self.names(lister)
+
+
+if __name__ == '__main__':
+    unittest.main()
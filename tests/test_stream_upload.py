@@ -0,0 +1,139 @@
+import os
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ossnake.driver.exceptions import TransferCancelledError
+from ossnake.utils.stream_upload import StreamUploader
+from ossnake.utils.transfer_token import TransferToken
+from tests.fake_client import FakeOSSClient
+
+
+class StreamClient(FakeOSSClient):
+    """记录每个分片的大小，可以让分片上传等待或失败"""
+
+    def __init__(self, fail_part=None):
+        super().__init__()
+        self.fail_part = fail_part
+        self.part_sizes = {}
+        self.release = threading.Event()
+        self.release.set()
+
+    def upload_part(self, upload, part_number, data):
+        self.release.wait(5)
+        if part_number == self.fail_part:
+            raise PermissionError("AccessDenied")
+        self.part_sizes[part_number] = len(data)
+        return super().upload_part(upload, part_number, data)
+
+
+def chunks(data, size=7):
+    """不能 seek、长度未知的数据源"""
+    for offset in range(0, len(data), size):
+        yield data[offset:offset + size]
+
+
+class TestStreamUpload(unittest.TestCase):
+    def make_uploader(self, client, token=None):
+        uploader = StreamUploader(client, token, part_size=100, workers=2)
+        uploader.RETRY_BASE_DELAY = 0
+        return uploader
+
+    def test_generator_of_unknown_length_uploads_in_parts(self):
+        client = StreamClient()
+        data = os.urandom(1050)
+        progress = []
+        self.make_uploader(client).upload(chunks(data), 'dump.tar', progress_callback=
+                                          lambda done, total: progress.append(done))
+        self.assertEqual(client.objects['dump.tar'], data)
+        self.assertEqual(sorted(client.part_sizes.items()), [(n, 100) for n in range(1, 11)] + [(11, 50)])
+        self.assertEqual(progress[-1], len(data))
+        self.assertEqual(client.uploads, {})
+
+    def test_short_stream_uses_single_put(self):
+        client = StreamClient()
+        self.make_uploader(client).upload(chunks(b'hello'), 'small.txt', content_type='text/plain')
+        self.assertEqual(client.objects['small.txt'], b'hello')
+        self.assertNotIn('init_multipart_upload', client.calls)
+
+    def test_pipe(self):
+        client = StreamClient()
+        data = os.urandom(777)
+        read_fd, write_fd = os.pipe()
+
+        def writer():
+            with os.fdopen(write_fd, 'wb') as f:
+                for chunk in chunks(data, 50):
+                    f.write(chunk)
+                    f.flush()
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        with os.fdopen(read_fd, 'rb', buffering=0) as pipe:
+            self.make_uploader(client).upload(pipe, 'pipe.bin')
+        thread.join(5)
+        self.assertEqual(client.objects['pipe.bin'], data)
+
+    def test_buffers_are_bounded(self):
+        client = StreamClient()
+        client.release.clear()
+        consumed = []
+
+        def source():
+            for chunk in chunks(os.urandom(2000), 10):
+                consumed.append(len(chunk))
+                yield chunk
+
+        uploader = self.make_uploader(client)
+        thread = threading.Thread(target=uploader.upload, args=(source(), 'big.bin'))
+        thread.start()
+        time.sleep(0.2)
+        # 2 个分片在上传，1 个缓冲区在读取，其余数据还没有读
+        self.assertLessEqual(sum(consumed), 3 * 100 + 10)
+        client.release.set()
+        thread.join(5)
+        self.assertEqual(len(client.objects['big.bin']), 2000)
+
+    def test_part_size_grows_for_unknown_length(self):
+        client = StreamClient()
+        uploader = self.make_uploader(client)
+        uploader.PART_GROWTH_INTERVAL = 2
+        data = os.urandom(100 * 2 + 200 * 2 + 400)
+        uploader.upload(chunks(data), 'grow.bin')
+        self.assertEqual(sorted(client.part_sizes.items()), [(1, 100), (2, 100), (3, 200), (4, 200), (5, 400)])
+        self.assertEqual(client.objects['grow.bin'], data)
+
+    def test_failed_part_aborts_upload(self):
+        client = StreamClient(fail_part=3)
+        with self.assertRaises(PermissionError):
+            self.make_uploader(client).upload(chunks(os.urandom(1000)), 'bad.bin')
+        self.assertNotIn('bad.bin', client.objects)
+        self.assertIn('abort_multipart_upload', client.calls)
+        self.assertEqual(client.uploads, {})
+
+    def test_cancel_aborts_upload(self):
+        client = StreamClient()
+        token = TransferToken()
+
+        def source():
+            yield os.urandom(150)
+            token.cancel()
+            yield os.urandom(150)
+
+        with self.assertRaises(TransferCancelledError):
+            self.make_uploader(client, token).upload(source(), 'cancel.bin')
+        self.assertNotIn('cancel.bin', client.objects)
+        self.assertEqual(client.uploads, {})
+
+    def test_client_upload_stream(self):
+        client = FakeOSSClient()
+        client.upload_stream(chunks(b'abc' * 10), 'x.txt')
+        self.assertEqual(client.objects['x.txt'], b'abc' * 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ossnake.driver.transfer_manager import TransferManager
+from ossnake.utils.transfer_journal import TransferJournal
+from tests.fake_client import FakeOSSClient, transfer_settings
+
+
+class FlakyClient(FakeOSSClient):
+    """指定分片第一次上传失败"""
+
+    def __init__(self, fail_parts):
+        super().__init__()
+        self.fail_parts = set(fail_parts)
+        self.uploaded_parts = []
+
+    def upload_part(self, upload, part_number, data):
+        if part_number in self.fail_parts:
+            self.fail_parts.discard(part_number)
+            raise IOError(f"part {part_number} failed")
+        self.uploaded_parts.append(part_number)
+        return super().upload_part(upload, part_number, data)
+
+
+class TestTransferJournal(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.journal = TransferJournal(os.path.join(self.tmpdir.name, 'transfers'))
+        self.local_file = os.path.join(self.tmpdir.name, 'data.bin')
+        self.data = os.urandom(10 * 1024 + 7)
+        with open(self.local_file, 'wb') as f:
+            f.write(self.data)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def make_manager(self):
+        manager = TransferManager()
+        manager.upload_settings = transfer_settings(chunk_size=1024, workers=1)
+        # 模拟传输中断，不重试
+        manager.MAX_RETRIES = 0
+        # 分片按多个块计算 MD5
+        manager.HASH_BLOCK_SIZE = 100
+        manager.journal = self.journal
+        return manager
+
+    def test_identity_changes_with_content(self):
+        before = TransferJournal.file_identity(self.local_file)
+        with open(self.local_file, 'r+b') as f:
+            f.write(b'x')
+        after = TransferJournal.file_identity(self.local_file)
+        self.assertNotEqual(before['sample_hash'], after['sample_hash'])
+
+    def test_directory_is_created_on_first_write(self):
+        journal = TransferJournal(os.path.join(self.tmpdir.name, 'lazy'))
+        self.assertIsNone(journal.load('k'))
+        self.assertFalse(os.path.exists(journal.journal_dir))
+        journal.create('k', upload_id='u1', part_size=1024)
+        self.assertEqual(journal.load('k')['upload_id'], 'u1')
+
+    def test_truncated_line_is_ignored(self):
+        self.journal.create('k', upload_id='u1', part_size=1024)
+        self.journal.record_part('k', 1, 'etag-1', 1024)
+        with open(self.journal.path_for('k'), 'a') as f:
+            f.write('{"part_number": 2, "et')
+        record = self.journal.load('k')
+        self.assertEqual(record['upload_id'], 'u1')
+        self.assertEqual(list(record['parts']), [1])
+
+    def test_resume_skips_completed_parts(self):
+        client = FlakyClient(fail_parts=[4])
+        manager = self.make_manager()
+        with self.assertRaises(Exception):
+            manager.upload_file(client, self.local_file, 'data.bin')
+        self.assertNotIn('abort_multipart_upload', client.calls)
+        done = sorted(client.uploaded_parts)
+        self.assertNotIn(4, done)
+
+        progress = manager.get_progress(self.local_file, 'data.bin', client)
+        # 分片完成顺序不固定，最后一个分片可能较小
+        expected = sum(min(1024, len(self.data) - (n - 1) * 1024) for n in done)
+        self.assertEqual(progress.transferred, expected)
+        self.assertEqual(sorted(progress.parts_completed), done)
+
+        client.uploaded_parts = []
+        manager.upload_file(client, self.local_file, 'data.bin')
+        self.assertEqual(sorted(client.uploaded_parts + done), list(range(1, 12)))
+        self.assertEqual(client.calls.count('init_multipart_upload'), 1)
+        self.assertEqual(client.objects['data.bin'], self.data)
+        self.assertIsNone(manager.get_progress(self.local_file, 'data.bin', client))
+
+    def test_restarts_when_upload_is_gone(self):
+        client = FlakyClient(fail_parts=[2])
+        manager = self.make_manager()
+        with self.assertRaises(Exception):
+            manager.upload_file(client, self.local_file, 'data.bin')
+
+        # 模拟服务端清理了未完成的分片上传
+        client.uploads.clear()
+        original = FakeOSSClient.upload_part
+
+        def upload_part(self, upload, part_number, data):
+            if upload.upload_id not in self.uploads:
+                raise IOError("NoSuchUpload: The specified upload does not exist")
+            return original(self, upload, part_number, data)
+
+        client.upload_part = upload_part.__get__(client)
+        manager.upload_file(client, self.local_file, 'data.bin')
+        self.assertEqual(client.calls.count('init_multipart_upload'), 2)
+        self.assertEqual(client.objects['data.bin'], self.data)
+
+
+    def test_resume_from_server_without_journal(self):
+        client = FlakyClient(fail_parts=[4])
+        with self.assertRaises(Exception):
+            self.make_manager().upload_file(client, self.local_file, 'data.bin', resumable=False)
+        done = sorted(client.uploaded_parts)
+        # 非续传模式失败后会取消上传，这里模拟另一台机器上残留的上传
+        self.assertIn('abort_multipart_upload', client.calls)
+        upload = client.init_multipart_upload('data.bin')
+        for n in done:
+            client.upload_part(upload, n, self.data[(n - 1) * 1024:n * 1024])
+
+        client.uploaded_parts = []
+        manager = self.make_manager()
+        manager.journal = TransferJournal(os.path.join(self.tmpdir.name, 'other'))
+        manager.upload_file(client, self.local_file, 'data.bin', resume_from_server=True)
+        self.assertEqual(sorted(client.uploaded_parts), [n for n in range(1, 12) if n not in done])
+        self.assertEqual(client.objects['data.bin'], self.data)
+
+    def test_resume_from_server_skips_mismatched_upload(self):
+        client = FakeOSSClient()
+        upload = client.init_multipart_upload('data.bin')
+        client.upload_part(upload, 1, b'x' * 1024)
+
+        manager = self.make_manager()
+        manager.upload_file(client, self.local_file, 'data.bin', resume_from_server=True)
+        self.assertEqual(client.calls.count('init_multipart_upload'), 2)
+        self.assertEqual(client.objects['data.bin'], self.data)
+
+    def test_multipart_disabled_uploads_in_one_request(self):
+        client = FlakyClient(fail_parts=[])
+        manager = self.make_manager()
+        manager.upload_settings['multipart_enabled'] = False
+        manager.upload_file(client, self.local_file, 'data.bin')
+        self.assertNotIn('init_multipart_upload', client.calls)
+        self.assertEqual(client.calls.count('put_object'), 1)
+        self.assertEqual(client.objects['data.bin'], self.data)
+
+
+if __name__ == '__main__':
+    unittest.main()
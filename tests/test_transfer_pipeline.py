@@ -0,0 +1,82 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ossnake.utils.transfer_manager import TransferManager
+from tests.fake_client import FakeOSSClient
+
+
+class TestStreamingUpload(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.NamedTemporaryFile(delete=False)
+        self.data = os.urandom(1024 * 50 + 123)
+        self.tmp.write(self.data)
+        self.tmp.close()
+
+    def tearDown(self):
+        os.remove(self.tmp.name)
+
+    def test_multipart_roundtrip(self):
+        client = FakeOSSClient()
+        manager = TransferManager(chunk_size=1024, max_workers=4, readahead=2)
+        manager.upload_file(client, self.tmp.name, 'big.bin')
+        self.assertEqual(client.objects['big.bin'], self.data)
+
+    def test_buffers_are_bounded(self):
+        release = threading.Event()
+        reads = []
+
+        class BlockingClient(FakeOSSClient):
+            def upload_part(self, upload, part_number, data):
+                release.wait(5)
+                return super().upload_part(upload, part_number, data)
+
+        from ossnake.utils import transfer_manager as module
+
+        class CountingSource(module.PartSource):
+            def reader(self, part_number):
+                reads.append(part_number)
+                return super().reader(part_number)
+
+        original_source = module.PartSource
+        module.PartSource = CountingSource
+        try:
+            client = BlockingClient()
+            manager = TransferManager(chunk_size=1024, max_workers=3, readahead=1)
+            worker = threading.Thread(
+                target=manager.upload_file,
+                args=(client, self.tmp.name, 'big.bin')
+            )
+            worker.start()
+            time.sleep(0.2)
+            # 上传被阻塞时，最多只能提交 max_workers + readahead 个分片
+            self.assertEqual(len(reads), manager.max_workers + manager.readahead)
+            release.set()
+            worker.join(5)
+        finally:
+            module.PartSource = original_source
+        self.assertEqual(client.objects['big.bin'], self.data)
+
+    def test_failure_aborts_upload(self):
+        class FailingClient(FakeOSSClient):
+            def upload_part(self, upload, part_number, data):
+                if part_number == 3:
+                    raise IOError("boom")
+                return super().upload_part(upload, part_number, data)
+
+        client = FailingClient()
+        manager = TransferManager(chunk_size=1024, max_workers=2, readahead=1, retry_base_delay=0)
+        with self.assertRaises(IOError):
+            manager.upload_file(client, self.tmp.name, 'big.bin')
+        self.assertIn('abort_multipart_upload', client.calls)
+        self.assertNotIn('big.bin', client.objects)
+
+
+if __name__ == '__main__':
+    unittest.main()
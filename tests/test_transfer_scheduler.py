@@ -0,0 +1,210 @@
+import itertools
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ossnake.utils.transfer_journal import TransferJournal
+from ossnake.utils.transfer_scheduler import TransferScheduler, TransferJob
+from tests.fake_client import FakeOSSClient
+
+
+class RecordingClient(FakeOSSClient):
+    """记录分片上传顺序和并发峰值"""
+
+    def __init__(self, fail_part=None):
+        super().__init__()
+        self.order = []
+        self.active = 0
+        self.peak = 0
+        self.fail_part = fail_part
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def init_multipart_upload(self, object_name):
+        self.gate.wait(5)
+        return super().init_multipart_upload(object_name)
+
+    def upload_part(self, upload, part_number, data):
+        with self.lock:
+            self.order.append((upload.object_name, part_number))
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(0.005)
+            if (upload.object_name, part_number) == self.fail_part:
+                raise PermissionError("AccessDenied")
+            return super().upload_part(upload, part_number, data)
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+class TestTransferScheduler(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = TransferScheduler()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.journal = self.scheduler.journal
+        self.scheduler.journal = TransferJournal(os.path.join(self.tmpdir.name, 'transfers'))
+
+    def tearDown(self):
+        self.scheduler.journal = self.journal
+        self.scheduler.__dict__.pop('MAX_ACTIVE_FILES', None)
+        self.scheduler.configure({})
+        self.scheduler.clear_finished()
+        self.tmpdir.cleanup()
+
+    def configure(self, workers, max_workers):
+        self.scheduler.configure({'workers': workers, 'max_workers': max_workers, 'adaptive': False})
+        self.scheduler.chunk_size = 1024
+
+    def make_file(self, name, size):
+        path = os.path.join(self.tmpdir.name, name)
+        data = os.urandom(size)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path, data
+
+    def test_parts_are_interleaved_across_files(self):
+        self.configure(1, 1)
+        client = RecordingClient()
+        client.gate.clear()
+        files = [self.make_file(name, 4096) for name in ('a.bin', 'b.bin')]
+        jobs = [self.scheduler.submit(client, path, os.path.basename(path)) for path, _ in files]
+        # 两个任务都入队后再开始
+        client.gate.set()
+        for job in jobs:
+            self.assertTrue(job.wait(5))
+
+        for (path, data), job in zip(files, jobs):
+            self.assertEqual(job.status, TransferJob.COMPLETED)
+            self.assertEqual(client.objects[os.path.basename(path)], data)
+        # 单并发时两个文件的请求轮流执行，不会先传完一个文件再传另一个
+        names = [name for name, _ in client.order]
+        runs = [len(list(group)) for _, group in itertools.groupby(names)]
+        self.assertLessEqual(max(runs), 2)
+        self.assertGreaterEqual(len(runs), 4)
+
+    def test_in_flight_requests_are_capped(self):
+        self.configure(3, 3)
+        client = RecordingClient()
+        files = [self.make_file(f"f{i}.bin", 8192) for i in range(6)]
+        jobs = [self.scheduler.submit(client, path, os.path.basename(path)) for path, _ in files]
+        for job in jobs:
+            self.assertTrue(job.wait(10))
+        self.assertTrue(all(job.status == TransferJob.COMPLETED for job in jobs))
+        self.assertLessEqual(client.peak, 3)
+
+    def test_failed_job_is_aborted_and_others_continue(self):
+        self.configure(2, 2)
+        client = RecordingClient(fail_part=('bad.bin', 2))
+        bad, _ = self.make_file('bad.bin', 4096)
+        good, good_data = self.make_file('good.bin', 4096)
+        events = []
+        self.scheduler.add_listener(lambda job: events.append((job.remote_path, job.status)))
+        try:
+            errors = []
+            bad_job = self.scheduler.submit(client, bad, 'bad.bin',
+                                            on_error=lambda job, e: errors.append(e))
+            good_job = self.scheduler.submit(client, good, 'good.bin')
+            self.assertTrue(bad_job.wait(5) and good_job.wait(5))
+        finally:
+            self.scheduler._listeners.clear()
+
+        self.assertEqual(bad_job.status, TransferJob.FAILED)
+        self.assertIsInstance(errors[0], PermissionError)
+        self.assertIn('abort_multipart_upload', client.calls)
+        self.assertNotIn('bad.bin', client.objects)
+        self.assertEqual(client.objects['good.bin'], good_data)
+        self.assertIn(('good.bin', TransferJob.COMPLETED), events)
+
+    def test_failed_job_resumes_from_journal(self):
+        self.configure(1, 1)
+        self.scheduler.RETRY_BASE_DELAY = 0
+        client = RecordingClient()
+        path, data = self.make_file('data.bin', 4096)
+
+        def flaky_upload_part(upload, part_number, data):
+            if part_number == 3:
+                raise ConnectionError("connection reset")
+            return FakeOSSClient.upload_part(client, upload, part_number, data)
+
+        client.upload_part = flaky_upload_part
+        try:
+            job = self.scheduler.submit(client, path, 'data.bin')
+            self.assertTrue(job.wait(5))
+        finally:
+            self.scheduler.__dict__.pop('RETRY_BASE_DELAY', None)
+        self.assertEqual(job.status, TransferJob.FAILED)
+        # 临时错误不取消分片上传，已上传的分片留给下次续传
+        self.assertNotIn('abort_multipart_upload', client.calls)
+        self.assertEqual(len(client.uploads), 1)
+
+        del client.upload_part
+        client.calls.clear()
+        job = self.scheduler.submit(client, path, 'data.bin')
+        self.assertTrue(job.wait(5))
+        self.assertEqual(job.status, TransferJob.COMPLETED)
+        self.assertEqual(client.objects['data.bin'], data)
+        self.assertNotIn('init_multipart_upload', client.calls)
+        self.assertEqual(sorted(n for _, n in client.order), [3, 4])
+        self.assertFalse(os.listdir(os.path.join(self.tmpdir.name, 'transfers')))
+
+    def test_small_file_uploads_directly(self):
+        self.configure(2, 2)
+        client = RecordingClient()
+        path, data = self.make_file('small.bin', 100)
+        progress = []
+        job = self.scheduler.submit(client, path, 'small.bin',
+                                    progress_callback=lambda done, total, *args: progress.append(done))
+        self.assertTrue(job.wait(5))
+        self.assertEqual(client.objects['small.bin'], data)
+        self.assertEqual(progress[-1], 100)
+        self.assertIn(job, self.scheduler.jobs())
+
+    def test_paused_job_does_not_block_queue(self):
+        self.configure(1, 1)
+        self.scheduler.MAX_ACTIVE_FILES = 1
+        client = RecordingClient()
+        first, _ = self.make_file('first.bin', 4096)
+        second, second_data = self.make_file('second.bin', 4096)
+        client.gate.clear()
+        paused = self.scheduler.submit(client, first, 'first.bin')
+        try:
+            queued = self.scheduler.submit(client, second, 'second.bin')
+            paused.token.pause()
+            client.gate.set()
+            self.assertTrue(queued.wait(5))
+            self.assertEqual(client.objects['second.bin'], second_data)
+            self.assertFalse(paused.finished)
+        finally:
+            paused.token.resume()
+        self.assertTrue(paused.wait(5))
+
+    def test_cancelled_queued_job_finishes(self):
+        self.configure(1, 1)
+        self.scheduler.MAX_ACTIVE_FILES = 1
+        client = RecordingClient()
+        first, _ = self.make_file('first.bin', 4096)
+        second, _ = self.make_file('second.bin', 4096)
+        client.gate.clear()
+        try:
+            running = self.scheduler.submit(client, first, 'first.bin')
+            queued = self.scheduler.submit(client, second, 'second.bin')
+            queued.token.cancel()
+            # 第一个任务仍在初始化，排队的任务也立即结束
+            self.assertTrue(queued.wait(5))
+            self.assertEqual(queued.status, TransferJob.CANCELLED)
+        finally:
+            client.gate.set()
+        self.assertTrue(running.wait(5))
+        self.assertEqual(client.calls.count('init_multipart_upload'), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,214 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ossnake.driver.transfer_manager import TransferManager
+from ossnake.driver.exceptions import TransferCancelledError
+from ossnake.utils.transfer_journal import TransferJournal
+from ossnake.utils.transfer_scheduler import TransferScheduler, TransferJob
+from ossnake.utils.transfer_token import TransferToken, current_token
+from tests.fake_client import FakeOSSClient, transfer_settings
+
+
+class GatedClient(FakeOSSClient):
+    """上传到指定分片时通知测试并等待放行"""
+
+    def __init__(self, block_part):
+        super().__init__()
+        self.block_part = block_part
+        self.reached = threading.Event()
+        self.release = threading.Event()
+        self.uploaded_parts = []
+
+    def upload_part(self, upload, part_number, data):
+        if part_number == self.block_part:
+            self.reached.set()
+            self.release.wait(5)
+        etag = super().upload_part(upload, part_number, data)
+        with self.lock:
+            self.uploaded_parts.append(part_number)
+        return etag
+
+
+class TestTransferToken(unittest.TestCase):
+    def test_pause_resume_cancel(self):
+        token = TransferToken()
+        self.assertFalse(token.paused)
+        token.pause()
+        self.assertTrue(token.paused)
+        self.assertFalse(token.wait_if_paused(0.01))
+        token.resume()
+        self.assertTrue(token.wait_if_paused(0.01))
+
+        cancelled = []
+        token.on_cancel(lambda: cancelled.append(1))
+        token.pause()
+        token.cancel()
+        self.assertEqual(cancelled, [1])
+        self.assertTrue(token.cancelled)
+        self.assertFalse(token.paused)
+        with self.assertRaises(TransferCancelledError):
+            token.wait_if_paused(1)
+
+    def test_bound_is_thread_local(self):
+        token = TransferToken()
+        seen = []
+        with token.bound():
+            self.assertIs(current_token(), token)
+            thread = threading.Thread(target=lambda: seen.append(current_token()))
+            thread.start()
+            thread.join()
+        self.assertEqual(seen, [None])
+        self.assertIsNone(current_token())
+
+
+class TestTransferCancellation(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.local_file = os.path.join(self.tmpdir.name, 'data.bin')
+        self.data = os.urandom(8 * 1024)
+        with open(self.local_file, 'wb') as f:
+            f.write(self.data)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def make_manager(self):
+        manager = TransferManager()
+        manager.RETRY_BASE_DELAY = 0
+        # 单线程、固定并发，分片按顺序开始
+        manager.upload_settings = transfer_settings(chunk_size=1024, workers=1)
+        manager.download_settings = transfer_settings(chunk_size=1024, workers=1)
+        manager.journal = TransferJournal(os.path.join(self.tmpdir.name, 'transfers'))
+        return manager
+
+    def test_cancel_aborts_multipart_upload(self):
+        client = GatedClient(block_part=3)
+        manager = self.make_manager()
+        token = TransferToken()
+        errors = []
+
+        def upload():
+            try:
+                manager.upload_file(client, self.local_file, 'data.bin', token=token)
+            except Exception as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=upload)
+        thread.start()
+        try:
+            self.assertTrue(client.reached.wait(5))
+        finally:
+            token.cancel()
+            client.release.set()
+            thread.join(5)
+
+        self.assertEqual(len(errors), 1)
+        self.assertIsInstance(errors[0], TransferCancelledError)
+        self.assertIn('abort_multipart_upload', client.calls)
+        self.assertNotIn('complete_multipart_upload', client.calls)
+        self.assertEqual(client.uploads, {})
+        self.assertIsNone(manager.get_progress(self.local_file, 'data.bin', client))
+
+    def test_pause_stops_new_parts_and_resume_finishes(self):
+        client = GatedClient(block_part=3)
+        manager = self.make_manager()
+        token = TransferToken()
+        thread = threading.Thread(
+            target=manager.upload_file, args=(client, self.local_file, 'data.bin'),
+            kwargs={'token': token}
+        )
+        thread.start()
+        try:
+            self.assertTrue(client.reached.wait(5))
+            token.pause()
+            client.release.set()
+            time.sleep(0.1)
+            # 进行中的分片完成，之后不再开始新的分片
+            self.assertEqual(sorted(client.uploaded_parts), [1, 2, 3])
+        finally:
+            # 断言失败时也要放行，避免暂停的线程挂住测试进程
+            token.resume()
+            client.release.set()
+            thread.join(5)
+        self.assertEqual(sorted(client.uploaded_parts), list(range(1, 9)))
+        self.assertEqual(client.objects['data.bin'], self.data)
+
+    def test_cancel_discards_partial_download(self):
+        client = FakeOSSClient()
+        client.objects['big.bin'] = self.data
+        manager = self.make_manager()
+        token = TransferToken()
+        local_file = os.path.join(self.tmpdir.name, 'out.bin')
+
+        def on_progress(done, total):
+            if done >= 2048:
+                token.cancel()
+
+        with self.assertRaises(TransferCancelledError):
+            manager.download_file(client, 'big.bin', local_file, on_progress, token=token)
+        # 目标文件和未完成的临时文件都被删除
+        self.assertFalse([name for name in os.listdir(self.tmpdir.name) if name.startswith('out.bin')])
+
+
+class TestSchedulerCancellation(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = TransferScheduler()
+        self.scheduler.configure({'workers': 1, 'max_workers': 1, 'adaptive': False})
+        self.scheduler.chunk_size = 1024
+        self.scheduler.RETRY_BASE_DELAY = 0
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.journal = self.scheduler.journal
+        self.scheduler.journal = TransferJournal(os.path.join(self.tmpdir.name, 'transfers'))
+        self.local_file = os.path.join(self.tmpdir.name, 'data.bin')
+        self.data = os.urandom(8 * 1024)
+        with open(self.local_file, 'wb') as f:
+            f.write(self.data)
+
+    def tearDown(self):
+        self.scheduler.journal = self.journal
+        self.scheduler.__dict__.pop('RETRY_BASE_DELAY', None)
+        self.scheduler.configure({})
+        self.scheduler.clear_finished()
+        self.tmpdir.cleanup()
+
+    def test_cancel_job_aborts_upload(self):
+        client = GatedClient(block_part=3)
+        job = self.scheduler.submit(client, self.local_file, 'data.bin')
+        try:
+            self.assertTrue(client.reached.wait(5))
+        finally:
+            job.token.cancel()
+            client.release.set()
+        self.assertTrue(job.wait(5))
+
+        self.assertEqual(job.status, TransferJob.CANCELLED)
+        self.assertIsInstance(job.error, TransferCancelledError)
+        self.assertIn('abort_multipart_upload', client.calls)
+        self.assertNotIn('data.bin', client.objects)
+
+    def test_paused_job_resumes(self):
+        client = GatedClient(block_part=3)
+        job = self.scheduler.submit(client, self.local_file, 'data.bin')
+        try:
+            self.assertTrue(client.reached.wait(5))
+            job.token.pause()
+            client.release.set()
+            self.assertFalse(job.wait(0.1))
+            self.assertEqual(sorted(client.uploaded_parts), [1, 2, 3])
+        finally:
+            job.token.resume()
+            client.release.set()
+        self.assertTrue(job.wait(5))
+        self.assertEqual(job.status, TransferJob.COMPLETED)
+        self.assertEqual(client.objects['data.bin'], self.data)
+
+
+if __name__ == '__main__':
+    unittest.main()